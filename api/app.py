@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 from flask import Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
@@ -17,6 +18,7 @@ try:
     from api.services.group_service import GroupService
     from api.services.user_service import UserService
     from api.services.achievement_service import AchievementService
+    from api.services.achievement_evaluator import AchievementEvaluator
     from api.routes.mood_routes import create_mood_routes
     from api.routes.goal_routes import create_goal_routes
     from api.routes.group_routes import create_group_routes
@@ -26,6 +28,7 @@ try:
     from api.routes.achievement_routes import create_achievement_routes
     from api.utils.error_handlers import setup_error_handlers
     from api.utils.security_headers import add_security_headers
+    from api.utils.service_registry import ServiceRegistry, import_attr
 except Exception:  # fallback for running from inside api/
     from database import MoodDatabase
     from services.mood_service import MoodService
@@ -33,6 +36,7 @@ except Exception:  # fallback for running from inside api/
     from services.group_service import GroupService
     from services.user_service import UserService
     from services.achievement_service import AchievementService
+    from services.achievement_evaluator import AchievementEvaluator
     from routes.mood_routes import create_mood_routes
     from routes.goal_routes import create_goal_routes
     from routes.group_routes import create_group_routes
@@ -42,6 +46,7 @@ except Exception:  # fallback for running from inside api/
     from routes.achievement_routes import create_achievement_routes
     from utils.error_handlers import setup_error_handlers
     from utils.security_headers import add_security_headers
+    from utils.service_registry import ServiceRegistry, import_attr
 
 
 def create_app(config_name="default"):
@@ -54,6 +59,9 @@ def create_app(config_name="default"):
         from config import config as config_map  # type: ignore[import-not-found]
         from config import get_config, INSECURE_DEFAULT_SECRET  # type: ignore[import-not-found]
 
+    app_started = time.perf_counter()
+    services = ServiceRegistry()
+
     app = Flask(__name__)
     app.config.from_object(config_map[config_name])
 
@@ -107,32 +115,46 @@ def create_app(config_name="default"):
 
     # Add security headers
     add_security_headers(app)
+    services.record("flask_setup", app_started)
 
     def should_start_scheduler():
         return os.getenv("ENABLE_SCHEDULER", "0").lower() in {"1", "true", "yes", "on"}
 
     # Initialize database
-    db = MoodDatabase(app.config.get("DATABASE_PATH"))
+    started = time.perf_counter()
+    db = MoodDatabase(
+        app.config.get("DATABASE_PATH"),
+        pool_size=app.config.get("DATABASE_POOL_SIZE"),
+        read_pool_size=app.config.get("DATABASE_READ_POOL_SIZE"),
+        read_cache_size=app.config.get("DATABASE_READ_CACHE_SIZE"),
+        read_mmap_size=app.config.get("DATABASE_READ_MMAP_SIZE"),
+        group_commit=app.config.get("DATABASE_GROUP_COMMIT"),
+        group_commit_max_batch=app.config.get("DATABASE_GROUP_COMMIT_MAX_BATCH"),
+        instrument_queries=app.config.get("DATABASE_QUERY_STATS"),
+        slow_query_ms=app.config.get("DATABASE_SLOW_QUERY_MS"),
+        reference_cache_entries=app.config.get("DATABASE_REFERENCE_CACHE_ENTRIES"),
+    )
+    services.record("database", started)
 
     # Initialize services
-    mood_service = MoodService(db)
+    started = time.perf_counter()
+    achievement_evaluator = AchievementEvaluator(
+        db, wait_seconds=app.config.get("ACHIEVEMENT_WAIT_SECONDS", 0.5)
+    )
+    mood_service = MoodService(db, achievements=achievement_evaluator)
     group_service = GroupService(db)
-    goal_service = GoalService(db)
+    goal_service = GoalService(db, achievements=achievement_evaluator)
     user_service = UserService(db)
-    achievement_service = AchievementService(db)
+    achievement_service = AchievementService(db, evaluator=achievement_evaluator)
 
     # Initialize login attempt tracking service
-    try:
-        from api.services.login_attempt_service import LoginAttemptService
-    except ImportError:
-        from services.login_attempt_service import LoginAttemptService
+    LoginAttemptService = import_attr("services.login_attempt_service", "LoginAttemptService")
     login_attempt_service = LoginAttemptService(app.config.get("DATABASE_PATH"))
+    services.record("core_services", started)
 
     # Ensure default admin user exists
-    try:
-        from api.utils.password_utils import hash_password
-    except ImportError:
-        from utils.password_utils import hash_password
+    started = time.perf_counter()
+    hash_password = import_attr("utils.password_utils", "hash_password")
 
     try:
         existing_admin = user_service.get_user_by_username("admin")
@@ -167,23 +189,57 @@ def create_app(config_name="default"):
             app.logger.info("Default admin user created successfully")
     except Exception as e:
         app.logger.warning(f"Could not create default admin user: {e}")
+    services.record("admin_user", started)
 
     # Email & Password Reset services
-    try:
-        from api.services.email_service import create_email_service
-        from api.services.password_reset_service import PasswordResetService
-        from api.routes.password_reset_routes import create_password_reset_routes
-    except ImportError:
-        from services.email_service import create_email_service
-        from services.password_reset_service import PasswordResetService
-        from routes.password_reset_routes import create_password_reset_routes
+    started = time.perf_counter()
+    create_email_service = import_attr("services.email_service", "create_email_service")
+    PasswordResetService = import_attr("services.password_reset_service", "PasswordResetService")
+    create_password_reset_routes = import_attr("routes.password_reset_routes", "create_password_reset_routes")
 
     email_service = create_email_service(cfg) if cfg else None
     password_reset_service = (
         PasswordResetService(db, email_service) if email_service else None
     )
+    services.record("email", started)
+
+    # Services with heavy imports (PIL, pywebpush, APScheduler, matplotlib,
+    # weasyprint) are constructed on first use; routes get lazy proxies.
+    upload_folder = os.path.join(app.root_path, "..", "data", "media")
+    media_service = services.register(
+        "media",
+        lambda: import_attr("services.media_service", "MediaService")(
+            db, upload_folder, achievements=achievement_evaluator
+        ),
+    )
+    push_service = services.register(
+        "push", lambda: import_attr("services.push_service", "PushService")(db)
+    )
+    scheduler_service = services.register(
+        "scheduler",
+        lambda: import_attr("services.scheduler_service", "SchedulerService")(
+            db, services.get("push")
+        ),
+    )
+    export_service = services.register(
+        "export", lambda: import_attr("services.export_service", "ExportService")(db)
+    )
+    daylio_import_service = services.register(
+        "daylio_import",
+        lambda: import_attr("services.daylio_import_service", "DaylioImportService")(db),
+    )
+    analytics_service = services.register(
+        "analytics",
+        lambda: import_attr("services.analytics_service", "AnalyticsService")(
+            db,
+            cache_entries=app.config.get("ANALYTICS_CACHE_ENTRIES", 256),
+            cache_max_bytes=app.config.get("ANALYTICS_CACHE_MAX_BYTES", 32 * 1024 * 1024),
+            vectorized=app.config.get("ANALYTICS_VECTORIZED", True),
+        ),
+    )
 
     # Register blueprints with services
+    started = time.perf_counter()
     app.register_blueprint(
         create_auth_routes(user_service, login_attempt_service, email_service, db),
         url_prefix="/api",
@@ -194,13 +250,8 @@ def create_app(config_name="default"):
             create_password_reset_routes(password_reset_service),
             url_prefix="/api",
         )
-    
-    # Media Services needs to be created before some routes if we want to pass it
-    upload_folder = os.path.join(app.root_path, "..", "data", "media")
-    from api.services.media_service import MediaService
-    from api.routes.media_routes import create_media_routes
-    media_service = MediaService(db, upload_folder)
 
+    create_media_routes = import_attr("routes.media_routes", "create_media_routes")
     app.register_blueprint(create_mood_routes(mood_service, media_service), url_prefix="/api")
     app.register_blueprint(create_media_routes(media_service, mood_service), url_prefix="/api")
     app.register_blueprint(create_group_routes(group_service), url_prefix="/api")
@@ -213,132 +264,75 @@ def create_app(config_name="default"):
     app.register_blueprint(create_config_routes(), url_prefix="/api")
 
     # Search Services
-    try:
-        from api.routes.search_routes import create_search_routes
-        app.register_blueprint(create_search_routes(mood_service), url_prefix="/api")
-    except ImportError:
-        from routes.search_routes import create_search_routes
-        app.register_blueprint(create_search_routes(mood_service), url_prefix="/api")
+    create_search_routes = import_attr("routes.search_routes", "create_search_routes")
+    app.register_blueprint(create_search_routes(mood_service), url_prefix="/api")
 
     # Push Notification Services
-    try:
-        from api.services.push_service import PushService
-        from api.services.scheduler_service import SchedulerService
-        from api.routes.reminder_routes import create_reminder_routes
-
-        push_service = PushService(db)
-        scheduler_service = SchedulerService(db, push_service)
-        if should_start_scheduler():
-            scheduler_service.start()
-        else:
-            app.logger.info("Scheduler disabled; set ENABLE_SCHEDULER=1 to enable.")
-        
-        app.register_blueprint(create_reminder_routes(scheduler_service, push_service), url_prefix="/api")
-    except ImportError: # Fallback for local run
-        from services.push_service import PushService
-        from services.scheduler_service import SchedulerService
-        from routes.reminder_routes import create_reminder_routes
-        
-        push_service = PushService(db)
-        scheduler_service = SchedulerService(db, push_service)
-        if should_start_scheduler():
-            scheduler_service.start()
-        else:
-            app.logger.info("Scheduler disabled; set ENABLE_SCHEDULER=1 to enable.")
-        
-        app.register_blueprint(create_reminder_routes(scheduler_service, push_service), url_prefix="/api")
+    create_reminder_routes = import_attr("routes.reminder_routes", "create_reminder_routes")
+    app.register_blueprint(create_reminder_routes(scheduler_service, push_service), url_prefix="/api")
 
     # Export Service
-    try:
-        from api.services.export_service import ExportService
-        from api.routes.export_routes import create_export_routes
-        export_service = ExportService(db)
-        app.register_blueprint(create_export_routes(export_service), url_prefix="/api")
-    except ImportError:
-        from services.export_service import ExportService
-        from routes.export_routes import create_export_routes
-        export_service = ExportService(db)
-        app.register_blueprint(create_export_routes(export_service), url_prefix="/api")
+    create_export_routes = import_attr("routes.export_routes", "create_export_routes")
+    app.register_blueprint(create_export_routes(export_service), url_prefix="/api")
 
     # Daylio Import Service
-    try:
-        from api.services.daylio_import_service import DaylioImportService
-        from api.routes.import_routes import create_import_routes
-
-        daylio_import_service = DaylioImportService(db)
-        app.register_blueprint(create_import_routes(daylio_import_service), url_prefix="/api")
-    except ImportError:
-        from services.daylio_import_service import DaylioImportService
-        from routes.import_routes import create_import_routes
-
-        daylio_import_service = DaylioImportService(db)
-        app.register_blueprint(create_import_routes(daylio_import_service), url_prefix="/api")
+    create_import_routes = import_attr("routes.import_routes", "create_import_routes")
+    app.register_blueprint(create_import_routes(daylio_import_service), url_prefix="/api")
 
     # Custom Mood Definitions
-    try:
-        from api.services.mood_definition_service import MoodDefinitionService
-        from api.routes.mood_definition_routes import create_mood_definition_routes
-        mood_definition_service = MoodDefinitionService(db)
-        app.register_blueprint(create_mood_definition_routes(mood_definition_service), url_prefix="/api")
-    except ImportError:
-        from services.mood_definition_service import MoodDefinitionService
-        from routes.mood_definition_routes import create_mood_definition_routes
-        mood_definition_service = MoodDefinitionService(db)
-        app.register_blueprint(create_mood_definition_routes(mood_definition_service), url_prefix="/api")
+    MoodDefinitionService = import_attr("services.mood_definition_service", "MoodDefinitionService")
+    create_mood_definition_routes = import_attr("routes.mood_definition_routes", "create_mood_definition_routes")
+    mood_definition_service = MoodDefinitionService(db)
+    app.register_blueprint(create_mood_definition_routes(mood_definition_service), url_prefix="/api")
 
     # Scale Tracking
-    try:
-        from api.services.scale_service import ScaleService
-        from api.routes.scale_routes import create_scale_routes
-        scale_service = ScaleService(db)
-        app.register_blueprint(create_scale_routes(scale_service), url_prefix="/api")
-    except ImportError:
-        from services.scale_service import ScaleService
-        from routes.scale_routes import create_scale_routes
-        scale_service = ScaleService(db)
-        app.register_blueprint(create_scale_routes(scale_service), url_prefix="/api")
+    ScaleService = import_attr("services.scale_service", "ScaleService")
+    create_scale_routes = import_attr("routes.scale_routes", "create_scale_routes")
+    scale_service = ScaleService(db)
+    app.register_blueprint(create_scale_routes(scale_service), url_prefix="/api")
 
     # Analytics Services (after scale_service so we can pass it)
-    try:
-        from api.services.analytics_service import AnalyticsService
-        from api.routes.analytics_routes import create_analytics_routes
-        analytics_service = AnalyticsService(db)
-        app.register_blueprint(create_analytics_routes(analytics_service, scale_service=scale_service), url_prefix="/api")
-    except ImportError:
-        from services.analytics_service import AnalyticsService
-        from routes.analytics_routes import create_analytics_routes
-        analytics_service = AnalyticsService(db)
-        app.register_blueprint(create_analytics_routes(analytics_service, scale_service=scale_service), url_prefix="/api")
+    create_analytics_routes = import_attr("routes.analytics_routes", "create_analytics_routes")
+    app.register_blueprint(create_analytics_routes(analytics_service, scale_service=scale_service), url_prefix="/api")
 
     # Important Days / Countdowns
-    try:
-        from api.services.important_days_service import ImportantDaysService
-        from api.routes.important_days_routes import create_important_days_routes
-        important_days_service = ImportantDaysService(db)
-        app.register_blueprint(create_important_days_routes(important_days_service), url_prefix="/api")
-    except ImportError:
-        from services.important_days_service import ImportantDaysService
-        from routes.important_days_routes import create_important_days_routes
-        important_days_service = ImportantDaysService(db)
-        app.register_blueprint(create_important_days_routes(important_days_service), url_prefix="/api")
+    ImportantDaysService = import_attr("services.important_days_service", "ImportantDaysService")
+    create_important_days_routes = import_attr("routes.important_days_routes", "create_important_days_routes")
+    important_days_service = ImportantDaysService(db)
+    app.register_blueprint(create_important_days_routes(important_days_service), url_prefix="/api")
 
     # User Settings / App Lock
-    try:
-        from api.services.settings_service import SettingsService
-        from api.routes.settings_routes import create_settings_routes
-        settings_service = SettingsService(db)
-        app.register_blueprint(create_settings_routes(settings_service), url_prefix="/api")
-    except ImportError:
-        from services.settings_service import SettingsService
-        from routes.settings_routes import create_settings_routes
-        settings_service = SettingsService(db)
-        app.register_blueprint(create_settings_routes(settings_service), url_prefix="/api")
+    SettingsService = import_attr("services.settings_service", "SettingsService")
+    create_settings_routes = import_attr("routes.settings_routes", "create_settings_routes")
+    settings_service = SettingsService(db)
+    app.register_blueprint(create_settings_routes(settings_service), url_prefix="/api")
+
+    # Dashboard bootstrap (one snapshot read of the post-login data)
+    BootstrapService = import_attr("services.bootstrap_service", "BootstrapService")
+    create_bootstrap_routes = import_attr("routes.bootstrap_routes", "create_bootstrap_routes")
+    bootstrap_service = BootstrapService(db, mood_service, settings_service)
+    app.register_blueprint(create_bootstrap_routes(bootstrap_service), url_prefix="/api")
+
+    # Admin diagnostics (query stats, pool and writer counters)
+    create_admin_routes = import_attr("routes.admin_routes", "create_admin_routes")
+    app.register_blueprint(create_admin_routes(db, user_service), url_prefix="/api")
+    services.record("blueprints", started)
+
+    # The scheduler runs background jobs, so it is the one lazy service that
+    # must be built at startup when enabled.
+    if should_start_scheduler():
+        started = time.perf_counter()
+        services.get("scheduler").start()
+        services.record("scheduler_start", started)
+    else:
+        app.logger.info("Scheduler disabled; set ENABLE_SCHEDULER=1 to enable.")
 
     # Expose services for optional blueprints (e.g., OAuth) to reuse
     try:
         if not hasattr(app, "extensions") or app.extensions is None:  # type: ignore[attr-defined]
             app.extensions = {}  # type: ignore[attr-defined]
         app.extensions["user_service"] = user_service  # type: ignore[attr-defined]
+        app.extensions["services"] = services  # type: ignore[attr-defined]
     except Exception:
         pass
 
@@ -366,6 +360,13 @@ def create_app(config_name="default"):
                         f"[warn] ENABLE_GOOGLE_OAUTH is true but oauth blueprint not available: {e} / {e2}"
                     )
 
+    total = services.record("create_app", app_started)
+    app.logger.info(
+        "Startup timings (ms): %s; total %.1f ms",
+        ", ".join(f"{name}={ms}" for name, ms in services.timings().items() if name != "create_app"),
+        total,
+    )
+
     # Debug: Print all registered routes
     if app.debug:
         print("Registered routes:")
@@ -10,6 +10,30 @@ def _parse_cors_origins(raw: str) -> list[str]:
     """Parse comma-separated CORS origins into a normalized list."""
     return [origin.strip() for origin in raw.split(",") if origin.strip()]
 
+
+# Numeric and flag settings: unset, blank or malformed values fall back to the
+# default (a typo in the environment must not stop the app from importing).
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    raw = os.environ.get(name, "").strip()
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    raw = os.environ.get(name, "").strip()
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    raw = os.environ.get(name, "").strip().lower()
+    return raw in {"1", "true", "yes", "on"} if raw else default
+
+
 # Optional .env loader: only if python-dotenv is installed.
 try:
     from dotenv import load_dotenv  # type: ignore
@@ -36,6 +60,36 @@ class Config:
         Path(__file__).parent.parent, "data", "twilightio.db"
     )
 
+    # Idle SQLite connections kept per MoodDatabase (0 disables pooling)
+    DATABASE_POOL_SIZE = _env_int("DATABASE_POOL_SIZE", 8)
+    # Read-only connections (mode=ro, query_only) used by GET-path queries
+    DATABASE_READ_POOL_SIZE = _env_int("DATABASE_READ_POOL_SIZE", 8)
+    # PRAGMA cache_size (negative values are KiB) and mmap_size for read connections
+    DATABASE_READ_CACHE_SIZE = _env_int("DATABASE_READ_CACHE_SIZE", None)
+    DATABASE_READ_MMAP_SIZE = _env_int("DATABASE_READ_MMAP_SIZE", None)
+    # Batch concurrent writes through one writer thread (group commit)
+    DATABASE_GROUP_COMMIT = _env_flag("DATABASE_GROUP_COMMIT")
+    DATABASE_GROUP_COMMIT_MAX_BATCH = _env_int("DATABASE_GROUP_COMMIT_MAX_BATCH", 64)
+    # Per-statement SQL latency stats, served by /api/admin/db/query-stats
+    DATABASE_QUERY_STATS = _env_flag("DATABASE_QUERY_STATS")
+    DATABASE_SLOW_QUERY_MS = _env_float("DATABASE_SLOW_QUERY_MS", 100.0)
+    # Per-user groups/scales/mood definitions/settings kept in memory (0 disables)
+    DATABASE_REFERENCE_CACHE_ENTRIES = _env_int("DATABASE_REFERENCE_CACHE_ENTRIES", 4096)
+    # Per-user analytics result cache: entries (0 disables) and approximate
+    # JSON bytes (0 bounds by entry count only and skips measuring results)
+    ANALYTICS_CACHE_ENTRIES = _env_int("ANALYTICS_CACHE_ENTRIES", 256)
+    ANALYTICS_CACHE_MAX_BYTES = _env_int("ANALYTICS_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+    # Compute tag analytics from an in-memory NumPy matrix (falls back to SQL without NumPy)
+    ANALYTICS_VECTORIZED = _env_flag("ANALYTICS_VECTORIZED", True)
+    # Seconds a new-entry request waits for its achievement check before deferring it
+    ACHIEVEMENT_WAIT_SECONDS = _env_float("ACHIEVEMENT_WAIT_SECONDS", 0.5)
+    # Usernames allowed to call /api/admin/* endpoints
+    ADMIN_USERNAMES = [
+        name.strip()
+        for name in os.environ.get("ADMIN_USERNAMES", "admin").split(",")
+        if name.strip()
+    ]
+
     # CORS configuration
     CORS_ORIGINS = _parse_cors_origins(
         os.environ.get("CORS_ORIGINS", "http://localhost:5173,https://twilightio.vercel.app")
@@ -48,7 +102,7 @@ class Config:
     # JWT configuration (legacy)
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY") or SECRET_KEY
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hour
-    ENABLE_LOCAL_LOGIN = str(os.environ.get("ENABLE_LOCAL_LOGIN", "")).strip().lower() in {"1", "true", "yes", "on"}
+    ENABLE_LOCAL_LOGIN = _env_flag("ENABLE_LOCAL_LOGIN")
 
 
 class DevelopmentConfig(Config):
@@ -96,6 +150,12 @@ class TestingConfig(Config):
     TESTING = True
     # Use a file-backed SQLite DB so multiple connections see the same data
     DATABASE_PATH = "/tmp/twilightio_test.db"
+    # Tests delete and recreate the shared DB file between apps; pooled
+    # connections would keep the old file (and its WAL) open.
+    DATABASE_POOL_SIZE = 0
+    DATABASE_READ_POOL_SIZE = 0
+    # Responses should carry new achievements even on a slow test machine
+    ACHIEVEMENT_WAIT_SECONDS = 10.0
 
 
 # Configuration mapping (legacy app factory still uses this).
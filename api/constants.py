@@ -2,6 +2,17 @@
 class AnalyticsLimits:
     TAG_CO_OCCURRENCE = 20
     ADVANCED_CORRELATIONS = 50
+    MAX_STABILITY_WINDOW = 90
+    ITEMSETS = 25
+    MAX_ITEMSET_SIZE = 5
+    ITEMSET_TIME_BUDGET_SECONDS = 0.5
+    ITEMSET_MAX_NODES = 200_000
+    ITEMSET_MAX_BYTES = 16 * 1024 * 1024  # Stacked bitsets plus found itemsets
+    SCALE_CORRELATION_TAGS = 10
+    MAX_SCALE_CORRELATION_TAGS = 25
 
 class Defaults:
     MOOD_STABILITY_DAYS = 30
+    MOOD_STABILITY_WINDOW = 7
+    ITEMSET_MIN_SUPPORT = 0.02
+    ITEMSET_MAX_SIZE = 4
@@ -8,21 +8,33 @@ from typing import Optional
 from api.database_achievements import AchievementsMixin
 from api.database_analytics import AnalyticsMixin
 from api.database_common import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_READ_POOL_SIZE,
+    ConnectionPool,
     DatabaseConnectionMixin,
     DatabaseError,
+    GroupCommitWriter,
     SQLQueries,
     logger,
 )
 from api.database_goals import GoalsMixin
+from api.database_instrumentation import DEFAULT_SLOW_QUERY_MS, QueryStats
 from api.database_password_reset import PasswordResetMixin
 from api.database_groups import GroupsMixin
 from api.database_important_days import ImportantDaysMixin
 from api.database_media import MediaMixin
 from api.database_moods import MoodEntriesMixin, MoodDefinitionMixin
+from api.database_reference import (
+    DEFAULT_REFERENCE_CACHE_BYTES,
+    DEFAULT_REFERENCE_CACHE_ENTRIES,
+    ReferenceDataMixin,
+)
+from api.database_rollups import DailyRollupMixin
 from api.database_scales import ScalesMixin
 from api.database_schema import DatabaseSchemaMixin
 from api.database_users import UsersMixin
 from api.database_settings import SettingsMixin
+from api.utils.result_cache import VersionedLRUCache
 
 
 class MoodDatabase(
@@ -32,6 +44,7 @@ class MoodDatabase(
     GoalsMixin,
     MoodEntriesMixin,
     MoodDefinitionMixin,
+    DailyRollupMixin,
     ScalesMixin,
     GroupsMixin,
     AchievementsMixin,
@@ -39,12 +52,55 @@ class MoodDatabase(
     AnalyticsMixin,
     ImportantDaysMixin,
     SettingsMixin,
+    ReferenceDataMixin,
 ):
     """High-level facade composing all database-related mixins."""
 
     db_path: str
 
-    def __init__(self, db_path: Optional[str] = None, *, init: bool = True) -> None:
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        *,
+        init: bool = True,
+        pool_size: Optional[int] = None,
+        read_pool_size: Optional[int] = None,
+        read_cache_size: Optional[int] = None,
+        read_mmap_size: Optional[int] = None,
+        group_commit: Optional[bool] = None,
+        group_commit_max_batch: Optional[int] = None,
+        instrument_queries: Optional[bool] = None,
+        slow_query_ms: Optional[float] = None,
+        reference_cache_entries: Optional[int] = None,
+    ) -> None:
+        """Configure the database and optionally create the schema.
+
+        Args:
+            db_path: SQLite file path; defaults to ``data/twilightio.db``.
+            init: Run :meth:`init_database` immediately.
+            pool_size: Idle connections to keep open (default 8); ``0``
+                disables pooling so every call opens and closes its own
+                connection.
+            read_pool_size: Idle read-only connections to keep open; ``0``
+                opens a private read-only connection per read.
+            read_cache_size: ``PRAGMA cache_size`` for read connections
+                (negative values are KiB).
+            read_mmap_size: ``PRAGMA mmap_size`` in bytes for read
+                connections.
+            group_commit: Route write helpers through a single writer thread
+                that commits concurrent writes together (off by default).
+            group_commit_max_batch: Upper bound on writes per group commit.
+            instrument_queries: Record per-statement latency and row counts
+                (off by default).
+            slow_query_ms: Log statements at least this slow with their
+                caller and query plan.
+            reference_cache_entries: Per-user groups, scales, mood definitions
+                and settings kept in memory; ``0`` reads them from SQLite
+                every time.
+
+        The app passes the ``DATABASE_*`` settings of :mod:`api.config`;
+        ``None`` uses the built-in default.
+        """
         data_dir = Path(__file__).resolve().parent.parent / "data"
         data_dir.mkdir(parents=True, exist_ok=True)
 
@@ -53,7 +109,59 @@ class MoodDatabase(
         )
         self.db_path = str(resolved_path)
 
-        logger.debug("MoodDatabase configured with db_path=%s", self.db_path)
+        if pool_size is None:
+            pool_size = DEFAULT_POOL_SIZE
+        if read_pool_size is None:
+            read_pool_size = DEFAULT_READ_POOL_SIZE
+        if group_commit_max_batch is None:
+            group_commit_max_batch = 64
+        if slow_query_ms is None:
+            slow_query_ms = DEFAULT_SLOW_QUERY_MS
+        if reference_cache_entries is None:
+            reference_cache_entries = DEFAULT_REFERENCE_CACHE_ENTRIES
+
+        self._query_stats = (
+            QueryStats(slow_query_ms=slow_query_ms) if instrument_queries else None
+        )
+        self._pool = (
+            ConnectionPool(self.db_path, size=pool_size, query_stats=self._query_stats)
+            if pool_size > 0
+            else None
+        )
+        self._read_pool = (
+            ConnectionPool(
+                self.db_path,
+                size=read_pool_size,
+                read_only=True,
+                cache_size=read_cache_size,
+                mmap_size=read_mmap_size,
+                query_stats=self._query_stats,
+            )
+            if read_pool_size > 0
+            else None
+        )
+        self._writer = (
+            GroupCommitWriter(
+                self.db_path,
+                max_batch=group_commit_max_batch,
+                query_stats=self._query_stats,
+            )
+            if group_commit
+            else None
+        )
+        self._reference_cache = (
+            VersionedLRUCache(reference_cache_entries, DEFAULT_REFERENCE_CACHE_BYTES)
+            if reference_cache_entries > 0
+            else None
+        )
+
+        logger.debug(
+            "MoodDatabase configured with db_path=%s pool_size=%s read_pool_size=%s group_commit=%s",
+            self.db_path,
+            pool_size,
+            read_pool_size,
+            bool(group_commit),
+        )
 
         if init:
             self.init_database()
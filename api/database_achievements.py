@@ -3,12 +3,56 @@
 from __future__ import annotations
 
 import sqlite3
+import time
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional
+from typing import AbstractSet, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 from api.database_common import DatabaseConnectionMixin, SQLQueries, logger
-
-MEANINGFUL_WORD_THRESHOLD = 50
+from api.database_rollups import MOOD_SCORES, rebuild_dirty_streaks, streak_days, streak_runs
+
+_EPOCH = date(1970, 1, 1)
+
+# Metric groups each kind of write can move; an event only re-checks the
+# rules reading one of its groups.
+ACHIEVEMENT_EVENTS: Dict[str, FrozenSet[str]] = {
+    "entry": frozenset({"entries", "moods", "streaks", "weekly_words"}),
+    "media": frozenset({"photos"}),
+    "goal": frozenset({"goals"}),
+    "stats_view": frozenset({"stats_views"}),
+}
+ALL_METRIC_GROUPS: FrozenSet[str] = frozenset().union(*ACHIEVEMENT_EVENTS.values())
+
+# (achievement type, metric group, condition over the loaded metrics)
+ACHIEVEMENT_RULES: Tuple[Tuple[str, str, Callable[[Dict[str, int]], bool]], ...] = (
+    ("first_entry", "entries", lambda m: m["entries"] >= 1),
+    ("week_warrior", "streaks", lambda m: m["current_streak"] >= 7),
+    ("consistency_king", "streaks", lambda m: m["current_streak"] >= 30),
+    ("data_lover", "stats_views", lambda m: m["stats_views"] >= 10),
+    ("mood_master", "entries", lambda m: m["entries"] >= 100),
+    ("complex_person", "moods", lambda m: m["unique_moods"] >= 5),
+    ("devoted", "streaks", lambda m: m["current_streak"] >= 365),
+    ("photographer", "photos", lambda m: m["photos"] >= 50),
+    ("goal_crusher", "goals", lambda m: m["goal_completions"] >= 10),
+    ("half_year", "streaks", lambda m: m["current_streak"] >= 180),
+    ("comeback_king", "streaks", lambda m: m["longest_streak"] > m["current_streak"] >= 7),
+    ("milestone_50", "entries", lambda m: m["entries"] >= 50),
+    ("milestone_250", "entries", lambda m: m["entries"] >= 250),
+    ("milestone_500", "entries", lambda m: m["entries"] >= 500),
+    ("weekly_wordsmith", "weekly_words", lambda m: m["weekly_words"] >= 500),
+    ("deep_diver", "streaks", lambda m: m["journaling_streak"] >= 7),
+    ("journaling_master", "streaks", lambda m: m["journaling_streak"] >= 30),
+)
+
+
+def _current_run(last_day: Optional[int], run: int, today: int) -> int:
+    """A run only counts as current when its last day is today or yesterday."""
+    return run if last_day is not None and today - last_day <= 1 else 0
+
+
+def _week_start_day() -> int:
+    """Epoch day of this calendar week's Monday."""
+    today = datetime.now().date()
+    return (today - timedelta(days=today.weekday()) - _EPOCH).days
 
 
 class AchievementsMixin(DatabaseConnectionMixin):
@@ -57,118 +101,91 @@ class AchievementsMixin(DatabaseConnectionMixin):
         }
 
     def get_mood_counts(self, user_id: int) -> Dict[int, int]:
-        cursor = self._query(
-            """
-            SELECT mood, COUNT(*) as count
-              FROM mood_entries
-             WHERE user_id = ?
-             GROUP BY mood
-             ORDER BY mood
-            """,
+        row = self._query(
+            "SELECT "
+            + ", ".join(f"COALESCE(SUM(mood_{score}), 0)" for score in MOOD_SCORES)
+            + " FROM daily_mood_rollup WHERE user_id = ?",
             (user_id,),
-        )
-        return {row[0]: row[1] for row in cursor.fetchall()}
+        ).fetchone()
+        return {score: count for score, count in zip(MOOD_SCORES, row) if count}
 
     # --- Streak calculation ---------------------------------------------------
+    def get_streak_state(self, user_id: int) -> Dict:
+        """Current/longest entry and journaling streaks from ``user_streaks``.
+
+        Triggers keep the row current for the common writes; a missing or
+        ``dirty`` row (backdated entry, delete, date edit) is recomputed in
+        memory from the entries, without writing.  Entry writes and
+        :meth:`persist_dirty_streaks` store the rebuilt rows.  Current
+        streaks count when the last day is today or yesterday.
+        """
+        row = self._query(
+            "SELECT last_day, run_length, longest, journal_last_day, journal_run_length, "
+            "journal_longest, dirty FROM user_streaks WHERE user_id = ?",
+            (user_id,),
+        ).fetchone()
+        if row is None or row["dirty"]:
+            with self._read_conn() as conn:
+                runs = streak_runs({user_id: [], **streak_days(conn, (user_id,))})[user_id]
+            row = dict(zip(
+                ("last_day", "run_length", "longest",
+                 "journal_last_day", "journal_run_length", "journal_longest"),
+                (*runs[0], *runs[1]),
+            ))
+
+        today = (datetime.now().date() - _EPOCH).days
+        return {
+            "current_streak": _current_run(row["last_day"], row["run_length"], today),
+            "longest_streak": row["longest"],
+            "journaling_streak": _current_run(row["journal_last_day"], row["journal_run_length"], today),
+            "longest_journaling_streak": row["journal_longest"],
+            "last_entry_date": (
+                (_EPOCH + timedelta(days=row["last_day"])).isoformat()
+                if row["last_day"] is not None else None
+            ),
+        }
+
+    def persist_dirty_streaks(self) -> int:
+        """Store every ``dirty`` streak row rebuilt; returns the rows written."""
+        return self._run_write(rebuild_dirty_streaks)
+
     def get_current_streak(self, user_id: int) -> int:
         try:
-            dates = self._get_user_entry_dates(user_id)
-            if not dates:
-                return 0
-            parsed_dates = self._parse_date_strings(dates)
-            if not parsed_dates:
-                return 0
-            return self._calculate_streak_from_dates(parsed_dates)
+            return self.get_streak_state(user_id)["current_streak"]
         except Exception as exc:  # pragma: no cover - defensive guard
             logger.warning("Error calculating streak for user %s: %s", user_id, exc)
             return 0
 
-    def _get_user_entry_dates(self, user_id: int) -> List[str]:
-        cursor = self._query(SQLQueries.GET_USER_ENTRY_DATES, (user_id,))
-        return [row[0] for row in cursor.fetchall()]
-
-    def _parse_date_strings(self, date_strings: List[str]) -> List[date]:
-        parsed_dates: List[date] = []
-        date_formats = ["%m/%d/%Y", "%Y-%m-%d"]
-        for date_str in date_strings:
-            for fmt in date_formats:
-                try:
-                    parsed_dates.append(datetime.strptime(date_str, fmt).date())
-                    break
-                except ValueError:
-                    continue
-            else:
-                logger.debug("Could not parse date: %s", date_str)
-        return sorted(parsed_dates, reverse=True)
-
-    def _calculate_streak_from_dates(self, parsed_dates: List[date]) -> int:
-        if not parsed_dates:
-            return 0
-        today = datetime.now().date()
-        most_recent = parsed_dates[0]
-        if (today - most_recent).days > 1:
-            return 0
-        streak = 0
-        expected_date = most_recent
-        for entry_date in parsed_dates:
-            if entry_date == expected_date:
-                streak += 1
-                expected_date = entry_date - timedelta(days=1)
-            else:
-                break
-        return streak
-
     def get_longest_streak(self, user_id: int) -> int:
         """Calculate the longest streak ever achieved by the user."""
         try:
-            dates = self._get_user_entry_dates(user_id)
-            if not dates:
-                return 0
-            parsed_dates = self._parse_date_strings(dates)
-            if not parsed_dates:
-                return 0
-            return self._calculate_longest_streak(parsed_dates)
+            return self.get_streak_state(user_id)["longest_streak"]
         except Exception as exc:
             logger.warning("Error calculating longest streak for user %s: %s", user_id, exc)
             return 0
 
-    def _calculate_longest_streak(self, parsed_dates: List[date]) -> int:
-        """Find the longest consecutive streak from a sorted list of dates."""
-        if not parsed_dates:
-            return 0
-
-        # Sort ascending for easier processing
-        sorted_dates = sorted(set(parsed_dates))
+    def get_streak_details(self, user_id: int, state: Optional[Dict] = None) -> Dict:
+        """Get current streak, longest streak, and recent 5 days with entry status.
 
-        longest = 1
-        current = 1
-
-        for i in range(1, len(sorted_dates)):
-            if (sorted_dates[i] - sorted_dates[i-1]).days == 1:
-                current += 1
-                longest = max(longest, current)
-            else:
-                current = 1
-
-        return longest
-
-    def get_streak_details(self, user_id: int) -> Dict:
-        """Get current streak, longest streak, and recent 5 days with entry status."""
+        ``state`` is a :meth:`get_streak_state` result the caller already has.
+        """
         try:
-            dates = self._get_user_entry_dates(user_id)
-            parsed_dates = self._parse_date_strings(dates) if dates else []
-            entry_dates_set = set(parsed_dates)
-
-            current_streak = self._calculate_streak_from_dates(parsed_dates) if parsed_dates else 0
-            longest_streak = self._calculate_longest_streak(parsed_dates) if parsed_dates else 0
+            if state is None:
+                state = self.get_streak_state(user_id)
 
             # Generate recent 5 days including today
             today = datetime.now().date()
             day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+            days = [today - timedelta(days=i) for i in range(4, -1, -1)]  # 4 days ago to today
+
+            rows = self._query(
+                "SELECT DISTINCT day FROM mood_entries WHERE user_id = ? AND day BETWEEN ? AND ?",
+                (user_id, (days[0] - _EPOCH).days, (today - _EPOCH).days),
+            ).fetchall()
+            entry_dates_set = {_EPOCH + timedelta(days=row[0]) for row in rows}
 
             recent_days = []
-            for i in range(4, -1, -1):  # 4 days ago to today
-                day = today - timedelta(days=i)
+            for day in days:
                 recent_days.append({
                     "date": day.strftime("%Y-%m-%d"),
                     "dayName": day_names[day.weekday()],
@@ -177,8 +194,8 @@ class AchievementsMixin(DatabaseConnectionMixin):
                 })
 
             return {
-                "current_streak": current_streak,
-                "longest_streak": longest_streak,
+                "current_streak": state["current_streak"],
+                "longest_streak": state["longest_streak"],
                 "recent_days": recent_days
             }
         except Exception as exc:
@@ -190,22 +207,10 @@ class AchievementsMixin(DatabaseConnectionMixin):
             }
 
     # --- Journaling streaks ---------------------------------------------------
-    def _get_journaling_dates(self, user_id: int) -> List[str]:
-        """Get distinct dates where the user wrote 50+ words."""
-        cursor = self._query(
-            "SELECT DISTINCT date FROM mood_entries WHERE user_id = ? AND word_count >= ?",
-            (user_id, MEANINGFUL_WORD_THRESHOLD),
-        )
-        return [row[0] for row in cursor.fetchall()]
-
     def get_journaling_streak(self, user_id: int) -> int:
         """Consecutive days with entries having 50+ words."""
         try:
-            dates = self._get_journaling_dates(user_id)
-            if not dates:
-                return 0
-            parsed = self._parse_date_strings(dates)
-            return self._calculate_streak_from_dates(parsed) if parsed else 0
+            return self.get_streak_state(user_id)["journaling_streak"]
         except Exception as exc:
             logger.warning("Error calculating journaling streak for user %s: %s", user_id, exc)
             return 0
@@ -213,23 +218,20 @@ class AchievementsMixin(DatabaseConnectionMixin):
     def get_longest_journaling_streak(self, user_id: int) -> int:
         """Longest consecutive streak of 50+ word entries ever."""
         try:
-            dates = self._get_journaling_dates(user_id)
-            if not dates:
-                return 0
-            parsed = self._parse_date_strings(dates)
-            return self._calculate_longest_streak(parsed) if parsed else 0
+            return self.get_streak_state(user_id)["longest_journaling_streak"]
         except Exception as exc:
             logger.warning("Error calculating longest journaling streak for user %s: %s", user_id, exc)
             return 0
 
     def get_weekly_word_count(self, user_id: int) -> int:
-        """Sum of word_count for entries in the current calendar week (Mon-Sun)."""
+        """Sum of word_count for entries in the current calendar week (Mon-Sun).
+
+        Read from the week's ``daily_mood_rollup`` rows, not the entries.
+        """
         try:
-            today = datetime.now().date()
-            monday = today - timedelta(days=today.weekday())
             row = self._query(
-                "SELECT COALESCE(SUM(word_count), 0) FROM mood_entries WHERE user_id = ? AND date >= ?",
-                (user_id, monday.strftime("%Y-%m-%d")),
+                "SELECT COALESCE(SUM(word_count), 0) FROM daily_mood_rollup WHERE user_id = ? AND day >= ?",
+                (user_id, _week_start_day()),
             ).fetchone()
             return int(row[0]) if row else 0
         except Exception as exc:
@@ -261,108 +263,258 @@ class AchievementsMixin(DatabaseConnectionMixin):
         )
         return [dict(row) for row in cursor.fetchall()]
 
-    def check_achievements(self, user_id: int) -> List[str]:
-        new_achievements: List[str] = []
-        stats = self.get_mood_statistics(user_id)
-        total_entries = stats["total_entries"]
-        current_streak = self.get_current_streak(user_id)
-        longest_streak = self.get_longest_streak(user_id)
-        stats_views = int(self.get_user_metrics(user_id).get("stats_views") or 0)
-        mood_counts = self.get_mood_counts(user_id)
-
-        # Check if user has used all 5 mood levels
-        unique_moods_count = sum(1 for count in mood_counts.values() if count > 0)
-
-        # Get goal completions and photo counts (may need to query separately)
-        goal_completions = 0
-        photo_count = 0
-        try:
-            with self._connect() as conn:
-                cursor = conn.execute(
-                    "SELECT COUNT(*) FROM goals WHERE user_id = ? AND completed = 1",
-                    (user_id,)
-                )
-                goal_completions = cursor.fetchone()[0]
-
-                cursor = conn.execute(
-                    """SELECT COUNT(*) FROM media_attachments ma
-                       JOIN mood_entries me ON ma.entry_id = me.id
-                       WHERE me.user_id = ?""",
-                    (user_id,)
+    def get_achievement_metrics(
+        self, user_id: int, groups: AbstractSet[str] = ALL_METRIC_GROUPS
+    ) -> Dict[str, int]:
+        """Load the values achievement rules read, limited to ``groups``.
+
+        Entry, mood, photo and goal completion counts come from
+        ``achievement_counters``, streaks from ``user_streaks`` and weekly
+        words from ``daily_mood_rollup``; none of them scan the user's
+        history.
+        """
+        metrics: Dict[str, int] = {}
+        if groups & {"entries", "moods", "photos", "goals"}:
+            counters = dict(
+                self._query(
+                    "SELECT metric, value FROM achievement_counters WHERE user_id = ?",
+                    (user_id,),
+                ).fetchall()
+            )
+            metrics["entries"] = counters.get("entries", 0)
+            metrics["unique_moods"] = sum(
+                1 for score in MOOD_SCORES if counters.get(f"mood_{score}", 0) > 0
+            )
+            metrics["photos"] = counters.get("photos", 0)
+            metrics["goal_completions"] = counters.get("goal_completions", 0)
+        if "streaks" in groups:
+            streaks = self.get_streak_state(user_id)
+            metrics["current_streak"] = streaks["current_streak"]
+            metrics["longest_streak"] = streaks["longest_streak"]
+            metrics["journaling_streak"] = streaks["journaling_streak"]
+        if "weekly_words" in groups:
+            metrics["weekly_words"] = self.get_weekly_word_count(user_id)
+        if "stats_views" in groups:
+            metrics["stats_views"] = int(self.get_user_metrics(user_id).get("stats_views") or 0)
+        return metrics
+
+    def check_achievements(
+        self, user_id: int, event: Optional[str] = None, hold: bool = False
+    ) -> List[str]:
+        """Award every achievement whose rule now holds; return the new types.
+
+        With ``event`` (a key of ``ACHIEVEMENT_EVENTS``) only the rules that
+        event can affect are evaluated and only their metrics are loaded.
+        Achievements the user already has are skipped before any metric is
+        read, and the rest are inserted in one write.  With ``hold`` they are
+        stored unannounced, for :meth:`take_unannounced_achievements`.
+        """
+        if event is not None and event not in ACHIEVEMENT_EVENTS:
+            raise ValueError(f"Unknown achievement event: {event}")
+        groups = ACHIEVEMENT_EVENTS[event] if event else ALL_METRIC_GROUPS
+        earned = {
+            row[0]
+            for row in self._query(
+                "SELECT achievement_type FROM achievements WHERE user_id = ?", (user_id,)
+            ).fetchall()
+        }
+        rules = [rule for rule in ACHIEVEMENT_RULES if rule[1] in groups and rule[0] not in earned]
+        if not rules:
+            return []
+
+        metrics = self.get_achievement_metrics(user_id, {group for _, group, _ in rules})
+        due = [achievement_type for achievement_type, _, holds in rules if holds(metrics)]
+        if not due:
+            return []
+
+        def _award(conn: sqlite3.Connection) -> List[str]:
+            return [
+                achievement_type
+                for achievement_type in due
+                if conn.execute(
+                    "INSERT OR IGNORE INTO achievements (user_id, achievement_type, announced) "
+                    "VALUES (?, ?, ?)",
+                    (user_id, achievement_type, 0 if hold else 1),
+                ).rowcount
+            ]
+
+        return self._run_write(_award)
+
+    def take_unannounced_achievements(self, user_id: int) -> List[str]:
+        """Return the user's held awards, oldest first, and mark them announced.
+
+        Reads first, so the common case of nothing held costs no write.
+        """
+        select = "SELECT 1 FROM achievements WHERE user_id = ? AND announced = 0 LIMIT 1"
+        if self._query(select, (user_id,)).fetchone() is None:
+            return []
+
+        def _take(conn: sqlite3.Connection) -> List[str]:
+            rows = conn.execute(
+                "UPDATE achievements SET announced = 1 WHERE user_id = ? AND announced = 0 "
+                "RETURNING id, achievement_type",
+                (user_id,),
+            ).fetchall()
+            return [row[1] for row in sorted(rows, key=lambda row: row[0])]
+
+        return self._run_write(_take)
+
+    # --- Backfill -------------------------------------------------------------
+    def backfill_achievements(
+        self, achievement_types: Optional[Iterable[str]] = None, batch_size: int = 500
+    ) -> Dict:
+        """Award ``achievement_types`` (default: every rule) to all users who qualify.
+
+        Users are walked in id order ``batch_size`` at a time.  Each batch
+        loads its metrics with one grouped query per metric group, evaluates
+        the rules in memory and inserts the results with ``INSERT OR IGNORE``
+        in one short write transaction, so request writes wait at most one
+        batch.  Safe to re-run; returns user/award totals and throughput.
+        """
+        if achievement_types is None:
+            rules = list(ACHIEVEMENT_RULES)
+        else:
+            wanted = set(achievement_types)
+            rules = [rule for rule in ACHIEVEMENT_RULES if rule[0] in wanted]
+            unknown = wanted - {rule[0] for rule in rules}
+            if unknown:
+                raise ValueError(f"Unknown achievement type(s): {', '.join(sorted(unknown))}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        groups = {group for _, group, _ in rules}
+
+        started = time.perf_counter()
+        awarded = {achievement_type: 0 for achievement_type, _, _ in rules}
+        users = batches = 0
+        last_id = 0
+        while rules:
+            with self._read_conn() as conn:
+                user_ids = [
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT id FROM users WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                    ).fetchall()
+                ]
+                if not user_ids:
+                    break
+                metrics = self._batch_achievement_metrics(conn, user_ids, groups)
+                earned = {
+                    tuple(row)
+                    for row in conn.execute(
+                        "SELECT user_id, achievement_type FROM achievements WHERE user_id BETWEEN ? AND ?",
+                        (user_ids[0], user_ids[-1]),
+                    ).fetchall()
+                }
+
+            due = [
+                (uid, achievement_type)
+                for uid in user_ids
+                for achievement_type, _, holds in rules
+                if (uid, achievement_type) not in earned and holds(metrics[uid])
+            ]
+            if due:
+                def _award(conn: sqlite3.Connection) -> List[str]:
+                    return [
+                        achievement_type
+                        for uid, achievement_type in due
+                        if conn.execute(
+                            "INSERT OR IGNORE INTO achievements (user_id, achievement_type) VALUES (?, ?)",
+                            (uid, achievement_type),
+                        ).rowcount
+                    ]
+
+                for achievement_type in self._run_write(_award):
+                    awarded[achievement_type] += 1
+            users += len(user_ids)
+            batches += 1
+            last_id = user_ids[-1]
+
+        seconds = time.perf_counter() - started
+        result = {
+            "users": users,
+            "batches": batches,
+            "awarded": {key: value for key, value in awarded.items() if value},
+            "seconds": round(seconds, 3),
+            "users_per_second": round(users / seconds, 1) if seconds > 0 else float(users),
+        }
+        logger.info(
+            "Achievement backfill: %s users in %.2fs (%.1f users/s), awarded %s",
+            users, seconds, result["users_per_second"], sum(awarded.values()),
+        )
+        return result
+
+    @staticmethod
+    def _batch_achievement_metrics(
+        conn: sqlite3.Connection, user_ids: List[int], groups: AbstractSet[str]
+    ) -> Dict[int, Dict[str, int]]:
+        """:meth:`get_achievement_metrics` for a contiguous id batch, one query per group."""
+        lo, hi = user_ids[0], user_ids[-1]
+        metrics: Dict[int, Dict[str, int]] = {
+            uid: {
+                "entries": 0, "unique_moods": 0, "photos": 0,
+                "current_streak": 0, "longest_streak": 0, "journaling_streak": 0,
+                "weekly_words": 0, "goal_completions": 0, "stats_views": 0,
+            }
+            for uid in user_ids
+        }
+        if groups & {"entries", "moods", "photos", "goals"}:
+            for uid, metric, value in conn.execute(
+                "SELECT user_id, metric, value FROM achievement_counters WHERE user_id BETWEEN ? AND ?",
+                (lo, hi),
+            ).fetchall():
+                if metric.startswith("mood_"):
+                    metrics[uid]["unique_moods"] += value > 0
+                else:
+                    metrics[uid][metric] = value
+        if "streaks" in groups:
+            today = (datetime.now().date() - _EPOCH).days
+            stale = set(user_ids)
+            for row in conn.execute(
+                "SELECT user_id, last_day, run_length, longest, journal_last_day, journal_run_length "
+                "FROM user_streaks WHERE user_id BETWEEN ? AND ? AND dirty = 0",
+                (lo, hi),
+            ).fetchall():
+                stale.discard(row[0])
+                metrics[row[0]].update(
+                    current_streak=_current_run(row[1], row[2], today),
+                    longest_streak=row[3],
+                    journaling_streak=_current_run(row[4], row[5], today),
                 )
-                photo_count = cursor.fetchone()[0]
-        except:
-            pass
-
-        achievements_to_check = [
-            # Original achievements
-            ("first_entry", total_entries >= 1),
-            ("week_warrior", current_streak >= 7),
-            ("consistency_king", current_streak >= 30),
-            ("data_lover", stats_views >= 10),
-            ("mood_master", total_entries >= 100),
-
-            # New achievements
-            ("complex_person", unique_moods_count >= 5),  # All 5 mood levels used
-            ("devoted", current_streak >= 365),  # 1 year streak
-            ("photographer", photo_count >= 50),  # 50 photos
-            ("goal_crusher", goal_completions >= 10),  # 10 goals completed
-            ("half_year", current_streak >= 180),  # 6 month streak
-            ("comeback_king", longest_streak > current_streak and current_streak >= 7),
-
-            # Milestone achievements
-            ("milestone_50", total_entries >= 50),
-            ("milestone_250", total_entries >= 250),
-            ("milestone_500", total_entries >= 500),
-        ]
-
-        # Journaling achievements
-        weekly_word_count = self.get_weekly_word_count(user_id)
-        journaling_streak = self.get_journaling_streak(user_id)
-
-        achievements_to_check.extend([
-            ("weekly_wordsmith", weekly_word_count >= 500),
-            ("deep_diver", journaling_streak >= 7),
-            ("journaling_master", journaling_streak >= 30),
-        ])
-
-        for achievement_type, condition in achievements_to_check:
-            if condition:
-                achievement_id = self.add_achievement(user_id, achievement_type)
-                if achievement_id:
-                    new_achievements.append(achievement_type)
-
-        return new_achievements
+            # Rows the triggers could not keep current: recompute from the
+            # sorted entry days without writing them back.
+            if stale:
+                runs = streak_runs(streak_days(conn, sorted(stale)))
+                for uid, ((last_day, run, longest), (journal_last, journal_run, _)) in runs.items():
+                    metrics[uid].update(
+                        current_streak=_current_run(last_day, run, today),
+                        longest_streak=longest,
+                        journaling_streak=_current_run(journal_last, journal_run, today),
+                    )
+        grouped = {
+            "weekly_words": (
+                "weekly_words",
+                "SELECT user_id, SUM(word_count) FROM daily_mood_rollup "
+                "WHERE user_id BETWEEN ? AND ? AND day >= ? GROUP BY user_id",
+                (lo, hi, _week_start_day()),
+            ),
+            "stats_views": (
+                "stats_views",
+                "SELECT user_id, stats_views FROM user_metrics WHERE user_id BETWEEN ? AND ?",
+                (lo, hi),
+            ),
+        }
+        for group, (metric, sql, params) in grouped.items():
+            if group in groups:
+                for uid, value in conn.execute(sql, params).fetchall():
+                    metrics[uid][metric] = int(value or 0)
+        return metrics
 
     def get_achievements_progress(self, user_id: int) -> Dict[str, Dict[str, int]]:
-        stats = self.get_mood_statistics(user_id)
-        total_entries = int(stats.get("total_entries") or 0)
-        current_streak = int(self.get_current_streak(user_id) or 0)
-        longest_streak = int(self.get_longest_streak(user_id) or 0)
-        stats_views = int(self.get_user_metrics(user_id).get("stats_views") or 0)
-        mood_counts = self.get_mood_counts(user_id)
-        unique_moods = sum(1 for count in mood_counts.values() if count > 0)
-
-        # Get goal completions and photo counts
-        goal_completions = 0
-        photo_count = 0
-        try:
-            with self._connect() as conn:
-                cursor = conn.execute(
-                    "SELECT COUNT(*) FROM goals WHERE user_id = ? AND completed = 1",
-                    (user_id,)
-                )
-                goal_completions = cursor.fetchone()[0]
-
-                cursor = conn.execute(
-                    """SELECT COUNT(*) FROM media_attachments ma
-                       JOIN mood_entries me ON ma.entry_id = me.id
-                       WHERE me.user_id = ?""",
-                    (user_id,)
-                )
-                photo_count = cursor.fetchone()[0]
-        except:
-            pass
+        metrics = self.get_achievement_metrics(user_id)
+        total_entries = metrics["entries"]
+        current_streak = metrics["current_streak"]
+        photo_count = metrics["photos"]
+        goal_completions = metrics["goal_completions"]
 
         def clamp(value: int, maximum: int) -> int:
             return max(0, min(int(value), int(maximum)))
@@ -372,11 +524,11 @@ class AchievementsMixin(DatabaseConnectionMixin):
             "first_entry": {"current": clamp(total_entries, 1), "max": 1},
             "week_warrior": {"current": clamp(current_streak, 7), "max": 7},
             "consistency_king": {"current": clamp(current_streak, 30), "max": 30},
-            "data_lover": {"current": clamp(stats_views, 10), "max": 10},
+            "data_lover": {"current": clamp(metrics["stats_views"], 10), "max": 10},
             "mood_master": {"current": clamp(total_entries, 100), "max": 100},
 
             # New achievements
-            "complex_person": {"current": clamp(unique_moods, 5), "max": 5},
+            "complex_person": {"current": clamp(metrics["unique_moods"], 5), "max": 5},
             "devoted": {"current": clamp(current_streak, 365), "max": 365},
             "photographer": {"current": clamp(photo_count, 50), "max": 50},
             "goal_crusher": {"current": clamp(goal_completions, 10), "max": 10},
@@ -389,10 +541,10 @@ class AchievementsMixin(DatabaseConnectionMixin):
             "milestone_500": {"current": clamp(total_entries, 500), "max": 500},
 
             # Journaling
-            "weekly_wordsmith": {"current": clamp(self.get_weekly_word_count(user_id), 500), "max": 500},
-            "deep_diver": {"current": clamp(self.get_journaling_streak(user_id), 7), "max": 7},
-            "journaling_master": {"current": clamp(self.get_journaling_streak(user_id), 30), "max": 30},
+            "weekly_wordsmith": {"current": clamp(metrics["weekly_words"], 500), "max": 500},
+            "deep_diver": {"current": clamp(metrics["journaling_streak"], 7), "max": 7},
+            "journaling_master": {"current": clamp(metrics["journaling_streak"], 30), "max": 30},
         }
 
 
-__all__ = ["AchievementsMixin"]
+__all__ = ["ACHIEVEMENT_EVENTS", "ACHIEVEMENT_RULES", "AchievementsMixin"]
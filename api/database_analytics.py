@@ -2,9 +2,33 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
 
 from api.database_common import DatabaseConnectionMixin
+from api.database_rollups import day_bounds, day_date_sql, epoch_day, iso_date_sql
+
+TIMESERIES_BUCKETS = ("day", "week", "month", "weekday", "hour")
+_EPOCH = date(1970, 1, 1)
+
+
+def _bucket_sql(bucket: str, iso: str, time_column: str) -> str:
+    """Bucket key for a row: ISO day, Monday of the week, ``YYYY-MM``, 0-6 (Sunday first) or hour.
+
+    ``iso`` is SQL for the row's ``YYYY-MM-DD`` date.
+    """
+    if bucket == "day":
+        return iso
+    if bucket == "week":
+        return f"date({iso}, '-6 days', 'weekday 1')"
+    if bucket == "month":
+        return f"substr({iso}, 1, 7)"
+    if bucket == "weekday":
+        return f"CAST(strftime('%w', {iso}) AS INTEGER)"
+    if bucket == "hour":
+        # created_at holds the entry time ("YYYY-MM-DD HH:MM:SS" or ISO "...THH:MM...").
+        return f"CAST(substr({time_column}, 12, 2) AS INTEGER)"
+    raise ValueError(f"Unknown bucket: {bucket}")
 
 
 class AnalyticsMixin(DatabaseConnectionMixin):
@@ -21,12 +45,11 @@ class AnalyticsMixin(DatabaseConnectionMixin):
                 go.id,
                 go.name,
                 go.icon,
-                COUNT(me.id) as count,
-                AVG(me.mood) as average_mood
-            FROM group_options go
-            JOIN entry_selections es ON go.id = es.option_id
-            JOIN mood_entries me ON es.entry_id = me.id
-            WHERE me.user_id = ?
+                SUM(ou.entry_count) as count,
+                SUM(ou.entry_count * ou.mood) * 1.0 / SUM(ou.entry_count) as average_mood
+            FROM option_usage ou
+            JOIN group_options go ON go.id = ou.option_id
+            WHERE ou.user_id = ?
             GROUP BY go.id
             HAVING count >= 3 -- Only showing significantly used tags
             ORDER BY average_mood DESC
@@ -40,31 +63,7 @@ class AnalyticsMixin(DatabaseConnectionMixin):
         Find pairs of tags that appear together in the same entry.
         Returns a list of pairs with frequency.
         """
-        cursor = self._query(
-            """
-            SELECT
-                op1.id as option1_id,
-                op1.name as option1_name,
-                op1.icon as option1_icon,
-                op2.id as option2_id,
-                op2.name as option2_name,
-                op2.icon as option2_icon,
-                COUNT(*) as frequency
-            FROM entry_selections es1
-            JOIN entry_selections es2
-                ON es1.entry_id = es2.entry_id
-                AND es1.option_id < es2.option_id
-            JOIN mood_entries me ON es1.entry_id = me.id
-            JOIN group_options op1 ON es1.option_id = op1.id
-            JOIN group_options op2 ON es2.option_id = op2.id
-            WHERE me.user_id = ?
-            GROUP BY es1.option_id, es2.option_id
-            ORDER BY frequency DESC
-            LIMIT ?
-            """,
-            (user_id, limit),
-        )
-        return [dict(row) for row in cursor.fetchall()]
+        return self._pair_frequencies(user_id, None, limit)
 
     def get_tag_co_occurrence_by_mood(
         self, user_id: int, mood: int, limit: int = 10
@@ -72,8 +71,13 @@ class AnalyticsMixin(DatabaseConnectionMixin):
         """
         Find pairs of tags that appear together in entries with a specific mood.
         """
+        return self._pair_frequencies(user_id, mood, limit)
+
+    def _pair_frequencies(self, user_id: int, mood: Optional[int], limit: int) -> List[Dict]:
+        mood_filter = "" if mood is None else " AND pu.mood = ?"
+        params: list = [user_id] + ([] if mood is None else [mood]) + [limit]
         cursor = self._query(
-            """
+            f"""
             SELECT
                 op1.id as option1_id,
                 op1.name as option1_name,
@@ -81,150 +85,327 @@ class AnalyticsMixin(DatabaseConnectionMixin):
                 op2.id as option2_id,
                 op2.name as option2_name,
                 op2.icon as option2_icon,
-                COUNT(*) as frequency
-            FROM entry_selections es1
-            JOIN entry_selections es2
-                ON es1.entry_id = es2.entry_id
-                AND es1.option_id < es2.option_id
-            JOIN mood_entries me ON es1.entry_id = me.id
-            JOIN group_options op1 ON es1.option_id = op1.id
-            JOIN group_options op2 ON es2.option_id = op2.id
-            WHERE me.user_id = ? AND me.mood = ?
-            GROUP BY es1.option_id, es2.option_id
+                SUM(pu.pair_count) as frequency
+            FROM option_pair_usage pu
+            JOIN group_options op1 ON pu.option1_id = op1.id
+            JOIN group_options op2 ON pu.option2_id = op2.id
+            WHERE pu.user_id = ?{mood_filter}
+            GROUP BY pu.option1_id, pu.option2_id
             ORDER BY frequency DESC
             LIMIT ?
             """,
-            (user_id, mood, limit),
+            params,
         )
         return [dict(row) for row in cursor.fetchall()]
 
-    def get_advanced_correlations(self, user_id: int, days: int = 180, limit: int = 50) -> List[Dict]:
+    def get_advanced_correlations(
+        self, user_id: int, days: Optional[int] = None, limit: int = 50
+    ) -> List[Dict]:
         """
         Calculate Apriori metrics (Support, Confidence, Lift) for tag pairs.
-        Defaults to last 180 days to prevent O(N^2) performance issues on full table scans.
+
+        All-time by default, read from the maintained usage counters.  With
+        ``days`` the counters cover whole months after the cutoff month and
+        only the cutoff month itself is counted from raw selections.
         """
-        cursor = self._query(
+        since = None
+        if days is not None:
+            since = (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
+
+        with self._read_conn() as conn:
+            total, tag_counts, pair_counts = self._usage_counts(conn, user_id, since)
+            pairs = [
+                (pair, count) for pair, count in pair_counts.items() if count >= 3  # Min support count
+            ]
+            if not total or not pairs:
+                return []
+
+            option_ids = sorted({option_id for pair, _ in pairs for option_id in pair})
+            placeholders = ",".join("?" for _ in option_ids)
+            options = {
+                row["id"]: row
+                for row in conn.execute(
+                    f"SELECT id, name, icon FROM group_options WHERE id IN ({placeholders})",
+                    option_ids,
+                )
+            }
+
+        results = []
+        for (id1, id2), frequency in pairs:
+            if id1 not in options or id2 not in options:
+                continue
+            results.append({
+                "option1_id": id1,
+                "option1_name": options[id1]["name"],
+                "option1_icon": options[id1]["icon"],
+                "option2_id": id2,
+                "option2_name": options[id2]["name"],
+                "option2_icon": options[id2]["icon"],
+                "frequency": frequency,
+                "confidence_1_to_2": frequency / tag_counts[id1],
+                "confidence_2_to_1": frequency / tag_counts[id2],
+                "lift": frequency * total / (tag_counts[id1] * tag_counts[id2]),
+                "support": frequency / total,
+            })
+        results.sort(key=lambda r: r["lift"], reverse=True)
+        return results[:limit]
+
+    def _usage_counts(self, conn, user_id: int, since: Optional[str]):
+        """Entry total, per-option and per-pair counts on or after ``since``."""
+        if since is None:
+            total = conn.execute(
+                "SELECT COALESCE(SUM(entry_count), 0) FROM daily_mood_rollup WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()[0]
+            tags = conn.execute(
+                "SELECT option_id, SUM(entry_count) FROM option_usage "
+                "WHERE user_id = ? GROUP BY option_id",
+                (user_id,),
+            ).fetchall()
+            pairs = conn.execute(
+                "SELECT option1_id, option2_id, SUM(pair_count) FROM option_pair_usage "
+                "WHERE user_id = ? GROUP BY option1_id, option2_id",
+                (user_id,),
+            ).fetchall()
+            return total, dict(tags), {(a, b): n for a, b, n in pairs}
+
+        # Whole months after the cutoff come from the counters; the partial
+        # cutoff month is counted from the raw rows (at most ~31 days).
+        month = since[:7]
+        next_month = (date.fromisoformat(month + "-01") + timedelta(days=32)).strftime("%Y-%m-01")
+        since_day, next_month_day = epoch_day(since), epoch_day(next_month)
+        # Same integer day filter as the raw-row counts below, so every stored
+        # date format lands in the numerators and the denominator alike.
+        total = conn.execute(
+            "SELECT COALESCE(SUM(entry_count), 0) FROM daily_mood_rollup WHERE user_id = ? AND day >= ?",
+            (user_id, since_day),
+        ).fetchone()[0]
+        tags = conn.execute(
             """
-            WITH
-              Total AS (
-                SELECT COUNT(*) as N
-                FROM mood_entries
-                WHERE user_id = ? AND date >= date('now', '-' || ? || ' days')
-              ),
-              TagCounts AS (
-                SELECT option_id, COUNT(*) as cnt
-                FROM entry_selections es
-                JOIN mood_entries me ON es.entry_id = me.id
-                WHERE me.user_id = ? AND me.date >= date('now', '-' || ? || ' days')
-                GROUP BY option_id
-              ),
-              Pairs AS (
-                SELECT
-                  es1.option_id as id1, es2.option_id as id2, COUNT(*) as pair_cnt
-                FROM entry_selections es1
-                JOIN entry_selections es2 ON es1.entry_id = es2.entry_id AND es1.option_id < es2.option_id
-                JOIN mood_entries me ON es1.entry_id = me.id
-                WHERE me.user_id = ? AND me.date >= date('now', '-' || ? || ' days')
-                GROUP BY es1.option_id, es2.option_id
-              )
-            SELECT
-                p.id1 as option1_id, op1.name as option1_name, op1.icon as option1_icon,
-                p.id2 as option2_id, op2.name as option2_name, op2.icon as option2_icon,
-                p.pair_cnt as frequency,
-                CAST(p.pair_cnt AS FLOAT) / tc1.cnt as confidence_1_to_2,
-                CAST(p.pair_cnt AS FLOAT) / tc2.cnt as confidence_2_to_1,
-                (CAST(p.pair_cnt AS FLOAT) * (SELECT N FROM Total)) / (tc1.cnt * tc2.cnt) as lift,
-                (CAST(p.pair_cnt AS FLOAT) / (SELECT N FROM Total)) as support
-            FROM Pairs p
-            JOIN TagCounts tc1 ON p.id1 = tc1.option_id
-            JOIN TagCounts tc2 ON p.id2 = tc2.option_id
-            JOIN group_options op1 ON p.id1 = op1.id
-            JOIN group_options op2 ON p.id2 = op2.id
-            JOIN Total
-            WHERE p.pair_cnt >= 3 -- Min support count filter
-            ORDER BY lift DESC
-            LIMIT ?
+            SELECT option_id, SUM(cnt) FROM (
+                SELECT option_id, entry_count as cnt FROM option_usage
+                 WHERE user_id = ? AND month > ?
+                UNION ALL
+                SELECT es.option_id, 1 FROM entry_selections es
+                  JOIN mood_entries me ON es.entry_id = me.id
+                 WHERE me.user_id = ? AND me.day >= ? AND me.day < ?
+            ) GROUP BY option_id
             """,
-            (user_id, days, user_id, days, user_id, days, limit),
-        )
-        return [dict(row) for row in cursor.fetchall()]
+            (user_id, month, user_id, since_day, next_month_day),
+        ).fetchall()
+        pairs = conn.execute(
+            """
+            SELECT id1, id2, SUM(cnt) FROM (
+                SELECT option1_id as id1, option2_id as id2, pair_count as cnt
+                  FROM option_pair_usage WHERE user_id = ? AND month > ?
+                UNION ALL
+                SELECT es1.option_id, es2.option_id, 1
+                  FROM entry_selections es1
+                  JOIN entry_selections es2
+                    ON es1.entry_id = es2.entry_id AND es1.option_id < es2.option_id
+                  JOIN mood_entries me ON es1.entry_id = me.id
+                 WHERE me.user_id = ? AND me.day >= ? AND me.day < ?
+            ) GROUP BY id1, id2
+            """,
+            (user_id, month, user_id, since_day, next_month_day),
+        ).fetchall()
+        return total, dict(tags), {(a, b): n for a, b, n in pairs}
+
+    def get_timeseries(
+        self,
+        user_id: int,
+        metric: str,
+        bucket: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """
+        Aggregate a metric into time buckets, returned as parallel arrays.
+
+        ``metric`` is ``mood``, ``word_count``, ``scale:<id>`` or ``tag:<id>``.
+        Per bucket ``count`` is the number of entries (scale values, tag
+        selections), ``sum`` the total of moods, words or scale values and
+        ``average`` their mean; for a tag, ``sum``/``average`` are the moods
+        of the entries it was selected on.  Mood and word count read the daily
+        rollups except for hourly buckets; an all-time monthly tag series reads
+        the usage counters.  Returns ``None`` for a scale or tag the user
+        cannot see.
+        """
+        kind, _, raw_id = metric.partition(":")
+        if bucket not in TIMESERIES_BUCKETS:
+            raise ValueError(f"Unknown bucket: {bucket}")
+        if kind in ("scale", "tag"):
+            if not raw_id.isdigit():
+                raise ValueError(f"Invalid metric: {metric}")
+            target_id = int(raw_id)
+        elif kind not in ("mood", "word_count") or raw_id:
+            raise ValueError(f"Invalid metric: {metric}")
+
+        params: list = [user_id]
+        if kind in ("mood", "word_count") and bucket != "hour":
+            key = _bucket_sql(bucket, day_date_sql("day"), "")
+            total = "mood_sum" if kind == "mood" else "word_count"
+            sql = (
+                f"SELECT {key} as bucket, SUM(entry_count), SUM({total}) "
+                "FROM daily_mood_rollup WHERE user_id = ?"
+            )
+            date_column, bounds = "day", day_bounds(start_date, end_date)
+        elif kind == "tag" and bucket == "month" and not (start_date or end_date):
+            sql = (
+                "SELECT month as bucket, SUM(entry_count), SUM(entry_count * mood) "
+                "FROM option_usage WHERE user_id = ? AND option_id = ?"
+            )
+            params.append(target_id)
+            date_column, bounds = None, (None, None)
+        else:
+            key = _bucket_sql(bucket, iso_date_sql("me.date"), "me.created_at")
+            if kind == "scale":
+                value, source = "se.value", (
+                    "scale_entries se JOIN mood_entries me ON me.id = se.entry_id "
+                    "WHERE me.user_id = ? AND se.scale_id = ?"
+                )
+            elif kind == "tag":
+                value, source = "me.mood", (
+                    "entry_selections es JOIN mood_entries me ON me.id = es.entry_id "
+                    "WHERE me.user_id = ? AND es.option_id = ?"
+                )
+            else:
+                value, source = f"me.{kind}", "mood_entries me WHERE me.user_id = ?"
+            if kind in ("scale", "tag"):
+                params.append(target_id)
+            sql = f"SELECT {key} as bucket, COUNT(*), SUM({value}) FROM {source}"
+            date_column, bounds = "me.day", day_bounds(start_date, end_date)
+
+        start, end = bounds
+        if start is not None:
+            sql += f" AND {date_column} >= ?"
+            params.append(start)
+        if end is not None:
+            sql += f" AND {date_column} <= ?"
+            params.append(end)
+        sql += " GROUP BY bucket HAVING bucket IS NOT NULL ORDER BY bucket"
+
+        with self._read_conn() as conn:
+            if kind == "scale":
+                visible = conn.execute(
+                    "SELECT 1 FROM scale_definitions WHERE id = ? AND user_id = ?",
+                    (target_id, user_id),
+                ).fetchone()
+            elif kind == "tag":
+                visible = conn.execute(
+                    """
+                    SELECT 1 FROM group_options go JOIN groups g ON g.id = go.group_id
+                     WHERE go.id = ? AND (g.user_id = ? OR g.user_id IS NULL)
+                    """,
+                    (target_id, user_id),
+                ).fetchone()
+            else:
+                visible = True
+            if not visible:
+                return None
+            rows = conn.execute(sql, params).fetchall()
+
+        return {
+            "metric": metric,
+            "bucket": bucket,
+            "start": start_date,
+            "end": end_date,
+            "buckets": [row[0] for row in rows],
+            "count": [row[1] for row in rows],
+            "sum": [row[2] or 0 for row in rows],
+            "average": [round((row[2] or 0) / row[1], 3) if row[1] else None for row in rows],
+        }
 
     def get_mood_stability(self, user_id: int, days: int = 30) -> Optional[float]:
         """
         Calculate mood stability score (0-100) based on standard deviation.
         Higher is more stable.
         """
-        cursor = self._query(
+        since = (date.today() - timedelta(days=days) - _EPOCH).days
+        row = self._query(
             """
-            SELECT mood
-            FROM mood_entries
-            WHERE user_id = ?
-              AND date >= date('now', '-' || ? || ' days')
-            ORDER BY date
+            SELECT SUM(entry_count), SUM(mood_sum), SUM(mood_sq_sum)
+            FROM daily_mood_rollup
+            WHERE user_id = ? AND day >= ?
             """,
-            (user_id, days),
-        )
-        moods = [row[0] for row in cursor.fetchall()]
+            (user_id, since),
+        ).fetchone()
+        count = row[0] or 0
 
-        if len(moods) < 2:
+        if count < 2:
             return None
 
-        # Calculate Standard Deviation
-        avg = sum(moods) / len(moods)
-        variance = sum((x - avg) ** 2 for x in moods) / len(moods)
-        std_dev = variance ** 0.5
+        return {'score': _stability_score(count, row[1], row[2]), 'count': count}
 
-        # Map std_dev (approx 0-2.5) to 0-100 score
-        score = max(0, 100 - (std_dev * 40))
-        return {'score': int(score), 'count': len(moods)}
-
-    def get_mood_stability_trend(self, user_id: int, days: int = 30) -> List[Dict]:
+    def get_mood_stability_trend(self, user_id: int, days: int = 30, window_size: int = 7) -> List[Dict]:
         """
         Calculate daily stability score for the trend line.
         """
-        window_size = 7  # Rolling window
+        return self.get_mood_stability_trends(user_id, days, (window_size,))[window_size]
+
+    def get_mood_stability_trends(
+        self, user_id: int, days: int = 30, windows: Sequence[int] = (7, 14, 30)
+    ) -> Dict[int, List[Dict]]:
+        """
+        Daily stability scores for several rolling windows in one pass.
+
+        Each window covers ``[day - window, day]``.  Per-day rollups are read
+        once; every window keeps running count/sum/sum-of-squares that are
+        updated as a day enters and leaves it, so the cost is
+        O(days x windows) regardless of how many entries the user has.
+        """
+        windows = sorted(set(windows))
+        widest = windows[-1]
 
+        today = date.today()
+        first = today - timedelta(days=days + widest)
+        first_day = (first - _EPOCH).days
+        # Dense per-day arrays indexed by offset from ``first``.
+        span = (today - first).days + 1
         cursor = self._query(
             """
-            SELECT date, mood
-            FROM mood_entries
-            WHERE user_id = ?
-              AND date >= date('now', '-' || ? || ' days')
-            ORDER BY date ASC
+            SELECT day, entry_count, mood_sum, mood_sq_sum
+            FROM daily_mood_rollup
+            WHERE user_id = ? AND day BETWEEN ? AND ?
+            ORDER BY day ASC
             """,
-            (user_id, days + window_size),
+            (user_id, first_day, first_day + span - 1),
         )
-        rows = cursor.fetchall()
-
-        entries = [{'date': r['date'], 'mood': r['mood']} for r in rows]
 
-        from datetime import date, timedelta
-
-        trend = []
-        today = date.today()
-        start_date = today - timedelta(days=days)
+        counts, sums, squares = [0] * span, [0] * span, [0] * span
+        for row in cursor.fetchall():
+            offset = row['day'] - first_day
+            if 0 <= offset < span:
+                counts[offset] += row['entry_count']
+                sums[offset] += row['mood_sum']
+                squares[offset] += row['mood_sq_sum']
 
-        current = start_date
-        while current <= today:
-            d_str = current.isoformat()
+        running = {w: [0, 0, 0] for w in windows}
+        trends: Dict[int, List[Dict]] = {w: [] for w in windows}
+        for offset in range(span):
+            for window, totals in running.items():
+                totals[0] += counts[offset]
+                totals[1] += sums[offset]
+                totals[2] += squares[offset]
+                leaving = offset - window - 1
+                if leaving >= 0:
+                    totals[0] -= counts[leaving]
+                    totals[1] -= sums[leaving]
+                    totals[2] -= squares[leaving]
+            if offset < widest:
+                continue  # Warm-up days before the requested range
 
-            # Get moods in window [current - window_size, current]
-            window_start = (current - timedelta(days=window_size)).isoformat()
+            d_str = (first + timedelta(days=offset)).isoformat()
+            for window, (count, total, sq_total) in running.items():
+                score = _stability_score(count, total, sq_total) if count >= 2 else None
+                trends[window].append({'date': d_str, 'score': score})
 
-            window_moods = [
-                e['mood'] for e in entries
-                if window_start <= e['date'] <= d_str
-            ]
-
-            if len(window_moods) >= 2:
-                avg = sum(window_moods) / len(window_moods)
-                variance = sum((x - avg) ** 2 for x in window_moods) / len(window_moods)
-                std_dev = variance ** 0.5
-                score = max(0, 100 - (std_dev * 40))
-                trend.append({'date': d_str, 'score': int(score)})
-            else:
-                trend.append({'date': d_str, 'score': None})
+        return trends
 
-            current += timedelta(days=1)
 
-        return trend
+def _stability_score(count: int, total: int, squares: int) -> int:
+    """Map the population std-dev of moods (approx 0-2.5) to a 0-100 score."""
+    # Integer arithmetic keeps the variance exact: n*sum(x^2) - sum(x)^2.
+    variance = max(0, count * squares - total * total) / (count * count)
+    std_dev = variance ** 0.5
+    return int(max(0, 100 - (std_dev * 40)))
@@ -3,15 +3,43 @@
 from __future__ import annotations
 
 import logging
+import os
+import queue
 import sqlite3
 import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 from contextlib import contextmanager
-from typing import Any, Dict, Generator, Iterable, Optional, Sequence
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from api.database_instrumentation import InstrumentedConnection, QueryStats
 
 # Configure logging once for all database modules
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("api.database")
 
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
 
 class DatabaseError(Exception):
     """Raised when a database operation fails."""
@@ -62,54 +90,731 @@ class SQLQueries:
     )
 
     # Mood entries queries
-    GET_USER_ENTRY_DATES = (
-        "SELECT DISTINCT date FROM mood_entries WHERE user_id = ? ORDER BY date DESC"
-    )
-
     GET_MOOD_STATISTICS = (
         "SELECT "
-        "  COUNT(*) as total_entries, "
-        "  AVG(mood) as average_mood, "
-        "  MIN(mood) as lowest_mood, "
-        "  MAX(mood) as highest_mood, "
-        "  MIN(date) as first_entry_date, "
-        "  MAX(date) as last_entry_date "
-        "FROM mood_entries WHERE user_id = ?"
+        "  COALESCE(SUM(entry_count), 0) as total_entries, "
+        "  SUM(mood_sum) * 1.0 / SUM(entry_count) as average_mood, "
+        "  MIN(min_mood) as lowest_mood, "
+        "  MAX(max_mood) as highest_mood, "
+        # Rollup days are day numbers; first/last are returned as ISO dates
+        "  date(MIN(day) + 2440587.5) as first_entry_date, "
+        "  date(MAX(day) + 2440587.5) as last_entry_date "
+        "FROM daily_mood_rollup WHERE user_id = ?"
     )
 
 
-# Module-level write lock shared across all instances within a process.
-# Serializes write transactions to prevent intra-process contention
-# (e.g. DaylioImportService's ThreadPoolExecutor running alongside requests).
-_write_lock = threading.Lock()
+class ProcessWriteLock:
+    """Write lock shared by every thread *and* process using one database.
 
+    A thread lock serializes writers inside the process (e.g.
+    DaylioImportService's ThreadPoolExecutor running alongside requests) and an
+    exclusive ``flock`` on ``<db>.lock`` serializes the process against other
+    gunicorn workers.  Only one thread per process ever waits on the file lock,
+    and the kernel releases it if a worker dies mid-transaction.
 
-class DatabaseConnectionMixin:
-    """Provides connection helpers shared across database mixins."""
+    The lock is not reentrant: a write started while the same thread already
+    holds it (e.g. ``_run_write`` called from inside another write) would wait
+    on itself forever, so it raises :class:`DatabaseError` instead.
 
-    db_path: str
+    On platforms without ``fcntl`` the lock degrades to in-process only.
+    """
 
-    def _connect(self) -> sqlite3.Connection:
-        """Create a SQLite connection with safe defaults and timeout."""
+    def __init__(self, lock_path: str) -> None:
+        self.lock_path = lock_path
+        self._thread_lock = threading.Lock()
+        self._owner: Optional[int] = None
+        self._fd: Optional[int] = None
+        self._pid = os.getpid()
+        self._stats = {"acquired": 0, "contended": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+
+    def _check_fork(self) -> None:
+        # flock locks belong to the open file description, which a forked
+        # child shares with its parent, so the child needs its own descriptor
+        # (and a fresh thread lock in case the fork happened mid-write).
+        if self._pid != os.getpid():
+            self._thread_lock = threading.Lock()
+            self._owner = None
+            self._fd = None
+            self._pid = os.getpid()
+
+    def _file(self) -> int:
+        if self._fd is None:
+            Path(self.lock_path).parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        return self._fd
+
+    def acquire(self) -> None:
+        self._check_fork()
+        if self._owner == threading.get_ident():
+            raise DatabaseError("Nested write transaction on the same thread")
+        started = time.monotonic()
+        self._thread_lock.acquire()
+        contended = False
         try:
+            if fcntl is not None:
+                fd = self._file()
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    contended = True
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._owner = threading.get_ident()
+        waited = (time.monotonic() - started) * 1000
+        stats = self._stats
+        stats["acquired"] += 1
+        stats["contended"] += int(contended)
+        stats["wait_ms_total"] += waited
+        stats["wait_ms_max"] = max(stats["wait_ms_max"], waited)
+
+    def release(self) -> None:
+        self._owner = None
+        try:
+            if fcntl is not None and self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+
+    def __enter__(self) -> "ProcessWriteLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cross_process": fcntl is not None, **self._stats}
+
+
+_write_locks: Dict[str, ProcessWriteLock] = {}
+_write_locks_guard = threading.Lock()
+
+
+def get_write_lock(db_path: str) -> ProcessWriteLock:
+    """Return the shared write lock for ``db_path`` (one per database file)."""
+    key = str(Path(db_path).resolve())
+    with _write_locks_guard:
+        lock = _write_locks.get(key)
+        if lock is None:
+            lock = ProcessWriteLock(key + ".lock")
+            _write_locks[key] = lock
+        return lock
+
+
+# Number of idle connections each MoodDatabase keeps open; 0 disables pooling.
+DEFAULT_POOL_SIZE = 8
+# Pooled connections are closed and replaced after this many seconds.
+DEFAULT_POOL_MAX_LIFETIME = 3600.0
+# Read-only connections kept per MoodDatabase (0 opens one per read).
+DEFAULT_READ_POOL_SIZE = 8
+
+
+def _open_connection(
+    db_path: str,
+    *,
+    shared: bool = False,
+    read_only: bool = False,
+    cache_size: Optional[int] = None,
+    mmap_size: Optional[int] = None,
+    query_stats: Optional[QueryStats] = None,
+) -> sqlite3.Connection:
+    """Open a SQLite connection with safe defaults and timeout.
+
+    Args:
+        db_path: Path to the SQLite database file.
+        shared: When ``True`` the connection may be handed between threads
+            (pooled connections are used by one thread at a time, but not
+            always the thread that opened them).
+        read_only: Open with a ``mode=ro`` URI and ``PRAGMA query_only`` so
+            the connection can never take a write lock.
+        cache_size: Optional ``PRAGMA cache_size`` (negative values are KiB).
+        mmap_size: Optional ``PRAGMA mmap_size`` in bytes.
+        query_stats: Optional collector; the connection is then an
+            :class:`InstrumentedConnection` reporting every statement to it.
+    """
+    factory = InstrumentedConnection if query_stats is not None else sqlite3.Connection
+    try:
+        if read_only:
+            uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(
+                uri,
+                timeout=30.0,
+                uri=True,
+                check_same_thread=not shared,
+                factory=factory,
+            )
+            conn.execute("PRAGMA query_only=ON")
+        else:
             # Add connection timeout to prevent indefinite blocking
-            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn = sqlite3.connect(
+                db_path, timeout=30.0, check_same_thread=not shared, factory=factory
+            )
             conn.execute("PRAGMA foreign_keys=ON")
-            # Set busy timeout for when database is locked by another process
-            conn.execute("PRAGMA busy_timeout=30000")
+        # Set busy timeout for when database is locked by another process
+        conn.execute("PRAGMA busy_timeout=30000")
+        if not read_only:
             # WAL allows concurrent reads while a write is in progress
             conn.execute("PRAGMA journal_mode=WAL")
-            return conn
-        except sqlite3.Error as exc:  # pragma: no cover - rare failure
-            logger.error("Failed to connect to database: %s", exc)
-            raise DatabaseError(f"Database connection failed: {exc}") from exc
+        if cache_size is not None:
+            conn.execute(f"PRAGMA cache_size={int(cache_size)}")
+        if mmap_size is not None:
+            conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        if query_stats is not None:
+            # Attached last so the setup PRAGMAs are not counted.
+            conn._query_stats = query_stats  # type: ignore[attr-defined]
+        return conn
+    except sqlite3.Error as exc:  # pragma: no cover - rare failure
+        logger.error("Failed to connect to database: %s", exc)
+        raise DatabaseError(f"Database connection failed: {exc}") from exc
 
-    @contextmanager
-    def _conn(self) -> Generator[sqlite3.Connection, None, None]:
-        """Context manager providing a connection with row_factory pre-set."""
-        with self._connect() as conn:
+
+_READ_PREFIXES = ("SELECT", "WITH")
+
+
+def _is_read_statement(sql: str) -> bool:
+    """Return ``True`` for statements that only read (``SELECT``/``WITH``)."""
+    head = sql.lstrip().split(None, 1)
+    return bool(head) and head[0].upper() in _READ_PREFIXES
+
+
+class QueryResult:
+    """Fully fetched result of :meth:`DatabaseConnectionMixin._query`.
+
+    Mirrors the subset of the ``sqlite3.Cursor`` API used by the mixins so the
+    underlying connection can go back to the pool before the caller reads rows.
+    """
+
+    __slots__ = ("_rows", "_pos", "rowcount", "lastrowid", "description")
+
+    def __init__(self, cursor: sqlite3.Cursor) -> None:
+        self._rows = cursor.fetchall()
+        self._pos = 0
+        self.rowcount = cursor.rowcount
+        self.lastrowid = cursor.lastrowid
+        self.description = cursor.description
+
+    def fetchone(self) -> Optional[Any]:
+        if self._pos >= len(self._rows):
+            return None
+        row = self._rows[self._pos]
+        self._pos += 1
+        return row
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        rows = self._rows[self._pos : self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        rows = self._rows[self._pos :]
+        self._pos = len(self._rows)
+        return rows
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.fetchall())
+
+
+class ConnectionPool:
+    """Reusable SQLite connections for a single database file.
+
+    Connections are opened lazily with the standard PRAGMAs applied once, then
+    handed out LIFO so hot connections keep their page cache warm.  Up to
+    ``size`` idle connections are retained; checkouts beyond that open
+    overflow connections that are closed on release instead of blocking, so
+    nested helpers (a read that provisions defaults via a write) can never
+    deadlock on the pool.  Connections older than ``max_lifetime`` seconds are
+    recycled on release.
+
+    With ``read_only=True`` every connection is opened ``mode=ro`` with
+    ``PRAGMA query_only`` and the optional ``cache_size``/``mmap_size`` tuning.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        size: int = DEFAULT_POOL_SIZE,
+        max_lifetime: float = DEFAULT_POOL_MAX_LIFETIME,
+        read_only: bool = False,
+        cache_size: Optional[int] = None,
+        mmap_size: Optional[int] = None,
+        query_stats: Optional[QueryStats] = None,
+    ) -> None:
+        self.db_path = db_path
+        self.size = max(1, int(size))
+        self.max_lifetime = max_lifetime
+        self.read_only = read_only
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.query_stats = query_stats
+        self._lock = threading.Lock()
+        self._idle: Deque[Tuple[sqlite3.Connection, float]] = deque()
+        self._opened_at: Dict[int, float] = {}
+        self._pid = os.getpid()
+        self._closed = False
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "overflow": 0,
+            "recycled": 0,
+            "discarded": 0,
+            "closed": 0,
+            "checked_out": 0,
+        }
+
+    def _reset_after_fork(self) -> None:
+        # Connections inherited across fork() must not be used (or closed) by
+        # the child; forget them and start over.
+        self._idle.clear()
+        self._opened_at.clear()
+        self._stats["checked_out"] = 0
+        self._pid = os.getpid()
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, opening a new one if none are idle."""
+        with self._lock:
+            if self._closed:
+                raise DatabaseError("Connection pool is closed")
+            if self._pid != os.getpid():
+                self._reset_after_fork()
+            self._stats["checked_out"] += 1
+            if self._idle:
+                conn, _ = self._idle.pop()
+                self._stats["reused"] += 1
+                return conn
+            self._stats["created"] += 1
+            if self._stats["checked_out"] > self.size:
+                self._stats["overflow"] += 1
+
+        try:
+            conn = _open_connection(
+                self.db_path,
+                shared=True,
+                read_only=self.read_only,
+                cache_size=self.cache_size,
+                mmap_size=self.mmap_size,
+                query_stats=self.query_stats,
+            )
+        except DatabaseError:
+            with self._lock:
+                self._stats["checked_out"] -= 1
+                self._stats["created"] -= 1
+            raise
+        conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._opened_at[id(conn)] = time.monotonic()
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection, closing it if it is unusable, stale or surplus."""
+        keep = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
             conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            keep = False
+
+        with self._lock:
+            if self._pid != os.getpid():
+                # Checked out before a fork; not ours to pool.
+                return
+            self._stats["checked_out"] = max(0, self._stats["checked_out"] - 1)
+            opened_at = self._opened_at.get(id(conn), 0.0)
+            if not keep:
+                self._stats["discarded"] += 1
+            elif time.monotonic() - opened_at > self.max_lifetime:
+                self._stats["recycled"] += 1
+                keep = False
+            elif self._closed or len(self._idle) >= self.size:
+                keep = False
+            if keep:
+                self._idle.append((conn, opened_at))
+                return
+            self._opened_at.pop(id(conn), None)
+            self._stats["closed"] += 1
+        conn.close()
+
+    @contextmanager
+    def connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """Context manager that checks a connection out and always returns it."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Close all idle connections and refuse further checkouts."""
+        with self._lock:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle] if self._pid == os.getpid() else []
+            self._idle.clear()
+            self._opened_at.clear()
+            self._stats["closed"] += len(idle)
+        for conn in idle:
+            try:
+                conn.close()
+            except sqlite3.Error:  # pragma: no cover - best effort
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of pool counters."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["idle"] = len(self._idle)
+            snapshot["size"] = self.size
+            snapshot["read_only"] = int(self.read_only)
+            return snapshot
+
+
+class _WriteRequest:
+    __slots__ = ("operation", "future", "enqueued_at")
+
+    def __init__(self, operation: Callable[[sqlite3.Connection], Any]) -> None:
+        self.operation = operation
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """Single writer thread that commits concurrent writes together.
+
+    Callers submit closures taking a connection.  The writer drains whatever is
+    queued (up to ``max_batch``), runs each closure inside its own SAVEPOINT in
+    one ``BEGIN IMMEDIATE`` transaction and pays a single commit for the whole
+    batch.  A closure that raises is rolled back to its savepoint and only its
+    own future fails; the rest of the batch still commits.  Futures resolve
+    after the commit, so a returned result is always durable.
+
+    The database's :class:`ProcessWriteLock` is held for each batch, so code still using
+    :meth:`DatabaseConnectionMixin._write_transaction` stays serialized with
+    the writer.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        max_batch: int = 64,
+        max_batch_delay: float = 0.0,
+        query_stats: Optional[QueryStats] = None,
+    ) -> None:
+        self.db_path = db_path
+        self.query_stats = query_stats
+        self.max_batch = max(1, int(max_batch))
+        self.max_batch_delay = max(0.0, float(max_batch_delay))
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = os.getpid()
+        self._closed = False
+        self._stats = {
+            "batches": 0,
+            "operations": 0,
+            "failed_operations": 0,
+            "failed_batches": 0,
+            "max_batch_size": 0,
+            "queue_wait_total_ms": 0.0,
+            "queue_wait_max_ms": 0.0,
+            "commit_total_ms": 0.0,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._pid != os.getpid():
+            # A forked child inherits neither the thread nor a usable
+            # connection; start fresh.
+            self._queue = queue.Queue()
+            self._thread = None
+            self._conn = None
+            self._pid = os.getpid()
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="sqlite-group-commit", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, operation: Callable[[sqlite3.Connection], Any]) -> Future:
+        """Queue ``operation`` and return a future for its result."""
+        request = _WriteRequest(operation)
+        with self._lock:
+            if self._closed:
+                raise DatabaseError("Group-commit writer is closed")
+            if threading.current_thread() is self._thread:
+                raise DatabaseError("Nested write submitted from the writer thread")
+            self._ensure_started()
+            self._queue.put(request)
+        return request.future
+
+    def run(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """Submit ``operation`` and block until its batch has committed."""
+        return self.submit(operation).result()
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Drain queued writes, stop the thread and close its connection."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread if self._pid == os.getpid() else None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch-size and queue-wait counters."""
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._stats)
+        batches = snapshot["batches"] or 1
+        operations = snapshot["operations"] or 1
+        snapshot["avg_batch_size"] = round(snapshot["operations"] / batches, 2)
+        snapshot["avg_queue_wait_ms"] = round(snapshot["queue_wait_total_ms"] / operations, 3)
+        snapshot["avg_commit_ms"] = round(snapshot["commit_total_ms"] / batches, 3)
+        snapshot["pending"] = self._queue.qsize()
+        return snapshot
+
+    # --- writer thread ----------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            stop = self._collect(batch)
+            self._commit_batch(batch)
+            if stop:
+                break
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _collect(self, batch: List[_WriteRequest]) -> bool:
+        """Add already-queued requests to ``batch``; return ``True`` on stop."""
+        deadline = time.monotonic() + self.max_batch_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _open_connection(
+                self.db_path, shared=True, query_stats=self.query_stats
+            )
+            self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+    def _commit_batch(self, batch: List[_WriteRequest]) -> None:
+        started = time.monotonic()
+        waits = [(started - request.enqueued_at) * 1000 for request in batch]
+        outcomes: List[Tuple[bool, Any]] = []
+
+        with get_write_lock(self.db_path):
+            try:
+                conn = self._connection()
+                conn.execute("BEGIN IMMEDIATE")
+            except Exception as exc:
+                self._discard_connection()
+                self._fail_batch(batch, exc, waits)
+                return
+
+            for index, request in enumerate(batch):
+                savepoint = f"gc_op_{index}"
+                conn.execute(f"SAVEPOINT {savepoint}")
+                try:
+                    result = request.operation(conn)
+                    conn.execute(f"RELEASE {savepoint}")
+                    outcomes.append((True, result))
+                except Exception as exc:
+                    try:
+                        conn.execute(f"ROLLBACK TO {savepoint}")
+                        conn.execute(f"RELEASE {savepoint}")
+                    except sqlite3.Error:
+                        pass
+                    outcomes.append((False, exc))
+
+            commit_started = time.monotonic()
+            try:
+                conn.commit()
+            except Exception as exc:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    self._discard_connection()
+                self._fail_batch(batch, exc, waits)
+                return
+            commit_ms = (time.monotonic() - commit_started) * 1000
+
+        failed = sum(1 for ok, _ in outcomes if not ok)
+        self._record(len(batch), failed, waits, commit_ms)
+        for request, (ok, value) in zip(batch, outcomes):
+            if ok:
+                request.future.set_result(value)
+            else:
+                request.future.set_exception(value)
+
+    def _discard_connection(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:  # pragma: no cover - best effort
+                pass
+            self._conn = None
+
+    def _fail_batch(
+        self, batch: List[_WriteRequest], exc: BaseException, waits: List[float]
+    ) -> None:
+        logger.error("Group commit of %d writes failed: %s", len(batch), exc)
+        self._record(len(batch), len(batch), waits, 0.0, batch_failed=True)
+        for request in batch:
+            request.future.set_exception(exc)
+
+    def _record(
+        self,
+        size: int,
+        failed: int,
+        waits: List[float],
+        commit_ms: float,
+        *,
+        batch_failed: bool = False,
+    ) -> None:
+        with self._lock:
+            stats = self._stats
+            stats["batches"] += 1
+            stats["operations"] += size
+            stats["failed_operations"] += failed
+            stats["failed_batches"] += int(batch_failed)
+            stats["max_batch_size"] = max(stats["max_batch_size"], size)
+            stats["queue_wait_total_ms"] += sum(waits)
+            stats["queue_wait_max_ms"] = max(stats["queue_wait_max_ms"], max(waits))
+            stats["commit_total_ms"] += commit_ms
+
+
+class DatabaseConnectionMixin:
+    """Provides connection helpers shared across database mixins."""
+
+    db_path: str
+    # Set by MoodDatabase; ``None`` means every call opens and closes its own
+    # connection (the opt-out used by the shared test database).
+    _pool: Optional[ConnectionPool] = None
+    _read_pool: Optional[ConnectionPool] = None
+    # Optional group-commit writer used by _run_write.
+    _writer: Optional[GroupCommitWriter] = None
+    # Optional per-statement instrumentation shared by every connection.
+    _query_stats: Optional[QueryStats] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Create a standalone SQLite connection owned by the caller."""
+        return _open_connection(self.db_path, query_stats=self._query_stats)
+
+    @contextmanager
+    def _checkout(self) -> Generator[sqlite3.Connection, None, None]:
+        """Borrow a pooled connection, or a private one when pooling is off."""
+        if self._pool is not None:
+            with self._pool.connection() as conn:
+                yield conn
+            return
+
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
             yield conn
+        finally:
+            conn.close()
+
+    def _snapshot_state(self) -> threading.local:
+        state = self.__dict__.get("_snapshot")
+        if state is None:
+            state = self.__dict__.setdefault("_snapshot", threading.local())
+        return state
+
+    def _in_read_snapshot(self) -> bool:
+        return getattr(self._snapshot_state(), "conn", None) is not None
+
+    @contextmanager
+    def read_snapshot(self) -> Generator[sqlite3.Connection, None, None]:
+        """Serve every read this thread makes from one read transaction.
+
+        Inside the block :meth:`_query` reads, :meth:`_read_conn` and
+        :meth:`_read_checkout` share a single read-only connection with a
+        transaction open, so reads spread over several methods see one
+        consistent WAL snapshot.  Writes still use writable connections and
+        are not visible until the block exits.  Nested calls join the outer
+        snapshot.
+        """
+        state = self._snapshot_state()
+        if getattr(state, "conn", None) is not None:
+            yield state.conn
+            return
+
+        with self._read_checkout() as conn:
+            conn.execute("BEGIN")
+            # WAL readers pick their snapshot at the first read, not at BEGIN.
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            state.conn = conn
+            try:
+                yield conn
+            finally:
+                state.conn = None
+                if conn.in_transaction:
+                    conn.rollback()
+
+    @contextmanager
+    def _read_checkout(self) -> Generator[sqlite3.Connection, None, None]:
+        """Borrow a read-only connection that can never take a write lock."""
+        pinned = getattr(self._snapshot_state(), "conn", None)
+        if pinned is not None:
+            try:
+                yield pinned
+            finally:
+                pinned.row_factory = sqlite3.Row
+            return
+
+        if self._read_pool is not None:
+            with self._read_pool.connection() as conn:
+                yield conn
+            return
+
+        conn = _open_connection(
+            self.db_path, read_only=True, query_stats=self._query_stats
+        )
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _read_conn(self) -> Generator[sqlite3.Connection, None, None]:
+        """Read-only counterpart of :meth:`_conn` for multi-statement reads."""
+        with self._read_checkout() as conn:
+            yield conn
+
+    @contextmanager
+    def _conn(self) -> Generator[sqlite3.Connection, None, None]:
+        """Context manager providing a connection with row_factory pre-set.
+
+        Commits on clean exit and rolls back on exception.
+        """
+        with self._checkout() as conn:
+            with conn:
+                yield conn
 
     def _query(
         self,
@@ -117,49 +822,99 @@ class DatabaseConnectionMixin:
         params: Sequence[Any] = (),
         *,
         commit: bool = False,
-    ) -> sqlite3.Cursor:
-        """Execute SQL and return the cursor.
+    ) -> QueryResult:
+        """Execute SQL and return its fully fetched result.
 
-        Automatically sets ``row_factory = sqlite3.Row`` on the connection so
-        that rows are returned as dict-like ``sqlite3.Row`` objects.
+        Rows are ``sqlite3.Row`` objects.  The connection is released before
+        returning, so the result carries ``rowcount`` and ``lastrowid``
+        alongside the rows.  Plain ``SELECT``/``WITH`` statements run on the
+        read-only pool; everything else uses a writable connection.
 
         Args:
             sql: The SQL statement to execute.
             params: Positional bind parameters.
             commit: When ``True`` the transaction is committed after execution.
         """
-        with self._connect() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(sql, params)
-            if commit:
-                conn.commit()
-            return cursor
+        if not commit and _is_read_statement(sql):
+            with self._read_checkout() as conn:
+                return QueryResult(conn.execute(sql, params))
+
+        with self._checkout() as conn:
+            with conn:
+                cursor = conn.execute(sql, params)
+                result = QueryResult(cursor)
+                if commit:
+                    conn.commit()
+                return result
 
     @contextmanager
     def _write_transaction(self) -> Generator[sqlite3.Connection, None, None]:
         """Context manager for serialized write transactions.
 
-        Acquires the module-level write lock, then opens a connection with
-        ``BEGIN IMMEDIATE`` so SQLite's reserved lock is taken upfront.
-        Commits on clean exit, rolls back on exception.
+        Acquires the database's cross-process write lock, then checks out a
+        connection and issues ``BEGIN IMMEDIATE`` so SQLite's reserved lock is
+        taken upfront.  Commits on clean exit, rolls back on exception.
         """
-        with _write_lock:
-            conn = self._connect()
-            conn.row_factory = sqlite3.Row
-            try:
-                conn.execute("BEGIN IMMEDIATE")
-                yield conn
-                conn.commit()
-            except Exception:
-                conn.rollback()
-                raise
-            finally:
-                conn.close()
+        with get_write_lock(self.db_path):
+            with self._checkout() as conn:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    yield conn
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+
+    def _run_write(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """Run ``operation(conn)`` inside a write transaction and return its result.
+
+        With the group-commit writer enabled the operation is batched with
+        other concurrent writes (isolated by a savepoint); otherwise it runs in
+        its own :meth:`_write_transaction`.  Operations must not commit.
+        """
+        if self._writer is not None:
+            return self._writer.run(operation)
+        with self._write_transaction() as conn:
+            return operation(conn)
+
+    def query_stats(self, *, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Return per-statement latency stats (empty when instrumentation is off)."""
+        if self._query_stats is None:
+            return {}
+        return self._query_stats.snapshot(limit=limit)
+
+    def write_stats(self) -> Dict[str, Any]:
+        """Return group-commit counters (empty when the writer is disabled)."""
+        return self._writer.stats() if self._writer is not None else {}
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return counters for the write and read pools that are enabled."""
+        stats: Dict[str, Dict[str, int]] = {}
+        if self._pool is not None:
+            stats["write"] = self._pool.stats()
+        if self._read_pool is not None:
+            stats["read"] = self._read_pool.stats()
+        return stats
+
+    def close(self) -> None:
+        """Stop the writer and close pooled connections held by this instance."""
+        if self._writer is not None:
+            self._writer.close()
+        for pool in (self._pool, self._read_pool):
+            if pool is not None:
+                pool.close()
 
 
 __all__ = [
+    "ConnectionPool",
+    "DEFAULT_POOL_SIZE",
+    "DEFAULT_READ_POOL_SIZE",
     "DatabaseConnectionMixin",
     "DatabaseError",
+    "GroupCommitWriter",
+    "ProcessWriteLock",
+    "QueryResult",
     "SQLQueries",
+    "get_write_lock",
     "logger",
 ]
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import base64
+import bisect
 import sqlite3
 from datetime import datetime, timedelta, date
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from api.database_common import (
     DatabaseConnectionMixin,
@@ -14,6 +16,29 @@ from api.database_common import (
     logger,
 )
 
+# SQL spelling of ``GoalsMixin._goal_target_total``.
+_GOAL_TARGET_SQL = (
+    "(CASE WHEN lower(COALESCE(goals.frequency_type, 'weekly')) = 'weekly' "
+    "THEN COALESCE(goals.frequency_per_week, 0) "
+    "ELSE COALESCE(NULLIF(goals.target_count, 0), goals.frequency_per_week, 0) END)"
+)
+
+MAX_COMPLETION_RANGE_DAYS = 3660  # ~10 years: 458-byte bitmaps at most
+
+
+def encode_day_bitmap(days: List[date], start: date, length: int) -> str:
+    """Base64 bitset of ``length`` days from ``start``: bit ``i`` (LSB-first) is ``start + i``."""
+    bits = bytearray((length + 7) // 8)
+    for day in days:
+        offset = (day - start).days
+        if 0 <= offset < length:
+            bits[offset >> 3] |= 1 << (offset & 7)
+    return base64.b64encode(bytes(bits)).decode("ascii")
+
+
+def _parse_iso_day(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
 
 class GoalsMixin(DatabaseConnectionMixin):
     """Provides goal CRUD and progress helpers."""
@@ -103,117 +128,103 @@ class GoalsMixin(DatabaseConnectionMixin):
             return True
         return target_date.weekday() in custom_days
 
-    def _rollover_goal_if_needed(
-        self,
-        conn: sqlite3.Connection,
-        goal_row: sqlite3.Row,
-        *,
-        in_transaction: bool = False,
-    ) -> Dict:
-        """Roll over goal to new period if needed, with transaction locking.
-
-        Args:
-            conn: Active database connection.
-            goal_row: The goal row to check.
-            in_transaction: When ``True`` the caller already holds a write
-                transaction (via ``_write_transaction``), so this method skips
-                its own ``BEGIN IMMEDIATE`` / commit / rollback.
-        """
-        goal_dict = dict(goal_row)
-        frequency_type = (goal_dict.get("frequency_type") or "weekly").lower()
-        today_start = self._get_period_start(frequency_type)
-        today_str = datetime.now().strftime("%Y-%m-%d")
-
-        # Quick check - if already current period, no rollover needed
-        if (goal_dict.get("period_start") or "") == today_start:
-            goal_dict["already_completed_today"] = (
-                goal_dict.get("last_completed_date") == today_str
-            )
-            return goal_dict
-
-        # Need rollover
-        try:
-            if not in_transaction:
-                conn.execute("BEGIN IMMEDIATE")
-
-            # Re-fetch to verify still needs rollover (double-check pattern)
-            conn.row_factory = sqlite3.Row
-            fresh_row = conn.execute(
-                """
-                SELECT id, user_id, title, description, frequency_per_week, frequency_type,
-                       target_count, custom_days, completed, streak, period_start,
-                       last_completed_date, created_at, updated_at
-                  FROM goals WHERE id = ? AND user_id = ?
-                """,
-                (goal_dict["id"], goal_dict["user_id"]),
-            ).fetchone()
-
-            if not fresh_row:
-                if not in_transaction:
-                    conn.rollback()
-                goal_dict["already_completed_today"] = False
-                return goal_dict
-
-            fresh_dict = dict(fresh_row)
+    def _previous_period_bounds(self, frequency_type: str, today: date) -> tuple[str, str]:
+        """Start/end of the period just before the one containing ``today``."""
+        current_start = datetime.strptime(self._get_period_start(frequency_type, today), "%Y-%m-%d").date()
+        return self._get_period_bounds(frequency_type, current_start - timedelta(days=1))
 
-            # Another request may have already rolled over
-            if (fresh_dict.get("period_start") or "") == today_start:
-                if not in_transaction:
-                    conn.rollback()
-                fresh_dict["already_completed_today"] = (
-                    fresh_dict.get("last_completed_date") == today_str
-                )
-                return fresh_dict
-
-            # Perform rollover
-            current_completed = int(fresh_dict.get("completed") or 0)
-            freq = self._goal_target_total(fresh_dict)
-            streak = int(fresh_dict.get("streak") or 0)
-
-            if freq > 0 and current_completed >= freq:
-                streak += 1
-            else:
-                streak = 0
+    def _rolled_over_goal(self, conn: sqlite3.Connection, goal_row: sqlite3.Row) -> Dict:
+        """Goal as it reads in the current period, without writing anything.
 
+        A goal still on an older period shows ``completed = 0`` for the new
+        one; its streak grows only if the stored period was the previous one
+        and its ``goal_completions`` reached the target, the same rule
+        :meth:`rollover_goals` applies in bulk.
+        """
+        goal = dict(goal_row)
+        frequency_type = (goal.get("frequency_type") or "weekly").lower()
+        today = datetime.now().date()
+        current_start = self._get_period_start(frequency_type, today)
+        if (goal.get("period_start") or "") != current_start:
+            previous_start, previous_end = self._previous_period_bounds(frequency_type, today)
+            met = False
+            target = self._goal_target_total(goal)
+            if goal.get("period_start") == previous_start and target > 0:
+                done = conn.execute(
+                    """
+                    SELECT COUNT(*) FROM goal_completions
+                     WHERE user_id = ? AND goal_id = ? AND date BETWEEN ? AND ?
+                    """,
+                    (goal["user_id"], goal["id"], previous_start, previous_end),
+                ).fetchone()[0]
+                met = done >= target
+            goal["streak"] = int(goal.get("streak") or 0) + 1 if met else 0
+            goal["completed"] = 0
+            goal["period_start"] = current_start
+        goal["already_completed_today"] = goal.get("last_completed_date") == today.strftime("%Y-%m-%d")
+        return goal
+
+    def _rollover_goal_if_needed(self, conn: sqlite3.Connection, goal_row: sqlite3.Row) -> Dict:
+        """Persist the current-period view of one goal; caller holds the write transaction."""
+        goal = self._rolled_over_goal(conn, goal_row)
+        if goal["period_start"] != goal_row["period_start"]:
             conn.execute(
                 """
                 UPDATE goals
-                   SET completed = ?,
+                   SET completed = 0,
                        streak = ?,
                        period_start = ?,
                        updated_at = CURRENT_TIMESTAMP
                  WHERE id = ? AND user_id = ?
                 """,
-                (0, streak, today_start, fresh_dict["id"], fresh_dict["user_id"]),
+                (goal["streak"], goal["period_start"], goal["id"], goal["user_id"]),
             )
-            if not in_transaction:
-                conn.commit()
-
-            # Fetch updated record
-            refreshed = conn.execute(
-                """
-                SELECT id, user_id, title, description, frequency_per_week, frequency_type,
-                       target_count, custom_days, completed, streak, period_start,
-                       last_completed_date, created_at, updated_at
-                  FROM goals WHERE id = ? AND user_id = ?
-                """,
-                (fresh_dict["id"], fresh_dict["user_id"]),
-            ).fetchone()
+        return goal
 
-            out = dict(refreshed) if refreshed else fresh_dict
-            out["already_completed_today"] = out.get("last_completed_date") == today_str
-            return out
+    def rollover_goals(self, today: Optional[date] = None) -> int:
+        """Move every goal still on an older period into the current one.
 
-        except sqlite3.Error as exc:
-            if not in_transaction:
-                conn.rollback()
-            else:
-                raise
-            logger.warning("Goal rollover failed, returning stale data: %s", exc)
-            goal_dict["already_completed_today"] = (
-                goal_dict.get("last_completed_date") == today_str
+        One UPDATE covers all users and frequencies: ``completed`` resets and
+        the streak grows when the goal's previous period met its target in
+        ``goal_completions`` (otherwise it resets).  Run by the scheduler
+        after each day boundary so goal reads never need to write.  Returns
+        the number of goals rolled over.
+        """
+        today = today or datetime.now().date()
+        periods: List[object] = []
+        for frequency_type in ("daily", "weekly", "monthly"):
+            periods.extend(
+                (
+                    frequency_type,
+                    self._get_period_start(frequency_type, today),
+                    *self._previous_period_bounds(frequency_type, today),
+                )
             )
-            return goal_dict
+        rows = self._query(
+            """
+            UPDATE goals
+               SET streak = CASE
+                     WHEN goals.period_start = p.previous_start
+                      AND {target} > 0
+                      AND (SELECT COUNT(*) FROM goal_completions gc
+                            WHERE gc.user_id = goals.user_id AND gc.goal_id = goals.id
+                              AND gc.date BETWEEN p.previous_start AND p.previous_end) >= {target}
+                     THEN goals.streak + 1 ELSE 0 END,
+                   completed = 0,
+                   period_start = p.current_start,
+                   updated_at = CURRENT_TIMESTAMP
+              FROM (SELECT ? AS kind, ? AS current_start, ? AS previous_start, ? AS previous_end
+                    UNION ALL SELECT ?, ?, ?, ?
+                    UNION ALL SELECT ?, ?, ?, ?) AS p
+             WHERE p.kind = CASE WHEN lower(COALESCE(goals.frequency_type, 'weekly')) IN ('daily', 'monthly')
+                                 THEN lower(goals.frequency_type) ELSE 'weekly' END
+               AND COALESCE(goals.period_start, '') != p.current_start
+            """.format(target=_GOAL_TARGET_SQL),
+            periods,
+            commit=True,
+        ).rowcount
+        logger.info("Rolled over %s goals into the current period", rows)
+        return rows
 
     # CRUD operations -----------------------------------------------------------
     def create_goal(
@@ -284,16 +295,16 @@ class GoalsMixin(DatabaseConnectionMixin):
             raise DatabaseError(f"Failed to create goal: {exc}") from exc
 
     def get_goals(self, user_id: int) -> List[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             rows = conn.execute(SQLQueries.GET_GOALS_BY_USER, (user_id,)).fetchall()
-            return [self._rollover_goal_if_needed(conn, row) for row in rows]
+            return [self._rolled_over_goal(conn, row) for row in rows]
 
     def get_goal_by_id(self, user_id: int, goal_id: int) -> Optional[Dict]:
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             row = conn.execute(SQLQueries.GET_GOAL_BY_ID, (goal_id, user_id)).fetchone()
             if not row:
                 return None
-            return self._rollover_goal_if_needed(conn, row)
+            return self._rolled_over_goal(conn, row)
 
     # Whitelist of columns allowed for dynamic UPDATE in goals
     _GOAL_UPDATE_COLUMNS = frozenset(
@@ -402,7 +413,7 @@ class GoalsMixin(DatabaseConnectionMixin):
             if not row:
                 return None
 
-            goal = self._rollover_goal_if_needed(conn, row, in_transaction=True)
+            goal = self._rollover_goal_if_needed(conn, row)
             current_completed = int(goal.get("completed") or 0)
             freq = self._goal_target_total(goal)
             streak = int(goal.get("streak") or 0)
@@ -492,7 +503,7 @@ class GoalsMixin(DatabaseConnectionMixin):
             if not row:
                 return None
 
-            goal = self._rollover_goal_if_needed(conn, row, in_transaction=True)
+            goal = self._rollover_goal_if_needed(conn, row)
             frequency_type = (goal.get("frequency_type") or "weekly").lower()
             freq = self._goal_target_total(goal)
 
@@ -588,6 +599,94 @@ class GoalsMixin(DatabaseConnectionMixin):
             result["is_completed"] = was_completed
             return result
 
+    def get_goals_with_completions(
+        self,
+        user_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[Dict]:
+        """All goals with their completion history for ``start``..``end`` (default: 90 days).
+
+        Completions for every goal come from one query and are attached as
+        ``completions``: a day bitmap (see :func:`encode_day_bitmap`) plus
+        the completion rate and best streak over the goal's periods in the
+        range.  Raises ``ValueError`` for malformed, reversed or oversized
+        ranges.
+        """
+        today = datetime.now().date()
+        end = _parse_iso_day(end_date) if end_date else today
+        start = _parse_iso_day(start_date) if start_date else end - timedelta(days=90)
+        length = (end - start).days + 1
+        if length < 1:
+            raise ValueError("start must not be after end")
+        if length > MAX_COMPLETION_RANGE_DAYS:
+            raise ValueError(f"range is limited to {MAX_COMPLETION_RANGE_DAYS} days")
+
+        # Widen to whole weeks/months so edge periods are judged on all their days.
+        load_from = min(start - timedelta(days=start.weekday()), start.replace(day=1))
+        _, month_end = self._get_period_bounds("monthly", end)
+        load_to = max(end + timedelta(days=6 - end.weekday()), _parse_iso_day(month_end))
+        with self._read_conn() as conn:
+            goals = [
+                self._rolled_over_goal(conn, row)
+                for row in conn.execute(SQLQueries.GET_GOALS_BY_USER, (user_id,)).fetchall()
+            ]
+            days_by_goal: Dict[int, List[date]] = {}
+            for goal_id, day in conn.execute(
+                """
+                SELECT goal_id, date
+                  FROM goal_completions
+                 WHERE user_id = ? AND date BETWEEN ? AND ?
+                 ORDER BY goal_id, date
+                """,
+                (user_id, load_from.isoformat(), load_to.isoformat()),
+            ).fetchall():
+                try:
+                    days_by_goal.setdefault(goal_id, []).append(_parse_iso_day(day))
+                except ValueError:
+                    continue
+
+        for goal in goals:
+            days = days_by_goal.get(goal["id"], [])
+            met, periods, best = self._period_stats(goal, days, start, end, today)
+            goal["completions"] = {
+                "start": start.isoformat(),
+                "days": length,
+                "bitmap": encode_day_bitmap(days, start, length),
+                "count": bisect.bisect_right(days, end) - bisect.bisect_left(days, start),
+                "periods": periods,
+                "periods_met": met,
+                "completion_rate": round(met / periods, 4) if periods else 0.0,
+                "best_streak": best,
+            }
+        return goals
+
+    def _period_stats(
+        self, goal: Dict, days: List[date], start: date, end: date, today: date
+    ) -> Tuple[int, int, int]:
+        """(periods met, periods counted, longest run of met periods) within ``start``..``end``.
+
+        ``days`` must be sorted.  The period still in progress only counts
+        once its target is met; periods after today are ignored.
+        """
+        frequency_type = (goal.get("frequency_type") or "weekly").lower()
+        target = self._goal_target_total(goal)
+        met = periods = run = best = 0
+        cursor = start
+        while cursor <= min(end, today):
+            period_start, period_end = (
+                _parse_iso_day(bound) for bound in self._get_period_bounds(frequency_type, cursor)
+            )
+            done = bisect.bisect_right(days, period_end) - bisect.bisect_left(days, period_start)
+            reached = target > 0 and done >= target
+            if reached or period_end < today:
+                periods += 1
+                met += reached
+                run = run + 1 if reached else 0
+                best = max(best, run)
+            cursor = period_end + timedelta(days=1)
+        return met, periods, best
+
     def get_goal_completions(
         self,
         user_id: int,
@@ -613,4 +712,4 @@ class GoalsMixin(DatabaseConnectionMixin):
         return [dict(row) for row in cursor.fetchall()]
 
 
-__all__ = ["GoalsMixin"]
+__all__ = ["GoalsMixin", "encode_day_bitmap"]
@@ -25,19 +25,26 @@ class GroupsMixin(DatabaseConnectionMixin):
         return self._aggregate_groups_from_rows(cursor.fetchall())
 
     def get_groups_for_user(self, user_id: int) -> List[Dict]:
-        """Get groups for a specific user with options in a single query (no N+1)."""
-        cursor = self._query(
-            """
-            SELECT g.id as group_id, g.name as group_name, g.user_id,
-                   go.id as option_id, go.name as option_name, go.icon
-            FROM groups g
-            LEFT JOIN group_options go ON g.id = go.group_id
-            WHERE g.user_id = ? OR g.user_id IS NULL
-            ORDER BY g.name, go.name
-            """,
-            (user_id,),
-        )
-        return self._aggregate_groups_from_rows(cursor.fetchall())
+        """Get groups for a specific user with options in a single query (no N+1).
+
+        Served from the reference cache; the returned list is shared and must
+        not be mutated.
+        """
+        def load() -> List[Dict]:
+            cursor = self._query(
+                """
+                SELECT g.id as group_id, g.name as group_name, g.user_id,
+                       go.id as option_id, go.name as option_name, go.icon
+                FROM groups g
+                LEFT JOIN group_options go ON g.id = go.group_id
+                WHERE g.user_id = ? OR g.user_id IS NULL
+                ORDER BY g.name, go.name
+                """,
+                (user_id,),
+            )
+            return self._aggregate_groups_from_rows(cursor.fetchall())
+
+        return self._cached_reference(user_id, "groups", load)
 
     def _aggregate_groups_from_rows(self, rows: List[sqlite3.Row]) -> List[Dict]:
         """Aggregate flat JOIN rows into nested group/options structure."""
@@ -145,12 +152,14 @@ class GroupsMixin(DatabaseConnectionMixin):
         return cursor.rowcount > 0
 
     def add_entry_selections(self, entry_id: int, option_ids: List[int]) -> None:
-        with self._write_transaction() as conn:
+        def _insert(conn: sqlite3.Connection) -> None:
             conn.executemany(
                 "INSERT INTO entry_selections (entry_id, option_id) VALUES (?, ?)",
                 [(entry_id, option_id) for option_id in option_ids],
             )
 
+        self._run_write(_insert)
+
     def get_entry_selections(self, entry_id: int) -> List[Dict]:
         cursor = self._query(
             """
@@ -170,7 +179,7 @@ class GroupsMixin(DatabaseConnectionMixin):
         if not entry_ids:
             return {}
 
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             placeholders = ','.join('?' for _ in entry_ids)
             cursor = conn.execute(
                 f"""
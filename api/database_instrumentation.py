@@ -0,0 +1,326 @@
+"""Opt-in SQL instrumentation for Twilightio's SQLite connections.
+
+Connections opened with a :class:`QueryStats` collector use
+:class:`InstrumentedConnection`, whose cursors time every statement from
+``execute`` until its rows have been consumed.  Timings are aggregated per
+normalized statement (literals replaced by ``?``) and statements slower than
+the configured threshold are logged with the calling mixin method and their
+``EXPLAIN QUERY PLAN``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+slow_query_logger = logging.getLogger("api.database.slow_queries")
+
+# Latency samples kept per statement for percentile estimates.
+DEFAULT_SAMPLE_SIZE = 1024
+DEFAULT_SLOW_QUERY_MS = 100.0
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Frames from these files are plumbing, not the code that issued the query.
+_INTERNAL_FILES = ("database_common.py", "database_instrumentation.py", "contextlib.py")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and literals so equivalent statements share stats."""
+    text = _STRING_LITERAL.sub("?", sql)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _IN_LIST.sub("(?...)", text)
+
+
+def _percentile(ordered: Sequence[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _find_caller() -> str:
+    """Return ``module.function`` of the first frame outside the DB plumbing.
+
+    Prefers database mixin frames (``database_*.py``) so the slow-query log
+    names the mixin method rather than the service that called it.
+    """
+    frame = sys._getframe(2)
+    fallback = "unknown"
+    while frame is not None:
+        filename = os.path.basename(frame.f_code.co_filename)
+        if filename not in _INTERNAL_FILES:
+            location = f"{filename[:-3]}.{frame.f_code.co_name}"
+            if filename.startswith("database"):
+                return location
+            if fallback == "unknown":
+                fallback = location
+        frame = frame.f_back
+    return fallback
+
+
+class _StatementStats:
+    __slots__ = ("sql", "count", "total_ms", "max_ms", "rows", "errors", "samples")
+
+    def __init__(self, sql: str, sample_size: int) -> None:
+        self.sql = sql
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": round(_percentile(ordered, 50), 3),
+            "p95_ms": round(_percentile(ordered, 95), 3),
+            "p99_ms": round(_percentile(ordered, 99), 3),
+        }
+
+
+class QueryStats:
+    """Thread-safe per-statement latency and row counters."""
+
+    def __init__(
+        self,
+        *,
+        slow_query_ms: Optional[float] = DEFAULT_SLOW_QUERY_MS,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        explain_slow_queries: bool = True,
+    ) -> None:
+        self.slow_query_ms = slow_query_ms
+        self.sample_size = max(1, int(sample_size))
+        self.explain_slow_queries = explain_slow_queries
+        self._lock = threading.Lock()
+        self._statements: Dict[str, _StatementStats] = {}
+        self.slow_queries = 0
+
+    def record(
+        self,
+        sql: str,
+        elapsed_ms: float,
+        rows: int,
+        *,
+        error: bool = False,
+        conn: Optional[sqlite3.Connection] = None,
+        params: Any = None,
+    ) -> None:
+        key = normalize_sql(sql)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = _StatementStats(key, self.sample_size)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.rows += max(0, rows)
+            stats.errors += int(error)
+            stats.samples.append(elapsed_ms)
+        if self.slow_query_ms is not None and elapsed_ms >= self.slow_query_ms:
+            self._log_slow_query(key, sql, elapsed_ms, rows, conn, params)
+
+    def _log_slow_query(
+        self,
+        key: str,
+        sql: str,
+        elapsed_ms: float,
+        rows: int,
+        conn: Optional[sqlite3.Connection],
+        params: Any,
+    ) -> None:
+        with self._lock:
+            self.slow_queries += 1
+        plan = ""
+        if self.explain_slow_queries and conn is not None:
+            plan = explain_query_plan(conn, sql, params)
+        slow_query_logger.warning(
+            "Slow query %.1f ms (%d rows) in %s: %s%s",
+            elapsed_ms,
+            rows,
+            _find_caller(),
+            key,
+            f"\n{plan}" if plan else "",
+        )
+
+    def snapshot(self, *, limit: Optional[int] = None, order_by: str = "total_ms") -> Dict[str, Any]:
+        """Return aggregated stats, slowest (by ``order_by``) first."""
+        with self._lock:
+            rows = [stats.as_dict() for stats in self._statements.values()]
+            slow = self.slow_queries
+        rows.sort(key=lambda item: item.get(order_by, 0), reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+        return {
+            "statements": rows,
+            "statement_count": len(self._statements),
+            "slow_queries": slow,
+            "slow_query_ms": self.slow_query_ms,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self.slow_queries = 0
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, params: Any = None) -> str:
+    """Return ``EXPLAIN QUERY PLAN`` output as indented text ('' on failure)."""
+    try:
+        cursor = sqlite3.Connection.execute(
+            conn, f"EXPLAIN QUERY PLAN {sql}", params if params is not None else ()
+        )
+        plan_rows = cursor.fetchall()
+    except sqlite3.Error:
+        return ""
+    depth: Dict[int, int] = {0: 0}
+    lines: List[str] = []
+    for row in plan_rows:
+        node_id, parent, detail = row[0], row[1], row[-1]
+        level = depth.get(parent, 0) + 1
+        depth[node_id] = level
+        lines.append(f"{'  ' * level}{detail}")
+    return "\n".join(lines)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement to its connection's collector.
+
+    A statement is recorded once its rows are exhausted, or when the cursor
+    is reused, closed or collected, so fetch time counts towards latency.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._pending: Optional[List[Any]] = None
+
+    def _begin(self, sql: str, params: Any) -> None:
+        self._finish()
+        # [sql, params, elapsed_ms, rows]
+        self._pending = [sql, params, 0.0, 0]
+
+    def _finish(self, *, error: bool = False) -> None:
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        stats = getattr(self.connection, "_query_stats", None)
+        if stats is None:
+            return
+        sql, params, elapsed, rows = pending
+        if rows == 0 and self.rowcount > 0:
+            rows = self.rowcount
+        stats.record(sql, elapsed, rows, error=error, conn=self.connection, params=params)
+
+    def _timed(self, fn: Any, *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            result = fn(*args)
+        except Exception:
+            if self._pending is not None:
+                self._pending[2] += (time.perf_counter() - started) * 1000
+            self._finish(error=True)
+            raise
+        if self._pending is not None:
+            self._pending[2] += (time.perf_counter() - started) * 1000
+        return result
+
+    def execute(self, sql: str, parameters: Any = ()) -> "InstrumentedCursor":  # type: ignore[override]
+        self._begin(sql, parameters)
+        self._timed(super().execute, sql, parameters)
+        if self.description is None:
+            self._finish()
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> "InstrumentedCursor":  # type: ignore[override]
+        self._begin(sql, None)
+        self._timed(super().executemany, sql, seq_of_parameters)
+        self._finish()
+        return self
+
+    def fetchone(self) -> Any:
+        row = self._timed(super().fetchone)
+        if self._pending is not None:
+            if row is None:
+                self._finish()
+            else:
+                self._pending[3] += 1
+        return row
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Any]:
+        rows = self._timed(super().fetchmany, size if size is not None else self.arraysize)
+        if self._pending is not None:
+            self._pending[3] += len(rows)
+            if not rows:
+                self._finish()
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        rows = self._timed(super().fetchall)
+        if self._pending is not None:
+            self._pending[3] += len(rows)
+            self._finish()
+        return rows
+
+    def __next__(self) -> Any:
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._pending is not None:
+            self._pending[3] += 1
+        return row
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+    def __del__(self) -> None:
+        try:
+            self._finish()
+        except Exception:  # pragma: no cover - interpreter shutdown
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors feed ``self._query_stats`` when it is set."""
+
+    _query_stats: Optional[QueryStats] = None
+
+    def cursor(self, factory: Any = None) -> sqlite3.Cursor:  # type: ignore[override]
+        return super().cursor(factory or InstrumentedCursor)
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:  # type: ignore[override]
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:  # type: ignore[override]
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+__all__ = [
+    "DEFAULT_SLOW_QUERY_MS",
+    "InstrumentedConnection",
+    "InstrumentedCursor",
+    "QueryStats",
+    "explain_query_plan",
+    "normalize_sql",
+]
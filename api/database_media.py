@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import Dict, List, Optional
 
 from api.database_common import DatabaseConnectionMixin
+from api.database_rollups import day_bounds
 
 
 class MediaMixin(DatabaseConnectionMixin):
@@ -77,7 +78,7 @@ class MediaMixin(DatabaseConnectionMixin):
         if not entry_ids:
             return {}
 
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             placeholders = ','.join('?' for _ in entry_ids)
             cursor = conn.execute(
                 f"""
@@ -103,7 +104,7 @@ class MediaMixin(DatabaseConnectionMixin):
         end_date: str = None,
     ) -> Dict:
         """Get all media across entries for a user with pagination."""
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             # Build query with optional date filters
             query = """
                 SELECT m.id, m.entry_id, m.file_path, m.file_type, m.thumbnail_path, m.created_at,
@@ -114,12 +115,13 @@ class MediaMixin(DatabaseConnectionMixin):
             """
             params = [user_id]
 
-            if start_date:
-                query += " AND e.date >= ?"
-                params.append(start_date)
-            if end_date:
-                query += " AND e.date <= ?"
-                params.append(end_date)
+            start, end = day_bounds(start_date, end_date)
+            if start is not None:
+                query += " AND e.day >= ?"
+                params.append(start)
+            if end is not None:
+                query += " AND e.day <= ?"
+                params.append(end)
 
             # Count total
             count_query = query.replace(
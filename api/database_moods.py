@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import re
 import sqlite3
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from api.database_common import DatabaseConnectionMixin, logger
+from api.database_rollups import day_bounds, rebuild_dirty_streaks
 
 
 def compute_word_count(content: str) -> int:
@@ -27,6 +28,21 @@ DEFAULT_MOODS = [
 ]
 
 
+def insert_default_moods(conn: sqlite3.Connection, user_ids: Sequence[int]) -> None:
+    """Give each user the default mood definitions; caller owns the transaction."""
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO mood_definitions (user_id, score, label, icon, color_hex, is_active)
+        VALUES (?, ?, ?, ?, ?, 1)
+        """,
+        [
+            (user_id, mood["score"], mood["label"], mood["icon"], mood["color_hex"])
+            for user_id in user_ids
+            for mood in DEFAULT_MOODS
+        ],
+    )
+
+
 class MoodDefinitionMixin(DatabaseConnectionMixin):
     """CRUD helpers for custom mood definitions."""
 
@@ -34,36 +50,19 @@ class MoodDefinitionMixin(DatabaseConnectionMixin):
     _MOOD_DEF_UPDATE_COLUMNS = frozenset({"label", "icon", "color_hex"})
 
     def get_user_mood_definitions(self, user_id: int) -> List[Dict]:
-        """Get mood definitions for a user. Creates defaults if none exist."""
-        with self._conn() as conn:
-            cursor = conn.execute(
+        """Mood definitions for a user (defaults are provisioned with the user).
+
+        Served from the reference cache; the returned list is shared and must
+        not be mutated.
+        """
+        def load() -> List[Dict]:
+            cursor = self._query(
                 "SELECT id, user_id, score, label, icon, color_hex, is_active FROM mood_definitions WHERE user_id = ? ORDER BY score",
                 (user_id,),
             )
-            rows = [dict(row) for row in cursor.fetchall()]
-
-            # If no definitions exist, create defaults
-            if not rows:
-                self._create_default_moods(user_id)
-                cursor = conn.execute(
-                    "SELECT id, user_id, score, label, icon, color_hex, is_active FROM mood_definitions WHERE user_id = ? ORDER BY score",
-                    (user_id,),
-                )
-                rows = [dict(row) for row in cursor.fetchall()]
-
-            return rows
+            return [dict(row) for row in cursor.fetchall()]
 
-    def _create_default_moods(self, user_id: int) -> None:
-        """Create default mood definitions for a new user."""
-        with self._write_transaction() as conn:
-            for mood in DEFAULT_MOODS:
-                conn.execute(
-                    """
-                    INSERT OR IGNORE INTO mood_definitions (user_id, score, label, icon, color_hex, is_active)
-                    VALUES (?, ?, ?, ?, ?, 1)
-                    """,
-                    (user_id, mood["score"], mood["label"], mood["icon"], mood["color_hex"]),
-                )
+        return self._cached_reference(user_id, "moods", load)
 
     def update_mood_definition(
         self,
@@ -74,9 +73,6 @@ class MoodDefinitionMixin(DatabaseConnectionMixin):
         color_hex: Optional[str] = None,
     ) -> Optional[Dict]:
         """Update a specific mood definition for a user."""
-        # Ensure user has mood definitions
-        self.get_user_mood_definitions(user_id)
-
         # Build updates from whitelisted columns only
         field_values = {
             "label": label,
@@ -95,6 +91,9 @@ class MoodDefinitionMixin(DatabaseConnectionMixin):
             return None
 
         with self._write_transaction() as conn:
+            # Users created before defaults were provisioned at sign-up
+            if conn.execute("SELECT 1 FROM mood_definitions WHERE user_id = ?", (user_id,)).fetchone() is None:
+                insert_default_moods(conn, [user_id])
             params.extend([user_id, score])
             # Column names are from hardcoded whitelist, safe for query
             query = f"UPDATE mood_definitions SET {', '.join(updates)} WHERE user_id = ? AND score = ?"
@@ -130,7 +129,8 @@ class MoodEntriesMixin(DatabaseConnectionMixin):
         selected_options: Optional[List[int]] = None,
     ) -> int:
         wc = compute_word_count(content)
-        with self._write_transaction() as conn:
+
+        def _insert(conn: sqlite3.Connection) -> int:
             if time:
                 cursor = conn.execute(
                     """
@@ -155,9 +155,12 @@ class MoodEntriesMixin(DatabaseConnectionMixin):
                     "INSERT INTO entry_selections (entry_id, option_id) VALUES (?, ?)",
                     [(entry_id, option_id) for option_id in selected_options],
                 )
+            rebuild_dirty_streaks(conn, user_id)
 
             return int(entry_id if entry_id is not None else 0)
 
+        return self._run_write(_insert)
+
     def get_all_mood_entries(self, user_id: int) -> List[Dict]:
         cursor = self._query(
             """
@@ -188,7 +191,7 @@ class MoodEntriesMixin(DatabaseConnectionMixin):
         """
         offset = (page - 1) * per_page
 
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             # Get total count
             count_cursor = conn.execute(
                 "SELECT COUNT(*) as cnt FROM mood_entries WHERE user_id = ?",
@@ -211,20 +214,76 @@ class MoodEntriesMixin(DatabaseConnectionMixin):
 
             return {"entries": entries, "total": total}
 
+    def get_mood_entries_page(
+        self,
+        user_id: int,
+        *,
+        limit: int = 20,
+        after: Optional[Sequence] = None,
+        include_total: bool = False,
+    ) -> Dict:
+        """Keyset page of entries ordered like :meth:`get_all_mood_entries`.
+
+        Seeks past ``after`` -- the ``(created_at, date, id)`` of the previous
+        page's last row -- on the ``(user_id, created_at, date, id)`` index, so
+        deep pages cost the same as the first one.
+
+        Returns:
+            Dict with 'entries', 'next' (key of the last row when more rows
+            follow, else ``None``) and 'total' (``None`` unless requested)
+        """
+        clauses = ["user_id = ?"]
+        params: List = [user_id]
+        if after is not None:
+            clauses.append("(created_at, date, id) < (?, ?, ?)")
+            params.extend(after)
+
+        with self._read_conn() as conn:
+            total = None
+            if include_total:
+                total = conn.execute(
+                    "SELECT COUNT(*) FROM mood_entries WHERE user_id = ?",
+                    (user_id,),
+                ).fetchone()[0]
+
+            rows = conn.execute(
+                f"""
+                SELECT id, date, mood, content, created_at, updated_at
+                  FROM mood_entries
+                 WHERE {' AND '.join(clauses)}
+                 ORDER BY created_at DESC, date DESC, id DESC
+                 LIMIT ?
+                """,
+                params + [limit + 1],
+            ).fetchall()
+
+        entries = [dict(row) for row in rows[:limit]]
+        next_key = None
+        if len(rows) > limit and entries:
+            last = entries[-1]
+            next_key = (last["created_at"], last["date"], last["id"])
+        return {"entries": entries, "next": next_key, "total": total}
+
     def get_mood_entries_by_date_range(
         self,
         user_id: int,
         start_date: str,
         end_date: str,
     ) -> List[Dict]:
+        """Entries dated ``start_date``..``end_date`` inclusive, in either stored format.
+
+        Raises:
+            ValueError: A bound is not a date.
+        """
+        start, end = day_bounds(start_date, end_date)
         cursor = self._query(
             """
             SELECT id, date, mood, content, created_at, updated_at
               FROM mood_entries
-             WHERE user_id = ? AND date BETWEEN ? AND ?
+             WHERE user_id = ? AND day BETWEEN ? AND ?
              ORDER BY created_at DESC, date DESC
             """,
-            (user_id, start_date, end_date),
+            (user_id, start, end),
         )
         return [dict(row) for row in cursor.fetchall()]
 
@@ -267,7 +326,7 @@ class MoodEntriesMixin(DatabaseConnectionMixin):
             updates.append("created_at = ?")
             params.append(time)
 
-        with self._write_transaction() as conn:
+        def _update(conn: sqlite3.Connection) -> bool:
             row = conn.execute(
                 "SELECT id FROM mood_entries WHERE id = ? AND user_id = ?",
                 (entry_id, user_id),
@@ -304,17 +363,119 @@ class MoodEntriesMixin(DatabaseConnectionMixin):
                         [(entry_id, option_id) for option_id in selected_options],
                     )
                 updated = True
+            rebuild_dirty_streaks(conn, user_id)
 
             return updated or bool(selected_options is not None)
 
+        return self._run_write(_update)
+
     def delete_mood_entry(self, user_id: int, entry_id: int) -> bool:
         """Delete a mood entry for a user."""
-        cursor = self._query(
-            "DELETE FROM mood_entries WHERE id = ? AND user_id = ?",
-            (entry_id, user_id),
-            commit=True,
+
+        def _delete(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(
+                "DELETE FROM mood_entries WHERE id = ? AND user_id = ?",
+                (entry_id, user_id),
+            )
+            rebuild_dirty_streaks(conn, user_id)
+            return cursor.rowcount > 0
+
+        return self._run_write(_delete)
+
+    def _search_filters(
+        self,
+        user_id: int,
+        query: str,
+        moods: Optional[List[int]],
+        start_date: Optional[str],
+        end_date: Optional[str],
+    ) -> Tuple[str, List[str], List]:
+        """Build the FROM clause, WHERE terms and params shared by search queries."""
+        base_sql = " FROM mood_entries m"
+        params: List = []
+        where_clauses = ["m.user_id = ?"]
+        params.append(user_id)
+
+        # FTS Join if query present
+        if query:
+            base_sql += " JOIN entries_fts f ON f.rowid = m.id "
+            where_clauses.append("entries_fts MATCH ?")
+            params.append(query)
+
+        if moods:
+            placeholders = ','.join('?' for _ in moods)
+            where_clauses.append(f"m.mood IN ({placeholders})")
+            params.extend(moods)
+
+        start, end = day_bounds(start_date, end_date)
+        if start is not None:
+            where_clauses.append("m.day >= ?")
+            params.append(start)
+
+        if end is not None:
+            where_clauses.append("m.day <= ?")
+            params.append(end)
+
+        return base_sql, where_clauses, params
+
+    def search_mood_entries_page(
+        self,
+        user_id: int,
+        query: str,
+        moods: Optional[List[int]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        *,
+        limit: int = 20,
+        after: Optional[Sequence] = None,
+        include_total: bool = False,
+    ) -> Dict:
+        """Keyset-paginated search ordered by ``(date, created_at, id)`` descending.
+
+        Args:
+            after: ``(date, created_at, id)`` of the last row of the previous
+                page, or ``None`` for the first page.
+            include_total: Also count all matches (callers should do this once
+                and carry the total forward, not on every page).
+
+        Returns:
+            Dict with 'entries', 'next' (key of the last row when more rows
+            follow, else ``None``) and 'total' (``None`` unless requested)
+        """
+        base_sql, where_clauses, params = self._search_filters(
+            user_id, query, moods, start_date, end_date
         )
-        return cursor.rowcount > 0
+        page_clauses = list(where_clauses)
+        page_params = list(params)
+        if after is not None:
+            page_clauses.append("(m.date, m.created_at, m.id) < (?, ?, ?)")
+            page_params.extend(after)
+
+        with self._read_conn() as conn:
+            try:
+                total = None
+                if include_total:
+                    count_sql = "SELECT COUNT(*)" + base_sql + " WHERE " + " AND ".join(where_clauses)
+                    total = conn.execute(count_sql, params).fetchone()[0]
+
+                select_sql = (
+                    "SELECT m.id, m.date, m.mood, m.content, m.created_at, m.updated_at"
+                    + base_sql
+                    + " WHERE " + " AND ".join(page_clauses)
+                    + " ORDER BY m.date DESC, m.created_at DESC, m.id DESC LIMIT ?"
+                )
+                rows = conn.execute(select_sql, page_params + [limit + 1]).fetchall()
+            except sqlite3.OperationalError as e:
+                # FTS might fail on invalid syntax
+                logger.warning(f"Search query failed: {e}")
+                return {"entries": [], "next": None, "total": 0 if include_total else None}
+
+        entries = [dict(row) for row in rows[:limit]]
+        next_key = None
+        if len(rows) > limit and entries:
+            last = entries[-1]
+            next_key = (last["date"], last["created_at"], last["id"])
+        return {"entries": entries, "next": next_key, "total": total}
 
     def search_mood_entries(
         self,
@@ -340,34 +501,13 @@ class MoodEntriesMixin(DatabaseConnectionMixin):
         Returns:
             Dict with 'entries' list and 'total' count
         """
-        base_sql = " FROM mood_entries m"
-        params: List = []
-        where_clauses = ["m.user_id = ?"]
-        params.append(user_id)
-
-        # FTS Join if query present
-        if query:
-            base_sql += " JOIN entries_fts f ON f.rowid = m.id "
-            where_clauses.append("entries_fts MATCH ?")
-            params.append(query)
-
-        if moods:
-            placeholders = ','.join('?' for _ in moods)
-            where_clauses.append(f"m.mood IN ({placeholders})")
-            params.extend(moods)
-
-        if start_date:
-            where_clauses.append("m.date >= ?")
-            params.append(start_date)
-
-        if end_date:
-            where_clauses.append("m.date <= ?")
-            params.append(end_date)
-
+        base_sql, where_clauses, params = self._search_filters(
+            user_id, query, moods, start_date, end_date
+        )
         where_sql = " WHERE " + " AND ".join(where_clauses)
         offset = (page - 1) * per_page
 
-        with self._conn() as conn:
+        with self._read_conn() as conn:
             try:
                 # Get total count
                 count_sql = "SELECT COUNT(*)" + base_sql + where_sql
@@ -0,0 +1,129 @@
+"""Per-user reference data: versions, cache and default provisioning.
+
+Groups (with their options), scale definitions, mood definitions and
+settings are read on nearly every screen but rarely change.
+``reference_versions`` (schema migration 10) holds one counter per
+(user, kind) that triggers bump on every write to the underlying tables,
+so a cached copy is valid exactly while the counter is unchanged -- no
+write method has to remember to invalidate, and writes made by another
+process are seen on the next read.  ``user_id`` 0 carries the shared
+(``user_id IS NULL``) groups every user sees.
+
+The same migration provisions default moods, scales and settings in an
+``AFTER INSERT ON users`` trigger, so the read paths never write.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, Callable, Dict, Optional
+
+from api.database_common import DatabaseConnectionMixin
+from api.database_moods import DEFAULT_MOODS, insert_default_moods
+from api.database_scales import DEFAULT_SCALES, insert_default_scales
+from api.utils.result_cache import VersionedLRUCache
+
+# Four kinds per active user; entries are small lists of rows.
+DEFAULT_REFERENCE_CACHE_ENTRIES = 4096
+DEFAULT_REFERENCE_CACHE_BYTES = 16 * 1024 * 1024
+
+# Table -> (kind, owner expression); ``{row}`` is ``new`` or ``old``.
+REFERENCE_TABLES = {
+    "groups": ("groups", "COALESCE({row}.user_id, 0)"),
+    "group_options": ("groups", "(SELECT COALESCE(user_id, 0) FROM groups WHERE id = {row}.group_id)"),
+    "scale_definitions": ("scales", "{row}.user_id"),
+    "mood_definitions": ("moods", "{row}.user_id"),
+    "user_settings": ("settings", "{row}.user_id"),
+}
+
+
+def _sql_literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, int):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def default_provisioning_sql(user: str = "new.id") -> str:
+    """Statements giving ``user`` the default moods, scales and settings row."""
+    moods = ", ".join(
+        "({}, {}, {}, {}, {}, 1)".format(
+            user, *(_sql_literal(mood[key]) for key in ("score", "label", "icon", "color_hex"))
+        )
+        for mood in DEFAULT_MOODS
+    )
+    scales = ", ".join(
+        "({}, {}, {}, {}, {}, 1)".format(
+            user, *(_sql_literal(scale[key]) for key in ("name", "min_label", "max_label", "color_hex"))
+        )
+        for scale in DEFAULT_SCALES
+    )
+    return (
+        "INSERT OR IGNORE INTO mood_definitions "
+        f"(user_id, score, label, icon, color_hex, is_active) VALUES {moods};"
+        "INSERT INTO scale_definitions "
+        f"(user_id, name, min_label, max_label, color_hex, is_active) VALUES {scales};"
+        f"INSERT OR IGNORE INTO user_settings (user_id) VALUES ({user});"
+    )
+
+
+def provision_missing_defaults(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Give existing users the defaults their reads used to create lazily.
+
+    Users with no mood definitions get the default moods, users with no
+    active scale get the default scales and every user gets a settings row.
+    Returns the number of users provisioned per kind.
+    """
+    without_moods = [
+        row[0]
+        for row in conn.execute(
+            "SELECT id FROM users u WHERE NOT EXISTS "
+            "(SELECT 1 FROM mood_definitions m WHERE m.user_id = u.id)"
+        )
+    ]
+    without_scales = [
+        row[0]
+        for row in conn.execute(
+            "SELECT id FROM users u WHERE NOT EXISTS "
+            "(SELECT 1 FROM scale_definitions s WHERE s.user_id = u.id AND s.is_active = 1)"
+        )
+    ]
+    insert_default_moods(conn, without_moods)
+    insert_default_scales(conn, without_scales)
+    settings = conn.execute(
+        "INSERT OR IGNORE INTO user_settings (user_id) SELECT id FROM users"
+    ).rowcount
+    return {"moods": len(without_moods), "scales": len(without_scales), "settings": settings}
+
+
+class ReferenceDataMixin(DatabaseConnectionMixin):
+    """Versioned, process-level cache for per-user reference data."""
+
+    _reference_cache: Optional[VersionedLRUCache] = None
+
+    def get_reference_version(self, user_id: int, kind: str) -> int:
+        """Counter that changes whenever ``kind`` data visible to the user changes."""
+        row = self._query(
+            "SELECT COALESCE(SUM(version), 0) FROM reference_versions "
+            "WHERE kind = ? AND user_id IN (?, 0)",
+            (kind, user_id),
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def reference_etag(self, user_id: int, kind: str) -> str:
+        """Entity tag (unquoted) for the user's ``kind`` reference data.
+
+        Read it before the data: a write landing in between then only costs
+        the client one extra full response.
+        """
+        return f"{kind}-{user_id}-{self.get_reference_version(user_id, kind)}"
+
+    def reference_cache_stats(self) -> Dict[str, Any]:
+        return self._reference_cache.stats() if self._reference_cache is not None else {}
+
+    def _cached_reference(self, user_id: int, kind: str, load: Callable[[], Any]) -> Any:
+        if self._reference_cache is None:
+            return load()
+        version = self.get_reference_version(user_id, kind)
+        return self._reference_cache.get_or_compute((user_id, kind, ()), version, load)
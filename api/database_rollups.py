@@ -0,0 +1,386 @@
+"""Aggregates maintained alongside ``mood_entries`` and ``entry_selections``.
+
+``daily_mood_rollup`` holds one row per (user, day) with the count, sum,
+sum of squares, min/max, word count and 1-5 histogram of that day's
+entries.  Triggers on ``mood_entries`` (created by schema migration 4)
+keep it exact on every insert, update and delete, so statistics cost
+grows with the number of days in range rather than the number of entries.
+Since migration 11 ``day`` is the integer day number (see below), so both
+stored date formats of one day share a row and ranges compare integers;
+entries whose date does not parse have no day and are not rolled up.
+
+``option_usage`` and ``option_pair_usage`` (migration 6) count how often
+each option, and each unordered pair of options, was selected, bucketed
+by (month, mood).  Co-occurrence and lift read these counters instead of
+self-joining ``entry_selections``.
+
+``user_streaks`` (migration 7) holds each user's entry and journaling
+streak state: the last day with an entry, the length of the run ending
+there and the longest run.  Triggers extend it in O(1) when an entry lands
+on or after the last day; anything else (a backdated entry, a delete that
+empties a day, a date or word-count edit) marks the row ``dirty``.  Reads
+recompute a dirty row in memory; the entry write paths and a periodic
+sweep persist it with :func:`rebuild_dirty_streaks`.
+
+``achievement_counters`` (migration 9) holds per-user counters the
+achievement rules read: ``entries``, ``mood_1``..``mood_5``, ``photos`` and
+(migration 14) ``goal_completions``.  Triggers on ``mood_entries``,
+``media_attachments`` and ``goals`` keep them exact, so evaluating a rule
+is a primary-key lookup rather than a COUNT.  Weekly word counts read the
+week's (at most seven) ``daily_mood_rollup`` rows.
+
+``mood_entries.day`` (migration 8) is a generated column holding the entry
+date as days since 1970-01-01, whichever text format it was stored in.
+Range filters and streak code compare it instead of the free-form
+``date`` text; :func:`epoch_day` and :func:`epoch_day_sql` are the Python
+and SQL spellings of the same conversion.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from api.database_common import DatabaseConnectionMixin, logger
+
+MOOD_SCORES = (1, 2, 3, 4, 5)
+_EPOCH = date(1970, 1, 1)
+MEANINGFUL_WORD_THRESHOLD = 50  # Words an entry needs to count toward journaling streaks
+
+_HISTOGRAM_COLUMNS = ", ".join(f"mood_{score}" for score in MOOD_SCORES)
+
+
+def month_sql(column: str) -> str:
+    """SQL for the ``YYYY-MM`` bucket of a date column in either stored format."""
+    return (
+        f"CASE WHEN {column} LIKE '__/__/____' "
+        f"THEN substr({column}, 7, 4) || '-' || substr({column}, 1, 2) "
+        f"ELSE substr({column}, 1, 7) END"
+    )
+
+
+def iso_date_sql(column: str) -> str:
+    """SQL for the ``YYYY-MM-DD`` form of a date column in either stored format."""
+    return (
+        f"CASE WHEN {column} LIKE '__/__/____' "
+        f"THEN substr({column}, 7, 4) || '-' || substr({column}, 1, 2) || '-' || substr({column}, 4, 2) "
+        f"ELSE substr({column}, 1, 10) END"
+    )
+
+
+def epoch_day_sql(column: str) -> str:
+    """SQL for days since 1970-01-01 of a date column in either stored format (NULL if invalid)."""
+    return f"CAST(julianday({iso_date_sql(column)}) - 2440587.5 AS INTEGER)"
+
+
+def day_date_sql(column: str) -> str:
+    """SQL for the ISO date of a day-number column (inverse of :func:`epoch_day_sql`)."""
+    return f"date({column} + 2440587.5)"
+
+
+# Grouped on the same day expression the rollup triggers use, so the
+# rebuild works before and after ``mood_entries.day`` exists.
+_REBUILD_SELECT = (
+    f"SELECT user_id, {epoch_day_sql('date')} as entry_day, COUNT(*), SUM(mood), SUM(mood * mood), "
+    "MIN(mood), MAX(mood), COALESCE(SUM(word_count), 0), "
+    + ", ".join(f"SUM(mood = {score})" for score in MOOD_SCORES)
+    + " FROM mood_entries WHERE entry_day IS NOT NULL"
+)
+
+
+def epoch_day(value: Optional[str]) -> Optional[int]:
+    """Days since 1970-01-01 of a stored date string, ``None`` if unparseable."""
+    if not value:
+        return None
+    try:
+        if len(value) == 10 and value[2] == "/" and value[5] == "/":
+            parsed = datetime.strptime(value, "%m/%d/%Y").date()
+        else:
+            parsed = date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+    return (parsed - _EPOCH).days
+
+
+def day_bounds(
+    start_date: Optional[str], end_date: Optional[str]
+) -> Tuple[Optional[int], Optional[int]]:
+    """Inclusive day numbers for optional ``start``/``end`` date filters.
+
+    Raises:
+        ValueError: A bound was given but is not a date.
+    """
+    bounds = []
+    for value in (start_date, end_date):
+        day = epoch_day(value)
+        if value and day is None:
+            raise ValueError(f"Invalid date: {value}")
+        bounds.append(day)
+    return bounds[0], bounds[1]
+
+
+def _runs(days: List[int]) -> Tuple[Optional[int], int, int]:
+    """(last day, length of the run ending there, longest run) for ascending distinct days."""
+    if not days:
+        return None, 0, 0
+    run = longest = 1
+    for previous, day in zip(days, days[1:]):
+        run = run + 1 if day == previous + 1 else 1
+        longest = max(longest, run)
+    return days[-1], run, longest
+
+
+def streak_days(
+    conn: sqlite3.Connection, user_ids: Optional[Sequence[int]] = None
+) -> Dict[int, List[Tuple[int, int]]]:
+    """Ascending distinct ``(day, journaled)`` pairs per user with entries.
+
+    Covers every user, or only ``user_ids`` when given.
+    """
+    where, params = "", ()
+    if user_ids is not None:
+        where = f" AND user_id IN ({', '.join('?' * len(user_ids))})"
+        params = tuple(user_ids)
+    rows = conn.execute(
+        "SELECT user_id, day, MAX(word_count >= ?) FROM mood_entries "
+        f"WHERE day IS NOT NULL{where} GROUP BY user_id, day ORDER BY user_id, day",
+        (MEANINGFUL_WORD_THRESHOLD, *params),
+    ).fetchall()
+    by_user: Dict[int, List[Tuple[int, int]]] = {}
+    for row in rows:
+        by_user.setdefault(row[0], []).append((row[1], row[2]))
+    return by_user
+
+
+def streak_runs(
+    days_by_user: Dict[int, List[Tuple[int, int]]]
+) -> Dict[int, Tuple[Tuple[Optional[int], int, int], Tuple[Optional[int], int, int]]]:
+    """Entry and journaling runs per user from :func:`streak_days` output."""
+    return {
+        uid: (_runs([d for d, _ in days]), _runs([d for d, journaled in days if journaled]))
+        for uid, days in days_by_user.items()
+    }
+
+
+def rebuild_user_streaks(conn: sqlite3.Connection, user_id: Optional[int] = None) -> int:
+    """Recompute streak state from ``mood_entries``; caller owns the transaction.
+
+    With ``user_id`` a row is always written (zeros when the user has no
+    entries).  Returns the number of rows written.
+    """
+    if user_id is None:
+        conn.execute("DELETE FROM user_streaks")
+        by_user = streak_days(conn)
+    else:
+        by_user = {user_id: [], **streak_days(conn, (user_id,))}
+
+    _write_streaks(conn, by_user)
+    return len(by_user)
+
+
+def rebuild_dirty_streaks(
+    conn: sqlite3.Connection, user_id: Optional[int] = None, batch_size: int = 500
+) -> int:
+    """Rebuild the rows marked ``dirty`` (only ``user_id``'s when given).
+
+    The caller owns the transaction.  Returns the number of rows written.
+    """
+    where, params = "", ()
+    if user_id is not None:
+        where, params = " AND user_id = ?", (user_id,)
+    user_ids = [
+        row[0]
+        for row in conn.execute(
+            f"SELECT user_id FROM user_streaks WHERE dirty = 1{where}", params
+        ).fetchall()
+    ]
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start:start + batch_size]
+        _write_streaks(conn, {**{uid: [] for uid in batch}, **streak_days(conn, batch)})
+    return len(user_ids)
+
+
+def _write_streaks(conn: sqlite3.Connection, days_by_user: Dict[int, List[Tuple[int, int]]]) -> None:
+    for uid, (entry, journal) in streak_runs(days_by_user).items():
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO user_streaks
+                (user_id, last_day, run_length, longest,
+                 journal_last_day, journal_run_length, journal_longest, dirty)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            """,
+            (uid, *entry, *journal),
+        )
+
+
+def rebuild_option_usage(conn: sqlite3.Connection, user_id: Optional[int] = None) -> int:
+    """Recompute option and pair counters from the raw selections.
+
+    The caller owns the transaction.  Returns the number of counter rows
+    written (options plus pairs).
+    """
+    month = month_sql("me.date")
+    user_filter = "" if user_id is None else " AND me.user_id = ?"
+    params = () if user_id is None else (user_id,)
+    if user_id is None:
+        conn.execute("DELETE FROM option_usage")
+        conn.execute("DELETE FROM option_pair_usage")
+    else:
+        conn.execute("DELETE FROM option_usage WHERE user_id = ?", params)
+        conn.execute("DELETE FROM option_pair_usage WHERE user_id = ?", params)
+
+    options = conn.execute(
+        f"""
+        INSERT INTO option_usage (user_id, option_id, month, mood, entry_count)
+        SELECT me.user_id, es.option_id, {month}, me.mood, COUNT(*)
+          FROM entry_selections es
+          JOIN mood_entries me ON me.id = es.entry_id
+         WHERE 1 = 1{user_filter}
+         GROUP BY me.user_id, es.option_id, {month}, me.mood
+        """,
+        params,
+    ).rowcount
+    pairs = conn.execute(
+        f"""
+        INSERT INTO option_pair_usage (user_id, option1_id, option2_id, month, mood, pair_count)
+        SELECT me.user_id, a.option_id, b.option_id, {month}, me.mood, COUNT(*)
+          FROM entry_selections a
+          JOIN entry_selections b ON b.entry_id = a.entry_id AND a.option_id < b.option_id
+          JOIN mood_entries me ON me.id = a.entry_id
+         WHERE 1 = 1{user_filter}
+         GROUP BY me.user_id, a.option_id, b.option_id, {month}, me.mood
+        """,
+        params,
+    ).rowcount
+    return options + pairs
+
+
+def rebuild_daily_rollups(conn: sqlite3.Connection, user_id: Optional[int] = None) -> int:
+    """Recompute rollups from ``mood_entries``; caller owns the transaction.
+
+    Returns the number of rollup rows written.
+    """
+    columns = (
+        "user_id, day, entry_count, mood_sum, mood_sq_sum, min_mood, max_mood, "
+        f"word_count, {_HISTOGRAM_COLUMNS}"
+    )
+    if user_id is None:
+        conn.execute("DELETE FROM daily_mood_rollup")
+        cursor = conn.execute(
+            f"INSERT INTO daily_mood_rollup ({columns}) {_REBUILD_SELECT} "
+            "GROUP BY user_id, entry_day"
+        )
+    else:
+        conn.execute("DELETE FROM daily_mood_rollup WHERE user_id = ?", (user_id,))
+        cursor = conn.execute(
+            f"INSERT INTO daily_mood_rollup ({columns}) {_REBUILD_SELECT} "
+            "AND user_id = ? GROUP BY user_id, entry_day",
+            (user_id,),
+        )
+    return cursor.rowcount
+
+
+def rebuild_achievement_counters(conn: sqlite3.Connection, user_id: Optional[int] = None) -> int:
+    """Recompute achievement counters from the raw rows; caller owns the transaction.
+
+    Returns the number of counter rows written.
+    """
+    where, params = ("", ()) if user_id is None else (" WHERE me.user_id = ?", (user_id,))
+    goals_where = "" if user_id is None else " AND user_id = ?"
+    conn.execute(
+        "DELETE FROM achievement_counters" + ("" if user_id is None else " WHERE user_id = ?"),
+        params,
+    )
+    return conn.execute(
+        f"""
+        INSERT INTO achievement_counters (user_id, metric, value)
+        SELECT me.user_id, 'entries', COUNT(*) FROM mood_entries me{where} GROUP BY me.user_id
+        UNION ALL
+        SELECT me.user_id, 'mood_' || me.mood, COUNT(*) FROM mood_entries me{where}
+         GROUP BY me.user_id, me.mood
+        UNION ALL
+        SELECT me.user_id, 'photos', COUNT(*)
+          FROM media_attachments ma JOIN mood_entries me ON me.id = ma.entry_id{where}
+         GROUP BY me.user_id
+        UNION ALL
+        SELECT user_id, 'goal_completions', COUNT(*) FROM goals
+         WHERE completed = 1{goals_where} GROUP BY user_id
+        """,
+        params * 4,
+    ).rowcount
+
+
+class DailyRollupMixin(DatabaseConnectionMixin):
+    """Reads and maintenance for the rollup, usage, streak and counter tables."""
+
+    def rebuild_daily_rollups(self, user_id: Optional[int] = None) -> int:
+        """Rebuild rollups for one user (or everyone) from the raw entries."""
+        rows = self._run_write(lambda conn: rebuild_daily_rollups(conn, user_id))
+        logger.info(
+            "Rebuilt %s daily mood rollup rows%s",
+            rows,
+            "" if user_id is None else f" for user {user_id}",
+        )
+        return rows
+
+    def rebuild_option_usage(self, user_id: Optional[int] = None) -> int:
+        """Rebuild option/pair counters for one user (or everyone)."""
+        rows = self._run_write(lambda conn: rebuild_option_usage(conn, user_id))
+        logger.info(
+            "Rebuilt %s option usage rows%s",
+            rows,
+            "" if user_id is None else f" for user {user_id}",
+        )
+        return rows
+
+    def rebuild_user_streaks(self, user_id: Optional[int] = None) -> int:
+        """Rebuild streak state for one user (or everyone) from the raw entries."""
+        rows = self._run_write(lambda conn: rebuild_user_streaks(conn, user_id))
+        logger.info(
+            "Rebuilt %s user streak rows%s",
+            rows,
+            "" if user_id is None else f" for user {user_id}",
+        )
+        return rows
+
+    def rebuild_achievement_counters(self, user_id: Optional[int] = None) -> int:
+        """Rebuild achievement counters for one user (or everyone) from the raw rows."""
+        rows = self._run_write(lambda conn: rebuild_achievement_counters(conn, user_id))
+        logger.info(
+            "Rebuilt %s achievement counter rows%s",
+            rows,
+            "" if user_id is None else f" for user {user_id}",
+        )
+        return rows
+
+    def get_daily_rollups(
+        self,
+        user_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[Dict]:
+        """Per-day aggregates for a user, oldest day first.
+
+        ``start_date``/``end_date`` are inclusive and may use either stored
+        date format; ``day`` is returned as an ISO date.
+
+        Raises:
+            ValueError: A bound was given but is not a date.
+        """
+        start, end = day_bounds(start_date, end_date)
+        query = (
+            f"SELECT {day_date_sql('day')} as day, entry_count, mood_sum, mood_sq_sum, "
+            f"min_mood, max_mood, word_count, {_HISTOGRAM_COLUMNS} "
+            "FROM daily_mood_rollup WHERE user_id = ?"
+        )
+        params: list = [user_id]
+        # Qualified: ``day`` alone would read as the ISO output column.
+        if start is not None:
+            query += " AND daily_mood_rollup.day >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND daily_mood_rollup.day <= ?"
+            params.append(end)
+        query += " ORDER BY daily_mood_rollup.day"
+        return [dict(row) for row in self._query(query, params).fetchall()]
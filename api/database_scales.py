@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import sqlite3
+from typing import Dict, List, Optional, Sequence
 
 from api.database_common import DatabaseConnectionMixin
+from api.database_rollups import day_bounds
 
 
 # Default scales for new users
@@ -15,13 +17,32 @@ DEFAULT_SCALES = [
 ]
 
 
+def insert_default_scales(conn: sqlite3.Connection, user_ids: Sequence[int]) -> None:
+    """Give each user the default scales; caller owns the transaction."""
+    conn.executemany(
+        """
+        INSERT INTO scale_definitions (user_id, name, min_label, max_label, color_hex, is_active)
+        VALUES (?, ?, ?, ?, ?, 1)
+        """,
+        [
+            (user_id, scale["name"], scale["min_label"], scale["max_label"], scale["color_hex"])
+            for user_id in user_ids
+            for scale in DEFAULT_SCALES
+        ],
+    )
+
+
 class ScalesMixin(DatabaseConnectionMixin):
     """CRUD helpers for custom scale definitions and entries."""
 
     def get_user_scales(self, user_id: int) -> List[Dict]:
-        """Get all scale definitions for a user. Creates defaults if none exist."""
-        with self._conn() as conn:
-            cursor = conn.execute(
+        """Active scale definitions for a user (defaults are provisioned with the user).
+
+        Served from the reference cache; the returned list is shared and must
+        not be mutated.
+        """
+        def load() -> List[Dict]:
+            cursor = self._query(
                 """
                 SELECT id, user_id, name, min_value, max_value, min_label, max_label, color_hex, is_active, created_at
                 FROM scale_definitions
@@ -30,35 +51,9 @@ class ScalesMixin(DatabaseConnectionMixin):
                 """,
                 (user_id,),
             )
-            rows = [dict(row) for row in cursor.fetchall()]
-
-            # If no scales exist, create defaults
-            if not rows:
-                self._create_default_scales(user_id)
-                cursor = conn.execute(
-                    """
-                    SELECT id, user_id, name, min_value, max_value, min_label, max_label, color_hex, is_active, created_at
-                    FROM scale_definitions
-                    WHERE user_id = ? AND is_active = 1
-                    ORDER BY id
-                    """,
-                    (user_id,),
-                )
-                rows = [dict(row) for row in cursor.fetchall()]
+            return [dict(row) for row in cursor.fetchall()]
 
-            return rows
-
-    def _create_default_scales(self, user_id: int) -> None:
-        """Create default scales for a new user."""
-        with self._write_transaction() as conn:
-            for scale in DEFAULT_SCALES:
-                conn.execute(
-                    """
-                    INSERT INTO scale_definitions (user_id, name, min_label, max_label, color_hex, is_active)
-                    VALUES (?, ?, ?, ?, ?, 1)
-                    """,
-                    (user_id, scale["name"], scale["min_label"], scale["max_label"], scale["color_hex"]),
-                )
+        return self._cached_reference(user_id, "scales", load)
 
     def create_scale(
         self,
@@ -136,7 +131,7 @@ class ScalesMixin(DatabaseConnectionMixin):
 
     def save_scale_entries(self, entry_id: int, scale_values: Dict[int, int]) -> None:
         """Save scale values for a mood entry. scale_values is {scale_id: value}."""
-        with self._write_transaction() as conn:
+        def _save(conn: sqlite3.Connection) -> None:
             # Delete existing entries for this mood entry
             conn.execute("DELETE FROM scale_entries WHERE entry_id = ?", (entry_id,))
 
@@ -147,6 +142,8 @@ class ScalesMixin(DatabaseConnectionMixin):
                     (entry_id, scale_id, value),
                 )
 
+        self._run_write(_save)
+
     def get_scale_entries_for_mood(self, entry_id: int) -> List[Dict]:
         """Get all scale entries for a mood entry."""
         cursor = self._query(
@@ -171,12 +168,13 @@ class ScalesMixin(DatabaseConnectionMixin):
         """
         params = [user_id]
 
-        if start_date:
-            query += " AND me.date >= ?"
-            params.append(start_date)
-        if end_date:
-            query += " AND me.date <= ?"
-            params.append(end_date)
+        start, end = day_bounds(start_date, end_date)
+        if start is not None:
+            query += " AND me.day >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND me.day <= ?"
+            params.append(end)
 
         cursor = self._query(query, params)
         return [dict(row) for row in cursor.fetchall()]
@@ -216,7 +214,7 @@ class ScalesMixin(DatabaseConnectionMixin):
             FROM scale_definitions sd
             LEFT JOIN scale_entries se ON sd.id = se.scale_id
             LEFT JOIN mood_entries me ON se.entry_id = me.id
-                AND me.date >= date('now', '-' || ? || ' days')
+                AND me.day >= CAST(julianday('now') - 2440587.5 AS INTEGER) - ?
             WHERE sd.user_id = ? AND sd.is_active = 1
             GROUP BY sd.id
             """,
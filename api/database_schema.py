@@ -4,82 +4,301 @@ from __future__ import annotations
 
 import os
 import sqlite3
-from typing import Iterable
-
-from api.database_common import DatabaseConnectionMixin, logger
-
-_IS_PRODUCTION = os.getenv("RAILWAY_ENVIRONMENT", "").lower() == "production"
-
+import time
+from typing import Iterable, Tuple
+
+from api.database_common import DatabaseConnectionMixin, get_write_lock, logger
+from api.database_rollups import (
+    MEANINGFUL_WORD_THRESHOLD,
+    MOOD_SCORES,
+    epoch_day_sql,
+    month_sql,
+    rebuild_achievement_counters,
+    rebuild_daily_rollups,
+    rebuild_option_usage,
+    rebuild_user_streaks,
+)
+from api.database_reference import (
+    REFERENCE_TABLES,
+    default_provisioning_sql,
+    provision_missing_defaults,
+)
 
 def _handle_migration_error(exc: sqlite3.Error, context: str) -> None:
-    """Log migration failure; re-raise in production to prevent silent schema drift."""
-    if _IS_PRODUCTION:
-        logger.error("%s migration failed: %s", context, exc)
-        raise
-    logger.warning("%s migration failed (non-critical): %s", context, exc)
+    """Log a failed migration step and re-raise it.
+
+    Called from ``except`` blocks inside a migration: the error reaches
+    :meth:`DatabaseSchemaMixin._apply_pending_migrations`, which rolls the
+    migration back without bumping ``user_version``, so the next boot
+    retries the step instead of skipping it for good.
+    """
+    logger.error("%s migration failed: %s", context, exc)
+    raise
 
 
 class DatabaseSchemaMixin(DatabaseConnectionMixin):
     """Provides table creation and bootstrap helpers."""
 
+    # Ordered registry of (user_version, description, method name).  Append new
+    # migrations with the next number; never renumber or edit applied ones.
+    MIGRATIONS: Tuple[Tuple[int, str, str], ...] = (
+        (1, "baseline schema and default groups", "_migration_0001_baseline"),
+        (2, "keyset pagination indexes", "_migration_0002_keyset_indexes"),
+        (3, "hot query indexes", "_migration_0003_hot_query_indexes"),
+        (4, "daily mood rollups", "_migration_0004_daily_mood_rollup"),
+        (5, "per-user data versions", "_migration_0005_user_data_versions"),
+        (6, "option and pair usage counters", "_migration_0006_option_usage"),
+        (7, "incremental streak state", "_migration_0007_user_streaks"),
+        (8, "integer entry day column", "_migration_0008_entry_day"),
+        (9, "achievement counters", "_migration_0009_achievement_counters"),
+        (10, "reference data versions and default provisioning", "_migration_0010_reference_data"),
+        (11, "daily rollups keyed by day number", "_migration_0011_rollup_day_numbers"),
+        (12, "unannounced achievement flag", "_migration_0012_achievement_announced"),
+        (13, "option usage pruning by key", "_migration_0013_option_usage_prune_by_key"),
+        (14, "goal completion counters", "_migration_0014_goal_completion_counters"),
+    )
+
+    @classmethod
+    def schema_version(cls) -> int:
+        """Return the ``user_version`` the registered migrations lead to."""
+        return max(version for version, _, _ in cls.MIGRATIONS)
+
     def init_database(self) -> None:
-        """Initialize the database with required tables and seed data."""
+        """Bring the schema up to date by applying pending migrations.
+
+        An up-to-date database costs a single ``PRAGMA user_version`` read.
+        Otherwise the cross-process write lock is taken, the version re-read
+        (another worker may have migrated meanwhile) and each pending
+        migration runs in its own exclusive transaction that also bumps
+        ``user_version``.
+        """
         try:
-            logger.info("Initializing database at: %s", self.db_path)
-            with sqlite3.connect(self.db_path) as conn:
-                logger.info("Database connection successful. Creating tables...")
-
-                # Core tables
-                self._create_users_table(conn)
-                self._create_mood_entries_table(conn)
-                self._create_groups_table(conn)
-                self._create_group_options_table(conn)
-                self._create_entry_selections_table(conn)
-                self._create_achievements_table(conn)
-
-                # Goals and metrics
-                self._create_goals_table(conn)
-                self._create_goal_completions_table(conn)
-                self._create_user_metrics_table(conn)
-
-                # Push Notifications
-                self._create_reminders_table(conn)
-                self._create_push_subscriptions_table(conn)
-                self._create_media_table(conn)
-                self._create_fts_tables(conn)
+            if self._read_user_version() >= self.schema_version():
+                logger.debug("Database schema current at: %s", self.db_path)
+                return
 
-                # Custom moods and scales
-                self._create_mood_definitions_table(conn)
-                self._create_scale_tables(conn)
-
-                # Important days / countdowns
-                self._create_important_days_table(conn)
-
-                # Failed login attempts tracking
-                self._create_failed_login_attempts_table(conn)
-
-                # Password reset & email verification tokens
-                self._create_password_reset_tokens_table(conn)
-                self._create_email_verification_tokens_table(conn)
-
-                # App Lock / Settings
-                if hasattr(self, "_create_settings_table"):
-                    self._create_settings_table(conn)
-
-                # Migrations
-                self._migrate_mood_entries_word_count(conn)
-
-                # Shared indexes
-                self._create_database_indexes(conn)
-
-                conn.commit()
-                logger.info("Database initialization complete")
-
-            self._insert_default_groups()
+            logger.info("Initializing database at: %s", self.db_path)
+            # Workers booting together must not run DDL/migrations concurrently.
+            with get_write_lock(self.db_path):
+                conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+                try:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    self._apply_pending_migrations(conn)
+                finally:
+                    conn.close()
+            logger.info("Database initialization complete")
         except Exception as exc:  # pragma: no cover - initialization rarely fails
             logger.error("Database initialization failed: %s", exc)
             raise
 
+    def _read_user_version(self) -> int:
+        if not os.path.exists(self.db_path):
+            return 0
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            return int(conn.execute("PRAGMA user_version").fetchone()[0])
+        finally:
+            conn.close()
+
+    def _apply_pending_migrations(self, conn: sqlite3.Connection) -> None:
+        current = int(conn.execute("PRAGMA user_version").fetchone()[0])
+        for version, description, method_name in sorted(self.MIGRATIONS):
+            if version <= current:
+                continue
+            started = time.perf_counter()
+            conn.execute("BEGIN EXCLUSIVE")
+            try:
+                getattr(self, method_name)(conn)
+                # PRAGMA arguments cannot be bound; version is a trusted int.
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                logger.error("Migration %04d (%s) failed", version, description)
+                raise
+            logger.info(
+                "Applied migration %04d (%s) in %.1f ms",
+                version,
+                description,
+                (time.perf_counter() - started) * 1000,
+            )
+
+    # --- Migrations -------------------------------------------------------------
+    def _migration_0001_baseline(self, conn: sqlite3.Connection) -> None:
+        """Create every table, run the legacy column probes and seed groups.
+
+        Idempotent, so databases created before versioning (``user_version``
+        0) are adopted in place.
+        """
+        # Core tables
+        self._create_users_table(conn)
+        self._create_mood_entries_table(conn)
+        self._create_groups_table(conn)
+        self._create_group_options_table(conn)
+        self._create_entry_selections_table(conn)
+        self._create_achievements_table(conn)
+
+        # Goals and metrics
+        self._create_goals_table(conn)
+        self._create_goal_completions_table(conn)
+        self._create_user_metrics_table(conn)
+
+        # Push Notifications
+        self._create_reminders_table(conn)
+        self._create_push_subscriptions_table(conn)
+        self._create_media_table(conn)
+        self._create_fts_tables(conn)
+
+        # Custom moods and scales
+        self._create_mood_definitions_table(conn)
+        self._create_scale_tables(conn)
+
+        # Important days / countdowns
+        self._create_important_days_table(conn)
+
+        # Failed login attempts tracking
+        self._create_failed_login_attempts_table(conn)
+
+        # Password reset & email verification tokens
+        self._create_password_reset_tokens_table(conn)
+        self._create_email_verification_tokens_table(conn)
+
+        # App Lock / Settings
+        if hasattr(self, "_create_settings_table"):
+            self._create_settings_table(conn)
+
+        # Migrations
+        self._migrate_mood_entries_word_count(conn)
+
+        # Shared indexes
+        self._create_database_indexes(conn)
+
+        self._insert_default_groups(conn)
+
+    def _migration_0002_keyset_indexes(self, conn: sqlite3.Connection) -> None:
+        """Composite indexes matching the history and search sort orders."""
+        # History: ORDER BY created_at DESC, date DESC, id DESC
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mood_entries_user_created "
+            "ON mood_entries(user_id, created_at, date, id)"
+        )
+        # Search: ORDER BY date DESC, created_at DESC, id DESC
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mood_entries_user_date_created "
+            "ON mood_entries(user_id, date, created_at, id)"
+        )
+
+    def _migration_0003_hot_query_indexes(self, conn: sqlite3.Connection) -> None:
+        """Indexes for lookups that previously fell back to full-table scans.
+
+        ``api/tests/test_query_plans.py`` checks every hot statement against
+        these; add the index here when that suite flags a new query.
+        """
+        indexes = (
+            # Option analytics and option deletion join on option_id.
+            "idx_entry_selections_option ON entry_selections(option_id, entry_id)",
+            # Per-entry media, newest first; also drives the user gallery join.
+            "idx_media_attachments_entry ON media_attachments(entry_id, created_at)",
+            "idx_media_attachments_file_path ON media_attachments(file_path)",
+            # Scheduler tick: active reminders due at HH:MM.
+            "idx_reminders_active_time ON reminders(is_active, time)",
+            "idx_reminders_user_time ON reminders(user_id, time)",
+            "idx_group_options_group ON group_options(group_id)",
+            "idx_scale_definitions_user ON scale_definitions(user_id)",
+            "idx_goals_user_created ON goals(user_id, created_at)",
+            "idx_achievements_user_earned ON achievements(user_id, earned_at)",
+            "idx_users_email ON users(email)",
+            "idx_push_subscriptions_endpoint ON push_subscriptions(endpoint)",
+        )
+        for index in indexes:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {index}")
+
+    def _migration_0004_daily_mood_rollup(self, conn: sqlite3.Connection) -> None:
+        """Per-day aggregates kept exact by triggers, backfilled from entries."""
+        self._create_daily_mood_rollup_table(conn)
+        rows = rebuild_daily_rollups(conn)
+        logger.info("Backfilled %s daily mood rollup rows", rows)
+
+    def _migration_0005_user_data_versions(self, conn: sqlite3.Connection) -> None:
+        """Per-user counters bumped by triggers on every analytics input."""
+        self._create_user_data_versions_table(conn)
+
+    def _migration_0006_option_usage(self, conn: sqlite3.Connection) -> None:
+        """Option/pair selection counters kept by triggers, backfilled once."""
+        self._create_option_usage_tables(conn)
+        rows = rebuild_option_usage(conn)
+        logger.info("Backfilled %s option usage rows", rows)
+
+    def _migration_0007_user_streaks(self, conn: sqlite3.Connection) -> None:
+        """Streak state extended by triggers, rebuilt lazily when marked dirty."""
+        self._create_user_streaks_table(conn)
+        # Seeded dirty; migration 8 computes them once entries have day numbers.
+        rows = conn.execute(
+            "INSERT OR IGNORE INTO user_streaks (user_id, dirty) "
+            "SELECT DISTINCT user_id, 1 FROM mood_entries"
+        ).rowcount
+        logger.info("Seeded %s user streak rows", rows)
+
+    def _migration_0008_entry_day(self, conn: sqlite3.Connection) -> None:
+        """``mood_entries.day`` as days since 1970-01-01, indexed per user."""
+        self._create_entry_day_column(conn)
+        rows = rebuild_user_streaks(conn)
+        logger.info("Rebuilt %s user streak rows from entry days", rows)
+
+    def _migration_0009_achievement_counters(self, conn: sqlite3.Connection) -> None:
+        """Per-user achievement counters kept by triggers, backfilled once."""
+        self._create_achievement_counters_table(conn)
+        rows = rebuild_achievement_counters(conn)
+        logger.info("Backfilled %s achievement counter rows", rows)
+
+    def _migration_0010_reference_data(self, conn: sqlite3.Connection) -> None:
+        """Reference data versions and sign-up defaults, backfilled once.
+
+        Users whose reads never created defaults get them here, so dropping
+        the lazy inserts from the read paths changes nothing they can see.
+        """
+        self._create_reference_versions_table(conn)
+        provisioned = provision_missing_defaults(conn)
+        logger.info("Provisioned reference defaults: %s", provisioned)
+
+    def _migration_0011_rollup_day_numbers(self, conn: sqlite3.Connection) -> None:
+        """Re-key ``daily_mood_rollup`` on the integer day and rebuild it.
+
+        Rows were keyed on the raw ``date`` text, so an ISO and a legacy
+        m/d/Y entry for the same day landed in two rows and text ranges
+        skipped the legacy ones.
+        """
+        for trigger in ("mood_rollup_ai", "mood_rollup_ad", "mood_rollup_au"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE IF EXISTS daily_mood_rollup")
+        self._create_daily_mood_rollup_table(conn)
+        rows = rebuild_daily_rollups(conn)
+        logger.info("Rebuilt %s daily mood rollup rows by day number", rows)
+
+    def _migration_0012_achievement_announced(self, conn: sqlite3.Connection) -> None:
+        """``achievements.announced`` so deferred unlocks survive any worker."""
+        self._create_achievement_announced_column(conn)
+
+    def _migration_0013_option_usage_prune_by_key(self, conn: sqlite3.Connection) -> None:
+        """Recreate the option usage triggers with key-scoped pruning.
+
+        The old triggers deleted emptied counters with a scan over all of
+        the user's rows on every entry delete or update.  Counts are
+        unchanged, so no rebuild is needed.
+        """
+        for trigger in (
+            "option_usage_es_ai", "option_usage_es_ad", "option_usage_es_au",
+            "option_usage_me_bd", "option_usage_me_au",
+        ):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        self._create_option_usage_tables(conn)
+
+    def _migration_0014_goal_completion_counters(self, conn: sqlite3.Connection) -> None:
+        """Completed goals as an ``achievement_counters`` metric, backfilled once."""
+        self._create_achievement_counters_table(conn)  # adds the goals triggers
+        rows = rebuild_achievement_counters(conn)
+        logger.info("Rebuilt %s achievement counter rows with goal completions", rows)
+
     # --- Table creation helpers -------------------------------------------------
     def _create_users_table(self, conn: sqlite3.Connection) -> None:
         conn.execute(
@@ -107,7 +326,11 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             cols: Iterable[str] = {row[1] for row in cur.fetchall()}
 
             if "username" not in cols:
-                conn.execute("ALTER TABLE users ADD COLUMN username TEXT UNIQUE")
+                # SQLite cannot add a UNIQUE column; a unique index enforces it.
+                conn.execute("ALTER TABLE users ADD COLUMN username TEXT")
+                conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS ux_users_username ON users(username)"
+                )
                 logger.info("Users table migrated to include username")
 
             if "password_hash" not in cols:
@@ -154,6 +377,40 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             conn.execute("UPDATE mood_entries SET word_count = ? WHERE id = ?", (wc, row[0]))
         logger.info("Migrated mood_entries: added word_count column and backfilled %d rows", len(rows))
 
+    def _create_entry_day_column(self, conn: sqlite3.Connection) -> None:
+        """Add ``mood_entries.day`` computed from either stored date format.
+
+        A VIRTUAL generated column: SQLite derives it from ``date`` on every
+        write, so no writer (or import) can let the two drift, and the
+        ``(user_id, day)`` index is the backfill.
+        """
+        cols = {row[1] for row in conn.execute("PRAGMA table_xinfo(mood_entries)").fetchall()}
+        if "day" not in cols:
+            conn.execute(
+                "ALTER TABLE mood_entries ADD COLUMN day INTEGER "
+                f"GENERATED ALWAYS AS ({epoch_day_sql('date')}) VIRTUAL"
+            )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mood_entries_user_day ON mood_entries(user_id, day)"
+        )
+        logger.info("Mood entries day column ready")
+
+    def _create_achievement_announced_column(self, conn: sqlite3.Connection) -> None:
+        """Add ``achievements.announced``; existing awards count as shown.
+
+        Awards made off the request thread are inserted with ``0`` and
+        flipped by the next evaluation that returns them, whichever process
+        serves it.
+        """
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(achievements)").fetchall()}
+        if "announced" not in cols:
+            conn.execute("ALTER TABLE achievements ADD COLUMN announced INTEGER NOT NULL DEFAULT 1")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_achievements_unannounced "
+            "ON achievements(user_id) WHERE announced = 0"
+        )
+        logger.info("Achievements announced column ready")
+
     def _create_groups_table(self, conn: sqlite3.Connection) -> None:
         conn.execute(
             """
@@ -287,7 +544,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             conn.execute("CREATE INDEX IF NOT EXISTS idx_goals_user ON goals(user_id)")
             logger.info("Goals table ready")
         except sqlite3.Error as exc:
-            logger.warning("Goals table creation failed (non-critical): %s", exc)
+            _handle_migration_error(exc, "Goals table")
 
     def _migrate_goals_table_schema(self, conn: sqlite3.Connection) -> None:
         try:
@@ -338,9 +595,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             )
             logger.info("Goal completions table ready")
         except sqlite3.Error as exc:
-            logger.warning(
-                "Goal completions table creation failed (non-critical): %s", exc
-            )
+            _handle_migration_error(exc, "Goal completions table")
 
     def _create_user_metrics_table(self, conn: sqlite3.Connection) -> None:
         try:
@@ -356,7 +611,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             )
             logger.info("User metrics table ready")
         except sqlite3.Error as exc:
-            logger.warning("User metrics table creation failed (non-critical): %s", exc)
+            _handle_migration_error(exc, "User metrics table")
 
     def _dedupe_integrity_rows(self, conn: sqlite3.Connection) -> None:
         """Backfill duplicate rows prior to unique-index creation."""
@@ -385,7 +640,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
                 """
             )
         except sqlite3.Error as exc:
-            logger.warning("Integrity backfill failed (non-critical): %s", exc)
+            _handle_migration_error(exc, "Integrity backfill")
 
     def _create_database_indexes(self, conn: sqlite3.Connection) -> None:
         try:
@@ -425,7 +680,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             )
             logger.info("Database indexes ready")
         except sqlite3.Error as exc:
-            logger.warning("Index creation failed (non-critical): %s", exc)
+            _handle_migration_error(exc, "Index")
 
     def _create_reminders_table(self, conn: sqlite3.Connection) -> None:
         try:
@@ -449,7 +704,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             self._migrate_reminders_schema(conn)
             logger.info("Reminders table ready")
         except sqlite3.Error as exc:
-            logger.warning("Reminders table creation failed: %s", exc)
+            _handle_migration_error(exc, "Reminders table")
 
     def _migrate_reminders_schema(self, conn: sqlite3.Connection) -> None:
         try:
@@ -471,6 +726,434 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
         except sqlite3.Error as exc:
             _handle_migration_error(exc, "Reminders table")
 
+    def _create_daily_mood_rollup_table(self, conn: sqlite3.Connection) -> None:
+        histogram = "".join(
+            f"                mood_{score} INTEGER NOT NULL DEFAULT 0,\n" for score in MOOD_SCORES
+        )
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS daily_mood_rollup (
+                user_id INTEGER NOT NULL,
+                day INTEGER NOT NULL,
+                entry_count INTEGER NOT NULL DEFAULT 0,
+                mood_sum INTEGER NOT NULL DEFAULT 0,
+                mood_sq_sum INTEGER NOT NULL DEFAULT 0,
+                min_mood INTEGER,
+                max_mood INTEGER,
+                word_count INTEGER NOT NULL DEFAULT 0,
+{histogram}                PRIMARY KEY (user_id, day),
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+            """
+        )
+
+        columns = ", ".join(f"mood_{score}" for score in MOOD_SCORES)
+
+        def add(row: str, sign: str) -> str:
+            # Upsert the row's contribution (sign "+") or subtract it ("-");
+            # an unparseable date has no day and is not rolled up.
+            day = epoch_day_sql(f"{row}.date")
+            values = ", ".join(f"{row}.mood = {score}" for score in MOOD_SCORES)
+            updates = ", ".join(
+                f"mood_{score} = mood_{score} {sign} excluded.mood_{score}" for score in MOOD_SCORES
+            )
+            return f"""
+                INSERT INTO daily_mood_rollup
+                    (user_id, day, entry_count, mood_sum, mood_sq_sum, word_count, {columns})
+                SELECT {row}.user_id, {day}, {sign}1, {sign}{row}.mood,
+                       {sign}{row}.mood * {row}.mood, {sign}COALESCE({row}.word_count, 0), {values}
+                 WHERE {day} IS NOT NULL
+                ON CONFLICT(user_id, day) DO UPDATE SET
+                    entry_count = entry_count + excluded.entry_count,
+                    mood_sum = mood_sum + excluded.mood_sum,
+                    mood_sq_sum = mood_sq_sum + excluded.mood_sq_sum,
+                    word_count = word_count + excluded.word_count,
+                    {updates};
+            """
+
+        def settle(row: str) -> str:
+            # min/max come from the histogram so deletes stay exact.
+            lowest = " ".join(f"WHEN mood_{score} > 0 THEN {score}" for score in MOOD_SCORES)
+            highest = " ".join(
+                f"WHEN mood_{score} > 0 THEN {score}" for score in reversed(MOOD_SCORES)
+            )
+            day = epoch_day_sql(f"{row}.date")
+            return f"""
+                DELETE FROM daily_mood_rollup
+                 WHERE user_id = {row}.user_id AND day = {day} AND entry_count <= 0;
+                UPDATE daily_mood_rollup
+                   SET min_mood = CASE {lowest} END, max_mood = CASE {highest} END
+                 WHERE user_id = {row}.user_id AND day = {day};
+            """
+
+        triggers = {
+            "mood_rollup_ai": ("AFTER INSERT", add("new", "+") + settle("new")),
+            "mood_rollup_ad": ("AFTER DELETE", add("old", "-") + settle("old")),
+            "mood_rollup_au": (
+                "AFTER UPDATE OF user_id, date, mood, word_count",
+                add("old", "-") + settle("old") + add("new", "+") + settle("new"),
+            ),
+        }
+        for name, (event, body) in triggers.items():
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {name} {event} ON mood_entries BEGIN {body} END"
+            )
+        logger.info("Daily mood rollup table ready")
+
+    def _create_user_data_versions_table(self, conn: sqlite3.Connection) -> None:
+        # user_id 0 tracks the shared (user_id NULL) groups every user sees.
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_data_versions (
+                user_id INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+
+        def bump(owner: str) -> str:
+            # A NULL owner means the parent row is already gone (cascade);
+            # the parent's own trigger has bumped the version.
+            return f"""
+                INSERT INTO user_data_versions (user_id, version)
+                SELECT uid, 1 FROM (SELECT {owner} AS uid) WHERE uid IS NOT NULL
+                ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+            """
+
+        owners = {
+            "mood_entries": "{row}.user_id",
+            "entry_selections": "(SELECT user_id FROM mood_entries WHERE id = {row}.entry_id)",
+            "scale_entries": "(SELECT user_id FROM mood_entries WHERE id = {row}.entry_id)",
+            "scale_definitions": "{row}.user_id",
+            "groups": "COALESCE({row}.user_id, 0)",
+            "group_options": "(SELECT COALESCE(user_id, 0) FROM groups WHERE id = {row}.group_id)",
+        }
+        for table, owner in owners.items():
+            for suffix, event, rows in (
+                ("ai", "AFTER INSERT", ("new",)),
+                ("au", "AFTER UPDATE", ("old", "new")),
+                ("ad", "AFTER DELETE", ("old",)),
+            ):
+                body = "".join(bump(owner.format(row=row)) for row in rows)
+                conn.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS data_version_{table}_{suffix} "
+                    f"{event} ON {table} BEGIN {body} END"
+                )
+        logger.info("User data versions table ready")
+
+    def _create_reference_versions_table(self, conn: sqlite3.Connection) -> None:
+        # user_id 0 tracks the shared (user_id NULL) groups every user sees.
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reference_versions (
+                user_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, kind)
+            ) WITHOUT ROWID
+            """
+        )
+
+        def bump(kind: str, owner: str) -> str:
+            # A NULL owner means the parent group is already gone (cascade);
+            # its own trigger has bumped the version.
+            return f"""
+                INSERT INTO reference_versions (user_id, kind, version)
+                SELECT uid, '{kind}', 1 FROM (SELECT {owner} AS uid) WHERE uid IS NOT NULL
+                ON CONFLICT(user_id, kind) DO UPDATE SET version = version + 1;
+            """
+
+        for table, (kind, owner) in REFERENCE_TABLES.items():
+            for suffix, event, rows in (
+                ("ai", "AFTER INSERT", ("new",)),
+                ("au", "AFTER UPDATE", ("old", "new")),
+                ("ad", "AFTER DELETE", ("old",)),
+            ):
+                body = "".join(bump(kind, owner.format(row=row)) for row in rows)
+                conn.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS reference_version_{table}_{suffix} "
+                    f"{event} ON {table} BEGIN {body} END"
+                )
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS provision_user_defaults AFTER INSERT ON users "
+            f"BEGIN {default_provisioning_sql('new.id')} END"
+        )
+        logger.info("Reference versions table ready")
+
+    def _create_option_usage_tables(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS option_usage (
+                user_id INTEGER NOT NULL,
+                option_id INTEGER NOT NULL,
+                month TEXT NOT NULL,
+                mood INTEGER NOT NULL,
+                entry_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, option_id, month, mood)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS option_pair_usage (
+                user_id INTEGER NOT NULL,
+                option1_id INTEGER NOT NULL,
+                option2_id INTEGER NOT NULL,
+                month TEXT NOT NULL,
+                mood INTEGER NOT NULL,
+                pair_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, option1_id, option2_id, month, mood)
+            ) WITHOUT ROWID
+            """
+        )
+
+        upsert_usage = (
+            "INSERT INTO option_usage (user_id, option_id, month, mood, entry_count) {select} "
+            "ON CONFLICT(user_id, option_id, month, mood) "
+            "DO UPDATE SET entry_count = entry_count + excluded.entry_count;"
+        )
+        upsert_pairs = (
+            "INSERT INTO option_pair_usage "
+            "(user_id, option1_id, option2_id, month, mood, pair_count) {select} "
+            "ON CONFLICT(user_id, option1_id, option2_id, month, mood) "
+            "DO UPDATE SET pair_count = pair_count + excluded.pair_count;"
+        )
+        # Emptied counters are dropped by key: only the rows this change
+        # decremented are looked up, never the user's whole history.
+        prune_usage = (
+            "DELETE FROM option_usage WHERE entry_count <= 0 "
+            "AND (user_id, option_id, month, mood) IN ({select});"
+        )
+        prune_pairs = (
+            "DELETE FROM option_pair_usage WHERE pair_count <= 0 "
+            "AND (user_id, option1_id, option2_id, month, mood) IN ({select});"
+        )
+
+        def delta(usage: Tuple[str, str], pairs: Tuple[str, str], sign: str) -> str:
+            # ``usage``/``pairs`` are (key columns, FROM clause) of the rows to move.
+            (usage_keys, usage_from), (pair_keys, pair_from) = usage, pairs
+            body = upsert_usage.format(
+                select=f"SELECT {usage_keys}, {sign}1 {usage_from}"
+            ) + upsert_pairs.format(select=f"SELECT {pair_keys}, {sign}1 {pair_from}")
+            if sign == "-":
+                body += prune_usage.format(
+                    select=f"SELECT {usage_keys} {usage_from}"
+                ) + prune_pairs.format(select=f"SELECT {pair_keys} {pair_from}")
+            return body
+
+        def entry_delta(row: str, sign: str) -> str:
+            # Every selection (and pair) of one entry moves in or out of its bucket.
+            month = month_sql(f"{row}.date")
+            return delta(
+                (
+                    f"{row}.user_id, es.option_id, {month}, {row}.mood",
+                    f"FROM entry_selections es WHERE es.entry_id = {row}.id",
+                ),
+                (
+                    f"{row}.user_id, a.option_id, b.option_id, {month}, {row}.mood",
+                    "FROM entry_selections a JOIN entry_selections b "
+                    "ON b.entry_id = a.entry_id AND a.option_id < b.option_id "
+                    f"WHERE a.entry_id = {row}.id",
+                ),
+                sign,
+            )
+
+        def selection_delta(row: str, sign: str) -> str:
+            # One selection and its pairs with the entry's other selections.
+            # Finds nothing when the parent entry is already deleted; the
+            # entry's BEFORE DELETE trigger has removed its counts.
+            month = month_sql("me.date")
+            return delta(
+                (
+                    f"me.user_id, {row}.option_id, {month}, me.mood",
+                    f"FROM mood_entries me WHERE me.id = {row}.entry_id",
+                ),
+                (
+                    f"me.user_id, MIN(o.option_id, {row}.option_id), "
+                    f"MAX(o.option_id, {row}.option_id), {month}, me.mood",
+                    "FROM entry_selections o JOIN mood_entries me ON me.id = o.entry_id "
+                    f"WHERE o.entry_id = {row}.entry_id AND o.option_id != {row}.option_id",
+                ),
+                sign,
+            )
+
+        triggers = {
+            "option_usage_es_ai": ("AFTER INSERT ON entry_selections", selection_delta("new", "+")),
+            "option_usage_es_ad": ("AFTER DELETE ON entry_selections", selection_delta("old", "-")),
+            "option_usage_es_au": (
+                "AFTER UPDATE OF entry_id, option_id ON entry_selections",
+                selection_delta("old", "-") + selection_delta("new", "+"),
+            ),
+            # BEFORE, so the selections are still there to be subtracted.
+            "option_usage_me_bd": ("BEFORE DELETE ON mood_entries", entry_delta("old", "-")),
+            "option_usage_me_au": (
+                "AFTER UPDATE OF user_id, date, mood ON mood_entries",
+                entry_delta("old", "-") + entry_delta("new", "+"),
+            ),
+        }
+        for name, (event, body) in triggers.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+        logger.info("Option usage tables ready")
+
+    def _create_user_streaks_table(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_streaks (
+                user_id INTEGER PRIMARY KEY,
+                last_day INTEGER,
+                run_length INTEGER NOT NULL DEFAULT 0,
+                longest INTEGER NOT NULL DEFAULT 0,
+                journal_last_day INTEGER,
+                journal_run_length INTEGER NOT NULL DEFAULT 0,
+                journal_longest INTEGER NOT NULL DEFAULT 0,
+                dirty INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+            )
+            """
+        )
+
+        day = epoch_day_sql("new.date")
+
+        def extend(prefix: str, condition: str) -> str:
+            # Same or next day extends the run, a later day starts a new one,
+            # an earlier day can merge runs and is left to the exact rebuild.
+            last, run, longest = f"{prefix}last_day", f"{prefix}run_length", f"{prefix}longest"
+            new_run = (
+                f"CASE WHEN {last} IS NULL OR {day} > {last} + 1 THEN 1 "
+                f"WHEN {day} = {last} + 1 THEN {run} + 1 ELSE {run} END"
+            )
+            return (
+                f"UPDATE user_streaks SET {run} = {new_run}, "
+                f"{longest} = MAX({longest}, {new_run}), "
+                f"{last} = MAX(COALESCE({last}, {day}), {day}), "
+                f"dirty = COALESCE({day} < {last}, 0) "
+                f"WHERE user_id = new.user_id AND dirty = 0 AND {day} IS NOT NULL{condition};"
+            )
+
+        def mark_dirty(user: str) -> str:
+            return (
+                f"INSERT INTO user_streaks (user_id, dirty) VALUES ({user}, 1) "
+                "ON CONFLICT(user_id) DO UPDATE SET dirty = 1;"
+            )
+
+        journaled = f"word_count >= {MEANINGFUL_WORD_THRESHOLD}"
+        same_day = "SELECT 1 FROM mood_entries WHERE user_id = old.user_id AND date = old.date"
+        triggers = {
+            # A user's first row starts dirty so it is computed exactly once.
+            "user_streaks_ai": (
+                "AFTER INSERT ON mood_entries",
+                "INSERT INTO user_streaks (user_id, dirty) VALUES (new.user_id, 1) "
+                "ON CONFLICT(user_id) DO NOTHING;"
+                + extend("", "")
+                + extend("journal_", f" AND new.{journaled}"),
+            ),
+            # Only a delete that empties a day (or its last long entry) can shorten a run.
+            "user_streaks_ad": (
+                "AFTER DELETE ON mood_entries",
+                "UPDATE user_streaks SET dirty = 1 WHERE user_id = old.user_id AND dirty = 0 AND ("
+                f"NOT EXISTS ({same_day}) OR (old.{journaled} AND NOT EXISTS ({same_day} AND {journaled})));",
+            ),
+            "user_streaks_au": (
+                "AFTER UPDATE OF user_id, date, word_count ON mood_entries "
+                "WHEN old.user_id IS NOT new.user_id OR old.date IS NOT new.date "
+                f"OR (old.{journaled}) IS NOT (new.{journaled})",
+                mark_dirty("old.user_id") + mark_dirty("new.user_id"),
+            ),
+        }
+        for name, (event, body) in triggers.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+        logger.info("User streaks table ready")
+
+    def _create_achievement_counters_table(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS achievement_counters (
+                user_id INTEGER NOT NULL,
+                metric TEXT NOT NULL,
+                value INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, metric),
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+            """
+        )
+
+        def add(user: str, metrics: str, amount: str = "1") -> str:
+            return (
+                f"INSERT INTO achievement_counters (user_id, metric, value) "
+                f"SELECT {user}, metric, {amount} FROM (SELECT {metrics}) "
+                f"WHERE {user} IS NOT NULL "
+                "ON CONFLICT(user_id, metric) DO UPDATE SET value = value + excluded.value;"
+            )
+
+        def subtract(user: str, metrics: str, amount: str = "1") -> str:
+            # Never creates rows, so a user's counters can be deleted first.
+            return (
+                f"UPDATE achievement_counters SET value = value - {amount} "
+                f"WHERE user_id = {user} AND metric IN ({metrics});"
+            )
+
+        def entry_metrics(row: str) -> str:
+            return f"'entries' AS metric UNION ALL SELECT 'mood_' || {row}.mood"
+
+        completed = "'goal_completions' AS metric"
+        entry_owner = "(SELECT user_id FROM mood_entries WHERE id = {row}.entry_id)"
+        photos = "(SELECT COUNT(*) FROM media_attachments WHERE entry_id = {row}.id)"
+        triggers = {
+            "achievement_counters_me_ai": (
+                "AFTER INSERT ON mood_entries",
+                add("new.user_id", entry_metrics("new")),
+            ),
+            "achievement_counters_me_ad": (
+                "AFTER DELETE ON mood_entries",
+                subtract("old.user_id", "'entries', 'mood_' || old.mood"),
+            ),
+            # Cascaded media deletes cannot see the entry any more, so its
+            # photos are taken off here, while it still exists.
+            "achievement_counters_me_bd": (
+                "BEFORE DELETE ON mood_entries",
+                subtract("old.user_id", "'photos'", photos.format(row="old")),
+            ),
+            "achievement_counters_me_au": (
+                "AFTER UPDATE OF user_id, mood ON mood_entries "
+                "WHEN old.user_id IS NOT new.user_id OR old.mood IS NOT new.mood",
+                subtract("old.user_id", "'entries', 'mood_' || old.mood")
+                + add("new.user_id", entry_metrics("new"))
+                + subtract("old.user_id", "'photos'", photos.format(row="new"))
+                + add("new.user_id", "'photos' AS metric", photos.format(row="new")),
+            ),
+            "achievement_counters_ma_ai": (
+                "AFTER INSERT ON media_attachments",
+                add(entry_owner.format(row="new"), "'photos' AS metric"),
+            ),
+            "achievement_counters_ma_ad": (
+                "AFTER DELETE ON media_attachments",
+                subtract(entry_owner.format(row="old"), "'photos'"),
+            ),
+            "achievement_counters_ma_au": (
+                "AFTER UPDATE OF entry_id ON media_attachments",
+                subtract(entry_owner.format(row="old"), "'photos'")
+                + add(entry_owner.format(row="new"), "'photos' AS metric"),
+            ),
+            "achievement_counters_goals_ai": (
+                "AFTER INSERT ON goals WHEN new.completed = 1",
+                add("new.user_id", completed),
+            ),
+            "achievement_counters_goals_ad": (
+                "AFTER DELETE ON goals WHEN old.completed = 1",
+                subtract("old.user_id", "'goal_completions'"),
+            ),
+            # Period rollovers reset ``completed`` in bulk; each row moves once.
+            "achievement_counters_goals_au": (
+                "AFTER UPDATE OF user_id, completed ON goals "
+                "WHEN (old.completed = 1) IS NOT (new.completed = 1) OR old.user_id IS NOT new.user_id",
+                subtract("old.user_id", "'goal_completions'", "(old.completed = 1)")
+                + add("new.user_id", completed, "(new.completed = 1)"),
+            ),
+        }
+        for name, (event, body) in triggers.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+        logger.info("Achievement counters table ready")
+
     def _create_push_subscriptions_table(self, conn: sqlite3.Connection) -> None:
         try:
             conn.execute(
@@ -489,7 +1172,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             )
             logger.info("Push subscriptions table ready")
         except sqlite3.Error as exc:
-            logger.warning("Push subscriptions table creation failed: %s", exc)
+            _handle_migration_error(exc, "Push subscriptions table")
 
     def _create_media_table(self, conn: sqlite3.Connection) -> None:
         try:
@@ -509,7 +1192,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             self._migrate_media_schema(conn)
             logger.info("Media attachments table ready")
         except sqlite3.Error as exc:
-            logger.warning("Media table creation failed: %s", exc)
+            _handle_migration_error(exc, "Media table")
 
     def _migrate_media_schema(self, conn: sqlite3.Connection) -> None:
         try:
@@ -560,6 +1243,8 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
 
             logger.info("FTS tables and triggers ready")
         except sqlite3.Error as exc:
+            if "fts5" not in str(exc).lower():
+                _handle_migration_error(exc, "FTS table")
             logger.warning("FTS table creation failed. FTS5 might not be supported: %s", exc)
 
     def _create_mood_definitions_table(self, conn: sqlite3.Connection) -> None:
@@ -581,7 +1266,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             )
             logger.info("Mood definitions table ready")
         except sqlite3.Error as exc:
-            logger.warning("Mood definitions table creation failed: %s", exc)
+            _handle_migration_error(exc, "Mood definitions table")
 
     def _create_scale_tables(self, conn: sqlite3.Connection) -> None:
         try:
@@ -618,7 +1303,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             )
             logger.info("Scale tables ready")
         except sqlite3.Error as exc:
-            logger.warning("Scale tables creation failed: %s", exc)
+            _handle_migration_error(exc, "Scale tables")
 
     def _create_important_days_table(self, conn: sqlite3.Connection) -> None:
         try:
@@ -645,7 +1330,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             )
             logger.info("Important days table ready")
         except sqlite3.Error as exc:
-            logger.warning("Important days table creation failed: %s", exc)
+            _handle_migration_error(exc, "Important days table")
 
     def _create_failed_login_attempts_table(self, conn: sqlite3.Connection) -> None:
         try:
@@ -669,7 +1354,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             )
             logger.info("Failed login attempts table ready")
         except sqlite3.Error as exc:
-            logger.warning("Failed login attempts table creation failed: %s", exc)
+            _handle_migration_error(exc, "Failed login attempts table")
 
     def _create_password_reset_tokens_table(
         self, conn: sqlite3.Connection
@@ -694,9 +1379,7 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             )
             logger.info("Password reset tokens table ready")
         except sqlite3.Error as exc:
-            logger.warning(
-                "Password reset tokens table creation failed: %s", exc
-            )
+            _handle_migration_error(exc, "Password reset tokens table")
 
     def _create_email_verification_tokens_table(
         self, conn: sqlite3.Connection
@@ -721,12 +1404,10 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             )
             logger.info("Email verification tokens table ready")
         except sqlite3.Error as exc:
-            logger.warning(
-                "Email verification tokens table creation failed: %s", exc
-            )
+            _handle_migration_error(exc, "Email verification tokens table")
 
     # --- Seed helpers -----------------------------------------------------------
-    def _insert_default_groups(self) -> None:
+    def _insert_default_groups(self, conn: sqlite3.Connection) -> None:
         default_groups = {
             "Emotions": [
                 "happy",
@@ -763,28 +1444,26 @@ class DatabaseSchemaMixin(DatabaseConnectionMixin):
             ],
         }
 
-        with self._connect() as conn:
-            for group_name, options in default_groups.items():
+        for group_name, options in default_groups.items():
+            cursor = conn.execute(
+                "SELECT id FROM groups WHERE name = ?",
+                (group_name,),
+            )
+            group_row = cursor.fetchone()
+
+            if not group_row:
                 cursor = conn.execute(
-                    "SELECT id FROM groups WHERE name = ?",
+                    "INSERT INTO groups (name) VALUES (?)",
                     (group_name,),
                 )
-                group_row = cursor.fetchone()
-
-                if not group_row:
-                    cursor = conn.execute(
-                        "INSERT INTO groups (name) VALUES (?)",
-                        (group_name,),
+                group_id = cursor.lastrowid
+                for option in options:
+                    conn.execute(
+                        "INSERT INTO group_options (group_id, name) VALUES (?, ?)",
+                        (group_id, option),
                     )
-                    group_id = cursor.lastrowid
-                    for option in options:
-                        conn.execute(
-                            "INSERT INTO group_options (group_id, name) VALUES (?, ?)",
-                            (group_id, option),
-                        )
-
-            conn.commit()
-            logger.info("Default groups ensured")
+
+        logger.info("Default groups ensured")
 
 
 __all__ = ["DatabaseSchemaMixin"]
@@ -32,23 +32,21 @@ class SettingsMixin(DatabaseConnectionMixin):
             logger.warning("User settings table creation failed: %s", exc)
 
     def get_user_settings(self, user_id: int) -> Dict:
-        """Get settings for a user. Create defaults if not exists."""
-        with self._conn() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM user_settings WHERE user_id = ?", (user_id,)
-            )
-            row = cursor.fetchone()
-
-            if not row:
-                conn.execute(
-                    "INSERT INTO user_settings (user_id) VALUES (?)", (user_id,)
-                )
-                conn.commit()
-                # recursive call to get new row
-                return self.get_user_settings(user_id)
+        """Settings for a user (the row is provisioned with the user).
 
+        Served from the reference cache; the returned dict is shared and must
+        not be mutated.  A user without a row reads as the column defaults.
+        """
+        def load() -> Dict:
+            row = self._query(
+                "SELECT * FROM user_settings WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if row is None:
+                return {"user_id": user_id, "pin_hash": None, "lock_timeout_seconds": 60}
             return dict(row)
 
+        return self._cached_reference(user_id, "settings", load)
+
     def set_user_pin(self, user_id: int, pin: str) -> None:
         """Set a 4+ digit PIN."""
         pin_hash = generate_password_hash(pin)
@@ -73,6 +73,9 @@ class UsersMixin(DatabaseConnectionMixin):
     # Whitelist of tables that have a user_id column for safe deletion
     _USER_DATA_TABLES = frozenset({
         "mood_entries",
+        "daily_mood_rollup",
+        "user_streaks",
+        "achievement_counters",
         "goals",
         "groups",
         "user_settings",
@@ -99,6 +102,15 @@ class UsersMixin(DatabaseConnectionMixin):
             # Finally delete user
             conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
 
+    def get_data_version(self, user_id: int) -> int:
+        """Counter that changes whenever the user's entries, selections,
+        scales or groups change (maintained by triggers)."""
+        row = self._query(
+            "SELECT COALESCE(SUM(version), 0) FROM user_data_versions WHERE user_id IN (?, 0)",
+            (user_id,),
+        ).fetchone()
+        return int(row[0]) if row else 0
+
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """Get user by username."""
         row = self._query(
@@ -24,9 +24,10 @@ def _env_bool(name: str, default: bool = False) -> bool:
 
 
 bind = os.getenv("GUNICORN_BIND", f"[::]:{os.getenv('PORT', '5000')}")
-# Default to 1 worker: the in-process rate limiter and SQLite write lock
-# are not shared across OS processes.  Scale via WORKERS env var only after
-# moving rate-limiting state to Redis or nginx.
+# SQLite writes are serialized across workers by a file lock next to the
+# database, so WORKERS > 1 is safe for data.  The in-process rate limiter is
+# still per worker (effective limits scale with WORKERS); move it to Redis or
+# nginx before relying on exact limits with several workers.
 workers = _env_int("WORKERS", 1)
 worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
 timeout = _env_int("TIMEOUT", 120)
@@ -0,0 +1,59 @@
+from flask import Blueprint, current_app, jsonify, request
+import logging
+from api.database import MoodDatabase
+from api.services.user_service import UserService
+from api.utils.auth_middleware import require_auth, get_current_user_id
+from api.utils.secure_errors import secure_error_response
+
+logger = logging.getLogger(__name__)
+
+
+def create_admin_routes(db: MoodDatabase, user_service: UserService):
+    admin_bp = Blueprint("admin", __name__)
+
+    def _is_admin(user_id) -> bool:
+        if not isinstance(user_id, int):
+            return False
+        user = user_service.get_user_by_id(user_id)
+        allowed = current_app.config.get("ADMIN_USERNAMES") or []
+        return bool(user and user.get("username") in allowed)
+
+    @admin_bp.route("/admin/db/query-stats", methods=["GET"])
+    @require_auth
+    def get_query_stats():
+        try:
+            if not _is_admin(get_current_user_id()):
+                return jsonify({"error": "Forbidden"}), 403
+            limit = request.args.get("limit", type=int)
+            services = current_app.extensions.get("services")
+            analytics_cache = {}
+            if services is not None and services.is_loaded("analytics"):
+                analytics_cache = services.get("analytics").cache_stats()
+            return jsonify(
+                {
+                    "enabled": db._query_stats is not None,
+                    "queries": db.query_stats(limit=limit),
+                    "pools": db.pool_stats(),
+                    "writer": db.write_stats(),
+                    "analytics_cache": analytics_cache,
+                    "reference_cache": db.reference_cache_stats(),
+                }
+            )
+
+        except Exception as e:
+            return secure_error_response(e, 500)
+
+    @admin_bp.route("/admin/db/query-stats", methods=["DELETE"])
+    @require_auth
+    def reset_query_stats():
+        try:
+            if not _is_admin(get_current_user_id()):
+                return jsonify({"error": "Forbidden"}), 403
+            if db._query_stats is not None:
+                db._query_stats.reset()
+            return jsonify({"status": "reset"})
+
+        except Exception as e:
+            return secure_error_response(e, 500)
+
+    return admin_bp
@@ -1,13 +1,20 @@
+from datetime import date
+from typing import TYPE_CHECKING
+
 from flask import Blueprint, jsonify, request
 import logging
-from api.services.analytics_service import AnalyticsService
+from api.constants import AnalyticsLimits, Defaults
+from api.database_analytics import TIMESERIES_BUCKETS
 from api.utils.auth_middleware import require_auth, get_current_user_id
 from api.utils.secure_errors import secure_error_response
 
+if TYPE_CHECKING:  # NumPy is imported with the service, on first request
+    from api.services.analytics_service import AnalyticsService
+
 logger = logging.getLogger(__name__)
 
 
-def create_analytics_routes(analytics_service: AnalyticsService, scale_service=None):
+def create_analytics_routes(analytics_service: "AnalyticsService", scale_service=None):
     bp = Blueprint('analytics', __name__)
 
     @bp.route('/analytics/correlations', methods=['GET'])
@@ -62,6 +69,83 @@ def create_analytics_routes(analytics_service: AnalyticsService, scale_service=N
         except Exception as e:
             return secure_error_response(e, 500)
 
+    @bp.route('/analytics/itemsets', methods=['GET'])
+    @require_auth
+    def get_itemsets():
+        try:
+            user_id = get_current_user_id()
+            if user_id is None:
+                return jsonify({"error": "Unauthorized"}), 401
+
+            min_support = request.args.get("min_support", default=Defaults.ITEMSET_MIN_SUPPORT, type=float)
+            max_size = request.args.get("max_size", default=Defaults.ITEMSET_MAX_SIZE, type=int)
+            if min_support is None or not 0 < min_support <= 1:
+                return jsonify({"error": "min_support must be a fraction between 0 and 1"}), 400
+            if max_size is None or not 3 <= max_size <= AnalyticsLimits.MAX_ITEMSET_SIZE:
+                return jsonify({
+                    "error": f"max_size must be between 3 and {AnalyticsLimits.MAX_ITEMSET_SIZE}"
+                }), 400
+
+            return jsonify(analytics_service.get_itemsets(user_id, min_support, max_size))
+        except Exception as e:
+            return secure_error_response(e, 500)
+
+    @bp.route('/analytics/scale-correlations', methods=['GET'])
+    @require_auth
+    def get_scale_correlations():
+        try:
+            user_id = get_current_user_id()
+            if user_id is None:
+                return jsonify({"error": "Unauthorized"}), 401
+
+            top = request.args.get("top", default=AnalyticsLimits.SCALE_CORRELATION_TAGS, type=int)
+            if top is None or not 0 <= top <= AnalyticsLimits.MAX_SCALE_CORRELATION_TAGS:
+                return jsonify({
+                    "error": f"top must be between 0 and {AnalyticsLimits.MAX_SCALE_CORRELATION_TAGS}"
+                }), 400
+            from api.services import analytics_engine
+
+            if not analytics_engine.available():
+                return jsonify({"error": "Scale correlations are unavailable on this server"}), 503
+
+            return jsonify(analytics_service.get_scale_correlations(user_id, top))
+        except Exception as e:
+            return secure_error_response(e, 500)
+
+    @bp.route('/analytics/timeseries', methods=['GET'])
+    @require_auth
+    def get_timeseries():
+        try:
+            user_id = get_current_user_id()
+            if user_id is None:
+                return jsonify({"error": "Unauthorized"}), 401
+
+            metric = request.args.get("metric", "mood")
+            bucket = request.args.get("bucket", "day")
+            start = request.args.get("start") or None
+            end = request.args.get("end") or None
+            kind, _, raw_id = metric.partition(":")
+            if not (
+                (kind in ("mood", "word_count") and not raw_id)
+                or (kind in ("scale", "tag") and raw_id.isdigit())
+            ):
+                return jsonify({"error": "metric must be mood, word_count, scale:<id> or tag:<id>"}), 400
+            if bucket not in TIMESERIES_BUCKETS:
+                return jsonify({"error": f"bucket must be one of {', '.join(TIMESERIES_BUCKETS)}"}), 400
+            try:
+                for value in (start, end):
+                    if value:
+                        date.fromisoformat(value)
+            except ValueError:
+                return jsonify({"error": "start and end must be YYYY-MM-DD dates"}), 400
+
+            data = analytics_service.get_timeseries(user_id, metric, bucket, start, end)
+            if data is None:
+                return jsonify({"error": "Not found"}), 404
+            return jsonify(data)
+        except Exception as e:
+            return secure_error_response(e, 500)
+
     @bp.route('/analytics/stability', methods=['GET'])
     @require_auth
     def get_stability():
@@ -71,7 +155,18 @@ def create_analytics_routes(analytics_service: AnalyticsService, scale_service=N
                 return jsonify({"error": "Unauthorized"}), 401
 
             days = request.args.get("days", default=30, type=int)
-            data = analytics_service.get_mood_stability(user_id, days)
+            windows = None
+            raw_windows = request.args.get("windows")
+            if raw_windows:
+                try:
+                    windows = [int(w) for w in raw_windows.split(",") if w.strip()]
+                except ValueError:
+                    return jsonify({"error": "windows must be a comma-separated list of integers"}), 400
+                if not windows or not all(1 <= w <= AnalyticsLimits.MAX_STABILITY_WINDOW for w in windows):
+                    return jsonify({
+                        "error": f"windows must be between 1 and {AnalyticsLimits.MAX_STABILITY_WINDOW} days"
+                    }), 400
+            data = analytics_service.get_mood_stability(user_id, days, windows)
 
             # Legacy mapping for frontend compatibility
             response = {
@@ -81,6 +176,8 @@ def create_analytics_routes(analytics_service: AnalyticsService, scale_service=N
                 },
                 "trend": data["trend"]
             }
+            if windows:
+                response["trends"] = {str(w): series for w, series in data["trends"].items()}
             return jsonify(response)
         except Exception as e:
             return secure_error_response(e, 500)
@@ -94,26 +191,7 @@ def create_analytics_routes(analytics_service: AnalyticsService, scale_service=N
             if user_id is None:
                 return jsonify({"error": "Unauthorized"}), 401
 
-            # Fetch all analytics data
-            correlations = analytics_service.get_activity_correlations(user_id)
-            co_occurrence = analytics_service.get_tag_co_occurrence(user_id)
-
-            # Fetch scales if scale_service is available
-            scales = []
-            scale_entries = []
-            scale_averages = []
-            if scale_service is not None:
-                scales = scale_service.get_user_scales(user_id)
-                scale_entries = scale_service.get_user_scale_entries(user_id)
-                scale_averages = scale_service.get_scale_averages(user_id, days=30)
-
-            return jsonify({
-                "correlations": correlations,
-                "coOccurrence": co_occurrence,
-                "scales": scales,
-                "scaleEntries": scale_entries,
-                "scaleAverages": scale_averages
-            })
+            return jsonify(analytics_service.get_dashboard_batch(user_id, scale_service))
         except Exception as e:
             return secure_error_response(e, 500)
 
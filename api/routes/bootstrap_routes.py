@@ -0,0 +1,49 @@
+"""Single-request dashboard bootstrap."""
+
+import time
+from typing import Iterable, Tuple
+
+from flask import Blueprint, request, jsonify
+from api.utils.auth_middleware import require_auth, get_current_user_id
+from api.utils.secure_errors import secure_error_response
+
+
+def _server_timing(timings: Iterable[Tuple[str, float]]) -> str:
+    return ", ".join(f"{name};dur={ms:.2f}" for name, ms in timings)
+
+
+def create_bootstrap_routes(bootstrap_service):
+    """Create the bootstrap route.
+
+    Args:
+        bootstrap_service: BootstrapService instance assembling the sections
+    """
+    bp = Blueprint("bootstrap", __name__)
+
+    @bp.route("/bootstrap", methods=["GET"])
+    @require_auth
+    def get_bootstrap():
+        """Everything the dashboard loads after login, from one snapshot.
+
+        ``?fields=goals,settings`` limits the response to those sections;
+        ``Server-Timing`` reports how long each one took.
+        """
+        try:
+            started = time.perf_counter()
+            user_id = get_current_user_id()
+            fields = bootstrap_service.parse_fields(request.args.get("fields"))
+            payload, timings = bootstrap_service.build(user_id, fields)
+
+            serialize_started = time.perf_counter()
+            response = jsonify(payload)
+            finished = time.perf_counter()
+            timings.append(("serialize", (finished - serialize_started) * 1000))
+            timings.append(("total", (finished - started) * 1000))
+            response.headers["Server-Timing"] = _server_timing(timings)
+            return response
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            return secure_error_response(e, 500)
+
+    return bp
@@ -17,8 +17,18 @@ def create_goal_routes(goal_service: GoalService):
     def list_goals():
         try:
             user_id = get_current_user_id()
-            goals = goal_service.list_goals(user_id)
+            # ?include=completions&start=&end= adds each goal's completion bitmap
+            include_param = request.args.get("include", "")
+            includes = set(i.strip().lower() for i in include_param.split(",") if i.strip())
+            if "completions" in includes:
+                goals = goal_service.list_goals_with_completions(
+                    user_id, request.args.get("start"), request.args.get("end")
+                )
+            else:
+                goals = goal_service.list_goals(user_id)
             return jsonify(goals)
+        except ValueError:
+            return jsonify({"error": "Invalid date range"}), 400
         except Exception as e:
             return secure_error_response(e, 500)
 
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 import logging
 from api.services.group_service import GroupService
 from api.utils.secure_errors import secure_error_response
+from api.utils.responses import conditional_response
 from api.utils.auth_middleware import require_auth, get_current_user_id
 
 logger = logging.getLogger(__name__)
@@ -15,8 +16,10 @@ def create_group_routes(group_service: GroupService):
     def get_groups():
         try:
             user_id = get_current_user_id()
-            groups = group_service.get_groups_for_user(user_id)
-            return jsonify(groups)
+            return conditional_response(
+                group_service.groups_etag(user_id),
+                lambda: jsonify(group_service.get_groups_for_user(user_id)),
+            )
 
         except Exception as e:
             return secure_error_response(e, 500)
@@ -1,15 +1,18 @@
 import os
 import logging
+from typing import TYPE_CHECKING
 from flask import Blueprint, request, jsonify, send_from_directory
 from api.utils.auth_middleware import require_auth, get_current_user_id
 from api.utils.secure_errors import secure_error_response
-from api.services.media_service import MediaService
 from api.services.mood_service import MoodService
 
+if TYPE_CHECKING:  # PIL is only imported once the media service is first used
+    from api.services.media_service import MediaService
+
 logger = logging.getLogger(__name__)
 
 
-def create_media_routes(media_service: MediaService, mood_service: MoodService):
+def create_media_routes(media_service: "MediaService", mood_service: MoodService):
     media_bp = Blueprint("media", __name__)
 
     @media_bp.route("/mood/<int:entry_id>/media", methods=["POST"])
@@ -29,7 +32,7 @@ def create_media_routes(media_service: MediaService, mood_service: MoodService):
             if file.filename == '':
                 return jsonify({"error": "No selected file"}), 400
             
-            result = media_service.save_media(entry_id, file)
+            result = media_service.save_media(entry_id, file, user_id)
             return jsonify(result), 201
             
         except Exception as e:
@@ -114,6 +117,8 @@ def create_media_routes(media_service: MediaService, mood_service: MoodService):
                 user_id, limit, offset, start_date, end_date
             )
             return jsonify(result)
+        except ValueError:
+            return jsonify({"error": "Invalid date range"}), 400
         except Exception as e:
             return secure_error_response(e, 500)
 
@@ -4,8 +4,10 @@ from flask import Blueprint, request, jsonify
 
 try:
     from api.utils.auth_middleware import require_auth, get_current_user_id
+    from api.utils.responses import conditional_response
 except ImportError:
     from utils.auth_middleware import require_auth, get_current_user_id
+    from utils.responses import conditional_response
 
 
 def create_mood_definition_routes(mood_definition_service):
@@ -21,8 +23,10 @@ def create_mood_definition_routes(mood_definition_service):
     def get_mood_definitions():
         """Get all mood definitions for the current user."""
         user_id = get_current_user_id()
-        definitions = mood_definition_service.get_user_mood_definitions(user_id)
-        return jsonify(definitions)
+        return conditional_response(
+            mood_definition_service.definitions_etag(user_id),
+            lambda: jsonify(mood_definition_service.get_user_mood_definitions(user_id)),
+        )
 
     @bp.route('/mood-definitions/<int:score>', methods=['PUT'])
     @require_auth
@@ -3,6 +3,9 @@ from flask import Blueprint, request, jsonify
 import logging
 from api.services.mood_service import MoodService
 from api.utils.auth_middleware import require_auth, get_current_user_id
+from api.utils.is_truthy import is_truthy
+from api.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+from api.utils.responses import cursor_paginated_response
 from api.utils.secure_errors import secure_error_response
 from api.validators import ValidationError, MoodEntryCreate, MoodEntryUpdate
 
@@ -110,6 +113,44 @@ def create_mood_routes(mood_service: MoodService, media_service: Any = None):
             include_media = "media" in includes
             include_scales = "scales" in includes
 
+            # Keyset pagination is opt-in (?limit= / ?cursor=); without it the
+            # full history is returned as before.
+            if not (start_date and end_date) and (
+                "limit" in request.args or "cursor" in request.args
+            ):
+                limit = max(1, min(request.args.get("limit", 20, type=int) or 20, 100))
+                after, total = None, None
+                cursor = request.args.get("cursor")
+                if cursor:
+                    try:
+                        after, total = decode_cursor(cursor, "moods", (str, str, int))
+                    except InvalidCursor:
+                        return jsonify({"error": "Invalid cursor"}), 400
+                want_total = is_truthy(request.args.get("include_total"))
+
+                page = mood_service.get_entries_page(
+                    user_id,
+                    limit=limit,
+                    after=after,
+                    include_total=want_total and total is None,
+                )
+                if want_total and total is None:
+                    total = page["total"]
+                entries = mood_service.hydrate_entries(
+                    page["entries"],
+                    include_selections=include_selections,
+                    include_media=include_media,
+                    include_scales=include_scales,
+                )
+                next_cursor = (
+                    encode_cursor("moods", page["next"], total if want_total else None)
+                    if page["next"]
+                    else None
+                )
+                return cursor_paginated_response(
+                    entries, next_cursor, limit, total if want_total else None
+                )
+
             if start_date and end_date:
                 entries = mood_service.get_entries_by_date_range(
                     user_id, start_date, end_date
@@ -125,6 +166,8 @@ def create_mood_routes(mood_service: MoodService, media_service: Any = None):
                 entries = mood_service.get_all_entries(user_id)
             return jsonify(entries)
 
+        except ValueError:
+            return jsonify({"error": "Invalid date range"}), 400
         except Exception as e:
             return secure_error_response(e, 500)
 
@@ -5,11 +5,11 @@ from flask import Blueprint, request, jsonify
 try:
     from api.utils.auth_middleware import require_auth, get_current_user_id
     from api.validators import ValidationError, ScaleCreate, ScaleUpdate
-    from api.utils.responses import success_response, error_response, not_found_response
+    from api.utils.responses import success_response, error_response, not_found_response, conditional_response
 except ImportError:
     from utils.auth_middleware import require_auth, get_current_user_id
     from validators import ValidationError, ScaleCreate, ScaleUpdate
-    from utils.responses import success_response, error_response, not_found_response
+    from utils.responses import success_response, error_response, not_found_response, conditional_response
 
 
 def create_scale_routes(scale_service):
@@ -25,8 +25,10 @@ def create_scale_routes(scale_service):
     def get_scales():
         """Get all active scales for the current user."""
         user_id = get_current_user_id()
-        scales = scale_service.get_user_scales(user_id)
-        return success_response(data=scales)
+        return conditional_response(
+            scale_service.scales_etag(user_id),
+            lambda: success_response(data=scale_service.get_user_scales(user_id)),
+        )
 
     @bp.route('/scales', methods=['POST'])
     @require_auth
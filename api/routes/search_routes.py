@@ -1,10 +1,22 @@
 from flask import Blueprint, request, jsonify
 try:
     from api.utils.auth_middleware import require_auth, get_current_user_id
-    from api.utils.responses import paginated_response, success_response
+    from api.utils.is_truthy import is_truthy
+    from api.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+    from api.utils.responses import (
+        cursor_paginated_response,
+        paginated_response,
+        success_response,
+    )
 except ImportError:
     from utils.auth_middleware import require_auth, get_current_user_id
-    from utils.responses import paginated_response, success_response
+    from utils.is_truthy import is_truthy
+    from utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+    from utils.responses import (
+        cursor_paginated_response,
+        paginated_response,
+        success_response,
+    )
 
 
 def create_search_routes(mood_service):
@@ -28,6 +40,34 @@ def create_search_routes(mood_service):
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
 
+        # Keyset pagination: ?cursor= (empty for the first page) and ?limit=
+        if 'cursor' in request.args:
+            limit = request.args.get('limit', request.args.get('per_page', 20, type=int), type=int)
+            limit = max(1, min(limit or 20, 100))
+            after, total = None, None
+            cursor = request.args.get('cursor')
+            if cursor:
+                try:
+                    after, total = decode_cursor(cursor, 'search', (str, str, int))
+                except InvalidCursor:
+                    return jsonify({"error": "Invalid cursor"}), 400
+            want_total = is_truthy(request.args.get('include_total'))
+
+            result = mood_service.search_entries_page(
+                user_id, query, moods, start_date, end_date,
+                limit=limit, after=after, include_total=want_total and total is None,
+            )
+            if want_total and total is None:
+                total = result["total"]
+            next_cursor = (
+                encode_cursor('search', result["next"], total if want_total else None)
+                if result["next"]
+                else None
+            )
+            return cursor_paginated_response(
+                result["entries"], next_cursor, limit, total if want_total else None
+            )
+
         # Pagination params
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
@@ -3,6 +3,7 @@
 from flask import Blueprint, request, jsonify
 from api.utils.auth_middleware import require_auth, get_current_user_id
 from api.utils.rate_limiter import rate_limit
+from api.utils.responses import conditional_response
 
 def create_settings_routes(settings_service):
     settings_bp = Blueprint("settings", __name__)
@@ -11,12 +12,10 @@ def create_settings_routes(settings_service):
     @require_auth
     def get_settings():
         user_id = get_current_user_id()
-        settings = settings_service.get_settings(user_id)
-        # Convert to dict and sanitize
-        settings_dict = dict(settings)
-        settings_dict["has_pin"] = bool(settings_dict.get("pin_hash"))
-        settings_dict.pop("pin_hash", None)
-        return jsonify(settings_dict)
+        return conditional_response(
+            settings_service.settings_etag(user_id),
+            lambda: jsonify(settings_service.get_public_settings(user_id)),
+        )
 
     @settings_bp.route("/auth/pin", methods=["PUT"])
     @require_auth
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Award achievements to every user who already qualifies for them.
+- Run after adding a rule so existing users earn it without posting again
+- Evaluates users in id batches with grouped queries; each batch's awards
+  are one short INSERT OR IGNORE transaction, so it is safe on a live
+  database and idempotent
+- Optional --rule limits the run to specific achievement types
+- Prints users processed, awards per type and throughput in users/s
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure imports resolve when executing as a script: python api/scripts/backfill_achievements.py
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from api.database import MoodDatabase  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db-path", help="SQLite file (defaults to the app database)")
+    parser.add_argument(
+        "--rule", action="append", dest="rules", metavar="TYPE",
+        help="Achievement type to evaluate (repeatable; defaults to all)",
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Users per batch (default 500)")
+    args = parser.parse_args(argv)
+
+    db = MoodDatabase(args.db_path)
+    try:
+        result = db.backfill_achievements(args.rules, batch_size=args.batch_size)
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        db.close()
+
+    print(f"users: {result['users']} in {result['batches']} batches")
+    for achievement_type, count in sorted(result["awarded"].items()):
+        print(f"  {achievement_type}: {count}")
+    print(f"{result['seconds']:.3f}s ({result['users_per_second']:.1f} users/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
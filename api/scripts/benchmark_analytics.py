@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized analytics engine against the SQL analytics paths.
+- Seeds a synthetic user (default: 10,000 entries over 5 years, 40 options)
+  into a throwaway database, or reuses --db-path/--user-id
+- SQL: one query per endpoint (correlations, co-occurrence overall and for
+  each mood, advanced correlations all-time and last 90 days)
+- Engine: one load of the user's entries into arrays, then every result
+- Prints the median of --repeat runs for each path and the speedup, both
+  cold (load included) and warm (matrix already cached for the version)
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Ensure imports resolve when executing as a script: python api/scripts/benchmark_analytics.py
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from api.database import MoodDatabase  # noqa: E402
+from api.services import analytics_engine  # noqa: E402
+
+MOODS = (1, 2, 3, 4, 5)
+
+
+def seed_user(db: MoodDatabase, entries: int, years: int, options: int, seed: int = 7) -> int:
+    """Insert a user with ``entries`` entries spread over ``years`` years."""
+    rng = random.Random(seed)
+    user_id = db.create_user("bench", "bench@example.com", "Benchmark")
+    option_ids = []
+    for g in range(max(1, options // 8)):
+        group_id = db.create_group_for_user(user_id, f"Group {g}")
+        for o in range(8):
+            if len(option_ids) < options:
+                option_ids.append(db.create_group_option(group_id, f"Option {g}.{o}"))
+    # Skewed popularity so some pairs are frequent and lift varies.
+    weights = [1.0 / (rank + 1) for rank in range(len(option_ids))]
+
+    start = date.today() - timedelta(days=365 * years)
+    span = 365 * years
+
+    def write(conn):
+        for _ in range(entries):
+            day = (start + timedelta(days=rng.randrange(span))).isoformat()
+            mood = rng.choices(MOODS, weights=(1, 2, 4, 5, 3))[0]
+            cursor = conn.execute(
+                "INSERT INTO mood_entries (user_id, date, mood, content) VALUES (?, ?, ?, '')",
+                (user_id, day, mood),
+            )
+            picked = set(rng.choices(option_ids, weights=weights, k=rng.randrange(0, 7)))
+            conn.executemany(
+                "INSERT INTO entry_selections (entry_id, option_id) VALUES (?, ?)",
+                [(cursor.lastrowid, option_id) for option_id in picked],
+            )
+
+    db._run_write(write)
+    return user_id
+
+
+def run_sql(db: MoodDatabase, user_id: int) -> None:
+    db.get_mood_statistics(user_id)
+    db.get_activity_correlations(user_id)
+    db.get_tag_co_occurrence(user_id, limit=20)
+    for mood in MOODS:
+        db.get_tag_co_occurrence_by_mood(user_id, mood, limit=20)
+    db.get_advanced_correlations(user_id, limit=50)
+    db.get_advanced_correlations(user_id, days=90, limit=50)
+
+
+def run_engine(db: MoodDatabase, user_id: int, matrix=None) -> None:
+    if matrix is None:
+        with db._read_conn() as conn:
+            matrix = analytics_engine.EntryMatrix.load(conn, user_id)
+    matrix.activity_impact()
+    matrix.co_occurrence(limit=20)
+    matrix.co_occurrence_by_mood(limit=20)
+    matrix.association_rules(limit=50)
+    matrix.association_rules(days=90, limit=50)
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db-path", help="Benchmark an existing database instead of seeding one")
+    parser.add_argument("--user-id", type=int, help="User to benchmark (with --db-path)")
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--options", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    if not analytics_engine.available():
+        print("numpy is not installed; nothing to compare", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = MoodDatabase(args.db_path or str(Path(tmp) / "bench.db"))
+        try:
+            if args.db_path:
+                if args.user_id is None:
+                    parser.error("--user-id is required with --db-path")
+                user_id = args.user_id
+            else:
+                started = time.perf_counter()
+                user_id = seed_user(db, args.entries, args.years, args.options)
+                print(f"seeded {args.entries} entries in {time.perf_counter() - started:.1f}s")
+
+            run_sql(db, user_id)  # warm the page cache for both paths
+            with db._read_conn() as conn:
+                matrix = analytics_engine.EntryMatrix.load(conn, user_id)
+            sql_ms = _median_ms(lambda: run_sql(db, user_id), args.repeat)
+            engine_ms = _median_ms(lambda: run_engine(db, user_id), args.repeat)
+            warm_ms = _median_ms(lambda: run_engine(db, user_id, matrix), args.repeat)
+            print(
+                f"user {user_id}: {matrix.entry_count} entries, {len(matrix.indices)} selections, "
+                f"{len(matrix.option_ids)} options, {matrix.nbytes / 1024:.0f} KiB in arrays"
+            )
+            print(f"sql paths:      {sql_ms:8.1f} ms")
+            print(f"engine (cold):  {engine_ms:8.1f} ms  speedup {sql_ms / engine_ms:.2f}x")
+            print(f"engine (warm):  {warm_ms:8.1f} ms  speedup {sql_ms / warm_ms:.2f}x")
+        finally:
+            db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
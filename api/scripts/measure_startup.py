@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Measure application cold start: wall time and peak RSS of create_app().
+- Each run is a fresh interpreter, so imports are not shared between runs
+- "lazy" is the app as shipped: heavy services load on first request
+- "eager" builds every registered service right after create_app(), which
+  is what startup cost before services were registered lazily
+- Prints the median of --repeat runs per mode and which heavy modules
+  (numpy, weasyprint, matplotlib, PIL, ...) ended up imported
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure imports resolve when executing as a script: python api/scripts/measure_startup.py
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+HEAVY_MODULES = ("numpy", "weasyprint", "matplotlib", "PIL", "pywebpush", "apscheduler")
+
+_CHILD = """
+import json, os, resource, sys, time
+os.environ["DATABASE_PATH"] = sys.argv[2]
+started = time.perf_counter()
+from api.app import create_app
+app = create_app("development")
+failed = []
+if sys.argv[1] == "eager":
+    services = app.extensions["services"]
+    for name in services.names():
+        try:
+            services.get(name)
+        except Exception as exc:
+            failed.append(f"{name}: {exc.__class__.__name__}")
+elapsed = (time.perf_counter() - started) * 1000
+rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "ms": elapsed,
+    "rss_kib": rss_kib,
+    "heavy": [m for m in %r if m in sys.modules],
+    "failed": failed,
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure(mode: str, db_path: str) -> dict:
+    """Run one cold start in a child interpreter and return its report."""
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD, mode, db_path],
+        cwd=str(ROOT_DIR),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--mode", choices=("lazy", "eager", "both"), default="both",
+        help="Startup variant to measure (default: both, for comparison)",
+    )
+    args = parser.parse_args(argv)
+
+    modes = ("lazy", "eager") if args.mode == "both" else (args.mode,)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "startup.db")
+        measure("lazy", db_path)  # create the schema outside the timed runs
+        for mode in modes:
+            runs = [measure(mode, db_path) for _ in range(args.repeat)]
+            ms = statistics.median(run["ms"] for run in runs)
+            rss = statistics.median(run["rss_kib"] for run in runs) / 1024
+            results[mode] = (ms, rss)
+            heavy = ", ".join(runs[-1]["heavy"]) or "-"
+            print(f"{mode:5}  {ms:8.1f} ms  {rss:7.1f} MiB peak RSS  heavy modules: {heavy}")
+            for failure in runs[-1]["failed"]:
+                print(f"       not loaded: {failure}")
+    if len(results) == 2:
+        (lazy_ms, lazy_rss), (eager_ms, eager_rss) = results["lazy"], results["eager"]
+        print(f"lazy saves {eager_ms - lazy_ms:.1f} ms and {eager_rss - lazy_rss:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
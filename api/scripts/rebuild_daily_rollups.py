@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Rebuild the daily_mood_rollup and option usage tables from the raw entries.
+- Rollups are kept exact by triggers; run this after bulk edits made with
+  triggers disabled, or to verify/repair a database restored from backup
+- Optional --user-id limits the rebuild to one user
+- Idempotent: prints the number of daily and option usage rows written
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure imports resolve when executing as a script: python api/scripts/rebuild_daily_rollups.py
+API_DIR = Path(__file__).resolve().parent.parent
+if str(API_DIR) not in sys.path:
+    sys.path.insert(0, str(API_DIR))
+
+from database import MoodDatabase  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db-path", help="SQLite file (defaults to the app database)")
+    parser.add_argument("--user-id", type=int, help="Only rebuild this user's rollups")
+    args = parser.parse_args(argv)
+
+    db = MoodDatabase(args.db_path)
+    try:
+        print(f"daily_mood_rollup: {db.rebuild_daily_rollups(args.user_id)}")
+        print(f"option_usage: {db.rebuild_option_usage(args.user_id)}")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
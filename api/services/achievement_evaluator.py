@@ -0,0 +1,66 @@
+"""Achievement checks run after the write, on a small worker pool.
+
+A write commits first; its event (``entry``, ``media``, ``goal``,
+``stats_view``) is then handed to :meth:`MoodDatabase.check_achievements`
+on a background thread, which loads only the counters that event can move.
+``evaluate`` waits a bounded time so the response can still carry new
+badges.  Awards are stored unannounced (``achievements.announced = 0``), so
+anything that finishes later, or comes from a fire-and-forget ``notify``,
+is returned with that user's next evaluation in whichever worker serves it.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import List, Optional
+
+from api.database import MoodDatabase
+
+logger = logging.getLogger(__name__)
+
+
+class AchievementEvaluator:
+    """Event-driven achievement evaluation off the request thread."""
+
+    def __init__(self, db: MoodDatabase, max_workers: int = 2, wait_seconds: float = 0.5):
+        self.db = db
+        self.wait_seconds = wait_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="achievements")
+
+    def submit(self, user_id: int, event: Optional[str]) -> Future:
+        """Queue an evaluation; the future resolves to the newly earned types."""
+        return self._executor.submit(self._check, user_id, event)
+
+    def notify(self, user_id: int, event: Optional[str]) -> None:
+        """Evaluate without waiting; results are returned by the next ``evaluate``."""
+        self.submit(user_id, event)
+
+    def evaluate(self, user_id: int, event: Optional[str]) -> List[str]:
+        """Evaluate ``event`` and return new achievements, waiting at most ``wait_seconds``.
+
+        Includes awards still unannounced from earlier evaluations of this
+        user, whichever process made them.
+        """
+        future = self.submit(user_id, event)
+        try:
+            future.result(timeout=self.wait_seconds)
+        except FutureTimeout:
+            logger.info("Achievement check for user %s still running; deferring results", user_id)
+        try:
+            return self.db.take_unannounced_achievements(user_id)
+        except Exception as exc:
+            logger.warning("Could not collect achievements for user %s: %s", user_id, exc)
+            return []
+
+    def close(self) -> None:
+        """Finish queued evaluations and stop the workers."""
+        self._executor.shutdown(wait=True)
+
+    def _check(self, user_id: int, event: Optional[str]) -> List[str]:
+        try:
+            return self.db.check_achievements(user_id, event, hold=True)
+        except Exception as exc:
+            logger.warning("Achievement check failed for user %s (%s): %s", user_id, event, exc)
+            return []
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from api.database import MoodDatabase
+from api.services.achievement_evaluator import AchievementEvaluator
 
 
 class AchievementService:
-    def __init__(self, db: MoodDatabase):
+    def __init__(self, db: MoodDatabase, evaluator: Optional[AchievementEvaluator] = None):
         self.db = db
+        self.evaluator = evaluator
 
         # Backend source of truth for achievement definitions.
         # Frontend should consume this contract directly.
@@ -203,8 +205,14 @@ class AchievementService:
         return achievements
 
     def check_and_award_achievements(self, user_id: int) -> List[Dict]:
-        """Check for new achievements and return them with metadata."""
-        new_achievement_types = self.db.check_achievements(user_id)
+        """Check for new achievements and return them with metadata.
+
+        Includes any the evaluator earned in the background since the last check.
+        """
+        if self.evaluator is not None:
+            new_achievement_types = self.evaluator.evaluate(user_id, None)
+        else:
+            new_achievement_types = self.db.check_achievements(user_id)
 
         new_achievements = []
         for achievement_type in new_achievement_types:
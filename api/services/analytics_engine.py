@@ -0,0 +1,527 @@
+"""Vectorized in-memory analytics over one user's entries.
+
+``EntryMatrix.load`` reads a user's entries and selections once and keeps
+them as NumPy arrays: per-entry moods and day numbers, plus a CSR
+entry x option matrix (``indptr``/``indices``, SciPy layout without the
+SciPy dependency).  Activity impact, co-occurrence (overall and per mood),
+support/confidence/lift and confidence intervals are then computed from
+those arrays without further queries.  Pair counts come from the Gram
+matrix ``X.T @ X``, accumulated one dense row block at a time so memory
+stays bounded by ``_BLOCK_ROWS x options``; the blocks are kept only when
+the whole dense matrix fits in ``_DENSE_CACHE_BYTES``.
+
+NumPy is optional: ``available()`` reports whether it can be imported and
+callers fall back to the SQL paths when it cannot.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with matplotlib
+    np = None  # type: ignore[assignment]
+
+_BLOCK_ROWS = 4096
+_DENSE_CACHE_BYTES = 8 * 1024 * 1024
+_MIN_PAIR_COUNT = 3  # Same support floor as the SQL paths
+_MIN_ACTIVITY_COUNT = 3
+_Z_95 = 1.959964
+_EPOCH = date(1970, 1, 1)
+_NO_DAY = -(2**63)  # Day number of an unparseable date: before any cutoff
+
+
+def available() -> bool:
+    return np is not None
+
+
+def _parse_ints(text: Optional[str]) -> "np.ndarray":
+    if not text:
+        return np.zeros(0, dtype=np.int64)
+    return np.fromstring(text, dtype=np.int64, sep=",")
+
+
+class EntryMatrix:
+    """One user's entries as arrays; build with :meth:`load`."""
+
+    def __init__(
+        self,
+        moods: "np.ndarray",
+        days: "np.ndarray",
+        indptr: "np.ndarray",
+        indices: "np.ndarray",
+        option_ids: "np.ndarray",
+        options: Dict[int, Dict],
+    ) -> None:
+        self.moods = moods
+        self.days = days
+        self.indptr = indptr
+        self.indices = indices
+        self.option_ids = option_ids
+        self.options = options
+        # Row of every stored selection, aligned with ``indices``.
+        self.rows = np.repeat(np.arange(len(moods), dtype=np.int64), np.diff(indptr))
+        self._blocks: Optional[List["np.ndarray"]] = None  # Built on first pair count
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection, user_id: int) -> "EntryMatrix":
+        """Read the user's entries, selections and options on ``conn``."""
+        # One aggregate row per query: group_concat hands back the columns as
+        # comma-separated text that NumPy parses without per-row Python objects.
+        ids, moods, dates = conn.execute(
+            """
+            SELECT group_concat(id), group_concat(mood), group_concat(IFNULL(day, ?))
+              FROM mood_entries WHERE user_id = ?
+            """,
+            (_NO_DAY, user_id),
+        ).fetchone()
+        sel_entries, sel_options = conn.execute(
+            """
+            SELECT group_concat(es.entry_id), group_concat(es.option_id)
+              FROM entry_selections es
+              JOIN mood_entries me ON me.id = es.entry_id
+             WHERE me.user_id = ?
+            """,
+            (user_id,),
+        ).fetchone()
+
+        entry_ids = _parse_ints(ids)
+        order = np.argsort(entry_ids, kind="stable")
+        entry_ids = entry_ids[order]
+        moods = _parse_ints(moods)[order]
+        days = _parse_ints(dates)[order]
+
+        rows = np.searchsorted(entry_ids, _parse_ints(sel_entries))
+        option_ids, columns = np.unique(_parse_ints(sel_options), return_inverse=True)
+
+        options: Dict[int, Dict] = {}
+        if len(option_ids):
+            ids = option_ids.tolist()
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                for row in conn.execute(
+                    f"SELECT id, name, icon FROM group_options WHERE id IN ({placeholders})",
+                    chunk,
+                ):
+                    options[row[0]] = {"name": row[1], "icon": row[2]}
+
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(len(entry_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(entry_ids)), out=indptr[1:])
+        return cls(moods, days, indptr, columns[order].astype(np.int64), option_ids, options)
+
+    @property
+    def nbytes(self) -> int:
+        """Array memory, used by the result cache to bound its size.
+
+        Includes the dense blocks the matrix will keep once built, so the
+        size does not change after the matrix is cached.
+        """
+        arrays = [self.moods, self.days, self.indptr, self.indices, self.option_ids, self.rows]
+        dense = self._dense_bytes()
+        return sum(a.nbytes for a in arrays) + 64 * len(self.options) + (
+            dense if dense <= _DENSE_CACHE_BYTES else 0
+        )
+
+    @property
+    def entry_count(self) -> int:
+        return len(self.moods)
+
+    # -- masks and counts -------------------------------------------------
+
+    def _row_mask(self, mood: Optional[int] = None, days: Optional[int] = None) -> Optional["np.ndarray"]:
+        mask = None
+        if mood is not None:
+            mask = self.moods == mood
+        if days is not None:
+            cutoff = (date.today() - timedelta(days=days) - _EPOCH).days
+            recent = self.days >= cutoff
+            mask = recent if mask is None else mask & recent
+        return mask
+
+    def tag_counts(self, mask: Optional["np.ndarray"] = None) -> "np.ndarray":
+        if mask is None:
+            return np.bincount(self.indices, minlength=len(self.option_ids))
+        return np.bincount(self.indices[mask[self.rows]], minlength=len(self.option_ids))
+
+    def _dense_bytes(self) -> int:
+        return self.entry_count * len(self.option_ids) * 4
+
+    def _dense_blocks(self) -> Iterator[Tuple[int, "np.ndarray"]]:
+        """``(first row, block)`` pairs of ``X`` as dense float32 row blocks.
+
+        Yields one block at a time (counts per block stay exact).  The
+        blocks are kept on the matrix only when all of them fit in
+        ``_DENSE_CACHE_BYTES``; larger matrices never hold more than one.
+        """
+        if self._blocks is not None:
+            yield from zip(range(0, self.entry_count, _BLOCK_ROWS), self._blocks)
+            return
+        m = len(self.option_ids)
+        keep: Optional[List["np.ndarray"]] = [] if self._dense_bytes() <= _DENSE_CACHE_BYTES else None
+        bounds = np.searchsorted(self.rows, np.arange(0, self.entry_count + _BLOCK_ROWS, _BLOCK_ROWS))
+        for block, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+            start = block * _BLOCK_ROWS
+            height = min(_BLOCK_ROWS, self.entry_count - start)
+            if height <= 0:
+                break
+            cells = (self.rows[lo:hi] - start) * m + self.indices[lo:hi]
+            dense = np.bincount(cells, minlength=height * m).reshape(height, m).astype(np.float32)
+            if keep is not None:
+                keep.append(dense)
+            yield start, dense
+        if keep is not None:
+            self._blocks = keep
+
+    def pair_counts(self, mask: Optional["np.ndarray"] = None) -> "np.ndarray":
+        """Options x options co-occurrence counts (``X.T @ X``) over masked rows."""
+        return self.pair_counts_many([mask])[0]
+
+    def pair_counts_many(self, masks: Sequence[Optional["np.ndarray"]]) -> List["np.ndarray"]:
+        """:meth:`pair_counts` for several masks from one pass over the blocks."""
+        m = len(self.option_ids)
+        grams = [np.zeros((m, m), dtype=np.int64) for _ in masks]
+        if not m:
+            return grams
+        for start, dense in self._dense_blocks():
+            for gram, mask in zip(grams, masks):
+                rows = dense if mask is None else dense[mask[start:start + len(dense)]]
+                gram += np.rint(rows.T @ rows).astype(np.int64)
+        return grams
+
+    # -- analytics --------------------------------------------------------
+
+    def activity_impact(self, min_count: int = _MIN_ACTIVITY_COUNT, z: float = _Z_95) -> Dict:
+        """Average mood per option, its impact versus the overall average and a CI.
+
+        ``confidence_interval`` is the normal-approximation interval for the
+        option's mean mood using the sample standard deviation.
+        """
+        if not self.entry_count:
+            return {"overall_average": 0, "activities": []}
+        overall = round(float(self.moods.mean()), 2)
+        selected = self.moods[self.rows].astype(np.float64)
+        counts = self.tag_counts()
+        sums = np.bincount(self.indices, weights=selected, minlength=len(self.option_ids))
+        squares = np.bincount(self.indices, weights=selected ** 2, minlength=len(self.option_ids))
+
+        safe = np.maximum(counts, 1)
+        means = sums / safe
+        variance = np.maximum(squares - counts * means ** 2, 0) / np.maximum(counts - 1, 1)
+        margins = z * np.sqrt(variance / safe)
+
+        activities = []
+        for col in np.flatnonzero(counts >= min_count):
+            option_id = int(self.option_ids[col])
+            meta = self.options.get(option_id)
+            if meta is None:
+                continue
+            activities.append({
+                "id": option_id,
+                "name": meta["name"],
+                "icon": meta["icon"],
+                "count": int(counts[col]),
+                "average_mood": round(float(means[col]), 2),
+                "impact_score": round(float(means[col]) - overall, 2),
+                "confidence_interval": [
+                    round(float(means[col] - margins[col]), 2),
+                    round(float(means[col] + margins[col]), 2),
+                ],
+            })
+        activities.sort(key=lambda a: a["impact_score"], reverse=True)
+        return {"overall_average": overall, "activities": activities}
+
+    def _pairs(self, gram: "np.ndarray", min_count: int):
+        """Upper-triangle (i, j, count) for pairs with at least ``min_count``."""
+        first, second = np.triu_indices(len(self.option_ids), k=1)
+        counts = gram[first, second]
+        keep = counts >= max(min_count, 1)
+        return first[keep], second[keep], counts[keep]
+
+    def _pair_row(self, i: int, j: int) -> Optional[Dict]:
+        id1, id2 = int(self.option_ids[i]), int(self.option_ids[j])
+        meta1, meta2 = self.options.get(id1), self.options.get(id2)
+        if meta1 is None or meta2 is None:
+            return None
+        return {
+            "option1_id": id1,
+            "option1_name": meta1["name"],
+            "option1_icon": meta1["icon"],
+            "option2_id": id2,
+            "option2_name": meta2["name"],
+            "option2_icon": meta2["icon"],
+        }
+
+    def co_occurrence(self, mood: Optional[int] = None, limit: int = 10) -> List[Dict]:
+        """Most frequent option pairs, optionally only in entries with ``mood``."""
+        return self._top_pairs(self.pair_counts(self._row_mask(mood)), limit)
+
+    def _top_pairs(self, gram: "np.ndarray", limit: int) -> List[Dict]:
+        first, second, counts = self._pairs(gram, 1)
+        # Most frequent first; ties broken by option id for a stable order.
+        order = np.lexsort((self.option_ids[second], self.option_ids[first], -counts))
+        results = []
+        for k in order:
+            row = self._pair_row(first[k], second[k])
+            if row is None:
+                continue
+            row["frequency"] = int(counts[k])
+            results.append(row)
+            if len(results) >= limit:
+                break
+        return results
+
+    def co_occurrence_by_mood(self, limit: int = 10) -> Dict[int, List[Dict]]:
+        """Top pairs for every mood present, from one pass over the matrix."""
+        moods = [int(mood) for mood in np.unique(self.moods)]
+        grams = self.pair_counts_many([self._row_mask(mood) for mood in moods])
+        return {mood: self._top_pairs(gram, limit) for mood, gram in zip(moods, grams)}
+
+    def association_rules(
+        self, days: Optional[int] = None, limit: int = 50, min_count: int = _MIN_PAIR_COUNT
+    ) -> List[Dict]:
+        """Support, confidence and lift for pairs seen at least ``min_count`` times."""
+        mask = self._row_mask(days=days)
+        # Entries without a parseable date have no rollup row, so the SQL
+        # path's total leaves them out; count the same denominator here.
+        total = int((self.days != _NO_DAY).sum() if mask is None else mask.sum())
+        if not total:
+            return []
+        tags = self.tag_counts(mask).astype(np.float64)
+        first, second, counts = self._pairs(self.pair_counts(mask), min_count)
+        if not len(counts):
+            return []
+
+        frequency = counts.astype(np.float64)
+        confidence_12 = frequency / tags[first]
+        confidence_21 = frequency / tags[second]
+        lift = frequency * total / (tags[first] * tags[second])
+        support = frequency / total
+
+        results = []
+        for k in np.argsort(-lift, kind="stable"):
+            row = self._pair_row(first[k], second[k])
+            if row is None:
+                continue
+            row.update({
+                "frequency": int(counts[k]),
+                "confidence_1_to_2": float(confidence_12[k]),
+                "confidence_2_to_1": float(confidence_21[k]),
+                "lift": float(lift[k]),
+                "support": float(support[k]),
+            })
+            results.append(row)
+            if len(results) >= limit:
+                break
+        return results
+
+
+# -- daily series and correlations -----------------------------------------
+
+
+def load_daily_frame(conn: sqlite3.Connection, user_id: int, top_tags: int = 10) -> Dict:
+    """Per-day series for mood, every active scale and the ``top_tags`` most used options.
+
+    Aggregation happens in SQL: mood is the day's mean from
+    ``daily_mood_rollup``, a scale is the mean of that day's values and a
+    tag is the share of that day's entries that selected it.  There is one
+    row per day with entries (``days`` holds their ascending day numbers,
+    so a stray far-off date costs one row rather than a span of empty
+    ones); a day without a scale value is NaN for that scale.
+    """
+    rollups = conn.execute(
+        "SELECT day, entry_count, mood_sum FROM daily_mood_rollup WHERE user_id = ? ORDER BY day",
+        (user_id,),
+    ).fetchall()
+    scales = conn.execute(
+        "SELECT id, name, color_hex FROM scale_definitions WHERE user_id = ? AND is_active = 1 ORDER BY id",
+        (user_id,),
+    ).fetchall()
+    tags = conn.execute(
+        """
+        SELECT go.id, go.name, go.icon, SUM(ou.entry_count) as uses
+          FROM option_usage ou
+          JOIN group_options go ON go.id = ou.option_id
+         WHERE ou.user_id = ?
+         GROUP BY go.id
+         ORDER BY uses DESC, go.id
+         LIMIT ?
+        """,
+        (user_id, top_tags),
+    ).fetchall()
+
+    variables = [{"key": "mood", "type": "mood", "label": "Mood"}]
+    variables += [
+        {"key": f"scale:{row[0]}", "type": "scale", "id": row[0], "label": row[1], "color_hex": row[2]}
+        for row in scales
+    ]
+    variables += [
+        {"key": f"tag:{row[0]}", "type": "tag", "id": row[0], "label": row[1], "icon": row[2]}
+        for row in tags
+    ]
+
+    if not rollups:
+        return {
+            "variables": variables,
+            "first_day": None,
+            "days": np.zeros(0, dtype=np.int64),
+            "values": np.full((0, len(variables)), np.nan),
+        }
+    rollup = np.array([tuple(row) for row in rollups], dtype=np.int64)
+    days = rollup[:, 0]
+    first, last = int(days[0]), int(days[-1])
+    values = np.full((len(days), len(variables)), np.nan)
+
+    counts, sums = rollup[:, 1], rollup[:, 2]
+    has_entries = counts > 0
+    values[has_entries, 0] = sums[has_entries] / counts[has_entries]
+
+    def fill(rows, column_of, reduce_by_entries: bool) -> None:
+        if not rows:
+            return
+        slot = np.searchsorted(days, np.array([row[0] for row in rows], dtype=np.int64))
+        cols = np.array([column_of[row[1]] for row in rows], dtype=np.int64)
+        totals = np.array([row[2] for row in rows], dtype=np.float64)
+        weights = np.array([row[3] for row in rows], dtype=np.float64)
+        flat = slot * len(variables) + cols
+        num = np.bincount(flat, weights=totals, minlength=values.size).reshape(values.shape)
+        den = np.bincount(flat, weights=weights, minlength=values.size).reshape(values.shape)
+        if reduce_by_entries:
+            # Tag share: selections / entries that day; 0 on days with entries but no selection.
+            touched = np.unique(cols)
+            block = num[:, touched] / np.where(has_entries, counts, 1)[:, None]
+            values[:, touched] = np.where(has_entries[:, None], block, np.nan)
+        else:
+            seen = den > 0
+            values[seen] = num[seen] / den[seen]
+
+    if scales:
+        column_of = {row[0]: i + 1 for i, row in enumerate(scales)}
+        placeholders = ",".join("?" for _ in column_of)
+        fill(
+            conn.execute(
+                f"""
+                SELECT me.day, se.scale_id, SUM(se.value), COUNT(*)
+                  FROM scale_entries se
+                  JOIN mood_entries me ON me.id = se.entry_id
+                 WHERE me.user_id = ? AND me.day BETWEEN ? AND ? AND se.scale_id IN ({placeholders})
+                 GROUP BY me.day, se.scale_id
+                """,
+                [user_id, first, last, *column_of],
+            ).fetchall(),
+            column_of,
+            reduce_by_entries=False,
+        )
+    if tags:
+        offset = 1 + len(scales)
+        column_of = {row[0]: offset + i for i, row in enumerate(tags)}
+        placeholders = ",".join("?" for _ in column_of)
+        fill(
+            conn.execute(
+                f"""
+                SELECT me.day, es.option_id, COUNT(*), COUNT(*)
+                  FROM entry_selections es
+                  JOIN mood_entries me ON me.id = es.entry_id
+                 WHERE me.user_id = ? AND me.day BETWEEN ? AND ? AND es.option_id IN ({placeholders})
+                 GROUP BY me.day, es.option_id
+                """,
+                [user_id, first, last, *column_of],
+            ).fetchall(),
+            column_of,
+            reduce_by_entries=True,
+        )
+        # Tags never selected stay 0 on days with entries.
+        untouched = values[:, offset:]
+        untouched[has_entries[:, None] & np.isnan(untouched)] = 0.0
+
+    return {"variables": variables, "first_day": first, "days": days, "values": values}
+
+
+def _ranks(values: "np.ndarray") -> "np.ndarray":
+    """Column-wise average ranks of the non-NaN values (NaN stays NaN)."""
+    ranked = np.full(values.shape, np.nan)
+    for col in range(values.shape[1]):
+        present = ~np.isnan(values[:, col])
+        if not present.any():
+            continue
+        _, inverse, counts = np.unique(values[present, col], return_inverse=True, return_counts=True)
+        starts = np.cumsum(counts) - counts
+        ranked[present, col] = (starts + (counts + 1) / 2.0)[inverse]
+    return ranked
+
+
+def pairwise_correlations(a: "np.ndarray", b: "np.ndarray", min_count: int = 3):
+    """Pearson r between every column of ``a`` and of ``b`` over rows where both are present.
+
+    All pairs are computed together from masked matrix products; returns
+    ``(r, n)`` with NaN where fewer than ``min_count`` rows overlap or a
+    column is constant on the overlap.
+    """
+    ma, mb = ~np.isnan(a), ~np.isnan(b)
+    xa, xb = np.where(ma, a, 0.0), np.where(mb, b, 0.0)
+    fa, fb = ma.astype(np.float64), mb.astype(np.float64)
+
+    n = fa.T @ fb
+    sum_a = xa.T @ fb
+    sum_b = fa.T @ xb
+    cross = xa.T @ xb
+    sq_a = (xa * xa).T @ fb
+    sq_b = fa.T @ (xb * xb)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = cross - sum_a * sum_b / n
+        var_a = sq_a - sum_a * sum_a / n
+        var_b = sq_b - sum_b * sum_b / n
+        r = cov / np.sqrt(var_a * var_b)
+    degenerate = (n < min_count) | (var_a <= 1e-12 * np.maximum(n, 1)) | (var_b <= 1e-12 * np.maximum(n, 1))
+    r[degenerate] = np.nan
+    return np.clip(r, -1.0, 1.0), n.astype(np.int64)
+
+
+def correlation_matrix(frame: Dict, lag: int = 1) -> Dict:
+    """Pearson and Spearman matrices for a daily frame, same-day and ``lag`` days ahead.
+
+    Spearman ranks each series once over its own observed days and then
+    takes pairwise-complete Pearson of the ranks.  That matches re-ranking
+    every pair on its overlap whenever both series cover the same days
+    (mood and tags always do) and is a close approximation otherwise.
+    In the lagged matrices rows are day ``t`` and columns day ``t + lag``;
+    only days whose ``t + lag`` also has entries form pairs.
+    """
+    values, days = frame["values"], frame["days"]
+    ranks = _ranks(values)
+
+    def as_lists(matrix):
+        return [[None if np.isnan(v) else round(float(v), 4) for v in row] for row in matrix]
+
+    pearson, n = pairwise_correlations(values, values)
+    spearman, _ = pairwise_correlations(ranks, ranks)
+    result = {
+        "variables": frame["variables"],
+        "days": int(days[-1] - days[0] + 1) if len(days) else 0,
+        "pearson": as_lists(pearson),
+        "spearman": as_lists(spearman),
+        "n": n.tolist(),
+    }
+    ahead = np.searchsorted(days, days + lag)
+    paired = ahead < len(days)
+    paired[paired] = days[ahead[paired]] == days[paired] + lag
+    if paired.any():
+        now, later = np.flatnonzero(paired), ahead[paired]
+        lag_pearson, lag_n = pairwise_correlations(values[now], values[later])
+        lag_spearman, _ = pairwise_correlations(ranks[now], ranks[later])
+        result["lagged"] = {
+            "lag_days": lag,
+            "pearson": as_lists(lag_pearson),
+            "spearman": as_lists(lag_spearman),
+            "n": lag_n.tolist(),
+        }
+    else:
+        size = len(frame["variables"])
+        empty = [[None] * size for _ in range(size)]
+        result["lagged"] = {"lag_days": lag, "pearson": empty, "spearman": empty, "n": [[0] * size] * size}
+    return result
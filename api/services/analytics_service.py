@@ -1,15 +1,53 @@
-from typing import Dict, List
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
 from api.database import MoodDatabase
 from api.constants import AnalyticsLimits, Defaults
+from api.services import analytics_engine
+from api.services.itemset_miner import mood_itemsets
+from api.utils.result_cache import VersionedLRUCache
 
 class AnalyticsService:
-    def __init__(self, db: MoodDatabase):
+    def __init__(
+        self,
+        db: MoodDatabase,
+        cache_entries: int = 256,
+        cache_max_bytes: int = 32 * 1024 * 1024,
+        vectorized: bool = True,
+    ):
         self.db = db
+        # Results are keyed on the user's data version, which triggers bump
+        # on every entry/selection/scale/group write, so hits are never stale.
+        self.cache = VersionedLRUCache(cache_entries, cache_max_bytes)
+        # With NumPy available, tag analytics share one in-memory matrix per
+        # user and data version instead of issuing a query per endpoint.
+        self.vectorized = vectorized and analytics_engine.available()
+
+    def _cached(self, user_id: int, endpoint: str, params: Hashable, compute: Callable[[], Any]) -> Any:
+        version = self.db.get_data_version(user_id)
+        return self.cache.get_or_compute((user_id, endpoint, params), version, compute)
+
+    def cache_stats(self) -> Dict:
+        return self.cache.stats()
+
+    def _matrix(self, user_id: int) -> "analytics_engine.EntryMatrix":
+        def load():
+            with self.db._read_conn() as conn:
+                return analytics_engine.EntryMatrix.load(conn, user_id)
+
+        return self._cached(user_id, "matrix", (), load)
 
     def get_activity_correlations(self, user_id: int) -> Dict:
         """
         Get activities sorted by their impact on mood.
         """
+        return self._cached(
+            user_id, "correlations", (), lambda: self._compute_activity_correlations(user_id)
+        )
+
+    def _compute_activity_correlations(self, user_id: int) -> Dict:
+        if self.vectorized:
+            return self._matrix(user_id).activity_impact()
+
         # 1. Get overall user stats for baseline
         # mood_service usually calls get_mood_statistics, but logic might be in DB.
         # Let's assume MoodEntriesMixin has get_mood_statistics.
@@ -47,23 +85,144 @@ class AnalyticsService:
 
     def get_tag_co_occurrence(self, user_id: int) -> List[Dict]:
         """Get frequently paired tags."""
-        return self.db.get_tag_co_occurrence(user_id, limit=AnalyticsLimits.TAG_CO_OCCURRENCE)
+        return self._cached(
+            user_id,
+            "co_occurrence",
+            (),
+            lambda: (
+                self._matrix(user_id).co_occurrence(limit=AnalyticsLimits.TAG_CO_OCCURRENCE)
+                if self.vectorized
+                else self.db.get_tag_co_occurrence(user_id, limit=AnalyticsLimits.TAG_CO_OCCURRENCE)
+            ),
+        )
 
     def get_tag_co_occurrence_by_mood(self, user_id: int, mood: int) -> List[Dict]:
         """Get frequently paired tags filtered by mood."""
-        return self.db.get_tag_co_occurrence_by_mood(user_id, mood, limit=AnalyticsLimits.TAG_CO_OCCURRENCE)
+        return self._cached(
+            user_id,
+            "co_occurrence_by_mood",
+            (mood,),
+            lambda: (
+                self._matrix(user_id).co_occurrence(mood, limit=AnalyticsLimits.TAG_CO_OCCURRENCE)
+                if self.vectorized
+                else self.db.get_tag_co_occurrence_by_mood(
+                    user_id, mood, limit=AnalyticsLimits.TAG_CO_OCCURRENCE
+                )
+            ),
+        )
 
     def get_advanced_correlations(self, user_id: int) -> List[Dict]:
-        """Get Apriori analysis for tag pairs."""
-        return self.db.get_advanced_correlations(user_id, limit=AnalyticsLimits.ADVANCED_CORRELATIONS)
+        """Get all-time Apriori analysis for tag pairs."""
+        return self._cached(
+            user_id,
+            "advanced_correlations",
+            (),
+            lambda: (
+                self._matrix(user_id).association_rules(limit=AnalyticsLimits.ADVANCED_CORRELATIONS)
+                if self.vectorized
+                else self.db.get_advanced_correlations(
+                    user_id, limit=AnalyticsLimits.ADVANCED_CORRELATIONS
+                )
+            ),
+        )
+
+    def get_itemsets(
+        self,
+        user_id: int,
+        min_support: float = Defaults.ITEMSET_MIN_SUPPORT,
+        max_size: int = Defaults.ITEMSET_MAX_SIZE,
+    ) -> Dict:
+        """3+ tag combinations associated with notably high or low moods."""
+        def compute() -> Dict:
+            with self.db._read_conn() as conn:
+                return mood_itemsets(
+                    conn,
+                    user_id,
+                    min_support,
+                    max_size,
+                    limit=AnalyticsLimits.ITEMSETS,
+                    time_budget=AnalyticsLimits.ITEMSET_TIME_BUDGET_SECONDS,
+                    max_nodes=AnalyticsLimits.ITEMSET_MAX_NODES,
+                    max_bytes=AnalyticsLimits.ITEMSET_MAX_BYTES,
+                )
+
+        return self._cached(user_id, "itemsets", (min_support, max_size), compute)
 
-    def get_mood_stability(self, user_id: int, days: int = Defaults.MOOD_STABILITY_DAYS) -> Dict:
+    def get_scale_correlations(
+        self, user_id: int, top_tags: int = AnalyticsLimits.SCALE_CORRELATION_TAGS
+    ) -> Dict:
+        """Same-day and next-day correlations between mood, scales and top tags."""
+        if not analytics_engine.available():
+            raise RuntimeError("Scale correlations require NumPy")
+
+        def compute() -> Dict:
+            with self.db._read_conn() as conn:
+                frame = analytics_engine.load_daily_frame(conn, user_id, top_tags)
+            return analytics_engine.correlation_matrix(frame, lag=1)
+
+        return self._cached(user_id, "scale_correlations", (top_tags,), compute)
+
+    def get_timeseries(
+        self,
+        user_id: int,
+        metric: str,
+        bucket: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """Bucketed chart series; ``None`` when the scale/tag is not the user's."""
+        return self._cached(
+            user_id,
+            "timeseries",
+            (metric, bucket, start_date, end_date),
+            lambda: self.db.get_timeseries(user_id, metric, bucket, start_date, end_date),
+        )
+
+    def get_dashboard_batch(self, user_id: int, scale_service=None) -> Dict:
+        """Correlations, co-occurrence and scale data for the analytics dashboard."""
+        def compute() -> Dict:
+            scales, scale_entries, scale_averages = [], [], []
+            if scale_service is not None:
+                scales = scale_service.get_user_scales(user_id)
+                scale_entries = scale_service.get_user_scale_entries(user_id)
+                scale_averages = scale_service.get_scale_averages(user_id, days=30)
+            return {
+                "correlations": self.get_activity_correlations(user_id),
+                "coOccurrence": self.get_tag_co_occurrence(user_id),
+                "scales": scales,
+                "scaleEntries": scale_entries,
+                "scaleAverages": scale_averages,
+            }
+
+        return self._cached(
+            user_id, "batch", (date.today().isoformat(), scale_service is not None), compute
+        )
+
+    def get_mood_stability(
+        self,
+        user_id: int,
+        days: int = Defaults.MOOD_STABILITY_DAYS,
+        windows: Optional[Sequence[int]] = None,
+    ) -> Dict:
         """
         Calculate mood stability score and trend.
         Reference implementation delegating to DB mixins.
+
+        ``trend`` uses the first of ``windows`` (default 7 days); ``trends``
+        holds one series per requested window, computed in a single pass.
         """
+        windows = list(windows) if windows else [Defaults.MOOD_STABILITY_WINDOW]
+        return self._cached(
+            user_id,
+            "stability",
+            (days, tuple(windows), date.today().isoformat()),
+            lambda: self._compute_mood_stability(user_id, days, windows),
+        )
+
+    def _compute_mood_stability(self, user_id: int, days: int, windows: List[int]) -> Dict:
         data = self.db.get_mood_stability(user_id, days)
-        trend = self.db.get_mood_stability_trend(user_id, days)
+        trends = self.db.get_mood_stability_trends(user_id, days, windows)
+        trend = trends[windows[0]]
         
         if not data:
              return {
@@ -71,6 +230,7 @@ class AnalyticsService:
                 "interpretation": "Not enough data",
                 "sample_size": 0,
                 "trend": trend,
+                "trends": trends,
                 "days": days
              }
         
@@ -86,6 +246,7 @@ class AnalyticsService:
             "interpretation": interpretation,
             "sample_size": data['count'],
             "trend": trend,
+            "trends": trends,
             "days": days,
             "std_deviation": 0, # Placeholder if FE needs it, or handled by score
              "variance": 0
@@ -0,0 +1,138 @@
+"""Service assembling the dashboard's start-up data in one round trip."""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from api.database import MoodDatabase
+from api.services.mood_service import MoodService
+from api.services.settings_service import SettingsService
+from api.utils.pagination import encode_cursor
+
+# Sections in the order they are built and returned.
+SECTIONS = (
+    "statistics",
+    "streak",
+    "journal_stats",
+    "goals",
+    "important_days",
+    "mood_definitions",
+    "groups",
+    "scales",
+    "settings",
+    "recent_entries",
+)
+
+
+class BootstrapService:
+    """Builds the payloads of the endpoints the frontend calls after login.
+
+    Every section is read inside one :meth:`MoodDatabase.read_snapshot`, so
+    the whole response reflects a single point in time, and intermediate
+    results (the streak state behind statistics, streak and journal stats)
+    are computed once.  Each section has the same shape as its standalone
+    endpoint.
+    """
+
+    def __init__(
+        self,
+        db: MoodDatabase,
+        mood_service: MoodService,
+        settings_service: SettingsService,
+        recent_limit: int = 20,
+    ):
+        self.db = db
+        self.mood_service = mood_service
+        self.settings_service = settings_service
+        self.recent_limit = recent_limit
+
+    @staticmethod
+    def parse_fields(raw: Optional[str]) -> Tuple[str, ...]:
+        """Sections named in a ``fields=`` value, in :data:`SECTIONS` order.
+
+        Raises:
+            ValueError: When a name is not a known section.
+        """
+        if raw is None or not raw.strip():
+            return SECTIONS
+        requested = {f.strip().lower() for f in raw.split(",") if f.strip()}
+        unknown = requested.difference(SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(s for s in SECTIONS if s in requested)
+
+    def build(
+        self, user_id: int, fields: Iterable[str] = SECTIONS
+    ) -> Tuple[Dict[str, Any], List[Tuple[str, float]]]:
+        """Return the requested sections and per-section timings in ms."""
+        builders: Dict[str, Callable[[int, Dict[str, Any]], Any]] = {
+            name: getattr(self, f"_{name}") for name in SECTIONS
+        }
+        payload: Dict[str, Any] = {}
+        timings: List[Tuple[str, float]] = []
+        shared: Dict[str, Any] = {}
+        with self.db.read_snapshot():
+            for name in fields:
+                started = time.perf_counter()
+                payload[name] = builders[name](user_id, shared)
+                timings.append((name, (time.perf_counter() - started) * 1000))
+
+        # The one write /statistics makes, kept out of the read snapshot.
+        if "statistics" in payload:
+            self.mood_service.record_stats_view(user_id)
+        return payload, timings
+
+    # --- Sections -------------------------------------------------------------
+    def _streak_state(self, user_id: int, shared: Dict[str, Any]) -> Dict:
+        if "streak_state" not in shared:
+            shared["streak_state"] = self.db.get_streak_state(user_id)
+        return shared["streak_state"]
+
+    def _statistics(self, user_id: int, shared: Dict[str, Any]) -> Dict:
+        return {
+            "statistics": self.db.get_mood_statistics(user_id),
+            "mood_distribution": self.db.get_mood_counts(user_id),
+            "current_streak": self._streak_state(user_id, shared)["current_streak"],
+        }
+
+    def _streak(self, user_id: int, shared: Dict[str, Any]) -> Dict:
+        return self.db.get_streak_details(user_id, state=self._streak_state(user_id, shared))
+
+    def _journal_stats(self, user_id: int, shared: Dict[str, Any]) -> Dict:
+        state = self._streak_state(user_id, shared)
+        return {
+            "weekly_word_count": self.db.get_weekly_word_count(user_id),
+            "journaling_streak": state["journaling_streak"],
+            "longest_journaling_streak": state["longest_journaling_streak"],
+        }
+
+    def _goals(self, user_id: int, shared: Dict[str, Any]) -> List[Dict]:
+        return self.db.get_goals(user_id)
+
+    def _important_days(self, user_id: int, shared: Dict[str, Any]) -> List[Dict]:
+        return self.db.get_important_days(user_id)
+
+    def _mood_definitions(self, user_id: int, shared: Dict[str, Any]) -> List[Dict]:
+        return self.db.get_user_mood_definitions(user_id)
+
+    def _groups(self, user_id: int, shared: Dict[str, Any]) -> List[Dict]:
+        return self.db.get_groups_for_user(user_id)
+
+    def _scales(self, user_id: int, shared: Dict[str, Any]) -> List[Dict]:
+        return self.db.get_user_scales(user_id)
+
+    def _settings(self, user_id: int, shared: Dict[str, Any]) -> Dict:
+        return self.settings_service.get_public_settings(user_id)
+
+    def _recent_entries(self, user_id: int, shared: Dict[str, Any]) -> Dict:
+        """First page of ``GET /moods?limit=&include=selections,media,scales``."""
+        page = self.db.get_mood_entries_page(user_id, limit=self.recent_limit)
+        entries = self.mood_service.hydrate_entries(
+            page["entries"],
+            include_selections=True,
+            include_media=True,
+            include_scales=True,
+        )
+        return {
+            "entries": entries,
+            "next_cursor": encode_cursor("moods", page["next"]) if page["next"] else None,
+        }
@@ -1,14 +1,24 @@
 from typing import List, Optional, Dict
 from api.database import MoodDatabase
+from api.services.achievement_evaluator import AchievementEvaluator
 
 
 class GoalService:
-    def __init__(self, db: MoodDatabase):
+    def __init__(self, db: MoodDatabase, achievements: Optional[AchievementEvaluator] = None):
         self.db = db
+        self.achievements = achievements
 
     def list_goals(self, user_id: int) -> List[Dict]:
         return self.db.get_goals(user_id)
 
+    def list_goals_with_completions(
+        self,
+        user_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[Dict]:
+        return self.db.get_goals_with_completions(user_id, start_date, end_date)
+
     def create_goal(
         self,
         user_id: int,
@@ -60,12 +70,20 @@ class GoalService:
         return self.db.delete_goal(user_id, goal_id)
 
     def increment_progress(self, user_id: int, goal_id: int) -> Optional[Dict]:
-        return self.db.increment_goal_progress(user_id, goal_id)
+        result = self.db.increment_goal_progress(user_id, goal_id)
+        self._goal_event(user_id, result)
+        return result
 
     def toggle_completion(
         self, user_id: int, goal_id: int, date_str: str
     ) -> Optional[Dict]:
-        return self.db.toggle_goal_completion(user_id, goal_id, date_str)
+        result = self.db.toggle_goal_completion(user_id, goal_id, date_str)
+        self._goal_event(user_id, result)
+        return result
+
+    def _goal_event(self, user_id: int, result: Optional[Dict]) -> None:
+        if result is not None and self.achievements is not None:
+            self.achievements.notify(user_id, "goal")
 
     def get_completions(
         self,
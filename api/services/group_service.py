@@ -17,6 +17,10 @@ class GroupService:
         # Fallback to global groups for backward compatibility
         return self._db.get_all_groups()
 
+    def groups_etag(self, user_id: int) -> str:
+        """Entity tag for the groups and options a user sees"""
+        return self._db.reference_etag(user_id, "groups")
+
     def create_group(self, user_id: int, name: str) -> int:
         """Create a new group for a user"""
         if not name.strip():
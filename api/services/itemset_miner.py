@@ -0,0 +1,213 @@
+"""Frequent tag combinations (itemsets) with bitset support counting.
+
+Every option a user has selected becomes a bitset over their entries
+(bit ``i`` set when entry ``i`` has the option), stored as a Python int.
+Eclat then walks the itemset lattice depth first: the support of
+``prefix + {option}`` is ``popcount(bits(prefix) & bits(option))``, so each
+candidate costs one AND and one popcount, and nothing is re-read from the
+database.  Mood association uses the same trick with one bitset per mood.
+
+Mining is bounded by a wall-clock budget, a cap on visited nodes and a
+byte budget for what the search holds (the bitsets on its stack plus the
+itemsets found so far); when any is hit the search stops and the result is
+flagged ``truncated``, with ``truncated_by`` naming the limit.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import time
+from typing import Dict, List
+
+_MOOD_DELTA = 0.5  # |average - overall| needed to call an itemset high/low
+_FOUND_BYTES = 256  # Approximate footprint of one found itemset dict
+
+
+class Transactions:
+    """A user's entries as per-option and per-mood bitsets."""
+
+    def __init__(self, entry_count: int, option_bits: Dict[int, int], mood_bits: Dict[int, int]) -> None:
+        self.entry_count = entry_count
+        self.option_bits = option_bits
+        self.mood_bits = mood_bits
+        self.mood_total = sum(mood * bits.bit_count() for mood, bits in mood_bits.items())
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection, user_id: int) -> "Transactions":
+        positions: Dict[int, int] = {}
+        mood_rows: Dict[int, List[int]] = {}
+        for position, (entry_id, mood) in enumerate(
+            conn.execute("SELECT id, mood FROM mood_entries WHERE user_id = ? ORDER BY id", (user_id,))
+        ):
+            positions[entry_id] = position
+            mood_rows.setdefault(mood, []).append(position)
+
+        option_rows: Dict[int, List[int]] = {}
+        for entry_id, option_id in conn.execute(
+            """
+            SELECT es.entry_id, es.option_id
+              FROM entry_selections es
+              JOIN mood_entries me ON me.id = es.entry_id
+             WHERE me.user_id = ?
+            """,
+            (user_id,),
+        ):
+            option_rows.setdefault(option_id, []).append(positions[entry_id])
+
+        size = len(positions)
+        return cls(
+            size,
+            {option_id: _bitset(rows, size) for option_id, rows in option_rows.items()},
+            {mood: _bitset(rows, size) for mood, rows in mood_rows.items()},
+        )
+
+    def mood_sum(self, bits: int) -> int:
+        return sum(mood * (bits & mask).bit_count() for mood, mask in self.mood_bits.items())
+
+
+def _bitset(positions: List[int], size: int) -> int:
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def mine_itemsets(
+    transactions: Transactions,
+    min_count: int,
+    min_size: int = 3,
+    max_size: int = 4,
+    time_budget: float = 0.5,
+    max_nodes: int = 200_000,
+    max_bytes: int = 16 * 1024 * 1024,
+) -> Dict:
+    """Eclat over ``transactions``; returns itemsets of ``min_size..max_size``.
+
+    Each found itemset is ``{"items", "count", "mood_sum"}``.  ``items`` are
+    option ids in ascending order.
+    """
+    deadline = time.monotonic() + time_budget
+    # Least frequent first keeps the intersections (and the tree) small.
+    frequent = sorted(
+        ((option_id, bits) for option_id, bits in transactions.option_bits.items()
+         if bits.bit_count() >= min_count),
+        key=lambda item: (item[1].bit_count(), item[0]),
+    )
+    found: List[Dict] = []
+    nodes = 0
+    held = 0  # Bytes of stacked bitsets and found itemsets
+    truncated_by = None
+
+    # Explicit stack of (prefix items, prefix bits, index of next candidate).
+    stack = [((), -1, 0)]
+    while stack:
+        prefix, prefix_bits, start = stack.pop()
+        if prefix:
+            held -= _bitset_bytes(prefix_bits)
+        for index in range(start, len(frequent)):
+            nodes += 1
+            if nodes > max_nodes:
+                truncated_by = "nodes"
+            elif held > max_bytes:
+                truncated_by = "memory"
+            elif nodes & 255 == 0 and time.monotonic() > deadline:
+                truncated_by = "time"
+            if truncated_by:
+                stack.clear()
+                break
+            option_id, bits = frequent[index]
+            bits &= prefix_bits
+            count = bits.bit_count()
+            if count < min_count:
+                continue
+            items = prefix + (option_id,)
+            if len(items) >= min_size:
+                found.append({
+                    "items": tuple(sorted(items)),
+                    "count": count,
+                    "mood_sum": transactions.mood_sum(bits),
+                })
+                held += _FOUND_BYTES
+            if len(items) < max_size:
+                stack.append((items, bits, index + 1))
+                held += _bitset_bytes(bits)
+
+    return {
+        "itemsets": found,
+        "truncated": truncated_by is not None,
+        "truncated_by": truncated_by,
+        "nodes": nodes,
+    }
+
+
+def _bitset_bytes(bits: int) -> int:
+    return (bits.bit_length() + 7) // 8
+
+
+def mood_itemsets(
+    conn: sqlite3.Connection,
+    user_id: int,
+    min_support: float,
+    max_size: int,
+    min_size: int = 3,
+    limit: int = 50,
+    time_budget: float = 0.5,
+    max_nodes: int = 200_000,
+    max_bytes: int = 16 * 1024 * 1024,
+) -> Dict:
+    """Tag combinations whose entries average well above or below the user's mood."""
+    transactions = Transactions.load(conn, user_id)
+    total = transactions.entry_count
+    min_count = max(3, math.ceil(min_support * total))
+    result = mine_itemsets(
+        transactions, min_count, min_size, max_size, time_budget, max_nodes, max_bytes
+    )
+
+    overall = transactions.mood_total / total if total else 0.0
+    option_ids = sorted({option_id for found in result["itemsets"] for option_id in found["items"]})
+    options: Dict[int, sqlite3.Row] = {}
+    for start in range(0, len(option_ids), 500):
+        chunk = option_ids[start:start + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        for row in conn.execute(
+            f"SELECT id, name, icon FROM group_options WHERE id IN ({placeholders})", chunk
+        ):
+            options[row[0]] = row
+
+    high: List[Dict] = []
+    low: List[Dict] = []
+    for found in result["itemsets"]:
+        if not all(option_id in options for option_id in found["items"]):
+            continue
+        average = found["mood_sum"] / found["count"]
+        delta = average - overall
+        if abs(delta) < _MOOD_DELTA:
+            continue
+        (high if delta > 0 else low).append({
+            "options": [
+                {"id": option_id, "name": options[option_id][1], "icon": options[option_id][2]}
+                for option_id in found["items"]
+            ],
+            "size": len(found["items"]),
+            "count": found["count"],
+            "support": round(found["count"] / total, 4),
+            "average_mood": round(average, 2),
+            "mood_delta": round(delta, 2),
+        })
+    high.sort(key=lambda s: (-s["mood_delta"], -s["count"]))
+    low.sort(key=lambda s: (s["mood_delta"], -s["count"]))
+
+    return {
+        "entry_count": total,
+        "overall_average": round(overall, 2),
+        "min_support": min_support,
+        "min_count": min_count,
+        "max_size": max_size,
+        "high": high[:limit],
+        "low": low[:limit],
+        "frequent_itemsets": len(result["itemsets"]),
+        "truncated": result["truncated"],
+        "truncated_by": result["truncated_by"],
+    }
+
@@ -4,6 +4,7 @@ import logging
 from typing import List, Dict, Optional
 from werkzeug.utils import secure_filename
 from api.database import MoodDatabase
+from api.services.achievement_evaluator import AchievementEvaluator
 from PIL import Image
 
 logger = logging.getLogger(__name__)
@@ -11,8 +12,14 @@ logger = logging.getLogger(__name__)
 THUMBNAIL_SIZE = (200, 200)
 
 class MediaService:
-    def __init__(self, db: MoodDatabase, upload_folder: str):
+    def __init__(
+        self,
+        db: MoodDatabase,
+        upload_folder: str,
+        achievements: Optional[AchievementEvaluator] = None,
+    ):
         self._db = db
+        self._achievements = achievements
         self.upload_folder = os.path.realpath(upload_folder)
         self.thumbnail_folder = os.path.join(self.upload_folder, "thumbnails")
         if not os.path.exists(self.upload_folder):
@@ -50,8 +57,11 @@ class MediaService:
             logger.warning("Thumbnail generation failed: %s", e)
             return None
 
-    def save_media(self, entry_id: int, file) -> Dict:
-        """Saves a file to disk, generates thumbnail, and creates a database record."""
+    def save_media(self, entry_id: int, file, user_id: Optional[int] = None) -> Dict:
+        """Saves a file to disk, generates thumbnail, and creates a database record.
+
+        With ``user_id`` the upload is reported to the achievement evaluator.
+        """
         if not file:
             raise ValueError("No file provided")
 
@@ -77,6 +87,8 @@ class MediaService:
         relative_path = unique_filename
         
         media_id = self._db.add_media_attachment(entry_id, relative_path, file_type, thumbnail_path)
+        if user_id is not None and self._achievements is not None:
+            self._achievements.notify(user_id, "media")
         
         return {
             "id": media_id,
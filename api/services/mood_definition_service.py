@@ -11,9 +11,13 @@ class MoodDefinitionService:
         self._db = db
 
     def get_user_mood_definitions(self, user_id: int) -> List[Dict]:
-        """Get mood definitions for a user, creating defaults if none exist."""
+        """Get mood definitions for a user (defaults are created at sign-up)."""
         return self._db.get_user_mood_definitions(user_id)
 
+    def definitions_etag(self, user_id: int) -> str:
+        """Entity tag for a user's mood definitions."""
+        return self._db.reference_etag(user_id, "moods")
+
     def update_mood_definition(
         self,
         user_id: int,
@@ -55,7 +59,7 @@ class MoodDefinitionService:
         """Reset user's mood definitions to defaults.
 
         This could be implemented by deleting existing definitions
-        and letting get_user_mood_definitions recreate them.
+        and re-inserting DEFAULT_MOODS.
         """
         # For now, just return current definitions
         # A full implementation would delete and recreate
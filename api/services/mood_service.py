@@ -1,11 +1,13 @@
 from typing import List, Optional, Dict
 from api.database import MoodDatabase
 from api.models.mood_entry import MoodEntry
+from api.services.achievement_evaluator import AchievementEvaluator
 
 
 class MoodService:
-    def __init__(self, db: MoodDatabase):
+    def __init__(self, db: MoodDatabase, achievements: Optional[AchievementEvaluator] = None):
         self.db = db
+        self.achievements = achievements
 
     def create_mood_entry(
         self,
@@ -27,8 +29,11 @@ class MoodService:
             user_id, date, mood, content, time, selected_options
         )
 
-        # Check for new achievements
-        new_achievements = self.db.check_achievements(user_id)
+        # Check for new achievements (on the evaluator's workers when available)
+        if self.achievements is not None:
+            new_achievements = self.achievements.evaluate(user_id, "entry")
+        else:
+            new_achievements = self.db.check_achievements(user_id, "entry")
 
         return {"entry_id": entry_id, "new_achievements": new_achievements}
 
@@ -44,8 +49,21 @@ class MoodService:
         include_scales: bool = False
     ) -> List[Dict]:
         """Get all mood entries with optional inline selections, media, and scales."""
-        entries = self.db.get_all_mood_entries(user_id)
+        return self.hydrate_entries(
+            self.db.get_all_mood_entries(user_id),
+            include_selections=include_selections,
+            include_media=include_media,
+            include_scales=include_scales,
+        )
 
+    def hydrate_entries(
+        self,
+        entries: List[Dict],
+        include_selections: bool = False,
+        include_media: bool = False,
+        include_scales: bool = False
+    ) -> List[Dict]:
+        """Attach selections, media, and scales to entries with batched lookups."""
         if not entries:
             return entries
 
@@ -74,6 +92,22 @@ class MoodService:
 
         return entries
 
+    def get_entries_page(
+        self,
+        user_id: int,
+        limit: int = 20,
+        after: Optional[tuple] = None,
+        include_total: bool = False,
+    ) -> Dict:
+        """Get one keyset page of mood entries (newest first).
+
+        Returns:
+            Dict with 'entries', 'next' sort key (or None) and 'total'
+        """
+        return self.db.get_mood_entries_page(
+            user_id, limit=limit, after=after, include_total=include_total
+        )
+
     def get_entries_by_date_range(
         self, user_id: int, start_date: str, end_date: str
     ) -> List[Dict]:
@@ -113,6 +147,8 @@ class MoodService:
 
         if not updated:
             return None
+        if self.achievements is not None:
+            self.achievements.notify(user_id, "entry")
 
         entry = self.db.get_mood_entry_by_id(user_id, entry_id)
         if not entry:
@@ -128,12 +164,7 @@ class MoodService:
 
     def get_statistics(self, user_id: int) -> Dict:
         """Get mood statistics for a user"""
-        # Track statistics view for achievements (Data Lover)
-        try:
-            self.db.increment_stats_view(user_id)
-        except Exception:
-            # Metrics should not break stats
-            pass
+        self.record_stats_view(user_id)
         stats = self.db.get_mood_statistics(user_id)
         mood_counts = self.db.get_mood_counts(user_id)
         current_streak = self.db.get_current_streak(user_id)
@@ -144,6 +175,16 @@ class MoodService:
             "current_streak": current_streak,
         }
 
+    def record_stats_view(self, user_id: int) -> None:
+        """Track a statistics view for achievements (Data Lover)"""
+        try:
+            self.db.increment_stats_view(user_id)
+            if self.achievements is not None:
+                self.achievements.notify(user_id, "stats_view")
+        except Exception:
+            # Metrics should not break stats
+            pass
+
     def get_current_streak(self, user_id: int) -> int:
         """Get current consecutive days streak for a user"""
         return self.db.get_current_streak(user_id)
@@ -175,6 +216,33 @@ class MoodService:
             user_id, query, moods, start_date, end_date, page, per_page
         )
 
+    def search_entries_page(
+        self,
+        user_id: int,
+        query: str,
+        moods: Optional[List[int]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[tuple] = None,
+        include_total: bool = False,
+    ) -> Dict:
+        """Search entries for a user with keyset pagination.
+
+        Returns:
+            Dict with 'entries', 'next' sort key (or None) and 'total'
+        """
+        return self.db.search_mood_entries_page(
+            user_id,
+            query,
+            moods,
+            start_date,
+            end_date,
+            limit=limit,
+            after=after,
+            include_total=include_total,
+        )
+
     def get_streak_details(self, user_id: int) -> Dict:
         """Get detailed streak information for a user"""
         return self.db.get_streak_details(user_id)
@@ -14,6 +14,10 @@ class ScaleService:
         """Get all scale definitions for a user."""
         return self._db.get_user_scales(user_id)
 
+    def scales_etag(self, user_id: int) -> str:
+        """Entity tag for a user's scale definitions."""
+        return self._db.reference_etag(user_id, "scales")
+
     def create_scale(
         self,
         user_id: int,
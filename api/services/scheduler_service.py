@@ -15,7 +15,10 @@ class SchedulerService:
         self.started = False
         self.health_status = {
             'check_reminders': {'last_run': None, 'last_error': None, 'last_success': None},
-            'check_important_days': {'last_run': None, 'last_error': None, 'last_success': None}
+            'check_important_days': {'last_run': None, 'last_error': None, 'last_success': None},
+            'backfill_achievements': {'last_run': None, 'last_error': None, 'last_success': None},
+            'rollover_goals': {'last_run': None, 'last_error': None, 'last_success': None},
+            'persist_streaks': {'last_run': None, 'last_error': None, 'last_success': None}
         }
 
     def start(self):
@@ -38,10 +41,37 @@ class SchedulerService:
                 name='Check Important Days Reminders',
                 replace_existing=True
             )
+
+            # Move goals into the new day/week/month right after midnight
+            self.scheduler.add_job(
+                self.rollover_goals,
+                trigger=CronTrigger(hour=0, minute=0, second=5),
+                id='rollover_goals',
+                name='Roll Over Goal Periods',
+                replace_existing=True
+            )
+
+            # Store streak rows left dirty by writes outside the entry paths
+            self.scheduler.add_job(
+                self.persist_streaks,
+                trigger=CronTrigger(minute='*/15'),
+                id='persist_streaks',
+                name='Persist Dirty Streaks',
+                replace_existing=True
+            )
+
+            # Award achievements added since users last triggered a check
+            self.scheduler.add_job(
+                self.backfill_achievements,
+                trigger=CronTrigger(hour=3, minute=30),
+                id='backfill_achievements',
+                name='Backfill Achievements',
+                replace_existing=True
+            )
             
             self.scheduler.start()
             self.started = True
-            logger.info("Scheduler started with mood and important days reminder jobs.")
+            logger.info("Scheduler started with reminder, goal rollover, streak and achievement backfill jobs.")
 
     def shutdown(self):
         if self.started:
@@ -138,6 +168,36 @@ class SchedulerService:
             self.health_status['check_important_days']['last_error'] = str(e)
             logger.exception("Important Days reminder check failed")
 
+    def rollover_goals(self):
+        """Daily job resetting every goal whose period ended, in one UPDATE."""
+        self.health_status['rollover_goals']['last_run'] = datetime.now()
+        try:
+            self.db.rollover_goals()
+            self.health_status['rollover_goals']['last_success'] = datetime.now()
+        except Exception as e:
+            self.health_status['rollover_goals']['last_error'] = str(e)
+            logger.exception("Goal rollover failed")
+
+    def persist_streaks(self):
+        """Job storing the streak rows reads have been recomputing in memory."""
+        self.health_status['persist_streaks']['last_run'] = datetime.now()
+        try:
+            self.db.persist_dirty_streaks()
+            self.health_status['persist_streaks']['last_success'] = datetime.now()
+        except Exception as e:
+            self.health_status['persist_streaks']['last_error'] = str(e)
+            logger.exception("Streak persistence failed")
+
+    def backfill_achievements(self):
+        """Nightly job evaluating every achievement rule for all users in batches."""
+        self.health_status['backfill_achievements']['last_run'] = datetime.now()
+        try:
+            self.db.backfill_achievements()
+            self.health_status['backfill_achievements']['last_success'] = datetime.now()
+        except Exception as e:
+            self.health_status['backfill_achievements']['last_error'] = str(e)
+            logger.exception("Achievement backfill failed")
+
     @staticmethod
     def _normalize_days(days, *, strict=False):
         if not isinstance(days, list):
@@ -5,6 +5,16 @@ class SettingsService:
     def get_settings(self, user_id):
         return self.db.get_user_settings(user_id)
 
+    def get_public_settings(self, user_id):
+        """Settings safe to send to the client: ``has_pin`` instead of the hash."""
+        settings_dict = dict(self.get_settings(user_id))
+        settings_dict["has_pin"] = bool(settings_dict.get("pin_hash"))
+        settings_dict.pop("pin_hash", None)
+        return settings_dict
+
+    def settings_etag(self, user_id):
+        return self.db.reference_etag(user_id, "settings")
+
     def set_pin(self, user_id, pin):
         self.db.set_user_pin(user_id, pin)
 
@@ -0,0 +1,91 @@
+"""Tests for the batched achievement backfill."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from api.database import MoodDatabase
+from api.scripts import backfill_achievements as script
+
+LONG = " ".join(["word"] * 60)
+
+
+def _earned(db):
+    with db._read_conn() as conn:
+        return {tuple(row) for row in conn.execute("SELECT user_id, achievement_type FROM achievements")}
+
+
+def _seed(db, users=12):
+    """Users with a spread of histories; entries are backdated so streak rows go dirty."""
+    rng = random.Random(21)
+    today = date.today()
+    user_ids = []
+    for n in range(users):
+        uid = db.create_user(f"user{n}", f"user{n}@example.com", f"User {n}")
+        user_ids.append(uid)
+        days = list(range(rng.choice([0, 3, 8, 35])))
+        rng.shuffle(days)
+        for offset in days:
+            entry_id = db.add_mood_entry(
+                uid, (today - timedelta(days=offset)).isoformat(), rng.randint(1, 5),
+                LONG if rng.random() < 0.7 else "short",
+            )
+            if rng.random() < 0.3:
+                db.add_media_attachment(entry_id, f"{uid}-{offset}.jpg", "image/jpeg")
+        for _ in range(rng.choice([0, 10])):
+            db.increment_stats_view(uid)
+        with db._write_transaction() as conn:
+            conn.executemany(
+                "INSERT INTO goals (user_id, title, frequency_per_week, completed) VALUES (?, 'g', 3, 1)",
+                [(uid,)] * rng.choice([0, 10]),
+            )
+    return user_ids
+
+
+def test_backfill_matches_per_user_checks(tmp_path):
+    batched = MoodDatabase(str(tmp_path / "batched.db"))
+    single = MoodDatabase(str(tmp_path / "single.db"))
+    user_ids = _seed(batched)
+    _seed(single)
+    with batched._write_transaction() as conn:  # wipe whatever entry events already awarded
+        conn.execute("DELETE FROM achievements")
+    with single._write_transaction() as conn:
+        conn.execute("DELETE FROM achievements")
+
+    result = batched.backfill_achievements(batch_size=5)
+    for uid in user_ids:
+        single.check_achievements(uid)
+
+    assert _earned(batched) == _earned(single)
+    assert result["users"] == len(user_ids) and result["batches"] == 3
+    assert sum(result["awarded"].values()) == len(_earned(batched))
+    assert result["users_per_second"] > 0
+    assert {"first_entry", "data_lover", "goal_crusher"} <= set(result["awarded"])
+
+    # Re-running is a no-op.
+    assert batched.backfill_achievements()["awarded"] == {}
+
+
+def test_backfill_limited_to_named_rules(tmp_path):
+    db = MoodDatabase(str(tmp_path / "rules.db"))
+    _seed(db, users=4)
+    with db._write_transaction() as conn:
+        conn.execute("DELETE FROM achievements")
+
+    result = db.backfill_achievements(["data_lover"])
+    assert set(result["awarded"]) <= {"data_lover"}
+    assert {kind for _, kind in _earned(db)} <= {"data_lover"}
+    with pytest.raises(ValueError):
+        db.backfill_achievements(["data_lover", "moon_landing"])
+
+
+def test_script_reports_throughput(tmp_path, capsys):
+    path = str(tmp_path / "script.db")
+    db = MoodDatabase(path)
+    db.add_mood_entry(db.create_user("s", "s@example.com", "S"), date.today().isoformat(), 3, "x")
+    db.close()
+
+    assert script.main(["--db-path", path]) == 0
+    out = capsys.readouterr().out
+    assert "users: 1 in 1 batches" in out and "users/s" in out
@@ -0,0 +1,145 @@
+"""Tests for achievement counters, event-scoped rules and the background evaluator."""
+
+import os
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from api.app import create_app
+from api.database import MoodDatabase
+from api.services.achievement_evaluator import AchievementEvaluator
+
+TEST_DB_PATH = "/tmp/twilightio_test.db"
+
+
+def _counters(db, user_id):
+    with db._read_conn() as conn:
+        return dict(
+            conn.execute(
+                "SELECT metric, value FROM achievement_counters WHERE user_id = ? AND value != 0",
+                (user_id,),
+            ).fetchall()
+        )
+
+
+def test_counters_follow_entries_and_media(test_db):
+    db = MoodDatabase(test_db)
+    user_id = db.create_user("counts", "counts@example.com", "Counts")
+    other_id = db.create_user("other", "other@example.com", "Other")
+    first = db.add_mood_entry(user_id, "2025-01-01", 2, "a")
+    second = db.add_mood_entry(user_id, "2025-01-02", 4, "b")
+    db.add_mood_entry(other_id, "2025-01-02", 5, "c")
+    for name in ("x.jpg", "y.jpg", "z.jpg"):
+        db.add_media_attachment(second, name, "image/jpeg")
+    lone = db.add_media_attachment(first, "w.jpg", "image/jpeg")
+    assert _counters(db, user_id) == {"entries": 2, "mood_2": 1, "mood_4": 1, "photos": 4}
+
+    db.update_mood_entry(user_id, first, mood=5)
+    db.delete_media_attachment(lone)
+    db.delete_mood_entry(user_id, second)  # cascades its three photos
+    assert _counters(db, user_id) == {"entries": 1, "mood_5": 1}
+    assert _counters(db, other_id) == {"entries": 1, "mood_5": 1}
+
+    before = {uid: _counters(db, uid) for uid in (user_id, other_id)}
+    db.rebuild_achievement_counters()
+    assert {uid: _counters(db, uid) for uid in (user_id, other_id)} == before
+
+
+def test_goal_completions_are_counted_by_triggers(test_db):
+    db = MoodDatabase(test_db)
+    user_id = db.create_user("goals", "goals@example.com", "Goals")
+    goals = [db.create_goal(user_id, f"Goal {i}", "", frequency_type="daily") for i in range(3)]
+    for goal_id in goals:
+        db.increment_goal_progress(user_id, goal_id)
+    db.delete_goal(user_id, goals[2])
+    assert _counters(db, user_id) == {"goal_completions": 2}
+    assert db.get_achievement_metrics(user_id, {"goals"})["goal_completions"] == 2
+    db.rebuild_achievement_counters(user_id)
+    assert _counters(db, user_id) == {"goal_completions": 2}
+
+    db.rollover_goals(date.today() + timedelta(days=1))  # resets ``completed``
+    assert _counters(db, user_id) == {}
+
+
+def test_events_only_load_their_metrics(test_db, monkeypatch):
+    db = MoodDatabase(test_db)
+    user_id = db.create_user("events", "events@example.com", "Events")
+    for _ in range(10):
+        db.increment_stats_view(user_id)
+    for score in range(1, 6):
+        db.add_mood_entry(user_id, f"2025-02-0{score}", score, "entry")
+
+    loaded = []
+    original = db.get_achievement_metrics
+    monkeypatch.setattr(
+        db, "get_achievement_metrics", lambda uid, groups: loaded.append(set(groups)) or original(uid, groups)
+    )
+
+    assert db.check_achievements(user_id, "entry") == ["first_entry", "complex_person"]
+    assert "stats_views" not in loaded[-1] and "photos" not in loaded[-1]
+    assert db.check_achievements(user_id, "stats_view") == ["data_lover"]
+    assert loaded[-1] == {"stats_views"}
+    # Nothing left to earn from views: no metrics are read at all.
+    assert db.check_achievements(user_id, "stats_view") == []
+    assert len(loaded) == 2
+    with pytest.raises(ValueError):
+        db.check_achievements(user_id, "birthday")
+
+
+class _SlowDatabase(MoodDatabase):
+    """Holds ``entry`` checks until released, like a slow metric load."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.release = threading.Event()
+
+    def check_achievements(self, user_id, event=None, hold=False):
+        if event == "entry":
+            self.release.wait(5)
+        return super().check_achievements(user_id, event, hold=hold)
+
+
+def test_late_results_come_back_with_the_next_evaluation(test_db):
+    db = _SlowDatabase(test_db)
+    user_id = db.create_user("late", "late@example.com", "Late")
+    db.add_mood_entry(user_id, "2025-01-01", 4, "a")
+    for _ in range(10):
+        db.increment_stats_view(user_id)
+    evaluator = AchievementEvaluator(db, max_workers=1, wait_seconds=0.05)
+    try:
+        assert evaluator.evaluate(user_id, "entry") == []  # deferred, not lost
+        evaluator.notify(user_id, "stats_view")
+    finally:
+        db.release.set()
+        evaluator.close()
+
+    # Held in the database, so another worker process returns them once.
+    other = AchievementEvaluator(MoodDatabase(test_db), max_workers=1, wait_seconds=5)
+    try:
+        assert other.evaluate(user_id, "goal") == ["first_entry", "data_lover"]
+        assert other.evaluate(user_id, "goal") == []
+    finally:
+        other.close()
+
+
+@pytest.fixture()
+def client():
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+    app = create_app("testing")
+    with app.test_client() as test_client:
+        yield test_client
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+def test_new_entry_response_carries_achievements(client):
+    token = client.post("/api/auth/local/login").get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    resp = client.post("/api/mood", headers=headers, json={"mood": 4, "date": "2024-05-01", "content": "x"})
+    assert resp.status_code == 201
+    assert resp.get_json()["new_achievements"] == ["first_entry"]
+
+    resp = client.post("/api/mood", headers=headers, json={"mood": 3, "date": "2024-05-02", "content": "y"})
+    assert resp.get_json()["new_achievements"] == []
@@ -98,3 +98,49 @@ def test_co_occurrence(db, service):
     assert pair["option1_id"] == min_id
     assert pair["option2_id"] == max_id
     assert pair["frequency"] == 3
+
+
+def _brute_force_trend(entries, days, window):
+    from datetime import timedelta
+    from fractions import Fraction
+
+    today = date.today()
+    trend = []
+    for offset in range(days, -1, -1):
+        current = today - timedelta(days=offset)
+        start = current - timedelta(days=window)
+        moods = [m for d, m in entries if start <= d <= current]
+        if len(moods) < 2:
+            trend.append({'date': current.isoformat(), 'score': None})
+            continue
+        n, total = len(moods), sum(moods)
+        # Exact variance so truncation to int matches the engine's integer sums.
+        std_dev = float(Fraction(sum((m * n - total) ** 2 for m in moods), n ** 3)) ** 0.5
+        trend.append({'date': current.isoformat(), 'score': int(max(0, 100 - std_dev * 40))})
+    return trend
+
+
+def test_stability_trends_match_recomputation(db, service):
+    import random
+    from datetime import timedelta
+
+    user_id = db.upsert_user_by_google_id("777", "st@example.com", "Stable", "")["id"]
+    rng = random.Random(11)
+    entries = []
+    for offset in range(1, 120):
+        if rng.random() < 0.3:
+            continue
+        day = date.today() - timedelta(days=offset)
+        for _ in range(rng.randint(1, 3)):
+            mood = rng.randint(1, 5)
+            db.add_mood_entry(user_id, day.isoformat(), mood, "Test")
+            entries.append((day, mood))
+
+    trends = db.get_mood_stability_trends(user_id, 60, (7, 14, 30))
+    for window in (7, 14, 30):
+        assert trends[window] == _brute_force_trend(entries, 60, window)
+    assert db.get_mood_stability_trend(user_id, 60) == trends[7]
+
+    result = service.get_mood_stability(user_id, 60, windows=[14, 30])
+    assert result["trend"] == trends[14]
+    assert set(result["trends"]) == {14, 30}
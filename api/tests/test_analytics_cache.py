@@ -0,0 +1,111 @@
+"""Tests for per-user data versions and the versioned analytics cache."""
+
+import pytest
+
+from api.database import MoodDatabase
+from api.services.analytics_service import AnalyticsService
+from api.utils.result_cache import VersionedLRUCache
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MoodDatabase(str(tmp_path / "cache.db"))
+
+
+def _user(db, name):
+    return db.create_user(name, f"{name}@example.com", name)
+
+
+def test_every_analytics_input_bumps_the_version(db):
+    user_id = _user(db, "writer")
+    other_id = _user(db, "bystander")
+    option_id = db.get_groups_for_user(user_id)[0]["options"][0]["id"]
+    scale_id = db.get_user_scales(user_id)[0]["id"]
+
+    seen = [db.get_data_version(user_id)]
+
+    def changed():
+        version = db.get_data_version(user_id)
+        assert version != seen[-1]
+        seen.append(version)
+
+    entry_id = db.add_mood_entry(user_id, "2026-01-01", 3, "hello")
+    changed()
+    db.update_mood_entry(user_id, entry_id, mood=4)
+    changed()
+    db.add_entry_selections(entry_id, [option_id])
+    changed()
+    db.save_scale_entries(entry_id, {scale_id: 7})
+    changed()
+    db.update_scale(user_id, scale_id, name="Energy level")
+    changed()
+    group_id = db.create_group_for_user(user_id, "Hobbies")
+    changed()
+    db.create_group_option(group_id, "Chess")
+    changed()
+    db.delete_mood_entry(user_id, entry_id)
+    changed()
+
+    # Another user's writes leave this user's version alone.
+    before = db.get_data_version(user_id)
+    db.add_mood_entry(other_id, "2026-01-01", 2, "unrelated")
+    assert db.get_data_version(user_id) == before
+
+    # Shared groups (user_id NULL) are visible to everyone.
+    db.create_group("Shared")
+    assert db.get_data_version(user_id) != before
+    assert db.get_data_version(other_id) != 0
+
+
+def test_cache_hits_until_a_write_then_recomputes(db):
+    user_id = _user(db, "reader")
+    service = AnalyticsService(db)
+    db.add_mood_entry(user_id, "2026-02-01", 5, "great")
+
+    first = service.get_mood_stability(user_id, 30)
+    assert service.get_mood_stability(user_id, 30) is first
+    assert service.cache_stats()["hits"] == 1
+
+    db.add_mood_entry(user_id, "2026-02-01", 1, "awful")
+    after = service.get_dashboard_batch(user_id)
+    assert after["correlations"]["overall_average"] == 3.0
+    stats = service.cache_stats()
+    assert stats["misses"] >= 3 and stats["entries"] >= 3
+
+    # Different parameters are cached separately.
+    service.get_mood_stability(user_id, 90)
+    assert service.get_mood_stability(user_id, 30) is not first
+
+
+def test_lru_is_bounded_by_entries_and_bytes():
+    cache = VersionedLRUCache(max_entries=2, max_bytes=1000)
+    for user_id in range(3):
+        cache.get_or_compute((user_id, "x", ()), 1, lambda: [user_id])
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+
+    calls = []
+    cache.get_or_compute((1, "x", ()), 1, lambda: calls.append(1))
+    assert calls == []  # still cached
+    cache.get_or_compute((1, "x", ()), 2, lambda: calls.append(2))
+    assert calls == [2]  # new version is a miss
+
+    cache.get_or_compute((9, "big", ()), 1, lambda: "x" * 5000)
+    assert cache.stats()["bytes"] <= 1000
+
+    cache.invalidate_user(1)
+    assert cache.stats()["entries"] == 1
+
+
+def test_no_byte_budget_skips_size_estimates(monkeypatch):
+    from api.utils import result_cache
+
+    def fail(value):
+        raise AssertionError("size estimated without a byte budget")
+
+    monkeypatch.setattr(result_cache, "_estimate_size", fail)
+    cache = VersionedLRUCache(max_entries=2, max_bytes=0)
+    big = "x" * 5000
+    assert cache.get_or_compute((1, "big", ()), 1, lambda: big) is big
+    assert cache.get_or_compute((1, "big", ()), 1, lambda: None) is big
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,175 @@
+"""The vectorized analytics engine must agree with the SQL analytics paths."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from api.database import MoodDatabase
+from api.services import analytics_engine
+from api.services.analytics_engine import EntryMatrix
+from api.services.analytics_service import AnalyticsService
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MoodDatabase(str(tmp_path / "engine.db"))
+
+
+@pytest.fixture
+def seeded(db):
+    rng = random.Random(14)
+    user_id = db.create_user("engine", "engine@example.com", "Engine")
+    other_id = db.create_user("other", "other@example.com", "Other")
+    options = [o["id"] for g in db.get_groups_for_user(user_id) for o in g["options"]][:10]
+    today = date.today()
+    for i in range(300):
+        day = (today - timedelta(days=rng.randrange(400))).isoformat()
+        db.add_mood_entry(
+            user_id, day, rng.choice((1, 2, 3, 3, 4, 4, 5)), "x",
+            selected_options=rng.sample(options, rng.randint(0, 5)),
+        )
+        if i % 10 == 0:
+            db.add_mood_entry(other_id, day, 1, "noise", selected_options=options[:3])
+    # A legacy m/d/Y row counts everywhere except date windows.
+    db.add_mood_entry(user_id, "01/15/2020", 2, "legacy", selected_options=options[:4])
+    return user_id
+
+
+def _load(db, user_id):
+    with db._read_conn() as conn:
+        return EntryMatrix.load(conn, user_id)
+
+
+def _pairs(rows):
+    return {(r["option1_id"], r["option2_id"]): r for r in rows}
+
+
+def test_matrix_shape_matches_stored_rows(db, seeded, monkeypatch):
+    monkeypatch.setattr(analytics_engine, "_BLOCK_ROWS", 64)  # exercise several blocks
+    matrix = _load(db, seeded)
+    assert matrix.entry_count == 301
+    assert matrix.indptr[-1] == len(matrix.indices)
+    with db._read_conn() as conn:
+        stored = conn.execute(
+            "SELECT COUNT(*) FROM entry_selections es JOIN mood_entries me ON me.id = es.entry_id "
+            "WHERE me.user_id = ?",
+            (seeded,),
+        ).fetchone()[0]
+    assert len(matrix.indices) == stored
+    gram = matrix.pair_counts()
+    assert (gram == gram.T).all()
+    assert (gram.diagonal() == matrix.tag_counts()).all()
+    assert [start for start, _ in matrix._dense_blocks()] == [0, 64, 128, 192, 256]
+
+
+def test_dense_blocks_are_built_lazily_and_kept_only_when_small(db, seeded, monkeypatch):
+    matrix = _load(db, seeded)
+    assert matrix._blocks is None
+    size = matrix.nbytes
+    matrix.pair_counts()
+    assert matrix._blocks is not None and matrix.nbytes == size
+
+    monkeypatch.setattr(analytics_engine, "_DENSE_CACHE_BYTES", 0)
+    large = _load(db, seeded)
+    assert (large.pair_counts() == matrix.pair_counts()).all()
+    assert large._blocks is None
+
+    # Uncached blocks are still streamed once for all moods, not once per mood.
+    passes = []
+    blocks = large._dense_blocks
+    monkeypatch.setattr(large, "_dense_blocks", lambda: passes.append(1) or blocks())
+    assert large.co_occurrence_by_mood(limit=90) == matrix.co_occurrence_by_mood(limit=90)
+    assert len(passes) == 1
+
+
+def test_engine_agrees_with_sql(db, seeded):
+    matrix = _load(db, seeded)
+
+    sql_activity = {a["id"]: a for a in db.get_activity_correlations(seeded)}
+    impact = matrix.activity_impact()
+    assert impact["overall_average"] == db.get_mood_statistics(seeded)["average_mood"]
+    assert {a["id"] for a in impact["activities"]} == set(sql_activity)
+    for activity in impact["activities"]:
+        expected = sql_activity[activity["id"]]
+        assert activity["count"] == expected["count"]
+        assert activity["average_mood"] == round(expected["average_mood"], 2)
+        low, high = activity["confidence_interval"]
+        assert low <= activity["average_mood"] <= high
+
+    everything = 10 * 9
+    assert {k: r["frequency"] for k, r in _pairs(matrix.co_occurrence(limit=everything)).items()} == {
+        k: r["frequency"] for k, r in _pairs(db.get_tag_co_occurrence(seeded, limit=everything)).items()
+    }
+    by_mood = matrix.co_occurrence_by_mood(limit=everything)
+    for mood in (1, 2, 3, 4, 5):
+        expected = db.get_tag_co_occurrence_by_mood(seeded, mood, limit=everything)
+        assert {k: r["frequency"] for k, r in _pairs(by_mood.get(mood, [])).items()} == {
+            k: r["frequency"] for k, r in _pairs(expected).items()
+        }
+
+    rules = matrix.association_rules(limit=everything)
+    assert [r["lift"] for r in rules] == sorted((r["lift"] for r in rules), reverse=True)
+    expected = _pairs(db.get_advanced_correlations(seeded, limit=everything))
+    assert set(_pairs(rules)) == set(expected)
+    for key, row in _pairs(rules).items():
+        for metric in ("frequency", "support", "lift", "confidence_1_to_2", "confidence_2_to_1"):
+            assert row[metric] == pytest.approx(expected[key][metric])
+
+
+def test_undated_entries_stay_out_of_the_lift_denominator(db, seeded):
+    options = [o["id"] for g in db.get_groups_for_user(seeded) for o in g["options"]][:2]
+    db.add_mood_entry(seeded, "someday", 3, "undated", selected_options=options)
+    rules = _pairs(_load(db, seeded).association_rules(limit=90))
+    expected = _pairs(db.get_advanced_correlations(seeded, limit=90))
+    assert set(rules) == set(expected)
+    for key, row in rules.items():
+        assert row["support"] == pytest.approx(expected[key]["support"])
+        assert row["lift"] == pytest.approx(expected[key]["lift"])
+
+
+def test_date_window_excludes_older_entries(db, seeded):
+    matrix = _load(db, seeded)
+    recent = matrix.association_rules(days=90, limit=1000, min_count=1)
+    cutoff = (date.today() - timedelta(days=90)).isoformat()
+    entries = [e for e in db.get_all_mood_entries(seeded) if e["date"] >= cutoff]
+    selections = db.get_selections_for_entries([e["id"] for e in entries])
+    expected = {}
+    for entry in entries:
+        ids = sorted(s["id"] for s in selections[entry["id"]])
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                expected[(a, b)] = expected.get((a, b), 0) + 1
+    assert {k: r["frequency"] for k, r in _pairs(recent).items()} == expected
+    assert all(r["support"] == pytest.approx(r["frequency"] / len(entries)) for r in recent)
+
+
+def test_empty_user(db):
+    user_id = db.create_user("empty", "empty@example.com", "Empty")
+    matrix = _load(db, user_id)
+    assert matrix.entry_count == 0
+    assert matrix.activity_impact() == {"overall_average": 0, "activities": []}
+    assert matrix.co_occurrence() == []
+    assert matrix.association_rules() == []
+
+
+def test_service_shares_one_matrix_per_version(db, seeded):
+    service = AnalyticsService(db)
+    fallback = AnalyticsService(db, vectorized=False)
+    assert service.vectorized and not fallback.vectorized
+
+    service.get_activity_correlations(seeded)
+    service.get_tag_co_occurrence(seeded)
+    service.get_advanced_correlations(seeded)
+    stats = service.cache_stats()
+    assert stats["hits"] == 2  # matrix loaded once, reused by the other two
+    assert stats["bytes"] >= service._matrix(seeded).nbytes
+
+    assert _pairs(service.get_advanced_correlations(seeded)).keys() == _pairs(
+        fallback.get_advanced_correlations(seeded)
+    ).keys()
+    assert [a["id"] for a in service.get_activity_correlations(seeded)["activities"]] == [
+        a["id"] for a in fallback.get_activity_correlations(seeded)["activities"]
+    ]
@@ -0,0 +1,141 @@
+"""Tests for /api/bootstrap and the read snapshot it is built on."""
+
+import os
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from api.app import create_app
+from api.database import MoodDatabase
+
+TEST_DB_PATH = "/tmp/twilightio_test.db"
+
+
+@pytest.fixture()
+def client():
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+    app = create_app("testing")
+    with app.test_client() as test_client:
+        yield test_client
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+def _auth_headers(client):
+    token = client.post("/api/auth/local/login").get_json()["token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_bootstrap_matches_the_individual_endpoints(client):
+    headers = _auth_headers(client)
+    today = date.today()
+    for offset, mood in ((2, 3), (1, 4), (0, 5)):
+        day = (today - timedelta(days=offset)).isoformat()
+        resp = client.post("/api/mood", headers=headers, json={"mood": mood, "date": day, "content": "word " * 60})
+        assert resp.status_code == 201
+    client.post("/api/goals", headers=headers, json={"title": "Walk", "frequency_per_week": 3})
+
+    resp = client.get("/api/bootstrap", headers=headers)
+    assert resp.status_code == 200
+    data = resp.get_json()
+
+    expected = {
+        "statistics": "/api/statistics",
+        "streak": "/api/streak/details",
+        "journal_stats": "/api/journal/stats",
+        "goals": "/api/goals",
+        "mood_definitions": "/api/mood-definitions",
+        "groups": "/api/groups",
+        "settings": "/api/user/settings",
+    }
+    for section, path in expected.items():
+        assert data[section] == client.get(path, headers=headers).get_json(), section
+    assert data["scales"] == client.get("/api/scales", headers=headers).get_json()["data"]
+    assert data["important_days"] == client.get("/api/important-days", headers=headers).get_json()["data"]["days"]
+
+    assert data["streak"]["current_streak"] == 3
+    assert data["journal_stats"]["journaling_streak"] == 3
+    recent = client.get("/api/moods?limit=20&include=selections,media,scales", headers=headers).get_json()
+    assert data["recent_entries"] == {"entries": recent["data"], "next_cursor": None}
+
+
+def test_fields_selector_and_server_timing(client):
+    headers = _auth_headers(client)
+
+    resp = client.get("/api/bootstrap?fields=settings, Goals", headers=headers)
+    assert resp.status_code == 200
+    assert set(resp.get_json()) == {"goals", "settings"}
+    timing = [metric.split(";")[0] for metric in resp.headers["Server-Timing"].split(", ")]
+    assert timing == ["goals", "settings", "serialize", "total"]
+
+    resp = client.get("/api/bootstrap?fields=goals,passwords", headers=headers)
+    assert resp.status_code == 400
+    assert resp.get_json() == {"error": "Unknown fields: passwords"}
+
+
+def test_streak_errors_are_not_reported_as_zero_streaks(client, monkeypatch):
+    headers = _auth_headers(client)
+
+    def broken(self, user_id):
+        raise sqlite3.OperationalError("database disk image is malformed")
+
+    monkeypatch.setattr(MoodDatabase, "get_streak_state", broken)
+    resp = client.get("/api/bootstrap?fields=streak,goals", headers=headers)
+    assert resp.status_code == 500
+    assert "streak" not in resp.get_json()
+    assert client.get("/api/bootstrap?fields=goals", headers=headers).status_code == 200
+
+
+def test_snapshot_hides_writes_made_while_it_is_open(tmp_path):
+    db = MoodDatabase(str(tmp_path / "snapshot.db"))
+    user_id = db.create_user("snap", "snap@example.com", "Snap")
+    db.add_mood_entry(user_id, "2024-03-01", 4, "first")
+
+    with db.read_snapshot():
+        assert db.get_mood_statistics(user_id)["total_entries"] == 1
+        db.add_mood_entry(user_id, "2024-03-02", 2, "second")
+        db.create_scale(user_id, "Focus")
+        assert db.get_mood_statistics(user_id)["total_entries"] == 1
+        assert db.get_mood_counts(user_id) == {4: 1}
+        assert len(db.get_user_scales(user_id)) == 3
+
+    assert db.get_mood_statistics(user_id)["total_entries"] == 2
+    assert len(db.get_user_scales(user_id)) == 4
+
+
+def test_dirty_streak_is_recomputed_in_memory_and_persisted_by_writers(tmp_path):
+    db = MoodDatabase(str(tmp_path / "streak.db"))
+    user_id = db.create_user("streak", "streak@example.com", "Streak")
+    today = date.today()
+    for offset in (3, 1, 0):
+        db.add_mood_entry(user_id, (today - timedelta(days=offset)).isoformat(), 3, "entry")
+    expected = db.get_streak_state(user_id)
+    assert expected["current_streak"] == 2
+
+    conn = sqlite3.connect(db.db_path)
+    dirty = "SELECT dirty FROM user_streaks WHERE user_id = ?"
+    with conn:
+        conn.execute("UPDATE user_streaks SET dirty = 1 WHERE user_id = ?", (user_id,))
+    writer = sqlite3.connect(db.db_path, timeout=0)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        # Neither read path writes, so both succeed while another writer holds the lock.
+        assert db.get_streak_state(user_id) == expected
+        with db.read_snapshot():
+            assert db.get_streak_state(user_id) == expected
+    finally:
+        writer.rollback()
+        writer.close()
+    assert conn.execute(dirty, (user_id,)).fetchone() == (1,)
+
+    assert db.persist_dirty_streaks() == 1
+    assert conn.execute(dirty, (user_id,)).fetchone() == (0,)
+    assert db.get_streak_state(user_id) == expected
+
+    # A backdated entry marks the row dirty; its own write stores the rebuild.
+    db.add_mood_entry(user_id, (today - timedelta(days=2)).isoformat(), 3, "entry")
+    assert conn.execute(dirty, (user_id,)).fetchone() == (0,)
+    assert db.get_streak_state(user_id)["current_streak"] == 4
+    conn.close()
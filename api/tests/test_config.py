@@ -23,3 +23,16 @@ def test_public_config_default_values():
     assert public["enable_google_oauth"] in (True, False)
     assert public["enable_registration"] in (True, False)
     assert public["enable_local_login"] in (True, False)
+
+
+def test_numeric_settings_fall_back_on_malformed_values(monkeypatch):
+    from api.config import _env_flag, _env_float, _env_int
+
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "eight")
+    monkeypatch.setenv("DATABASE_SLOW_QUERY_MS", " ")
+    monkeypatch.setenv("ANALYTICS_CACHE_MAX_BYTES", "0")
+    monkeypatch.delenv("ANALYTICS_VECTORIZED", raising=False)
+    assert _env_int("DATABASE_POOL_SIZE", 8) == 8
+    assert _env_float("DATABASE_SLOW_QUERY_MS", 100.0) == 100.0
+    assert _env_int("ANALYTICS_CACHE_MAX_BYTES", 32) == 0
+    assert _env_flag("ANALYTICS_VECTORIZED", True) is True
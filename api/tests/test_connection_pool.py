@@ -0,0 +1,125 @@
+"""Tests for the pooled SQLite connections owned by MoodDatabase."""
+
+import sqlite3
+
+import pytest
+
+from api.database import MoodDatabase
+from api.database_common import ConnectionPool
+
+
+def test_pool_reuses_connections(db_with_user):
+    db, user_id = db_with_user
+    db.get_all_mood_entries(user_id)
+    before = db.pool_stats()
+
+    for i in range(5):
+        db.add_mood_entry(user_id, f"2026-01-{i + 1:02d}", 3, f"entry {i}")
+        db.get_all_mood_entries(user_id)
+
+    after = db.pool_stats()
+    for kind in ("write", "read"):
+        assert after[kind]["created"] == before[kind]["created"], "warm pool should not open new connections"
+        assert after[kind]["reused"] >= before[kind]["reused"] + 5
+        assert after[kind]["checked_out"] == 0
+        assert after[kind]["idle"] >= 1
+
+
+def test_query_result_is_materialized(db_with_user):
+    db, user_id = db_with_user
+    db.add_mood_entry(user_id, "2026-01-01", 4, "first")
+    db.add_mood_entry(user_id, "2026-01-02", 5, "second")
+
+    result = db._query(
+        "SELECT mood FROM mood_entries WHERE user_id = ? ORDER BY date", (user_id,)
+    )
+    # The connection is already back in the pool.
+    assert db.pool_stats()["read"]["checked_out"] == 0
+    assert result.fetchone()["mood"] == 4
+    assert [row["mood"] for row in result.fetchall()] == [5]
+    assert result.fetchone() is None
+
+    deleted = db._query(
+        "DELETE FROM mood_entries WHERE user_id = ?", (user_id,), commit=True
+    )
+    assert deleted.rowcount == 2
+
+
+def test_failed_write_returns_clean_connection(db_with_user):
+    db, user_id = db_with_user
+
+    with pytest.raises(RuntimeError):
+        with db._write_transaction() as conn:
+            conn.execute(
+                "INSERT INTO mood_entries (user_id, date, mood, content) VALUES (?, ?, ?, ?)",
+                (user_id, "2026-01-01", 3, "rolled back"),
+            )
+            raise RuntimeError("boom")
+
+    with db._pool.connection() as conn:
+        assert not conn.in_transaction
+    assert db.get_all_mood_entries(user_id) == []
+
+
+def test_overflow_connections_are_closed(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), size=1)
+    first = pool.acquire()
+    second = pool.acquire()
+    assert pool.stats()["overflow"] == 1
+
+    pool.release(first)
+    pool.release(second)
+    stats = pool.stats()
+    assert stats["idle"] == 1
+    assert stats["closed"] == 1
+    pool.close()
+
+
+def test_stale_connections_are_recycled(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), size=2, max_lifetime=0)
+    conn = pool.acquire()
+    pool.release(conn)
+
+    stats = pool.stats()
+    assert stats["recycled"] == 1
+    assert stats["idle"] == 0
+
+
+def test_reads_use_query_only_connections(db_with_user):
+    db, user_id = db_with_user
+
+    with db._read_conn() as conn:
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute(
+                "INSERT INTO mood_entries (user_id, date, mood, content) VALUES (?, ?, ?, ?)",
+                (user_id, "2026-01-01", 3, "nope"),
+            )
+
+    db.add_mood_entry(user_id, "2026-01-02", 4, "visible to readers")
+    assert len(db.get_all_mood_entries(user_id)) == 1
+    assert db.pool_stats()["read"]["read_only"] == 1
+
+
+def test_read_pool_applies_tuning_pragmas(test_db):
+    db = MoodDatabase(test_db, read_cache_size=-4096, read_mmap_size=1 << 20)
+    with db._read_conn() as conn:
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -4096
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 1 << 20
+
+
+def test_pool_can_be_disabled(test_db):
+    db = MoodDatabase(test_db, pool_size=0, read_pool_size=0)
+    user_id = db.create_user("nopool", "np@example.com", "No Pool")
+    db.add_mood_entry(user_id, "2026-01-01", 3, "unpooled")
+
+    assert db._pool is None and db._read_pool is None
+    assert db.pool_stats() == {}
+    assert len(db.get_all_mood_entries(user_id)) == 1
+
+
+def test_closed_pool_rejects_checkout(test_db):
+    db = MoodDatabase(test_db, pool_size=2)
+    db.close()
+    with pytest.raises(Exception):
+        db.get_user_by_id(1)
@@ -0,0 +1,180 @@
+"""Tests for the trigger-maintained daily_mood_rollup table."""
+
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from api.database import MoodDatabase
+from api.scripts.rebuild_daily_rollups import main as rebuild_main
+
+
+def _rollups(db, user_id):
+    return {row["day"]: row for row in db.get_daily_rollups(user_id)}
+
+
+def _expected(db, user_id):
+    """Recompute every rollup row straight from mood_entries."""
+    expected = {}
+    for entry in db.get_all_mood_entries(user_id):
+        row = expected.setdefault(
+            entry["date"],
+            {"entry_count": 0, "mood_sum": 0, "mood_sq_sum": 0, "moods": []},
+        )
+        row["entry_count"] += 1
+        row["mood_sum"] += entry["mood"]
+        row["mood_sq_sum"] += entry["mood"] ** 2
+        row["moods"].append(entry["mood"])
+    return expected
+
+
+def _assert_exact(db, user_id):
+    actual = _rollups(db, user_id)
+    expected = _expected(db, user_id)
+    assert set(actual) == set(expected)
+    for day, want in expected.items():
+        got = actual[day]
+        assert got["entry_count"] == want["entry_count"]
+        assert got["mood_sum"] == want["mood_sum"]
+        assert got["mood_sq_sum"] == want["mood_sq_sum"]
+        assert got["min_mood"] == min(want["moods"])
+        assert got["max_mood"] == max(want["moods"])
+        for score in range(1, 6):
+            assert got[f"mood_{score}"] == want["moods"].count(score)
+
+
+def test_triggers_keep_rollups_exact_through_edits(db_with_user):
+    db, user_id = db_with_user
+    rng = random.Random(3)
+    ids = [
+        db.add_mood_entry(user_id, f"2026-01-0{rng.randint(1, 4)}", rng.randint(1, 5), "a b c")
+        for _ in range(30)
+    ]
+    _assert_exact(db, user_id)
+
+    for entry_id in ids[:10]:
+        db.update_mood_entry(user_id, entry_id, mood=rng.randint(1, 5))
+    db.update_mood_entry(user_id, ids[10], date="2026-02-01", content="one two three four")
+    for entry_id in ids[20:]:
+        db.delete_mood_entry(user_id, entry_id)
+    _assert_exact(db, user_id)
+
+    # Deleting the last entry of a day removes the day entirely.
+    assert db.delete_mood_entry(user_id, ids[10])
+    assert "2026-02-01" not in _rollups(db, user_id)
+
+
+def test_word_count_follows_content_edits(db_with_user):
+    db, user_id = db_with_user
+    entry_id = db.add_mood_entry(user_id, "2026-03-01", 3, "one two")
+    db.add_mood_entry(user_id, "2026-03-01", 4, "three")
+    assert _rollups(db, user_id)["2026-03-01"]["word_count"] == 3
+
+    db.update_mood_entry(user_id, entry_id, content="one two three four five")
+    assert _rollups(db, user_id)["2026-03-01"]["word_count"] == 6
+
+
+def test_statistics_read_from_rollups(db_with_user):
+    db, user_id = db_with_user
+    today = date.today()
+    moods = [1, 3, 3, 5, 4]
+    for offset, mood in enumerate(moods):
+        db.add_mood_entry(user_id, (today - timedelta(days=offset)).isoformat(), mood, "x")
+
+    stats = db.get_mood_statistics(user_id)
+    assert stats["total_entries"] == 5
+    assert stats["average_mood"] == round(sum(moods) / 5, 2)
+    assert (stats["lowest_mood"], stats["highest_mood"]) == (1, 5)
+    assert stats["first_entry_date"] == (today - timedelta(days=4)).isoformat()
+    assert db.get_mood_counts(user_id) == {1: 1, 3: 2, 4: 1, 5: 1}
+
+    avg = sum(moods) / 5
+    std_dev = (sum((m - avg) ** 2 for m in moods) / 5) ** 0.5
+    assert db.get_mood_stability(user_id, 30) == {"score": int(max(0, 100 - std_dev * 40)), "count": 5}
+    assert db.get_mood_stability_trend(user_id, 3)[-1]["score"] is not None
+
+
+def test_statistics_date_range_spans_both_date_formats(db_with_user):
+    db, user_id = db_with_user
+    db.add_mood_entry(user_id, "12/31/2020", 3, "legacy")
+    db.add_mood_entry(user_id, "2024-01-01", 4, "iso")
+    db.add_mood_entry(user_id, "2022-06-15", 5, "iso")
+
+    stats = db.get_mood_statistics(user_id)
+    assert (stats["first_entry_date"], stats["last_entry_date"]) == ("2020-12-31", "2024-01-01")
+
+
+def test_rebuild_matches_trigger_state(test_db):
+    db = MoodDatabase(test_db)
+    user_id = db.create_user("rollup", "r@example.com", "Rollup")
+    for i in range(12):
+        db.add_mood_entry(user_id, f"2026-04-0{i % 3 + 1}", i % 5 + 1, "some words here")
+    before = _rollups(db, user_id)
+
+    with db._write_transaction() as conn:
+        conn.execute("DELETE FROM daily_mood_rollup")
+    assert db.get_mood_statistics(user_id)["total_entries"] == 0
+
+    assert db.rebuild_daily_rollups(user_id) == 3
+    assert _rollups(db, user_id) == before
+    db.close()
+
+    assert rebuild_main(["--db-path", test_db]) == 0
+    assert _rollups(MoodDatabase(test_db), user_id) == before
+
+
+def test_both_date_formats_of_a_day_share_one_row(db_with_user):
+    db, user_id = db_with_user
+    today = date.today()
+    legacy_id = db.add_mood_entry(user_id, today.strftime("%m/%d/%Y"), 1, "legacy")
+    db.add_mood_entry(user_id, today.isoformat(), 5, "iso")
+    db.add_mood_entry(user_id, "not a date", 3, "broken")
+
+    (row,) = db.get_daily_rollups(user_id)
+    assert row["day"] == today.isoformat()
+    assert (row["entry_count"], row["min_mood"], row["max_mood"]) == (2, 1, 5)
+    assert db.get_daily_rollups(user_id, today.strftime("%m/%d/%Y"), today.isoformat()) == [row]
+    with pytest.raises(ValueError):
+        db.get_daily_rollups(user_id, "yesterday")
+
+    # Windowed readers see the legacy entry too.
+    assert db.get_mood_stability(user_id, 7)["count"] == 2
+    assert db.get_mood_stability_trend(user_id, 3, 2)[-1]["score"] is not None
+    series = db.get_timeseries(user_id, "mood", "day", today.isoformat(), today.isoformat())
+    assert (series["buckets"], series["count"]) == ([today.isoformat()], [2])
+
+    db.delete_mood_entry(user_id, legacy_id)
+    (row,) = db.get_daily_rollups(user_id)
+    assert (row["entry_count"], row["min_mood"]) == (1, 5)
+
+
+def test_upgrade_rekeys_text_rollups_by_day(tmp_path):
+    path = str(tmp_path / "text_rollups.db")
+    db = MoodDatabase(path)
+    user_id = db.create_user("upgrade", "up@example.com", "Upgrade")
+    db.add_mood_entry(user_id, "03/01/2026", 2, "legacy")
+    db.add_mood_entry(user_id, "2026-03-01", 4, "iso")
+    db.close()
+
+    conn = sqlite3.connect(path)
+    with conn:
+        for trigger in ("mood_rollup_ai", "mood_rollup_ad", "mood_rollup_au"):
+            conn.execute(f"DROP TRIGGER {trigger}")
+        conn.execute("DROP TABLE daily_mood_rollup")
+        conn.execute(
+            "CREATE TABLE daily_mood_rollup (user_id INTEGER, day TEXT, entry_count INTEGER, "
+            "PRIMARY KEY (user_id, day))"
+        )
+        conn.executemany(
+            "INSERT INTO daily_mood_rollup VALUES (?, ?, 1)",
+            [(user_id, "03/01/2026"), (user_id, "2026-03-01")],
+        )
+        conn.execute("PRAGMA user_version = 10")
+    conn.close()
+
+    upgraded = MoodDatabase(path)
+    (row,) = upgraded.get_daily_rollups(user_id)
+    assert (row["day"], row["entry_count"], row["mood_sum"]) == ("2026-03-01", 2, 6)
+    upgraded.add_mood_entry(user_id, "03/01/2026", 3, "after upgrade")
+    assert upgraded.get_daily_rollups(user_id)[0]["entry_count"] == 3
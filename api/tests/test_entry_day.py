@@ -0,0 +1,91 @@
+"""Tests for the integer ``mood_entries.day`` column and day-range filters."""
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+from api.database import MoodDatabase
+from api.database_rollups import day_bounds, epoch_day
+
+
+def _days(db, user_id):
+    with db._read_conn() as conn:
+        return dict(conn.execute("SELECT date, day FROM mood_entries WHERE user_id = ?", (user_id,)))
+
+
+def test_epoch_day_reads_both_formats():
+    expected = (date(2025, 12, 25) - date(1970, 1, 1)).days
+    assert epoch_day("2025-12-25") == expected
+    assert epoch_day("12/25/2025") == expected
+    assert epoch_day("2025-12-25T08:00:00") == expected
+    assert epoch_day("yesterday") is None and epoch_day("") is None
+    assert day_bounds(None, "2025-12-25") == (None, expected)
+    with pytest.raises(ValueError):
+        day_bounds("March", None)
+
+
+def test_day_follows_every_write(test_db):
+    db = MoodDatabase(test_db)
+    user_id = db.create_user("days", "days@example.com", "Days")
+    entry_id = db.add_mood_entry(user_id, "2025-12-25", 3, "iso")
+    db.add_mood_entry(user_id, "12/26/2025", 3, "legacy")
+    with db._write_transaction() as conn:  # writers that bypass the mixins too
+        conn.execute(
+            "INSERT INTO mood_entries (user_id, date, mood, content) VALUES (?, '01/02/2026', 4, 'raw')",
+            (user_id,),
+        )
+    assert _days(db, user_id) == {
+        "2025-12-25": epoch_day("2025-12-25"),
+        "12/26/2025": epoch_day("2025-12-26"),
+        "01/02/2026": epoch_day("2026-01-02"),
+    }
+
+    db.update_mood_entry(user_id, entry_id, date="12/31/2025")
+    assert _days(db, user_id)["12/31/2025"] == epoch_day("2025-12-31")
+
+
+def test_ranges_include_legacy_dates(test_db):
+    db = MoodDatabase(test_db)
+    user_id = db.create_user("ranges", "ranges@example.com", "Ranges")
+    db.add_mood_entry(user_id, "2025-12-20", 2, "before")
+    db.add_mood_entry(user_id, "12/25/2025", 4, "legacy christmas")
+    db.add_mood_entry(user_id, "2025-12-26", 5, "boxing day")
+    db.add_mood_entry(user_id, "2026-01-05", 3, "after")
+
+    in_range = db.get_mood_entries_by_date_range(user_id, "2025-12-24", "2025-12-31")
+    assert sorted(e["date"] for e in in_range) == ["12/25/2025", "2025-12-26"]
+
+    found = db.search_mood_entries_page(user_id, "", start_date="2025-12-25", end_date="2025-12-25")
+    assert [e["date"] for e in found["entries"]] == ["12/25/2025"]
+    with pytest.raises(ValueError):
+        db.get_mood_entries_by_date_range(user_id, "last week", "2025-12-31")
+
+
+def test_upgrade_adds_column_and_rebuilds_streaks(test_db):
+    db = MoodDatabase(test_db)
+    user_id = db.create_user("upgrade", "upgrade@example.com", "Upgrade")
+    for day in ("2025-03-01", "03/02/2025", "2025-03-03"):
+        db.add_mood_entry(user_id, day, 3, "x")
+    db.close()
+
+    # Put the file back at schema version 7.
+    conn = sqlite3.connect(test_db)
+    conn.execute("DROP INDEX idx_mood_entries_user_day")
+    conn.execute("ALTER TABLE mood_entries DROP COLUMN day")
+    conn.execute("UPDATE user_streaks SET longest = 0, dirty = 1")
+    conn.execute("PRAGMA user_version = 7")
+    conn.commit()
+    conn.close()
+
+    upgraded = MoodDatabase(test_db)
+    assert set(_days(upgraded, user_id).values()) == {
+        epoch_day("2025-03-01"), epoch_day("2025-03-02"), epoch_day("2025-03-03")
+    }
+    with upgraded._read_conn() as conn:
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(mood_entries)")}
+        streak = conn.execute(
+            "SELECT longest, dirty FROM user_streaks WHERE user_id = ?", (user_id,)
+        ).fetchone()
+    assert "idx_mood_entries_user_day" in indexes
+    assert tuple(streak) == (3, 0)
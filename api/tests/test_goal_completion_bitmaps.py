@@ -0,0 +1,106 @@
+"""Tests for the batched goal completion history (bitmaps and period stats)."""
+
+import base64
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from api.app import create_app
+from api.database import MoodDatabase
+from api.database_goals import encode_day_bitmap
+
+TEST_DB_PATH = "/tmp/twilightio_test.db"
+
+
+def _decode(completions):
+    start = date.fromisoformat(completions["start"])
+    raw = base64.b64decode(completions["bitmap"])
+    return [
+        start + timedelta(days=i)
+        for i in range(completions["days"])
+        if raw[i >> 3] & (1 << (i & 7))
+    ]
+
+
+def test_bitmap_round_trip():
+    start = date(2025, 1, 1)
+    days = [date(2024, 12, 31), start, date(2025, 1, 9), date(2025, 1, 10), date(2025, 2, 1)]
+    encoded = encode_day_bitmap(days, start, 10)
+    assert base64.b64decode(encoded) == bytes([0b00000001, 0b00000011])
+    assert _decode({"start": "2025-01-01", "days": 10, "bitmap": encoded}) == days[1:4]
+
+
+def test_all_goals_in_one_read_with_stats(test_db):
+    db = MoodDatabase(test_db)
+    user_id = db.create_user("bits", "bits@example.com", "Bits")
+    other_id = db.create_user("other", "other@example.com", "Other")
+    daily = db.create_goal(user_id, "Walk", "", frequency_type="daily", target_count=1)
+    weekly = db.create_goal(user_id, "Gym", "", frequency_per_week=2)
+    db.create_goal(other_id, "Theirs", "", frequency_type="daily", target_count=1)
+
+    # Four fully elapsed Mon-Sun weeks, ending the Sunday before last.
+    start = date.today() - timedelta(days=date.today().weekday() + 35)
+    end = start + timedelta(days=27)
+    walked = [start + timedelta(days=d) for d in (0, 1, 2, 4, 5, 6, 7, 8, 20)]
+    gym = [start + timedelta(days=d) for d in (0, 3, 7, 10, 21, 22)] + [start - timedelta(days=1)]
+    with db._write_transaction() as conn:
+        conn.executemany(
+            "INSERT INTO goal_completions (user_id, goal_id, date) VALUES (?, ?, ?)",
+            [(user_id, daily, d.isoformat()) for d in walked]
+            + [(user_id, weekly, d.isoformat()) for d in gym]
+            + [(other_id, daily + 2, start.isoformat())],
+        )
+
+    goals = {g["id"]: g for g in db.get_goals_with_completions(user_id, start.isoformat(), end.isoformat())}
+    assert set(goals) == {daily, weekly}
+
+    walk = goals[daily]["completions"]
+    assert _decode(walk) == walked
+    assert (walk["count"], walk["periods"], walk["periods_met"], walk["best_streak"]) == (9, 28, 9, 5)
+    assert walk["completion_rate"] == round(9 / 28, 4)
+
+    lift = goals[weekly]["completions"]
+    assert _decode(lift) == sorted(gym)[1:]  # the day before start is outside the bitmap
+    assert (lift["count"], lift["periods"], lift["periods_met"], lift["best_streak"]) == (6, 4, 3, 2)
+
+
+def test_range_validation(test_db):
+    db = MoodDatabase(test_db)
+    user_id = db.create_user("range", "range@example.com", "Range")
+    db.create_goal(user_id, "Read", "")
+    default = db.get_goals_with_completions(user_id)[0]["completions"]
+    assert default["days"] == 91 and default["start"] == (date.today() - timedelta(days=90)).isoformat()
+    for start, end in (("2025-02-01", "2025-01-01"), ("01/01/2025", None), ("2000-01-01", "2025-01-01")):
+        with pytest.raises(ValueError):
+            db.get_goals_with_completions(user_id, start, end)
+
+
+@pytest.fixture()
+def client():
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+    app = create_app("testing")
+    with app.test_client() as test_client:
+        yield test_client
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+def test_goals_endpoint_includes_completions(client):
+    token = client.post("/api/auth/local/login").get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    goal_id = client.post("/api/goals", headers=headers, json={"title": "Stretch", "frequency_per_week": 3}).get_json()["id"]
+    today = date.today().isoformat()
+    client.post(f"/api/goals/{goal_id}/toggle-completion", headers=headers, json={"date": today})
+
+    plain = client.get("/api/goals", headers=headers).get_json()
+    assert "completions" not in plain[0]
+
+    resp = client.get(f"/api/goals?include=completions&start={today}&end={today}", headers=headers)
+    assert resp.status_code == 200
+    completions = resp.get_json()[0]["completions"]
+    assert completions["days"] == 1 and _decode(completions) == [date.today()]
+
+    resp = client.get("/api/goals?include=completions&start=yesterday", headers=headers)
+    assert resp.status_code == 400
@@ -0,0 +1,105 @@
+"""Tests for the scheduled goal rollover sweep and the write-free goal reads."""
+
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from api.database import MoodDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MoodDatabase(str(tmp_path / "goals.db"))
+
+
+def _stored(db, user_id):
+    with db._read_conn() as conn:
+        return {
+            row["id"]: (row["completed"], row["streak"], row["period_start"])
+            for row in conn.execute("SELECT * FROM goals WHERE user_id = ?", (user_id,))
+        }
+
+
+def _goal(db, user_id, frequency_type, period_start, streak, completions, target=2):
+    goal_id = db.create_goal(
+        user_id, f"{frequency_type} goal", "", frequency_per_week=target,
+        frequency_type=frequency_type, target_count=target,
+    )
+    with db._write_transaction() as conn:
+        conn.execute(
+            "UPDATE goals SET completed = ?, streak = ?, period_start = ? WHERE id = ?",
+            (len(completions), streak, period_start, goal_id),
+        )
+        conn.executemany(
+            "INSERT INTO goal_completions (user_id, goal_id, date) VALUES (?, ?, ?)",
+            [(user_id, goal_id, day.isoformat()) for day in completions],
+        )
+    return goal_id
+
+
+def test_sweep_matches_what_reads_showed(db):
+    user_id = db.create_user("goals", "goals@example.com", "Goals")
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    this_monday = today - timedelta(days=today.weekday())
+    last_monday = this_monday - timedelta(days=7)
+    last_month = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+    ids = {
+        "daily_met": _goal(db, user_id, "daily", yesterday.isoformat(), 4, [yesterday], target=1),
+        "daily_missed": _goal(db, user_id, "daily", yesterday.isoformat(), 4, [], target=1),
+        "weekly_met": _goal(db, user_id, "weekly", last_monday.isoformat(), 2, [last_monday, last_monday + timedelta(days=3)]),
+        "weekly_short": _goal(db, user_id, "weekly", last_monday.isoformat(), 2, [last_monday]),
+        "weekly_skipped": _goal(db, user_id, "weekly", (last_monday - timedelta(days=14)).isoformat(), 5, []),
+        "monthly_met": _goal(db, user_id, "monthly", last_month.isoformat(), 0, [last_month, last_month + timedelta(days=5)]),
+        "current": _goal(db, user_id, "weekly", this_monday.isoformat(), 3, [this_monday]),
+    }
+    before = _stored(db, user_id)
+
+    shown = {goal["id"]: goal for goal in db.get_goals(user_id)}
+    assert _stored(db, user_id) == before  # reads never write
+    assert db.get_goal_by_id(user_id, ids["weekly_met"])["streak"] == 3
+
+    assert db.rollover_goals() == 6
+    after = _stored(db, user_id)
+    assert after == {
+        goal_id: (goal["completed"], goal["streak"], goal["period_start"])
+        for goal_id, goal in shown.items()
+    }
+    assert {name: after[goal_id][1] for name, goal_id in ids.items()} == {
+        "daily_met": 5,
+        "daily_missed": 0,
+        "weekly_met": 3,
+        "weekly_short": 0,
+        "weekly_skipped": 0,
+        "monthly_met": 1,
+        "current": 3,
+    }
+    assert after[ids["current"]] == before[ids["current"]]
+    assert db.rollover_goals() == 0
+
+
+def test_goal_reads_do_not_wait_for_writers(db):
+    user_id = db.create_user("reader", "reader@example.com", "Reader")
+    last_monday = date.today() - timedelta(days=date.today().weekday() + 7)
+    goal_id = _goal(db, user_id, "weekly", last_monday.isoformat(), 1, [last_monday])
+
+    writer = sqlite3.connect(db.db_path, timeout=0)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        goals = db.get_goals(user_id)
+    finally:
+        writer.rollback()
+        writer.close()
+    assert [(g["id"], g["completed"], g["streak"]) for g in goals] == [(goal_id, 0, 0)]
+
+
+def test_progress_after_boundary_persists_the_rollover(db):
+    user_id = db.create_user("progress", "progress@example.com", "Progress")
+    last_monday = date.today() - timedelta(days=date.today().weekday() + 7)
+    goal_id = _goal(db, user_id, "weekly", last_monday.isoformat(), 1, [last_monday, last_monday + timedelta(days=1)])
+
+    goal = db.increment_goal_progress(user_id, goal_id)
+    assert (goal["completed"], goal["streak"]) == (1, 2)
+    assert db.rollover_goals() == 0
@@ -0,0 +1,116 @@
+"""Tests for the optional group-commit writer."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from api.database import MoodDatabase
+from api.database_common import DatabaseError, GroupCommitWriter, get_write_lock
+
+
+@pytest.fixture
+def gc_db(test_db):
+    db = MoodDatabase(test_db, group_commit=True)
+    user_id = db.create_user("gc_user", "gc@example.com", "Group Commit")
+    yield db, user_id
+    db.close()
+
+
+def test_concurrent_writes_are_batched(gc_db):
+    db, user_id = gc_db
+    start = threading.Barrier(16)
+    errors = []
+
+    def worker(i):
+        try:
+            start.wait()
+            for j in range(10):
+                db.add_mood_entry(user_id, f"2026-01-{(j % 28) + 1:02d}", 3, f"t{i}-{j}")
+        except Exception as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(db.get_all_mood_entries(user_id)) == 160
+
+    stats = db.write_stats()
+    assert stats["operations"] == 160
+    assert stats["failed_operations"] == 0
+    assert stats["batches"] <= stats["operations"]
+    assert stats["max_batch_size"] >= 1
+    assert stats["pending"] == 0
+    assert stats["queue_wait_max_ms"] >= 0
+
+
+def test_failed_operation_does_not_poison_batch(test_db):
+    MoodDatabase(test_db)
+    writer = GroupCommitWriter(test_db)
+
+    def insert_user(name):
+        def _op(conn):
+            return conn.execute(
+                "INSERT INTO users (google_id, email, name) VALUES (?, ?, ?)",
+                (name, f"{name}@example.com", name),
+            ).lastrowid
+        return _op
+
+    def explode(conn):
+        conn.execute(
+            "INSERT INTO users (google_id, email, name) VALUES ('ghost', 'g@example.com', 'ghost')"
+        )
+        raise ValueError("boom")
+
+    # Holding the write lock parks the writer so the requests queue up together.
+    with get_write_lock(test_db):
+        futures = [
+            writer.submit(insert_user("alice")),
+            writer.submit(explode),
+            writer.submit(insert_user("bob")),
+        ]
+
+    assert futures[0].result(timeout=5) > 0
+    with pytest.raises(ValueError):
+        futures[1].result(timeout=5)
+    assert futures[2].result(timeout=5) > 0
+    writer.close()
+
+    conn = sqlite3.connect(test_db)
+    names = {row[0] for row in conn.execute("SELECT google_id FROM users")}
+    conn.close()
+    assert {"alice", "bob"} <= names
+    assert "ghost" not in names
+
+    stats = writer.stats()
+    assert stats["failed_operations"] == 1
+    assert stats["failed_batches"] == 0
+
+
+def test_update_and_delete_through_writer(gc_db):
+    db, user_id = gc_db
+    entry_id = db.add_mood_entry(user_id, "2026-02-01", 2, "before", selected_options=None)
+
+    assert db.update_mood_entry(user_id, entry_id, mood=5, content="after words")
+    assert db.get_mood_entry_by_id(user_id, entry_id)["mood"] == 5
+    assert db.delete_mood_entry(user_id, entry_id) is True
+    assert db.delete_mood_entry(user_id, entry_id) is False
+
+
+def test_closed_writer_rejects_submissions(gc_db):
+    db, user_id = gc_db
+    db.add_mood_entry(user_id, "2026-03-01", 4, "ok")
+    db._writer.close()
+    with pytest.raises(DatabaseError):
+        db.add_mood_entry(user_id, "2026-03-02", 4, "too late")
+
+
+def test_writer_disabled_by_default(db_with_user):
+    db, user_id = db_with_user
+    db.add_mood_entry(user_id, "2026-04-01", 3, "direct")
+    assert db._writer is None
+    assert db.write_stats() == {}
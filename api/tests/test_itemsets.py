@@ -0,0 +1,118 @@
+"""Tests for the bitset Eclat itemset miner and /api/analytics/itemsets."""
+
+import os
+import random
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from api.app import create_app
+from api.database import MoodDatabase
+from api.services.itemset_miner import Transactions, mine_itemsets, mood_itemsets
+
+TEST_DB_PATH = "/tmp/twilightio_test.db"
+
+
+def _transactions(rows):
+    """Build bitsets from ``[(mood, [option ids]), ...]``."""
+    option_bits, mood_bits = {}, {}
+    for position, (mood, items) in enumerate(rows):
+        for option_id in set(items):
+            option_bits[option_id] = option_bits.get(option_id, 0) | (1 << position)
+        mood_bits[mood] = mood_bits.get(mood, 0) | (1 << position)
+    return Transactions(len(rows), option_bits, mood_bits)
+
+
+def test_eclat_matches_enumeration():
+    rng = random.Random(15)
+    rows = [(rng.randint(1, 5), rng.sample(range(1, 13), rng.randint(0, 7))) for _ in range(400)]
+    result = mine_itemsets(_transactions(rows), min_count=8, min_size=2, max_size=4)
+    assert not result["truncated"]
+
+    expected = Counter()
+    moods = Counter()
+    for mood, items in rows:
+        for size in (2, 3, 4):
+            for combo in combinations(sorted(set(items)), size):
+                expected[combo] += 1
+                moods[combo] += mood
+    expected = {k: v for k, v in expected.items() if v >= 8}
+
+    assert {s["items"]: s["count"] for s in result["itemsets"]} == expected
+    assert all(s["mood_sum"] == moods[s["items"]] for s in result["itemsets"])
+
+
+def test_budget_truncates_search():
+    rows = [(3, list(range(1, 16))) for _ in range(20)]
+    result = mine_itemsets(_transactions(rows), min_count=3, max_size=5, max_nodes=50)
+    assert result["truncated"]
+    assert result["nodes"] <= 51
+
+    assert result["truncated_by"] == "nodes"
+
+    expired = mine_itemsets(_transactions(rows), min_count=3, max_size=5, time_budget=-1)
+    assert expired["truncated"]
+
+    capped = mine_itemsets(_transactions(rows), min_count=3, max_size=5, max_bytes=1024)
+    assert capped["truncated_by"] == "memory"
+    assert len(capped["itemsets"]) <= 1024 // 256 + 1
+
+
+def test_mood_itemsets_split_high_and_low(tmp_path):
+    db = MoodDatabase(str(tmp_path / "itemsets.db"))
+    user_id = db.create_user("miner", "miner@example.com", "Miner")
+    options = [o["id"] for g in db.get_groups_for_user(user_id) for o in g["options"]][:8]
+    good, bad = options[:3], options[3:7]
+    for i in range(12):
+        db.add_mood_entry(user_id, f"2026-03-{i + 1:02d}", 5, "x", selected_options=good)
+        db.add_mood_entry(user_id, f"2026-04-{i + 1:02d}", 1, "x", selected_options=bad)
+        db.add_mood_entry(user_id, f"2026-05-{i + 1:02d}", 3, "x", selected_options=[options[7]])
+
+    with db._read_conn() as conn:
+        result = mood_itemsets(conn, user_id, min_support=0.1, max_size=4)
+
+    assert result["entry_count"] == 36 and result["min_count"] == 4
+    assert {tuple(o["id"] for o in s["options"]) for s in result["high"]} == {tuple(sorted(good))}
+    assert result["high"][0]["average_mood"] == 5.0 and result["high"][0]["mood_delta"] == 2.0
+    low = {tuple(o["id"] for o in s["options"]) for s in result["low"]}
+    # Every 3- and 4-subset of the bad tags, nothing smaller.
+    assert low == {c for n in (3, 4) for c in combinations(sorted(bad), n)}
+
+
+@pytest.fixture()
+def client():
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+    app = create_app("testing")
+    with app.test_client() as test_client:
+        yield test_client
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+def test_itemsets_endpoint(client):
+    token = client.post("/api/auth/local/login").get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    groups = client.get("/api/groups", headers=headers).get_json()
+    options = [o["id"] for g in groups for o in g["options"]][:3]
+    for day in range(1, 6):
+        resp = client.post(
+            "/api/mood",
+            headers=headers,
+            json={"mood": 5, "date": f"2024-02-{day:02d}", "content": "x", "selected_options": options},
+        )
+        assert resp.status_code == 201
+    client.post(
+        "/api/mood", headers=headers, json={"mood": 1, "date": "2024-02-09", "content": "x"}
+    )
+
+    resp = client.get("/api/analytics/itemsets?min_support=0.5&max_size=3", headers=headers)
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["max_size"] == 3 and not body["truncated"]
+    assert [s["count"] for s in body["high"]] == [5]
+
+    assert client.get("/api/analytics/itemsets?max_size=9", headers=headers).status_code == 400
+    assert client.get("/api/analytics/itemsets?min_support=2", headers=headers).status_code == 400
+    assert client.get("/api/analytics/itemsets").status_code == 401
@@ -0,0 +1,119 @@
+import os
+
+import pytest
+
+from api.app import create_app
+from api.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+TEST_DB_PATH = "/tmp/twilightio_test.db"
+
+
+def _reset_test_db():
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+@pytest.fixture()
+def client():
+    _reset_test_db()
+    app = create_app("testing")
+    with app.test_client() as test_client:
+        yield test_client
+    _reset_test_db()
+
+
+def _auth_headers(client):
+    resp = client.post("/api/auth/local/login")
+    assert resp.status_code == 200
+    token = resp.get_json()["token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _seed(client, headers, count=12):
+    for i in range(count):
+        resp = client.post(
+            "/api/mood",
+            headers=headers,
+            json={
+                "mood": (i % 5) + 1,
+                "date": f"2024-02-{(i % 6) + 1:02d}",
+                "time": f"2024-02-{(i % 6) + 1:02d}T09:{i:02d}:00",
+                "content": f"walk number {i}",
+                "selected_options": [],
+            },
+        )
+        assert resp.status_code == 201
+
+
+def _walk(client, headers, url):
+    ids, totals, cursor = [], [], ""
+    while True:
+        sep = "&" if "?" in url else "?"
+        resp = client.get(f"{url}{sep}cursor={cursor}", headers=headers)
+        assert resp.status_code == 200
+        body = resp.get_json()
+        ids.extend(e["id"] for e in body["data"])
+        totals.append(body["pagination"].get("total"))
+        cursor = body["pagination"]["next_cursor"]
+        if not cursor:
+            assert body["pagination"]["has_next"] is False
+            return ids, totals
+
+
+def test_moods_keyset_pages_match_full_listing(client):
+    headers = _auth_headers(client)
+    _seed(client, headers)
+
+    full = [e["id"] for e in client.get("/api/moods", headers=headers).get_json()]
+    ids, totals = _walk(client, headers, "/api/moods?limit=5&include_total=1")
+
+    assert ids == full
+    # Counted on the first page, then carried forward in the cursor.
+    assert totals == [12, 12, 12]
+
+
+def test_moods_without_limit_keeps_legacy_list(client):
+    headers = _auth_headers(client)
+    _seed(client, headers, count=3)
+
+    body = client.get("/api/moods", headers=headers).get_json()
+    assert isinstance(body, list) and len(body) == 3
+
+
+def test_moods_keyset_page_hydrates_includes(client):
+    headers = _auth_headers(client)
+    _seed(client, headers, count=3)
+
+    body = client.get("/api/moods?limit=2&include=selections,scales", headers=headers).get_json()
+    assert len(body["data"]) == 2
+    assert all("selections" in e and "scale_entries" in e for e in body["data"])
+    assert "total" not in body["pagination"]
+
+
+def test_search_keyset_pages(client):
+    headers = _auth_headers(client)
+    _seed(client, headers)
+
+    offset = client.get("/api/search?q=walk&per_page=100", headers=headers).get_json()
+    ids, totals = _walk(client, headers, "/api/search?q=walk&limit=4&include_total=true")
+
+    assert ids == [e["id"] for e in offset["data"]]
+    assert totals == [12, 12, 12]
+
+
+def test_invalid_cursor_is_rejected(client):
+    headers = _auth_headers(client)
+    moods_cursor = encode_cursor("moods", ["2024-01-01 00:00:00", "2024-01-01", 1])
+
+    assert client.get("/api/moods?cursor=not-a-cursor", headers=headers).status_code == 400
+    assert client.get(f"/api/search?cursor={moods_cursor}", headers=headers).status_code == 400
+
+
+def test_cursor_round_trip_and_validation():
+    token = encode_cursor("moods", ["a", "b", 3], total=9)
+    assert decode_cursor(token, "moods", (str, str, int)) == (("a", "b", 3), 9)
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor("moods", ["a", "b", True]), "moods", (str, str, int))
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor("moods", ["a", 3]), "moods", (str, str, int))
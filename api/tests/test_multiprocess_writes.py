@@ -0,0 +1,154 @@
+"""Cross-process write stress tests (the N gunicorn sync workers case).
+
+Reuses the scenarios from ``test_concurrent_writes.py`` but runs the writers in
+separate OS processes, each with its own threads, so the in-process thread
+lock alone cannot serialize them.
+"""
+
+import multiprocessing
+import threading
+
+import pytest
+
+from api.database import MoodDatabase
+
+PROCESSES = 4
+THREADS = 3
+WRITES = 10
+
+try:
+    _ctx = multiprocessing.get_context("fork")
+except ValueError:  # pragma: no cover - Windows
+    _ctx = None
+
+pytestmark = pytest.mark.skipif(_ctx is None, reason="requires fork()")
+
+
+def _run_threads(target, *args):
+    errors = []
+
+    def wrapped(thread_id):
+        try:
+            target(thread_id, *args)
+        except Exception as exc:  # pragma: no cover - reported to parent
+            errors.append(repr(exc))
+
+    threads = [threading.Thread(target=wrapped, args=(t,)) for t in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+def _entry_worker(db_path, user_id, proc_id, results):
+    # Fresh instance per process, like gunicorn workers without preload_app.
+    db = MoodDatabase(db_path, init=False)
+
+    def create_entries(thread_id):
+        for i in range(WRITES):
+            db.add_mood_entry(
+                user_id=user_id,
+                date=f"2026-{proc_id + 1:02d}-{i + 1:02d}",
+                mood=(i % 5) + 1,
+                content=f"proc {proc_id} thread {thread_id} entry {i}",
+            )
+
+    results.put(_run_threads(create_entries))
+
+
+def _counter_worker(db, proc_id, results):
+    # ``db`` was created in the parent and inherited through fork (preload_app).
+    def increment(thread_id):
+        for _ in range(WRITES):
+            with db._write_transaction() as conn:
+                value = conn.execute("SELECT value FROM stress_counter WHERE id = 1").fetchone()[0]
+                conn.execute("UPDATE stress_counter SET value = ? WHERE id = 1", (value + 1,))
+
+    results.put(_run_threads(increment))
+
+
+def _mixed_worker(db_path, user_id, proc_id, results):
+    db = MoodDatabase(db_path, init=False)
+
+    def work(thread_id):
+        if thread_id == 0:
+            for i in range(WRITES):
+                db.add_mood_entry(user_id, f"2026-03-{i + 1:02d}", 4, f"p{proc_id} write {i}")
+        else:
+            for _ in range(WRITES * 2):
+                db.get_all_mood_entries(user_id)
+
+    results.put(_run_threads(work))
+
+
+def _run_processes(target, *args):
+    results = _ctx.Queue()
+    procs = [_ctx.Process(target=target, args=(*args, p, results)) for p in range(PROCESSES)]
+    for p in procs:
+        p.start()
+    errors = []
+    for _ in procs:
+        errors.extend(results.get(timeout=120))
+    for p in procs:
+        p.join(timeout=30)
+        assert p.exitcode == 0
+    return errors
+
+
+def test_multiprocess_mood_entries(db_with_user):
+    db, user_id = db_with_user
+
+    errors = _run_processes(_entry_worker, db.db_path, user_id)
+
+    assert errors == [], f"Errors during multiprocess writes: {errors}"
+    entries = db.get_all_mood_entries(user_id)
+    assert len(entries) == PROCESSES * THREADS * WRITES
+    assert len({e["id"] for e in entries}) == len(entries)
+
+
+def test_multiprocess_read_modify_write_loses_no_updates(initialized_db):
+    db = initialized_db
+    with db._write_transaction() as conn:
+        conn.execute("CREATE TABLE stress_counter (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.execute("INSERT INTO stress_counter (id, value) VALUES (1, 0)")
+
+    errors = _run_processes(_counter_worker, db)
+
+    assert errors == [], f"Errors during multiprocess increments: {errors}"
+    with db._conn() as conn:
+        value = conn.execute("SELECT value FROM stress_counter WHERE id = 1").fetchone()[0]
+    assert value == PROCESSES * THREADS * WRITES
+
+
+def test_multiprocess_mixed_reads_and_writes(db_with_user):
+    db, user_id = db_with_user
+
+    errors = _run_processes(_mixed_worker, db.db_path, user_id)
+
+    assert errors == [], f"Errors during multiprocess read/write: {errors}"
+    assert len(db.get_all_mood_entries(user_id)) == PROCESSES * WRITES
+
+
+def test_write_lock_is_shared_per_database(test_db, tmp_path):
+    from api.database_common import get_write_lock
+
+    assert get_write_lock(test_db) is get_write_lock(str(tmp_path / "." / "test.db"))
+    assert get_write_lock(test_db) is not get_write_lock(str(tmp_path / "other.db"))
+    with get_write_lock(test_db) as lock:
+        assert lock.lock_path.endswith("test.db.lock")
+    assert get_write_lock(test_db).stats()["acquired"] >= 1
+
+
+def test_nested_write_raises_instead_of_deadlocking(db_with_user):
+    from api.database_common import DatabaseError
+
+    db, user_id = db_with_user
+
+    def outer(conn):
+        return db._run_write(lambda inner: None)
+
+    with pytest.raises(DatabaseError, match="Nested write"):
+        db._run_write(outer)
+    # The lock was released on the way out.
+    db.add_mood_entry(user_id, "2024-01-01", 3, "after")
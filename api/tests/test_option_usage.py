@@ -0,0 +1,154 @@
+"""Tests for the trigger-maintained option and pair usage counters."""
+
+import random
+from collections import Counter
+from datetime import date, timedelta
+from itertools import combinations
+
+from api.database import MoodDatabase
+
+
+def _counters(db, user_id):
+    with db._read_conn() as conn:
+        usage = Counter()
+        for option_id, month, mood, count in conn.execute(
+            "SELECT option_id, month, mood, entry_count FROM option_usage WHERE user_id = ?",
+            (user_id,),
+        ):
+            usage[(option_id, month, mood)] = count
+        pairs = Counter()
+        for a, b, month, mood, count in conn.execute(
+            "SELECT option1_id, option2_id, month, mood, pair_count "
+            "FROM option_pair_usage WHERE user_id = ?",
+            (user_id,),
+        ):
+            pairs[(a, b, month, mood)] = count
+    return usage, pairs
+
+
+def _expected(db, user_id):
+    usage, pairs = Counter(), Counter()
+    entries = db.get_all_mood_entries(user_id)
+    selections = db.get_selections_for_entries([e["id"] for e in entries])
+    for entry in entries:
+        month = entry["date"][:7]
+        options = sorted(s["id"] for s in selections[entry["id"]])
+        for option_id in options:
+            usage[(option_id, month, entry["mood"])] += 1
+        for a, b in combinations(options, 2):
+            pairs[(a, b, month, entry["mood"])] += 1
+    return usage, pairs
+
+
+def _seed(db, user_id, count, rng):
+    options = [o["id"] for g in db.get_groups_for_user(user_id) for o in g["options"]][:8]
+    ids = []
+    for _ in range(count):
+        day = f"2026-0{rng.randint(1, 3)}-1{rng.randint(0, 9)}"
+        ids.append(
+            db.add_mood_entry(
+                user_id, day, rng.randint(1, 5), "x", selected_options=rng.sample(options, rng.randint(0, 4))
+            )
+        )
+    return ids, options
+
+
+def test_counters_stay_exact_through_edits(db_with_user):
+    db, user_id = db_with_user
+    rng = random.Random(5)
+    ids, options = _seed(db, user_id, 40, rng)
+    assert _counters(db, user_id) == _expected(db, user_id)
+
+    for entry_id in ids[:10]:
+        db.update_mood_entry(
+            user_id, entry_id, mood=rng.randint(1, 5), selected_options=rng.sample(options, 3)
+        )
+    db.update_mood_entry(user_id, ids[10], date="2025-12-31")
+    for entry_id in ids[30:]:
+        db.delete_mood_entry(user_id, entry_id)
+    db.delete_group_option(options[0])
+
+    usage, pairs = _counters(db, user_id)
+    assert (usage, pairs) == _expected(db, user_id)
+    assert all(count > 0 for count in list(usage.values()) + list(pairs.values()))
+
+
+def test_pruning_only_visits_the_decremented_keys(db_with_user):
+    db, user_id = db_with_user
+    options = [o["id"] for g in db.get_groups_for_user(user_id) for o in g["options"]][:3]
+    db.add_mood_entry(user_id, "2026-01-05", 4, "x", selected_options=options[:2])
+    gone = db.add_mood_entry(user_id, "2026-02-05", 2, "x", selected_options=options)
+    with db._write_transaction() as conn:
+        # An emptied row no trigger decremented: a scan of the user would drop it.
+        conn.execute(
+            "INSERT INTO option_usage (user_id, option_id, month, mood, entry_count) "
+            "VALUES (?, ?, '2019-01', 3, 0)",
+            (user_id, options[0]),
+        )
+
+    db.delete_mood_entry(user_id, gone)
+    usage, pairs = _counters(db, user_id)
+    assert dict(usage) == {
+        **{(o, "2026-01", 4): 1 for o in options[:2]},
+        (options[0], "2019-01", 3): 0,
+    }
+    assert set(pairs) == {(*sorted(options[:2]), "2026-01", 4)}
+    with db._read_conn() as conn:
+        triggers = " ".join(
+            row[0] for row in conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'option_usage_%'"
+            )
+        )
+    assert "user_id = old.user_id AND entry_count" not in triggers
+
+
+def test_rebuild_matches_trigger_state(db_with_user):
+    db, user_id = db_with_user
+    _seed(db, user_id, 25, random.Random(8))
+    before = _counters(db, user_id)
+
+    with db._write_transaction() as conn:
+        conn.execute("DELETE FROM option_pair_usage")
+    db.rebuild_option_usage(user_id)
+    assert _counters(db, user_id) == before
+
+
+def test_correlations_read_counters(tmp_path):
+    db = MoodDatabase(str(tmp_path / "usage.db"))
+    user_id = db.create_user("usage", "u@example.com", "Usage")
+    a, b, c = [o["id"] for g in db.get_groups_for_user(user_id) for o in g["options"]][:3]
+    recent = date.today().isoformat()
+    old = (date.today() - timedelta(days=400)).isoformat()
+    for _ in range(3):
+        db.add_mood_entry(user_id, recent, 5, "x", selected_options=[a, b])
+    for _ in range(4):
+        db.add_mood_entry(user_id, old, 1, "x", selected_options=[a, b, c])
+
+    pair = next(p for p in db.get_tag_co_occurrence(user_id) if (p["option1_id"], p["option2_id"]) == (min(a, b), max(a, b)))
+    assert pair["frequency"] == 7
+    assert {p["frequency"] for p in db.get_tag_co_occurrence_by_mood(user_id, 1)} == {4}
+
+    # All-time by default: the old entries count too.
+    all_time = {(r["option1_id"], r["option2_id"]): r for r in db.get_advanced_correlations(user_id)}
+    assert all_time[(min(a, b), max(a, b))]["frequency"] == 7
+    assert all_time[(min(a, b), max(a, b))]["support"] == 1.0
+    recent_only = db.get_advanced_correlations(user_id, days=180)
+    assert [r["frequency"] for r in recent_only] == [3]
+
+    activities = {row["id"]: row for row in db.get_activity_correlations(user_id)}
+    assert activities[a]["count"] == 7
+    assert activities[a]["average_mood"] == (3 * 5 + 4 * 1) / 7
+
+
+def test_windowed_support_counts_both_date_formats(tmp_path):
+    db = MoodDatabase(str(tmp_path / "formats.db"))
+    user_id = db.create_user("formats", "f@example.com", "Formats")
+    a, b = [o["id"] for g in db.get_groups_for_user(user_id) for o in g["options"]][:2]
+    day = date.today() - timedelta(days=2)
+    for stored in (day.isoformat(), day.strftime("%m/%d/%Y")) * 2:
+        db.add_mood_entry(user_id, stored, 4, "x", selected_options=[a, b])
+
+    (pair,) = db.get_advanced_correlations(user_id, days=30)
+    assert pair["frequency"] == 4
+    assert pair["support"] == 1.0
+    assert pair["confidence_1_to_2"] == 1.0
@@ -0,0 +1,119 @@
+"""Tests for opt-in SQL instrumentation and the admin query-stats endpoint."""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from jose import jwt
+
+import api.config as config_module
+from api.app import create_app
+from api.database import MoodDatabase
+from api.database_instrumentation import QueryStats, normalize_sql
+
+TEST_DB_PATH = "/tmp/twilightio_test.db"
+
+
+def _reset_test_db():
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+def _stat(db, fragment):
+    for stat in db.query_stats()["statements"]:
+        if fragment in stat["sql"]:
+            return stat
+    raise AssertionError(f"no stats recorded for {fragment!r}")
+
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    assert normalize_sql("SELECT *  FROM t\n WHERE id = 42 AND name = 'x''y'") == (
+        "SELECT * FROM t WHERE id = ? AND name = ?"
+    )
+    assert normalize_sql("DELETE FROM t WHERE id IN (?, ?, ?)") == "DELETE FROM t WHERE id IN (?...)"
+
+
+def test_records_count_rows_and_percentiles(test_db):
+    db = MoodDatabase(test_db, instrument_queries=True)
+    user_id = db.create_user("stats", "s@example.com", "Stats")
+    for i in range(3):
+        db.add_mood_entry(user_id, f"2026-01-0{i + 1}", 3, f"entry {i}")
+    for _ in range(4):
+        db.get_all_mood_entries(user_id)
+
+    insert = _stat(db, "INSERT INTO mood_entries")
+    assert insert["count"] == 3
+    assert insert["rows"] == 3
+
+    select = _stat(db, "FROM mood_entries WHERE user_id = ? ORDER BY created_at")
+    assert select["count"] == 4
+    assert select["rows"] == 12
+    assert 0 <= select["p50_ms"] <= select["p95_ms"] <= select["p99_ms"] <= select["max_ms"]
+
+
+def test_instrumentation_is_off_by_default(db_with_user):
+    db, _ = db_with_user
+    assert db.query_stats() == {}
+
+
+def test_slow_query_log_names_caller_and_plan(test_db, caplog):
+    db = MoodDatabase(test_db, instrument_queries=True, slow_query_ms=0)
+    user_id = db.create_user("slow", "slow@example.com", "Slow")
+
+    with caplog.at_level(logging.WARNING, logger="api.database.slow_queries"):
+        db.get_all_mood_entries(user_id)
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "api.database.slow_queries"]
+    line = next(m for m in messages if "FROM mood_entries WHERE user_id = ? ORDER BY created_at" in m)
+    assert "database_moods.get_all_mood_entries" in line
+    assert "SEARCH" in line or "SCAN" in line
+
+
+def test_query_stats_reset():
+    stats = QueryStats(slow_query_ms=None)
+    stats.record("SELECT 1", 1.0, 1)
+    assert stats.snapshot()["statement_count"] == 1
+    stats.reset()
+    assert stats.snapshot()["statements"] == []
+
+
+@pytest.fixture()
+def app(monkeypatch):
+    monkeypatch.setattr(config_module.TestingConfig, "DATABASE_QUERY_STATS", True, raising=False)
+    _reset_test_db()
+    yield create_app("testing")
+    _reset_test_db()
+
+
+def _token(app, user_id):
+    payload = {
+        "user_id": user_id,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        "iat": datetime.now(timezone.utc),
+    }
+    return jwt.encode(payload, app.config["JWT_SECRET_KEY"], algorithm="HS256")
+
+
+def test_admin_endpoint_requires_admin(app):
+    with app.test_client() as client:
+        token = client.post("/api/auth/local/login").get_json()["token"]
+        resp = client.get(
+            "/api/admin/db/query-stats", headers={"Authorization": f"Bearer {token}"}
+        )
+    assert resp.status_code == 403
+
+
+def test_admin_endpoint_returns_stats(app):
+    admin = app.extensions["user_service"].get_user_by_username("admin")
+    headers = {"Authorization": f"Bearer {_token(app, admin['id'])}"}
+
+    with app.test_client() as client:
+        resp = client.get("/api/admin/db/query-stats?limit=5", headers=headers)
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert body["enabled"] is True
+        assert len(body["queries"]["statements"]) <= 5
+        assert body["queries"]["statement_count"] >= 1
+
+        assert client.delete("/api/admin/db/query-stats", headers=headers).status_code == 200
@@ -0,0 +1,297 @@
+"""EXPLAIN QUERY PLAN regression suite for the hot database queries.
+
+A realistic database is seeded, the public mixin methods (plus the
+scheduler's job queries) are exercised with instrumentation on, and
+every distinct statement that ran is re-planned with ``EXPLAIN QUERY
+PLAN``.  The suite fails when a statement full-scans a table, or sorts a
+query over one of the unbounded per-user tables with a temp B-tree.
+
+When a new query trips it, add an index in a schema migration.  Only
+statements whose scan or sort is inherent (a deliberate sweep, ordering
+aggregated output, or a result already bounded to one entry or one date
+window) belong in ``SCAN_ALLOWED`` / ``SORT_ALLOWED``, each with the
+reason.
+"""
+
+import random
+import re
+import sqlite3
+
+import pytest
+
+from api.database import MoodDatabase
+from api.database_instrumentation import QueryStats, _find_caller, normalize_sql
+from api.services.scheduler_service import SchedulerService
+
+# Tables that grow with every user's history; sorting these needs an index.
+LARGE_TABLES = {
+    "mood_entries",
+    "entry_selections",
+    "scale_entries",
+    "media_attachments",
+    "goal_completions",
+    "reminders",
+    "achievements",
+    "users",
+    "daily_mood_rollup",
+    "option_usage",
+    "option_pair_usage",
+    "push_subscriptions",
+    "failed_login_attempts",
+}
+
+SORT_ALLOWED = {
+    # Range on date, ordered by created_at: sorts only the requested window.
+    "database_moods.get_mood_entries_by_date_range",
+    # Selections of a single entry.
+    "database_groups.get_entry_selections",
+    # ORDER BY an aggregate (count / average / lift) cannot come from an index.
+    "database_analytics.get_activity_correlations",
+    "database_analytics._pair_frequencies",
+}
+
+# (caller, table) pairs whose full scan is the point of the query.
+SCAN_ALLOWED = {
+    # Daily sweep over every subscribed user, answered from the covering index.
+    ("scheduler_service.check_important_day_reminders", "push_subscriptions"),
+    # Period rollover visits every goal once per day.
+    ("database_goals.rollover_goals", "goals"),
+}
+
+# Statements run through their own connections rather than the mixins.
+SERVICE_STATEMENTS = (
+    (
+        "login_attempt_service.is_account_locked",
+        "SELECT attempted_at, success FROM failed_login_attempts "
+        "WHERE username = ? AND attempted_at > ? ORDER BY attempted_at DESC",
+    ),
+    (
+        "login_attempt_service.cleanup_old_attempts",
+        "DELETE FROM failed_login_attempts WHERE attempted_at < ?",
+    ),
+    (
+        "push_service.send_notification",
+        "SELECT endpoint, p256dh_key, auth_key FROM push_subscriptions WHERE user_id = ?",
+    ),
+    (
+        "push_service._delete_subscription",
+        "DELETE FROM push_subscriptions WHERE endpoint = ?",
+    ),
+)
+
+_ALIAS_RE = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_NOT_ALIASES = {"where", "on", "join", "left", "inner", "cross", "group", "order", "limit", "set", "using", "values"}
+
+
+class _CapturingStats(QueryStats):
+    """Keeps the first raw statement, parameters and caller per query shape."""
+
+    def __init__(self):
+        super().__init__(slow_query_ms=None)
+        self.statements = {}
+
+    def record(self, sql, elapsed_ms, rows, *, error=False, conn=None, params=None):
+        key = normalize_sql(sql)
+        if not error and key not in self.statements:
+            snapshot = tuple(params) if isinstance(params, (list, tuple)) else params
+            self.statements[key] = (_find_caller(), sql, snapshot)
+        super().record(sql, elapsed_ms, rows, error=error, conn=conn, params=params)
+
+
+def _seed(db, scheduler):
+    rng = random.Random(7)
+    user_id = db.create_user("plan-1", "plans@example.com", "Plans")
+    other_id = db.create_user("plan-2", "other@example.com", "Other")
+    options = [o["id"] for g in db.get_groups_for_user(user_id) for o in g["options"]]
+    scales = [s["id"] for s in db.get_user_scales(user_id)]
+
+    entry_ids = []
+    for i in range(400):
+        day = f"2025-{(i // 28) % 12 + 1:02d}-{i % 28 + 1:02d}"
+        owner = other_id if i % 5 == 0 else user_id
+        entry_id = db.add_mood_entry(
+            owner,
+            day,
+            rng.randint(1, 5),
+            "walked and wrote " * rng.randint(1, 20),
+            time=f"{day} {i % 24:02d}:00:00",
+            selected_options=rng.sample(options, 3),
+        )
+        entry_ids.append(entry_id)
+        if i % 3 == 0:
+            db.save_scale_entries(entry_id, {s: rng.randint(1, 10) for s in scales})
+        if i % 10 == 0:
+            db.add_media_attachment(entry_id, f"media_{i}.jpg", "image/jpeg", None)
+
+    goal_id = db.create_goal(user_id, "Walk", "", frequency_per_week=3)
+    for day in range(1, 29):
+        db.toggle_goal_completion(user_id, goal_id, f"2025-01-{day:02d}")
+    db.create_important_day(user_id, "Birthday", "2026-05-01")
+    for i in range(40):
+        scheduler.create_reminder(user_id if i % 2 else other_id, f"{i % 24:02d}:00", [0, 1, 2])
+    return user_id, other_id, entry_ids, options, goal_id
+
+
+def _workload(db, scheduler, user_id, other_id, entry_ids, options, goal_id):
+    entry_id = entry_ids[11]
+    db.get_all_mood_entries(user_id)
+    db.get_mood_entries_paginated(user_id, 2, 10)
+    first = db.get_mood_entries_page(user_id, limit=10, include_total=True)
+    db.get_mood_entries_page(user_id, limit=10, after=first["next"])
+    db.get_mood_entries_by_date_range(user_id, "2025-01-01", "2025-02-01")
+    db.get_mood_entry_by_id(user_id, entry_id)
+    db.verify_entry_ownership(entry_id, user_id)
+    db.update_mood_entry(user_id, entry_id, mood=3, content="edited", selected_options=options[:2])
+    db.search_mood_entries(user_id, "walked", [1, 2], "2025-01-01", "2025-12-31")
+    db.search_mood_entries(user_id, "", None)
+    page = db.search_mood_entries_page(user_id, "walked", limit=5)
+    db.search_mood_entries_page(user_id, "walked", limit=5, after=page["next"])
+
+    db.get_selections_for_entries(entry_ids[:50])
+    db.get_entry_selections(entry_id)
+    db.get_scale_entries_for_entries(entry_ids[:50])
+    db.get_scale_entries_for_mood(entry_id)
+    db.get_user_scale_entries(user_id, "2025-01-01", "2025-06-01")
+    db.get_scale_averages(user_id, 3650)
+    db.get_media_for_entries(entry_ids[:50])
+    db.get_media_for_entry(entry_ids[10])
+    db.get_media_by_filename("media_10.jpg")
+    db.get_all_media_for_user(user_id, start_date="2025-01-01", end_date="2025-12-31")
+
+    db.get_mood_statistics(user_id)
+    db.get_mood_counts(user_id)
+    db.get_streak_details(user_id)
+    db.get_journaling_streak(user_id)
+    db.get_longest_journaling_streak(user_id)
+    db.get_weekly_word_count(user_id)
+    db.check_achievements(user_id)
+    db.get_user_achievements(user_id)
+    db.get_achievements_progress(user_id)
+
+    db.get_activity_correlations(user_id)
+    db.get_advanced_correlations(user_id)
+    db.get_advanced_correlations(user_id, 3650)
+    db.get_tag_co_occurrence(user_id)
+    db.get_tag_co_occurrence_by_mood(user_id, 3)
+    db.get_mood_stability(user_id, 3650)
+    db.get_mood_stability_trend(user_id, 30)
+
+    db.get_goals(user_id)
+    db.get_goal_by_id(user_id, goal_id)
+    db.get_goal_completions(user_id, goal_id, "2025-01-01", "2025-02-01")
+    db.get_goals_with_completions(user_id, "2025-01-01", "2025-02-01")
+    db.increment_goal_progress(user_id, goal_id)
+
+    db.get_groups_for_user(user_id)
+    db.verify_option_ownership(options[0], user_id)
+    db.get_user_mood_definitions(user_id)
+    db.get_user_settings(user_id)
+    db.get_important_days(user_id)
+    db.get_upcoming_important_days(user_id)
+    db.get_user_by_id(user_id)
+    db.get_user_by_email("plans@example.com")
+    db.get_user_by_username("nobody")
+    db.get_user_by_google_id("plan-1")
+
+    scheduler.check_reminders()
+    scheduler.check_important_day_reminders()
+    scheduler.rollover_goals()
+    scheduler.get_user_reminders(user_id)
+
+    db.delete_all_media_for_entry(entry_ids[20])
+    db.delete_mood_entry(user_id, entry_ids[21])
+    db.delete_user_data(other_id)
+
+
+def _table_aliases(sql):
+    aliases = {}
+    for table, alias in _ALIAS_RE.findall(sql):
+        aliases[table.lower()] = table.lower()
+        if alias and alias.lower() not in _NOT_ALIASES:
+            aliases[alias.lower()] = table.lower()
+    return aliases
+
+
+def _violations(conn, tables, caller, sql, params):
+    if params is None:
+        params = (None,) * sql.count("?")
+    aliases = _table_aliases(sql)
+    touches_large = any(t in LARGE_TABLES for t in aliases.values())
+    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    problems = []
+    for detail in plan:
+        scan = re.match(r"SCAN (\w+)", detail)
+        table = aliases.get(scan.group(1).lower()) if scan else None
+        if table in tables and (caller, table) not in SCAN_ALLOWED:
+            problems.append(detail)
+        if detail == "USE TEMP B-TREE FOR ORDER BY" and touches_large:
+            problems.append(detail)
+    return problems, plan
+
+
+@pytest.fixture(scope="module")
+def captured(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("plans") / "plans.db")
+    db = MoodDatabase(path, pool_size=0, read_pool_size=0)
+    scheduler = SchedulerService(db, None)
+    seeded = _seed(db, scheduler)
+
+    stats = _CapturingStats()
+    db._query_stats = stats
+    _workload(db, scheduler, *seeded)
+
+    conn = sqlite3.connect(path)
+    tables = {
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND sql NOT LIKE 'CREATE VIRTUAL%'"
+        )
+    }
+    statements = list(stats.statements.values())
+    statements += [(caller, sql, None) for caller, sql in SERVICE_STATEMENTS]
+    yield conn, tables, statements
+    conn.close()
+    db.close()
+
+
+def test_workload_covers_the_mixins(captured):
+    _, _, statements = captured
+    modules = {caller.split(".")[0] for caller, _, _ in statements}
+    for module in (
+        "database_moods",
+        "database_groups",
+        "database_media",
+        "database_scales",
+        "database_goals",
+        "database_achievements",
+        "database_analytics",
+        "scheduler_service",
+    ):
+        assert module in modules
+
+
+def test_hot_queries_use_indexes(captured):
+    conn, tables, statements = captured
+    failures = []
+    for caller, sql, params in statements:
+        if not re.match(r"\s*(SELECT|WITH|UPDATE|DELETE)", sql, re.IGNORECASE):
+            continue
+        problems, plan = _violations(conn, tables, caller, sql, params)
+        if caller in SORT_ALLOWED:
+            problems = [p for p in problems if not p.startswith("USE TEMP B-TREE")]
+        if problems:
+            failures.append(f"{caller}: {normalize_sql(sql)[:120]}\n    " + "\n    ".join(plan))
+    assert not failures, "queries without index support:\n" + "\n".join(failures)
+
+
+def test_migration_adds_hot_query_indexes(captured):
+    conn, _, _ = captured
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    for name in (
+        "idx_mood_entries_user_created",
+        "idx_entry_selections_option",
+        "idx_media_attachments_entry",
+        "idx_reminders_active_time",
+    ):
+        assert name in indexes
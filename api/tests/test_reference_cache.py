@@ -0,0 +1,157 @@
+"""Tests for the versioned reference data cache, its ETags and sign-up defaults."""
+
+import os
+import sqlite3
+
+import pytest
+
+from api.app import create_app
+from api.database import MoodDatabase
+
+TEST_DB_PATH = "/tmp/twilightio_test.db"
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MoodDatabase(str(tmp_path / "reference.db"))
+
+
+def _raw_rows(db, sql, params=()):
+    conn = sqlite3.connect(db.db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def test_defaults_are_provisioned_when_the_user_is_created(db):
+    user_id = db.create_user("new", "new@example.com", "New")
+    assert [m["score"] for m in db.get_user_mood_definitions(user_id)] == [1, 2, 3, 4, 5]
+    assert [s["name"] for s in db.get_user_scales(user_id)] == ["Sleep Quality", "Energy Level", "Stress Level"]
+    assert db.get_user_settings(user_id)["lock_timeout_seconds"] == 60
+
+    # Any insert path gets them, including ones that bypass the mixins.
+    conn = sqlite3.connect(db.db_path)
+    with conn:
+        raw_id = conn.execute(
+            "INSERT INTO users (email, name) VALUES ('raw@example.com', 'Raw')"
+        ).lastrowid
+    conn.close()
+    assert _raw_rows(db, "SELECT COUNT(*) FROM mood_definitions WHERE user_id = ?", (raw_id,)) == [(5,)]
+    assert _raw_rows(db, "SELECT COUNT(*) FROM user_settings WHERE user_id = ?", (raw_id,)) == [(1,)]
+
+
+def test_reads_do_not_write(db):
+    user_id = db.create_user("reader", "reader@example.com", "Reader")
+    conn = sqlite3.connect(db.db_path)
+    with conn:
+        conn.execute("DELETE FROM scale_definitions WHERE user_id = ?", (user_id,))
+        conn.execute("DELETE FROM user_settings WHERE user_id = ?", (user_id,))
+    conn.close()
+
+    writer = sqlite3.connect(db.db_path, timeout=0)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        assert db.get_user_scales(user_id) == []
+        assert db.get_user_settings(user_id)["pin_hash"] is None
+        assert len(db.get_groups_for_user(user_id)) > 0
+        assert len(db.get_user_mood_definitions(user_id)) == 5
+    finally:
+        writer.rollback()
+        writer.close()
+
+
+def test_cache_hits_until_a_write_bumps_the_version(db):
+    user_id = db.create_user("cached", "cached@example.com", "Cached")
+    other_id = db.create_user("other", "other@example.com", "Other")
+
+    first = db.get_user_scales(user_id)
+    assert db.get_user_scales(user_id) is first
+    etag = db.reference_etag(user_id, "scales")
+
+    db.create_scale(user_id, "Focus")
+    assert db.reference_etag(user_id, "scales") != etag
+    assert [s["name"] for s in db.get_user_scales(user_id)][-1] == "Focus"
+
+    # Writes made outside the mixins (another worker, a script) invalidate too.
+    conn = sqlite3.connect(db.db_path)
+    with conn:
+        conn.execute("UPDATE user_settings SET lock_timeout_seconds = 300 WHERE user_id = ?", (user_id,))
+    conn.close()
+    assert db.get_user_settings(user_id)["lock_timeout_seconds"] == 300
+
+    # Shared groups are seen by every user, so their writes reach everyone.
+    other_groups = db.get_groups_for_user(other_id)
+    own_group = db.create_group_for_user(user_id, "Mine")
+    assert db.get_groups_for_user(other_id) is other_groups
+    db.create_group_option(own_group, "Thing")
+    assert any(g["name"] == "Mine" for g in db.get_groups_for_user(user_id))
+    shared = db.create_group("Shared")
+    assert any(g["id"] == shared for g in db.get_groups_for_user(other_id))
+
+    stats = db.reference_cache_stats()
+    assert stats["hits"] >= 2
+
+
+def test_upgrade_backfills_defaults_for_existing_users(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    db = MoodDatabase(path)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("DROP TRIGGER provision_user_defaults")
+        legacy_id = conn.execute(
+            "INSERT INTO users (email, name) VALUES ('old@example.com', 'Old')"
+        ).lastrowid
+        retired_id = conn.execute(
+            "INSERT INTO users (email, name) VALUES ('retired@example.com', 'Retired')"
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO scale_definitions (user_id, name, is_active) VALUES (?, 'Gone', 0)",
+            (retired_id,),
+        )
+        conn.execute("DROP TABLE reference_versions")
+        conn.execute("PRAGMA user_version = 9")
+    conn.close()
+
+    upgraded = MoodDatabase(path)
+    assert len(upgraded.get_user_mood_definitions(legacy_id)) == 5
+    assert len(upgraded.get_user_scales(legacy_id)) == 3
+    assert len(upgraded.get_user_scales(retired_id)) == 3
+    assert _raw_rows(upgraded, "SELECT COUNT(*) FROM user_settings WHERE user_id = ?", (legacy_id,)) == [(1,)]
+
+
+@pytest.fixture()
+def client():
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+    app = create_app("testing")
+    with app.test_client() as test_client:
+        yield test_client
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+@pytest.mark.parametrize(
+    "path", ["/api/groups", "/api/scales", "/api/mood-definitions", "/api/user/settings"]
+)
+def test_reference_endpoints_revalidate_with_etags(client, path):
+    token = client.post("/api/auth/local/login").get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get(path, headers=headers)
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    etag = first.headers["ETag"]
+
+    cached = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.get_data() == b""
+
+    client.put("/api/mood-definitions/3", headers=headers, json={"label": "Steady"})
+    client.post("/api/groups", headers=headers, json={"name": "Fresh"})
+    client.post("/api/scales", headers=headers, json={"name": "Fresh"})
+    client.put("/api/user/settings/lock-timeout", headers=headers, json={"seconds": 120})
+    again = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 200
+    assert again.headers["ETag"] != etag
@@ -0,0 +1,138 @@
+"""Tests for the mood x scale x tag correlation matrix."""
+
+import math
+import os
+import random
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from api.app import create_app
+from api.database import MoodDatabase
+from api.services import analytics_engine
+from api.services.analytics_service import AnalyticsService
+
+TEST_DB_PATH = "/tmp/twilightio_test.db"
+
+
+def _pearson(pairs):
+    xs, ys = zip(*pairs)
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    cov = sum((x - mx) * (y - my) for x, y in pairs)
+    return cov / math.sqrt(sum((x - mx) ** 2 for x in xs) * sum((y - my) ** 2 for y in ys))
+
+
+def _rank(values):
+    order = sorted(values)
+    return [order.index(v) + (order.count(v) + 1) / 2 for v in values]
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    db = MoodDatabase(str(tmp_path / "scales.db"))
+    user_id = db.create_user("scaler", "scaler@example.com", "Scaler")
+    sleep, energy, stress = (s["id"] for s in db.get_user_scales(user_id))
+    walk = db.get_groups_for_user(user_id)[0]["options"][0]["id"]
+    rng = random.Random(16)
+    start = date(2025, 1, 1)
+    moods = [rng.randint(1, 5) for _ in range(60)]
+    for offset, mood in enumerate(moods):
+        if offset == 30:
+            continue  # one day without entries breaks the lag chain
+        day = (start + timedelta(days=offset)).isoformat()
+        entry_id = db.add_mood_entry(
+            user_id, day, mood, "x", selected_options=[walk] if mood >= 4 else []
+        )
+        values = {sleep: mood * 2}
+        if offset % 3:
+            values[stress] = 10 - mood  # missing on every third day
+        if offset:
+            values[energy] = moods[offset - 1] * 2  # tracks yesterday's mood
+        db.save_scale_entries(entry_id, values)
+    return db, user_id, {"sleep": sleep, "energy": energy, "stress": stress, "walk": walk}
+
+
+def test_matrix_matches_reference(seeded):
+    db, user_id, ids = seeded
+    with db._read_conn() as conn:
+        frame = analytics_engine.load_daily_frame(conn, user_id, top_tags=5)
+    result = analytics_engine.correlation_matrix(frame)
+    keys = [v["key"] for v in result["variables"]]
+    index = {key: i for i, key in enumerate(keys)}
+    assert keys[0] == "mood" and f"tag:{ids['walk']}" in keys
+    assert result["days"] == 60
+
+    mood, sleep = index["mood"], index[f"scale:{ids['sleep']}"]
+    stress, energy = index[f"scale:{ids['stress']}"], index[f"scale:{ids['energy']}"]
+    assert result["pearson"][mood][sleep] == pytest.approx(1.0)
+    # Stress skips days, so its ranks are global rather than per-overlap.
+    assert result["spearman"][mood][stress] == pytest.approx(-1.0, abs=0.01)
+    assert result["n"][mood][stress] == sum(1 for d in range(60) if d % 3 and d != 30)
+
+    # Energy today is yesterday's mood: weak same-day, perfect next-day.
+    lagged = result["lagged"]
+    assert lagged["pearson"][mood][energy] == pytest.approx(1.0)
+    assert lagged["n"][mood][energy] == 57  # 59 consecutive pairs minus the two touching day 30
+    assert abs(result["pearson"][mood][energy]) < 0.9
+
+    entries = {e["date"]: e for e in db.get_all_mood_entries(user_id)}
+    selections = db.get_selections_for_entries([e["id"] for e in entries.values()])
+    pairs = [(e["mood"], 1.0 if selections[e["id"]] else 0.0) for e in entries.values()]
+    walk = index[f"tag:{ids['walk']}"]
+    assert result["pearson"][mood][walk] == pytest.approx(_pearson(pairs), abs=1e-4)
+    ranked = list(zip(_rank([p[0] for p in pairs]), _rank([p[1] for p in pairs])))
+    assert result["spearman"][mood][walk] == pytest.approx(_pearson(ranked), abs=1e-4)
+
+
+def test_empty_user_and_cache(seeded):
+    db, user_id, _ = seeded
+    service = AnalyticsService(db)
+    assert service.get_scale_correlations(user_id) is service.get_scale_correlations(user_id)
+    assert service.get_scale_correlations(user_id, 0)["variables"][-1]["type"] == "scale"
+
+    empty = db.create_user("empty", "empty@example.com", "Empty")
+    result = service.get_scale_correlations(empty)
+    assert result["days"] == 0
+    assert all(v is None for row in result["pearson"] for v in row)
+
+
+def test_outlier_dates_do_not_allocate_the_span(seeded):
+    db, user_id, _ = seeded
+    db.add_mood_entry(user_id, "1900-01-01", 3, "typo")
+    db.add_mood_entry(user_id, "9999-12-31", 3, "typo")
+    with db._read_conn() as conn:
+        frame = analytics_engine.load_daily_frame(conn, user_id, top_tags=5)
+    assert frame["values"].shape[0] == 61
+    result = analytics_engine.correlation_matrix(frame)
+    assert result["lagged"]["n"][0][0] == 57
+
+
+@pytest.fixture()
+def client():
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+    app = create_app("testing")
+    with app.test_client() as test_client:
+        yield test_client
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+def test_scale_correlations_endpoint(client):
+    token = client.post("/api/auth/local/login").get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for day, mood in enumerate((1, 3, 5, 2, 4), start=1):
+        resp = client.post(
+            "/api/mood", headers=headers, json={"mood": mood, "date": f"2024-03-{day:02d}", "content": "x"}
+        )
+        assert resp.status_code == 201
+
+    resp = client.get("/api/analytics/scale-correlations?top=3", headers=headers)
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["variables"][0]["key"] == "mood"
+    assert body["pearson"][0][0] == 1.0 and body["lagged"]["lag_days"] == 1
+
+    assert client.get("/api/analytics/scale-correlations?top=99", headers=headers).status_code == 400
@@ -0,0 +1,132 @@
+"""Tests for the PRAGMA user_version migration registry."""
+
+import sqlite3
+
+import pytest
+
+from api.database import MoodDatabase
+from api.database_schema import DatabaseSchemaMixin
+
+
+def _user_version(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_fresh_database_is_stamped_with_latest_version(test_db):
+    MoodDatabase(test_db)
+    assert _user_version(test_db) == DatabaseSchemaMixin.schema_version()
+
+
+def test_current_schema_skips_all_migrations(test_db, monkeypatch):
+    MoodDatabase(test_db)
+
+    def fail(self, conn):  # pragma: no cover - must not run
+        raise AssertionError("migration re-applied on a current schema")
+
+    monkeypatch.setattr(DatabaseSchemaMixin, "_migration_0001_baseline", fail)
+    MoodDatabase(test_db)  # no-op startup
+
+
+def test_unversioned_database_is_adopted(test_db):
+    conn = sqlite3.connect(test_db)
+    conn.execute(
+        "CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, google_id TEXT UNIQUE, "
+        "email TEXT NOT NULL, name TEXT NOT NULL, avatar_url TEXT, "
+        "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, last_login TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    )
+    conn.execute("INSERT INTO users (google_id, email, name) VALUES ('legacy', 'l@example.com', 'Legacy')")
+    conn.commit()
+    conn.close()
+
+    db = MoodDatabase(test_db)
+
+    assert _user_version(test_db) == DatabaseSchemaMixin.schema_version()
+    user = db.get_user_by_google_id("legacy")
+    assert user is not None
+    # The rest of the baseline (tables, seed data) was filled in around it.
+    assert {g["name"] for g in db.get_all_groups()} >= {"Emotions", "Sleep", "Productivity"}
+
+
+def test_only_pending_migrations_run(test_db, monkeypatch):
+    MoodDatabase(test_db)
+    base = DatabaseSchemaMixin.schema_version()
+    applied = []
+
+    def add_column(self, conn):
+        applied.append("add")
+        conn.execute("ALTER TABLE users ADD COLUMN migration_probe TEXT")
+
+    monkeypatch.setattr(DatabaseSchemaMixin, "_migration_test_probe", add_column, raising=False)
+    monkeypatch.setattr(
+        DatabaseSchemaMixin,
+        "MIGRATIONS",
+        DatabaseSchemaMixin.MIGRATIONS + ((base + 1, "test probe", "_migration_test_probe"),),
+    )
+
+    MoodDatabase(test_db)
+    MoodDatabase(test_db)
+
+    assert applied == ["add"]
+    assert _user_version(test_db) == base + 1
+
+
+def test_failed_migration_rolls_back_and_keeps_version(test_db, monkeypatch):
+    MoodDatabase(test_db)
+    base = DatabaseSchemaMixin.schema_version()
+
+    def broken(self, conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER)")
+        raise sqlite3.OperationalError("boom")
+
+    monkeypatch.setattr(DatabaseSchemaMixin, "_migration_test_broken", broken, raising=False)
+    monkeypatch.setattr(
+        DatabaseSchemaMixin,
+        "MIGRATIONS",
+        DatabaseSchemaMixin.MIGRATIONS + ((base + 1, "broken", "_migration_test_broken"),),
+    )
+
+    with pytest.raises(sqlite3.OperationalError):
+        MoodDatabase(test_db)
+
+    assert _user_version(test_db) == base
+    conn = sqlite3.connect(test_db)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+    assert "half_done" not in tables
+
+
+class _LockedConn:
+    """Connection proxy failing statements that mention ``table``, as a locked DB would."""
+
+    def __init__(self, conn, table):
+        self._conn = conn
+        self._table = table
+
+    def execute(self, sql, *args):
+        if self._table in sql:
+            raise sqlite3.OperationalError("database is locked")
+        return self._conn.execute(sql, *args)
+
+
+def test_baseline_step_failure_is_retried_on_next_boot(test_db, monkeypatch):
+    original = DatabaseSchemaMixin._create_user_metrics_table
+    monkeypatch.setattr(
+        DatabaseSchemaMixin,
+        "_create_user_metrics_table",
+        lambda self, conn: original(self, _LockedConn(conn, "user_metrics")),
+    )
+    with pytest.raises(sqlite3.OperationalError):
+        MoodDatabase(test_db)
+    assert _user_version(test_db) == 0
+
+    monkeypatch.setattr(DatabaseSchemaMixin, "_create_user_metrics_table", original)
+    MoodDatabase(test_db)
+    assert _user_version(test_db) == DatabaseSchemaMixin.schema_version()
+    conn = sqlite3.connect(test_db)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+    assert "user_metrics" in tables
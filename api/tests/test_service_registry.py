@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from api.app import create_app
+from api.utils.service_registry import ServiceRegistry
+
+TEST_DB_PATH = "/tmp/twilightio_test.db"
+
+
+def _reset_test_db():
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+@pytest.fixture()
+def app():
+    _reset_test_db()
+    yield create_app("testing")
+    _reset_test_db()
+
+
+def test_registry_builds_service_once():
+    registry = ServiceRegistry()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return {"value": 42}
+
+    proxy = registry.register("thing", factory)
+    assert not registry.is_loaded("thing")
+
+    assert proxy.get("value") == 42
+    assert proxy.get("value") == 42
+    assert calls == [1]
+    assert registry.is_loaded("thing")
+    assert "thing" in registry.timings()
+
+
+def test_heavy_services_are_not_built_at_startup(app):
+    services = app.extensions["services"]
+    for name in ("media", "push", "scheduler", "export", "daylio_import"):
+        assert not services.is_loaded(name)
+
+    timings = services.timings()
+    for component in ("database", "blueprints", "create_app"):
+        assert component in timings
+
+
+class _StubExportService:
+    def generate_json(self, user_id):
+        return {"user_id": user_id, "entries": []}
+
+
+def test_service_loads_on_first_request(app):
+    services = app.extensions["services"]
+    # Swap the factory so the test does not depend on weasyprint/pango.
+    services.register("export", _StubExportService)
+    with app.test_client() as client:
+        token = client.post("/api/auth/local/login").get_json()["token"]
+        assert not services.is_loaded("export")
+        resp = client.get("/api/export/json", headers={"Authorization": f"Bearer {token}"})
+
+    assert resp.status_code == 200
+    assert resp.get_json()["entries"] == []
+    assert services.is_loaded("export")
+    assert not services.is_loaded("push")
+
+
+def test_startup_does_not_import_numpy():
+    _reset_test_db()
+    code = (
+        "import sys; from api.app import create_app; create_app('testing'); "
+        "print('numpy' in sys.modules)"
+    )
+    env = {**os.environ, "DATABASE_PATH": TEST_DB_PATH}
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+    )
+    _reset_test_db()
+    assert out.stdout.strip().splitlines()[-1] == "False"
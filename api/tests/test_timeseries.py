@@ -0,0 +1,124 @@
+"""Tests for bucketed time series aggregation and /api/analytics/timeseries."""
+
+import os
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+
+from api.app import create_app
+from api.database import MoodDatabase
+
+TEST_DB_PATH = "/tmp/twilightio_test.db"
+
+
+def _key(bucket, day, hour):
+    d = date.fromisoformat(day)
+    return {
+        "day": day,
+        "week": (d - timedelta(days=d.weekday())).isoformat(),
+        "month": day[:7],
+        "weekday": (d.weekday() + 1) % 7,
+        "hour": hour,
+    }[bucket]
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    db = MoodDatabase(str(tmp_path / "series.db"))
+    user_id = db.create_user("series", "series@example.com", "Series")
+    scale_id = db.get_user_scales(user_id)[0]["id"]
+    option_id = db.get_groups_for_user(user_id)[0]["options"][0]["id"]
+    rng = random.Random(17)
+    rows = []
+    for _ in range(120):
+        day = (date(2025, 11, 1) + timedelta(days=rng.randrange(120))).isoformat()
+        hour = rng.randrange(24)
+        mood = rng.randint(1, 5)
+        words = " ".join(["w"] * rng.randint(1, 9))
+        tagged = rng.random() < 0.4
+        entry_id = db.add_mood_entry(
+            user_id, day, mood, words, time=f"{day}T{hour:02d}:15:00",
+            selected_options=[option_id] if tagged else [],
+        )
+        scale = rng.randint(1, 10)
+        db.save_scale_entries(entry_id, {scale_id: scale})
+        rows.append((day, hour, mood, len(words.split()), scale, tagged))
+    # Legacy m/d/Y date lands in the same buckets as its ISO form.
+    db.add_mood_entry(user_id, "12/25/2025", 4, "legacy entry", time="2025-12-25 08:00:00")
+    rows.append(("2025-12-25", 8, 4, 2, None, False))
+    return db, user_id, scale_id, option_id, rows
+
+
+@pytest.mark.parametrize("bucket", ["day", "week", "month", "weekday", "hour"])
+def test_buckets_match_reference(seeded, bucket):
+    db, user_id, scale_id, option_id, rows = seeded
+    for metric, pick in (
+        ("mood", lambda r: r[2]),
+        ("word_count", lambda r: r[3]),
+        (f"scale:{scale_id}", lambda r: r[4]),
+        (f"tag:{option_id}", lambda r: r[2] if r[5] else None),
+    ):
+        expected = defaultdict(lambda: [0, 0])
+        for row in rows:
+            value = pick(row)
+            if value is not None:
+                slot = expected[_key(bucket, row[0], row[1])]
+                slot[0] += 1
+                slot[1] += value
+        series = db.get_timeseries(user_id, metric, bucket)
+        keys = sorted(expected)
+        assert series["buckets"] == keys, (metric, bucket)
+        assert series["count"] == [expected[k][0] for k in keys]
+        assert series["sum"] == [expected[k][1] for k in keys]
+        assert series["average"] == [round(expected[k][1] / expected[k][0], 3) for k in keys]
+
+
+def test_range_and_visibility(seeded):
+    db, user_id, scale_id, option_id, rows = seeded
+    series = db.get_timeseries(user_id, "mood", "month", "2025-12-01", "2025-12-31")
+    assert series["buckets"] == ["2025-12"]
+    assert series["count"] == [sum(1 for r in rows if r[0].startswith("2025-12"))]  # legacy m/d/Y included
+    with pytest.raises(ValueError):
+        db.get_timeseries(user_id, "mood", "day", "December")
+
+    tagged = db.get_timeseries(user_id, f"tag:{option_id}", "month", "2025-12-01", "2025-12-31")
+    assert tagged["count"] == [sum(1 for r in rows if r[5] and r[0].startswith("2025-12"))]
+
+    other = db.create_user("other", "other@example.com", "Other")
+    assert db.get_timeseries(other, f"scale:{scale_id}", "day") is None
+    with pytest.raises(ValueError):
+        db.get_timeseries(user_id, "scale:x", "day")
+
+
+@pytest.fixture()
+def client():
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+    app = create_app("testing")
+    with app.test_client() as test_client:
+        yield test_client
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+def test_timeseries_endpoint(client):
+    token = client.post("/api/auth/local/login").get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for day, mood in ((1, 2), (2, 4), (9, 5)):
+        resp = client.post(
+            "/api/mood", headers=headers, json={"mood": mood, "date": f"2024-03-{day:02d}", "content": "x"}
+        )
+        assert resp.status_code == 201
+
+    resp = client.get("/api/analytics/timeseries?metric=mood&bucket=week&start=2024-03-01", headers=headers)
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["buckets"] == ["2024-02-26", "2024-03-04"]
+    assert body["count"] == [2, 1] and body["average"] == [3.0, 5.0]
+
+    bad = ("metric=energy", "bucket=year", "start=March", "metric=tag:abc")
+    for query in bad:
+        assert client.get(f"/api/analytics/timeseries?{query}", headers=headers).status_code == 400
+    assert client.get("/api/analytics/timeseries?metric=scale:999999", headers=headers).status_code == 404
@@ -0,0 +1,150 @@
+"""Tests for the trigger-maintained user_streaks state."""
+
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from api.database import MoodDatabase
+
+LONG = " ".join(["word"] * 60)
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MoodDatabase(str(tmp_path / "streaks.db"))
+
+
+def _parse(value):
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _expected(db, user_id):
+    """Streaks recomputed from scratch, the way the old per-request code did."""
+    with db._read_conn() as conn:
+        rows = conn.execute(
+            "SELECT date, word_count FROM mood_entries WHERE user_id = ?", (user_id,)
+        ).fetchall()
+    today = datetime.now().date()
+
+    def streaks(days):
+        days = sorted(d for d in days if d)
+        longest = run = 0
+        previous = None
+        for day in days:
+            run = run + 1 if previous is not None and (day - previous).days == 1 else (run if day == previous else 1)
+            longest = max(longest, run)
+            previous = day
+        current = run if days and (today - days[-1]).days <= 1 else 0
+        return current, longest
+
+    entry = streaks({_parse(r[0]) for r in rows})
+    journal = streaks({_parse(r[0]) for r in rows if r[1] >= 50})
+    return {
+        "current_streak": entry[0],
+        "longest_streak": entry[1],
+        "journaling_streak": journal[0],
+        "longest_journaling_streak": journal[1],
+    }
+
+
+def _state(db, user_id):
+    state = db.get_streak_state(user_id)
+    return {key: state[key] for key in ("current_streak", "longest_streak", "journaling_streak", "longest_journaling_streak")}
+
+
+def _dirty(db, user_id):
+    with db._read_conn() as conn:
+        row = conn.execute("SELECT dirty FROM user_streaks WHERE user_id = ?", (user_id,)).fetchone()
+    return row[0] if row else None
+
+
+def test_appending_days_stays_on_the_fast_path(db):
+    user_id = db.create_user("fast", "fast@example.com", "Fast")
+    today = date.today()
+    db.add_mood_entry(user_id, (today - timedelta(days=3)).isoformat(), 3, "first")
+    assert _state(db, user_id)["current_streak"] == 0  # the first write computes the row
+
+    for offset in (2, 1, 1, 0):
+        day = (today - timedelta(days=offset)).isoformat()
+        db.add_mood_entry(user_id, day, 4, LONG if offset < 2 else "short")
+        assert _dirty(db, user_id) == 0
+    assert _state(db, user_id) == {
+        "current_streak": 4,
+        "longest_streak": 4,
+        "journaling_streak": 2,
+        "longest_journaling_streak": 2,
+    }
+
+    # A gap restarts the run without a rebuild, keeping the longest.
+    db.add_mood_entry(user_id, (today + timedelta(days=3)).isoformat(), 4, "future")
+    assert _dirty(db, user_id) == 0
+    assert _state(db, user_id)["longest_streak"] == 4
+
+
+def test_random_history_matches_recomputation(db):
+    rng = random.Random(18)
+    user_id = db.create_user("random", "random@example.com", "Random")
+    other_id = db.create_user("other", "other@example.com", "Other")
+    today = date.today()
+    entries = []
+
+    def some_day():
+        day = today - timedelta(days=rng.randrange(40))
+        return day.strftime("%m/%d/%Y") if rng.random() < 0.15 else day.isoformat()
+
+    for step in range(150):
+        action = rng.random()
+        if action < 0.55 or not entries:
+            content = LONG if rng.random() < 0.4 else "short note"
+            entries.append(db.add_mood_entry(user_id, some_day(), rng.randint(1, 5), content))
+        elif action < 0.75:
+            entry_id = entries.pop(rng.randrange(len(entries)))
+            db.delete_mood_entry(user_id, entry_id)
+        elif action < 0.9:
+            db.update_mood_entry(user_id, rng.choice(entries), date=some_day())
+        else:
+            content = LONG if rng.random() < 0.5 else "short"
+            db.update_mood_entry(user_id, rng.choice(entries), content=content)
+        if step % 5 == 0:
+            db.add_mood_entry(other_id, some_day(), 3, LONG)
+        if step % 3 == 0:
+            assert _state(db, user_id) == _expected(db, user_id)
+
+    assert _state(db, user_id) == _expected(db, user_id)
+    assert _state(db, other_id) == _expected(db, other_id)
+
+    before = {uid: _state(db, uid) for uid in (user_id, other_id)}
+    assert db.rebuild_user_streaks() == 2
+    assert {uid: _state(db, uid) for uid in (user_id, other_id)} == before
+
+
+def test_deleting_a_duplicate_day_keeps_state_clean(db):
+    user_id = db.create_user("dupe", "dupe@example.com", "Dupe")
+    today = date.today().isoformat()
+    first = db.add_mood_entry(user_id, today, 3, LONG)
+    second = db.add_mood_entry(user_id, today, 3, LONG)
+    db.get_streak_state(user_id)
+
+    # Raw deletes, so the triggers' marking is visible before any rebuild.
+    def delete(entry_id):
+        with db._write_transaction() as conn:
+            conn.execute("DELETE FROM mood_entries WHERE id = ?", (entry_id,))
+
+    delete(first)
+    assert _dirty(db, user_id) == 0  # the day still has a long entry
+    delete(second)
+    assert _dirty(db, user_id) == 1
+    assert db.persist_dirty_streaks() == 1
+    assert _dirty(db, user_id) == 0
+    assert _state(db, user_id) == {
+        "current_streak": 0,
+        "longest_streak": 0,
+        "journaling_streak": 0,
+        "longest_journaling_streak": 0,
+    }
@@ -0,0 +1,53 @@
+"""Opaque cursor tokens for keyset pagination.
+
+A cursor carries the sort key of the last row on the previous page plus,
+when the client asked for it, the total computed on the first page, so
+later pages never re-count.  Tokens are URL-safe base64 JSON; they are
+opaque to clients but not secret, and every field is validated on decode.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Optional, Sequence, Tuple
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded for the given listing."""
+
+
+def encode_cursor(kind: str, key: Sequence[Any], total: Optional[int] = None) -> str:
+    payload = {"k": kind, "v": list(key)}
+    if total is not None:
+        payload["t"] = int(total)
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, kind: str, key_types: Sequence[type]) -> Tuple[tuple, Optional[int]]:
+    """Return ``(key, total)`` from ``token`` or raise :class:`InvalidCursor`.
+
+    Args:
+        token: Value of the ``cursor`` query parameter.
+        kind: Listing the cursor must belong to (e.g. ``"moods"``).
+        key_types: Expected type of each key component.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError) as exc:
+        raise InvalidCursor("Malformed cursor") from exc
+
+    if not isinstance(payload, dict) or payload.get("k") != kind:
+        raise InvalidCursor("Cursor does not belong to this listing")
+    key = payload.get("v")
+    if not isinstance(key, list) or len(key) != len(key_types):
+        raise InvalidCursor("Malformed cursor")
+    for value, expected in zip(key, key_types):
+        # bool is an int subclass; never accept it for numeric keys.
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise InvalidCursor("Malformed cursor")
+    total = payload.get("t")
+    if total is not None and (isinstance(total, bool) or not isinstance(total, int) or total < 0):
+        raise InvalidCursor("Malformed cursor")
+    return tuple(key), total
@@ -1,7 +1,7 @@
 """Standardized API response utilities."""
 
-from typing import Any, Dict, List, Optional, Union
-from flask import jsonify
+from typing import Any, Callable, Dict, List, Optional, Union
+from flask import Response, jsonify, make_response, request
 
 
 def success_response(
@@ -86,6 +86,41 @@ def paginated_response(
     return jsonify(response), status
 
 
+def cursor_paginated_response(
+    data: List[Any],
+    next_cursor: Optional[str],
+    limit: int,
+    total: Optional[int] = None,
+    status: int = 200
+) -> tuple:
+    """Create a standardized keyset (cursor) paginated response.
+
+    Args:
+        data: The list of items for the current page
+        next_cursor: Opaque token for the following page, or None at the end
+        limit: Maximum number of items per page
+        total: Total number of items, when the client asked for it
+        status: HTTP status code (default 200)
+
+    Returns:
+        Tuple of (jsonify response, status code)
+    """
+    pagination: Dict[str, Any] = {
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "has_next": next_cursor is not None,
+    }
+    if total is not None:
+        pagination["total"] = total
+
+    response = {
+        "status": "success",
+        "data": data,
+        "pagination": pagination,
+    }
+    return jsonify(response), status
+
+
 def validation_error_response(
     errors: Union[str, List[str], Dict[str, str]],
     status: int = 422
@@ -136,3 +171,26 @@ def forbidden_response(message: str = "Forbidden") -> tuple:
         Tuple of (jsonify response, 403 status code)
     """
     return error_response(message, status=403)
+
+
+def conditional_response(etag: str, build: Callable[[], Any]) -> Response:
+    """Answer ``304 Not Modified`` when the client already holds ``etag``.
+
+    Otherwise ``build`` produces the response (anything a view may return).
+    Either way the ETag is attached with ``Cache-Control: private, no-cache``
+    so browsers keep the body but revalidate before every use.
+
+    Args:
+        etag: Unquoted entity tag of the current representation
+        build: Callable returning the full response
+
+    Returns:
+        Response with ETag and Cache-Control headers set
+    """
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(build())
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,107 @@
+"""Bounded LRU cache for per-user computed results.
+
+Each entry is stored under ``(user_id, endpoint, params)`` together with the
+user's data version at the time it was computed.  A lookup with a different
+version is a miss and the entry is replaced, so a write (which bumps the
+version) can never be followed by a stale read.  Size is bounded by entry
+count and, when ``max_bytes`` is set, by an estimate of the JSON-encoded
+payload size (or the ``nbytes`` of array-backed values); with
+``max_bytes=0`` nothing is serialized to measure it.  Cached values are shared between
+callers and must be treated as read-only.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+CacheKey = Tuple[int, str, Hashable]
+
+
+def _estimate_size(value: Any) -> int:
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes  # Array-backed values report their own footprint
+    try:
+        return len(json.dumps(value, default=str, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return 0
+
+
+class VersionedLRUCache:
+    """Thread-safe LRU of ``key -> (version, value, size)``."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[CacheKey, Tuple[int, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_compute(self, key: CacheKey, version: int, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` at ``version`` or compute and store it.
+
+        ``version`` must be read *before* calling, so a result computed while
+        a write lands is stored under the older version and recomputed next
+        time rather than served as current.
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return cached[1]
+            self._misses += 1
+
+        value = compute()
+        if self.max_entries:
+            self._store(key, version, value)
+        return value
+
+    def _store(self, key: CacheKey, version: int, value: Any) -> None:
+        size = _estimate_size(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                if previous[0] > version:
+                    # A newer result landed while this one was computing.
+                    self._entries[key] = previous
+                    return
+                self._bytes -= previous[2]
+            self._entries[key] = (version, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes and self._bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                self._bytes -= self._entries.pop(key)[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,96 @@
+"""Lazy service registry used by the application factory.
+
+Blueprints have to be registered when the app is built, but the services
+behind some of them pull in heavy dependencies (matplotlib/weasyprint for
+exports, pywebpush and APScheduler for reminders, PIL for media).  Routes are
+handed a :class:`LazyService` proxy instead, and the real service is imported
+and constructed the first time a request touches it.
+"""
+
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def import_attr(module: str, attr: str) -> Any:
+    """Import ``attr`` from ``api.<module>``, falling back to ``<module>``.
+
+    Mirrors the ``try: from api.x import ... except ImportError: from x``
+    pattern used when the app runs from inside ``api/``.  A missing
+    third-party dependency is re-raised rather than masked by the fallback.
+    """
+    try:
+        mod = importlib.import_module(f"api.{module}")
+    except ModuleNotFoundError as exc:
+        if not (exc.name or "").startswith("api"):
+            raise
+        mod = importlib.import_module(module)
+    return getattr(mod, attr)
+
+
+class ServiceRegistry:
+    """Builds services on first use and records per-component timings."""
+
+    def __init__(self) -> None:
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._timings: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> "LazyService":
+        """Register ``factory`` under ``name`` and return a lazy proxy for it."""
+        self._factories[name] = factory
+        return LazyService(self, name)
+
+    def get(self, name: str) -> Any:
+        """Return the service, importing and constructing it if needed."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                started = time.perf_counter()
+                instance = self._factories[name]()
+                self._instances[name] = instance
+                elapsed = self.record(name, started)
+                logger.info("Loaded service %s in %.1f ms", name, elapsed)
+        return instance
+
+    def names(self) -> List[str]:
+        """Registered service names, in registration order."""
+        return list(self._factories)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def record(self, component: str, started: float) -> float:
+        """Record the time since ``started`` (``perf_counter``) for ``component``."""
+        elapsed = (time.perf_counter() - started) * 1000
+        self._timings[component] = round(elapsed, 2)
+        return elapsed
+
+    def timings(self) -> Dict[str, float]:
+        """Return startup and lazy-load timings in milliseconds."""
+        return dict(self._timings)
+
+
+class LazyService:
+    """Attribute proxy that resolves its service through the registry."""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ServiceRegistry, name: str) -> None:
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._registry.get(self._name), attr)
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging helper
+        state = "loaded" if self._registry.is_loaded(self._name) else "pending"
+        return f"<LazyService {self._name} ({state})>"